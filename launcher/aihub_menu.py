@@ -366,6 +366,13 @@ def build_argument_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--detect-gpu", action="store_true", help="Print GPU detection details and exit"
     )
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const="-",
+        metavar="PATH",
+        help="Write a JSON cold-start profile (import tree, first-request timings) to PATH (default: stdout) and exit",
+    )
     return parser
 
 
@@ -373,6 +380,11 @@ def main(argv: Optional[List[str]] = None) -> int:
     parser = build_argument_parser()
     args = parser.parse_args(argv)
 
+    if args.profile_startup:
+        from modules.startup_profile import run_profile_flag
+
+        return run_profile_flag("menu", args.profile_startup)
+
     gpu_info = detect_gpu()
     log_line(
         f"Environment summary — GPU: {gpu_info['label']}, DirectML: {gpu_info['directml']}, "
@@ -486,7 +486,14 @@ def installer_env(config: Dict[str, Any]) -> str:
 def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="AI Hub configuration service")
     parser.add_argument("--config", default=DEFAULT_CONFIG_PATH, help="Path to the JSON/YAML config file")
-    subparsers = parser.add_subparsers(dest="command", required=True)
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const="-",
+        metavar="PATH",
+        help="Write a JSON cold-start profile (import tree, first-request timings) to PATH (default: stdout) and exit",
+    )
+    subparsers = parser.add_subparsers(dest="command")
 
     export_parser = subparsers.add_parser("export", help="Export configuration")
     export_parser.add_argument("--format", choices=["json", "env"], default="env")
@@ -575,6 +582,12 @@ def command_installer_profile(args: argparse.Namespace) -> int:
 def main(argv: List[str]) -> int:
     parser = build_arg_parser()
     args = parser.parse_args(argv)
+    if args.profile_startup:
+        from modules.startup_profile import run_profile_flag
+
+        return run_profile_flag("config_service", args.profile_startup)
+    if not args.command:
+        parser.error("a command is required (export, save, migrate, installer-profile)")
 
     try:
         if args.command == "export":
@@ -1,15 +1,35 @@
 """Placeholder ASR implementation."""
 from __future__ import annotations
 
-from pathlib import Path
+from typing import Dict, Optional
 
+from modules.runtime.residency import default_residency
 from .models import ASRRequest, ASRResult
 
 
-def transcribe(request: ASRRequest) -> ASRResult:
-    if not request.source_path.exists():
-        raise FileNotFoundError(f"Source not found: {request.source_path}")
+def _load_recognizer(language: str) -> Dict[str, str]:
+    # Placeholder for loading a recognizer; real backends return the model here.
+    return {"language": language}
+
+
+default_residency().register_loader("asr", _load_recognizer)
+
+
+class TranscriptionSession:
+    """Recognizer context bound to one language hint; batches reuse it across a group of sources."""
 
-    snippet = request.source_path.stem.replace("_", " ")
-    transcript = f"Transcript for {snippet}"
-    return ASRResult(transcript=transcript, source_path=request.source_path, language=request.language)
+    def __init__(self, language: Optional[str] = None) -> None:
+        self.language = language
+        self.model = default_residency().get("asr", language or "auto")
+
+    def transcribe(self, request: ASRRequest) -> ASRResult:
+        if not request.source_path.exists():
+            raise FileNotFoundError(f"Source not found: {request.source_path}")
+
+        snippet = request.source_path.stem.replace("_", " ")
+        transcript = f"Transcript for {snippet}"
+        return ASRResult(transcript=transcript, source_path=request.source_path, language=request.language)
+
+
+def transcribe(request: ASRRequest) -> ASRResult:
+    return TranscriptionSession(request.language).transcribe(request)
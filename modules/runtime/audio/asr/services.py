@@ -2,17 +2,18 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
 
-from modules.runtime.models.tasks import mark_failed, mark_running, mark_succeeded, new_task
-from .core import transcribe
+from modules.runtime.models.tasks import Task, mark_failed, mark_running, mark_succeeded, new_task
+from .core import TranscriptionSession, transcribe
 from .models import ASRRequest
 
 
 TASK_KIND = "asr"
 
 
-def run_asr(request: ASRRequest):
-    task = new_task(TASK_KIND, payload=request.to_dict())
+def run_asr(request: ASRRequest, task: Optional[Task] = None):
+    task = task or new_task(TASK_KIND, payload=request.to_dict())
     mark_running(task)
     try:
         result = transcribe(request)
@@ -22,9 +23,40 @@ def run_asr(request: ASRRequest):
     return task
 
 
-def run_asr_from_payload(payload):
+def request_from_payload(payload) -> ASRRequest:
     path_value = payload.get("source_path") or payload.get("path")
     if not path_value:
         raise ValueError("source_path is required for ASR")
-    request = ASRRequest(source_path=Path(path_value), language=payload.get("language"))
-    return run_asr(request)
+    return ASRRequest(source_path=Path(path_value), language=payload.get("language"))
+
+
+def run_asr_from_payload(payload):
+    return run_asr(request_from_payload(payload))
+
+
+def batch_key(request: ASRRequest) -> str:
+    return request.language or "auto"
+
+
+def run_asr_batch(
+    requests: Sequence[ASRRequest],
+    tasks: Optional[List[Task]] = None,
+    on_result: Optional[Callable[[Task], None]] = None,
+) -> List[Task]:
+    """Transcribe many sources with one ``TranscriptionSession`` per language; ``on_result`` fires per item."""
+
+    tasks = tasks or [new_task(TASK_KIND, payload=request.to_dict()) for request in requests]
+    groups: Dict[str, List[int]] = {}
+    for index, request in enumerate(requests):
+        groups.setdefault(batch_key(request), []).append(index)
+    for language, indexes in groups.items():
+        session = TranscriptionSession(None if language == "auto" else language)
+        for index in indexes:
+            task = mark_running(tasks[index])
+            try:
+                mark_succeeded(task, result=session.transcribe(requests[index]).to_dict())
+            except Exception as exc:
+                mark_failed(task, str(exc))
+            if on_result:
+                on_result(task)
+    return tasks
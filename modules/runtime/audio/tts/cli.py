@@ -3,17 +3,26 @@ from __future__ import annotations
 
 import argparse
 import json
-from typing import Any, Dict
+from typing import Any, Dict, List, Union
 
 from modules.runtime.models.tasks import serialize_task
-from .services import run_text_to_speech_from_payload
+from .services import request_from_payload, run_text_to_speech_batch, run_text_to_speech_from_payload
 
 
-def _load_payload(args: argparse.Namespace) -> Dict[str, Any]:
+def _parse_payloads(raw: str) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+    """One JSON object, a JSON array, or JSON Lines (one object per line) for batches."""
+
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return [json.loads(line) for line in raw.splitlines() if line.strip()]
+
+
+def _load_payload(args: argparse.Namespace) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
     if args.payload_json:
         return json.loads(args.payload_json)
     if args.payload_file:
-        return json.loads(args.payload_file.read_text(encoding="utf-8"))
+        return _parse_payloads(args.payload_file.read())
     if args.text:
         payload: Dict[str, Any] = {"text": args.text}
         if args.voice:
@@ -21,7 +30,7 @@ def _load_payload(args: argparse.Namespace) -> Dict[str, Any]:
         return payload
     raw = args.stdin.read() if not args.stdin.isatty() else ""
     if raw:
-        return json.loads(raw)
+        return _parse_payloads(raw)
     raise ValueError("No payload provided; pass --text or JSON")
 
 
@@ -30,11 +39,21 @@ def main() -> None:
     parser.add_argument("--text", help="Text to synthesize")
     parser.add_argument("--voice", help="Voice identifier")
     parser.add_argument("--payload-json", dest="payload_json", help="Inline JSON payload")
-    parser.add_argument("--payload-file", dest="payload_file", type=argparse.FileType("r"), help="Path to JSON payload")
+    parser.add_argument(
+        "--payload-file",
+        dest="payload_file",
+        type=argparse.FileType("r"),
+        help="Path to a JSON payload, or a JSON array / JSONL file to run as a batch",
+    )
     parser.add_argument("--stdin", type=argparse.FileType("r"), default="-", help="Optional stdin handle")
     args = parser.parse_args()
 
     payload = _load_payload(args)
+    if isinstance(payload, list):
+        # Batch: validate everything first, then print one JSON line per item as it finishes.
+        requests = [request_from_payload(item) for item in payload]
+        run_text_to_speech_batch(requests, on_result=lambda task: print(json.dumps(serialize_task(task)), flush=True))
+        return
     task = run_text_to_speech_from_payload(payload)
     print(json.dumps(serialize_task(task), indent=2))
 
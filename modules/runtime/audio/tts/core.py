@@ -2,29 +2,48 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
+from modules.runtime.residency import default_residency
 from .models import TextToSpeechRequest, TextToSpeechResult
 
 
 OUTPUT_DIR = Path.home() / ".cache/aihub/audio/tts"
 
 
+def _load_voice(voice: str) -> Dict[str, str]:
+    # Placeholder for loading a voice checkpoint; real backends return the model here.
+    return {"voice": voice}
+
+
+default_residency().register_loader("tts", _load_voice)
+
+
+class SpeechSession:
+    """Synthesis context bound to one voice; batches reuse it so voice setup happens once per group."""
+
+    def __init__(self, voice: Optional[str] = None) -> None:
+        self.voice = voice or "default"
+        self.model = default_residency().get("tts", self.voice)
+        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    def synthesize(self, request: TextToSpeechRequest, task_id: Optional[str] = None) -> TextToSpeechResult:
+        """Simulate speech synthesis by writing request details to a cache file."""
+
+        output_name = f"{task_id or 'tts-job'}.txt"
+        output_path = OUTPUT_DIR / output_name
+        output_path.write_text(
+            "\n".join(
+                [
+                    "AI Hub TTS placeholder output",
+                    f"voice={self.voice}",
+                    f"text={request.text}",
+                ]
+            ),
+            encoding="utf-8",
+        )
+        return TextToSpeechResult(audio_path=output_path, voice=self.voice)
+
+
 def synthesize_speech(request: TextToSpeechRequest, task_id: Optional[str] = None) -> TextToSpeechResult:
-    """Simulate speech synthesis by writing request details to a cache file."""
-
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    output_name = f"{task_id or 'tts-job'}.txt"
-    output_path = OUTPUT_DIR / output_name
-    voice = request.voice or "default"
-    output_path.write_text(
-        "\n".join(
-            [
-                "AI Hub TTS placeholder output",
-                f"voice={voice}",
-                f"text={request.text}",
-            ]
-        ),
-        encoding="utf-8",
-    )
-    return TextToSpeechResult(audio_path=output_path, voice=voice)
+    return SpeechSession(request.voice).synthesize(request, task_id=task_id)
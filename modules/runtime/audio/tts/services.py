@@ -1,16 +1,18 @@
 """Service helpers for TTS tasks."""
 from __future__ import annotations
 
-from modules.runtime.models.tasks import mark_failed, mark_running, mark_succeeded, new_task
-from .core import synthesize_speech
+from typing import Callable, Dict, List, Optional, Sequence
+
+from modules.runtime.models.tasks import Task, mark_failed, mark_running, mark_succeeded, new_task
+from .core import SpeechSession, synthesize_speech
 from .models import TextToSpeechRequest
 
 
 TASK_KIND = "tts"
 
 
-def run_text_to_speech(request: TextToSpeechRequest):
-    task = new_task(TASK_KIND, payload=request.to_dict())
+def run_text_to_speech(request: TextToSpeechRequest, task: Optional[Task] = None):
+    task = task or new_task(TASK_KIND, payload=request.to_dict())
     mark_running(task)
     try:
         result = synthesize_speech(request, task_id=task.id)
@@ -20,7 +22,7 @@ def run_text_to_speech(request: TextToSpeechRequest):
     return task
 
 
-def run_text_to_speech_from_payload(payload):
+def request_from_payload(payload) -> TextToSpeechRequest:
     request = TextToSpeechRequest(
         text=str(payload.get("text", "")),
         voice=payload.get("voice") or None,
@@ -28,4 +30,36 @@ def run_text_to_speech_from_payload(payload):
     )
     if not request.text:
         raise ValueError("Text is required for TTS")
-    return run_text_to_speech(request)
+    return request
+
+
+def run_text_to_speech_from_payload(payload):
+    return run_text_to_speech(request_from_payload(payload))
+
+
+def batch_key(request: TextToSpeechRequest) -> str:
+    return request.voice or "default"
+
+
+def run_text_to_speech_batch(
+    requests: Sequence[TextToSpeechRequest],
+    tasks: Optional[List[Task]] = None,
+    on_result: Optional[Callable[[Task], None]] = None,
+) -> List[Task]:
+    """Synthesize many requests with one ``SpeechSession`` per voice; ``on_result`` fires per item."""
+
+    tasks = tasks or [new_task(TASK_KIND, payload=request.to_dict()) for request in requests]
+    groups: Dict[str, List[int]] = {}
+    for index, request in enumerate(requests):
+        groups.setdefault(batch_key(request), []).append(index)
+    for voice, indexes in groups.items():
+        session = SpeechSession(voice)
+        for index in indexes:
+            task = mark_running(tasks[index])
+            try:
+                mark_succeeded(task, result=session.synthesize(requests[index], task_id=task.id).to_dict())
+            except Exception as exc:
+                mark_failed(task, str(exc))
+            if on_result:
+                on_result(task)
+    return tasks
@@ -10,6 +10,7 @@ from typing import Iterable, List
 
 from . import dataset, tagging, trainer
 from .models import CARD_STORAGE_ROOT, CharacterCard, CharacterStudioError
+from .tag_executor import MODES as TAGGER_MODES, TaggerOptions
 
 
 CARD_FILENAME = "card.json"
@@ -136,25 +137,58 @@ def create_dataset(args: argparse.Namespace) -> None:
 
 
 def add_dataset_images(args: argparse.Namespace) -> None:
-    stored = dataset.add_images_to_dataset(args.id, args.images, args.subset)
-    print("Added images:\n" + "\n".join(stored))
+    report = dataset.ingest_images(
+        args.id, args.images, args.subset, perceptual=args.perceptual, link=args.link, workers=args.workers
+    )
+    if report.added:
+        print("Added images:\n" + "\n".join(report.added))
+    if report.duplicates:
+        print("Skipped duplicates:\n" + "\n".join(f"{item['image']} (same as {item['existing']})" for item in report.duplicates))
+    if report.near_duplicates:
+        print(
+            "Possible near-duplicates:\n"
+            + "\n".join(f"{item['image']} ~ {item['similar_to']} ({item['distance']} bits)" for item in report.near_duplicates)
+        )
+
+
+def _print_caption_changes(changes: List[dataset.CaptionChange], heading: str, dry_run: bool) -> None:
+    changed = [change for change in changes if change.changed]
+    unchanged = len(changes) - len(changed)
+    if dry_run:
+        for change in changed:
+            print(change.diff or f"{change.caption}: {change.status}")
+        print(f"{len(changed)} caption(s) would change, {unchanged} unchanged (dry run).")
+        return
+    if changed:
+        print(f"{heading}:\n" + "\n".join(change.caption for change in changed))
+    print(f"{len(changed)} caption(s) written, {unchanged} unchanged.")
 
 
 def caption_dataset(args: argparse.Namespace) -> None:
-    captions = dataset.generate_captions_for_dataset(args.id, args.subset)
-    if not captions:
+    changes = dataset.update_subset_captions(args.id, args.subset, dry_run=args.dry_run)
+    if not changes:
         print("No images found to caption.")
         return
-    print("Generated captions:\n" + "\n".join(captions))
+    _print_caption_changes(changes, "Generated captions", args.dry_run)
 
 
 def auto_tag_dataset(args: argparse.Namespace) -> None:
     extra_tags = _parse_tags(args.extra_tags)
-    captions = tagging.auto_tag_images(args.id, args.subset, tagger_cmd=args.tagger, extra_tags=extra_tags)
-    if not captions:
+    options = TaggerOptions.from_env(workers=args.workers, timeout=args.timeout, batch_size=args.batch_size, mode=args.mode)
+    results = tagging.auto_tag_subset(
+        args.id, args.subset, tagger_cmd=args.tagger, extra_tags=extra_tags, options=options, refresh_cache=args.refresh_cache
+    )
+    captions = [result.caption for result in results if result.caption]
+    failures = [result for result in results if not result.ok]
+    if captions:
+        cached = sum(result.cached for result in results)
+        note = f" ({cached} from the tag cache)" if cached else ""
+        print(f"Tagged images{note}:\n" + "\n".join(captions))
+    elif not failures:
         print("No images tagged.")
-        return
-    print("Tagged images:\n" + "\n".join(captions))
+    if failures:
+        print("Tagging failed for:\n" + "\n".join(f"{result.image}: {result.error}" for result in failures))
+        raise SystemExit(1)
 
 
 def bulk_edit_dataset_tags(args: argparse.Namespace) -> None:
@@ -168,8 +202,13 @@ def bulk_edit_dataset_tags(args: argparse.Namespace) -> None:
         print("No images found for tag editing.")
         return
 
-    updated = tagging.bulk_edit_tags(targets, append_tags=_parse_tags(args.append), replace_with=_parse_tags(args.replace))
-    print("Updated tags for:\n" + "\n".join(updated))
+    changes = tagging.apply_tag_edits(
+        targets,
+        append_tags=_parse_tags(args.append),
+        replace_with=_parse_tags(args.replace) if args.replace is not None else None,
+        dry_run=args.dry_run,
+    )
+    _print_caption_changes(changes, "Updated tags for", args.dry_run)
 
 
 def export_training(args: argparse.Namespace) -> None:
@@ -238,11 +277,17 @@ def build_parser() -> argparse.ArgumentParser:
     dataset_add.add_argument("id", help="Unique character id")
     dataset_add.add_argument("subset", help="Subset name (e.g., base, nsfw/variant_a)")
     dataset_add.add_argument("images", nargs="+", help="Image paths to copy")
+    dataset_add.add_argument("--perceptual", action="store_true", help="Also flag visually similar images (dHash)")
+    dataset_add.add_argument(
+        "--link", choices=dataset.COPY_MODES, default="auto", help="auto: reflink when supported, else copy"
+    )
+    dataset_add.add_argument("--workers", type=int, default=None, help="Parallel hash/copy threads")
     dataset_add.set_defaults(func=add_dataset_images)
 
     dataset_caption = subparsers.add_parser("generate-captions", help="Create caption files for a subset")
     dataset_caption.add_argument("id", help="Unique character id")
     dataset_caption.add_argument("subset", help="Subset name (e.g., base or nsfw)")
+    dataset_caption.add_argument("--dry-run", action="store_true", help="Show caption diffs without writing")
     dataset_caption.set_defaults(func=caption_dataset)
 
     dataset_tag = subparsers.add_parser("auto-tag", help="Auto-tag a dataset subset")
@@ -250,6 +295,11 @@ def build_parser() -> argparse.ArgumentParser:
     dataset_tag.add_argument("subset", help="Subset name")
     dataset_tag.add_argument("--tagger", help="External tagger command overriding CHAR_STUDIO_TAGGER_CMD")
     dataset_tag.add_argument("--extra-tags", help="Comma separated tags to append to each caption")
+    dataset_tag.add_argument("--workers", type=int, help="Concurrent tagger processes (CHAR_STUDIO_TAGGER_WORKERS)")
+    dataset_tag.add_argument("--timeout", type=float, help="Seconds allowed per image (CHAR_STUDIO_TAGGER_TIMEOUT)")
+    dataset_tag.add_argument("--batch-size", type=int, help="Images per batch-mode invocation (CHAR_STUDIO_TAGGER_BATCH)")
+    dataset_tag.add_argument("--mode", choices=TAGGER_MODES, help="Tagger contract (CHAR_STUDIO_TAGGER_MODE, default auto)")
+    dataset_tag.add_argument("--refresh-cache", action="store_true", help="Re-run the tagger even for images already in the tag cache")
     dataset_tag.set_defaults(func=auto_tag_dataset)
 
     dataset_tag_edit = subparsers.add_parser("edit-tags", help="Manually edit or bulk-append tags")
@@ -258,6 +308,7 @@ def build_parser() -> argparse.ArgumentParser:
     dataset_tag_edit.add_argument("--images", nargs="*", help="Specific image paths to edit; defaults to all in subset")
     dataset_tag_edit.add_argument("--append", help="Comma separated tags to append")
     dataset_tag_edit.add_argument("--replace", help="Comma separated tags to replace existing captions")
+    dataset_tag_edit.add_argument("--dry-run", action="store_true", help="Show caption diffs without writing")
     dataset_tag_edit.set_defaults(func=bulk_edit_dataset_tags)
 
     export_pack = subparsers.add_parser("export-training", help="Create a portable training pack")
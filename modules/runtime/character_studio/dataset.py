@@ -2,17 +2,27 @@
 
 - Purpose: structure character datasets, enforce NSFW boundaries, and generate caption scaffolding.
 - Assumptions: Character Cards exist on disk and dataset directories are writable.
-- Side effects: creates dataset folders, copies user images, and writes caption metadata files.
+- Side effects: creates dataset folders, copies (or reflinks/hardlinks) user images, and writes caption
+  metadata files plus a ``dataset_index.json`` per subset.
 """
 
 from __future__ import annotations
 
+import difflib
+import hashlib
 import json
 import logging
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
+from modules.runtime.downloads.blobstore import _reflink
+from modules.runtime.downloads.hashing import file_sha256
+
+from .image_hash import image_size, perceptual_hash
 from .models import CARD_STORAGE_ROOT, CharacterCard, CharacterStudioError, SchemaValidationError
 
 logger = logging.getLogger(__name__)
@@ -21,12 +31,52 @@ DATASET_ROOT = Path(__file__).resolve().parent / "datasets"
 DATASET_ROOT.mkdir(exist_ok=True)
 
 IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".bmp"}
+INDEX_FILENAME = "dataset_index.json"
+INDEX_VERSION = 1
+# auto: reflink (copy-on-write) where the filesystem supports it, else copy.
+# hardlink: share the source inode, so editing either file changes both.
+COPY_MODES = ("auto", "hardlink", "copy")
+# dHash bits that may differ for two images to count as near-duplicates.
+NEAR_DUPLICATE_DISTANCE = 6
+INGEST_WORKERS = 4
+# Index fields about an image's caption; they stay valid when the image itself is re-hashed.
+CAPTION_FIELDS = ("caption_sha256", "caption_size_bytes", "caption_mtime_ns")
 
 
 class DatasetOperationError(CharacterStudioError):
     """Raised when dataset creation or tagging setup fails."""
 
 
+@dataclass
+class IngestReport:
+    """What ``ingest_images`` stored, skipped and flagged."""
+
+    added: List[str] = field(default_factory=list)
+    # {"image": source path, "existing": stored path with the same SHA-256}
+    duplicates: List[Dict[str, str]] = field(default_factory=list)
+    # {"image": stored path, "similar_to": stored path, "distance": differing dHash bits}
+    near_duplicates: List[Dict[str, object]] = field(default_factory=list)
+    # Copy method ("reflink", "hardlink", "copy") -> number of images placed with it.
+    methods: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class CaptionChange:
+    """Outcome of writing one caption: ``created``, ``updated`` or ``unchanged``.
+
+    In a dry run nothing is written and ``diff`` holds the unified diff that a
+    real run would apply.
+    """
+
+    caption: str
+    status: str
+    diff: str = ""
+
+    @property
+    def changed(self) -> bool:
+        return self.status != "unchanged"
+
+
 def _load_card(character_id: str) -> CharacterCard:
     card_path = CARD_STORAGE_ROOT / character_id / "card.json"
     if not card_path.exists():
@@ -101,8 +151,173 @@ def create_dataset_structure(character_id: str) -> None:
 
 
 def add_images_to_dataset(character_id: str, images: Iterable[str], subset_name: str) -> List[str]:
-    """Add selected images to a dataset subset and return stored paths."""
+    """Add selected images to a dataset subset and return stored paths.
+
+    Images whose content is already in the subset are skipped; see ``ingest_images``.
+    """
+
+    return ingest_images(character_id, images, subset_name).added
+
 
+def subset_index_path(character_id: str, subset_name: str) -> Path:
+    return get_subset_dir(character_id, subset_name) / INDEX_FILENAME
+
+
+def load_subset_index(character_id: str, subset_name: str) -> Dict[str, Dict[str, object]]:
+    """Return the ``dataset_index.json`` entries of a subset keyed by image file name.
+
+    Images captioned before they were ever ingested carry only the caption
+    fields until the next ``ingest_images`` or ``refresh_subset_index``.
+    """
+
+    return _read_index(get_subset_dir(character_id, subset_name))
+
+
+def _read_index(subset_dir: Path) -> Dict[str, Dict[str, object]]:
+    try:
+        payload = json.loads((subset_dir / INDEX_FILENAME).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    images = payload.get("images") if isinstance(payload, dict) else None
+    if not isinstance(images, dict):
+        return {}
+    return {name: entry for name, entry in images.items() if isinstance(entry, dict)}
+
+
+def _write_index(subset_dir: Path, entries: Dict[str, Dict[str, object]]) -> Path:
+    for name, entry in entries.items():
+        entry["caption"] = "present" if (subset_dir / Path(name).with_suffix(".txt")).exists() else "missing"
+    index_path = subset_dir / INDEX_FILENAME
+    temp = index_path.with_name(f".{INDEX_FILENAME}.tmp")
+    temp.write_text(json.dumps({"version": INDEX_VERSION, "images": dict(sorted(entries.items()))}, indent=2), encoding="utf-8")
+    os.replace(temp, index_path)
+    return index_path
+
+
+def _describe_image(path: Path, perceptual: bool) -> Dict[str, object]:
+    stat = path.stat()
+    dimensions = image_size(path)
+    entry: Dict[str, object] = {
+        "sha256": file_sha256(path, use_sidecar=False),
+        "size_bytes": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "width": dimensions[0] if dimensions else None,
+        "height": dimensions[1] if dimensions else None,
+    }
+    if perceptual:
+        # ``None`` means "could not decode"; a missing key means "not computed yet".
+        entry["phash"] = perceptual_hash(path)
+    return entry
+
+
+def _sync_index(subset_dir: Path, perceptual: bool, pool: ThreadPoolExecutor) -> Dict[str, Dict[str, object]]:
+    """Index every image in ``subset_dir``, re-hashing only new or modified files."""
+
+    previous = _read_index(subset_dir)
+    entries: Dict[str, Dict[str, object]] = {}
+    stale: List[Path] = []
+    if subset_dir.is_dir():
+        for path in sorted(subset_dir.iterdir()):
+            if not path.is_file() or path.suffix.lower() not in IMAGE_EXTENSIONS:
+                continue
+            entry = previous.get(path.name)
+            stat = path.stat()
+            if entry and (entry.get("size_bytes"), entry.get("mtime_ns")) == (stat.st_size, stat.st_mtime_ns):
+                entries[path.name] = entry
+                if perceptual and "phash" not in entry:
+                    stale.append(path)
+            else:
+                stale.append(path)
+
+    def refresh(path: Path) -> None:
+        entry = entries.get(path.name)
+        if entry is None:
+            # Keep where a modified image came from and what its caption holds; its hashes are recomputed.
+            kept = {
+                key: value
+                for key, value in previous.get(path.name, {}).items()
+                if key in ("source", "near_duplicate_of") + CAPTION_FIELDS
+            }
+            entries[path.name] = {**kept, **_describe_image(path, perceptual)}
+        else:
+            entry["phash"] = perceptual_hash(path)
+
+    list(pool.map(refresh, stale))
+    return entries
+
+
+def refresh_subset_index(character_id: str, subset_name: str, *, perceptual: bool = False) -> Dict[str, Dict[str, object]]:
+    """Rebuild ``dataset_index.json`` for images added or edited outside ``ingest_images``."""
+
+    subset_dir = get_subset_dir(character_id, subset_name)
+    subset_dir.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=INGEST_WORKERS) as pool:
+        entries = _sync_index(subset_dir, perceptual, pool)
+    _write_index(subset_dir, entries)
+    return entries
+
+
+def _place(source: Path, destination: Path, mode: str) -> str:
+    """Materialize ``source`` at ``destination`` and return the method that worked."""
+
+    attempts = {"auto": ("reflink", "copy"), "hardlink": ("hardlink", "reflink", "copy"), "copy": ("copy",)}[mode]
+    # Write beside the destination and rename, so an interrupted copy never looks like a dataset image.
+    temp = destination.with_name(f".{destination.name}.ingest-tmp")
+    for method in attempts:
+        temp.unlink(missing_ok=True)
+        try:
+            if method == "hardlink":
+                os.link(source, temp)
+            elif method == "reflink":
+                _reflink(source, temp)
+            else:
+                shutil.copy(source, temp)
+        except (OSError, ImportError):
+            temp.unlink(missing_ok=True)
+            if method == "copy":
+                raise
+            continue
+        os.replace(temp, destination)
+        return method
+    raise OSError(f"Unable to place {source} at {destination}")
+
+
+def _free_name(target_dir: Path, source: Path, taken: set) -> Path:
+    # Avoid accidental overwrite by suffixing name collisions inside the chosen subset.
+    destination = target_dir / source.name
+    suffix_counter = 1
+    while destination.name in taken or destination.exists():
+        destination = target_dir / f"{source.stem}_{suffix_counter}{source.suffix}"
+        suffix_counter += 1
+    return destination
+
+
+def ingest_images(
+    character_id: str,
+    images: Iterable[str],
+    subset_name: str,
+    *,
+    perceptual: bool = False,
+    link: str = "auto",
+    near_distance: int = NEAR_DUPLICATE_DISTANCE,
+    workers: Optional[int] = None,
+) -> IngestReport:
+    """Copy images into a subset, skipping exact duplicates and flagging near-duplicates.
+
+    Every incoming image and every image already in the subset is identified by
+    SHA-256 (existing ones are re-hashed only when their size or mtime changed),
+    so content already present is skipped rather than stored under a ``_1``
+    name. With ``perceptual`` a dHash is computed too, and images within
+    ``near_distance`` bits of another are still stored but reported and marked
+    ``near_duplicate_of`` in the index. Hashing and copies run on ``workers``
+    threads; ``link`` picks reflink/hardlink/copy as in ``COPY_MODES``.
+    ``dataset_index.json`` records hash, size, dimensions and caption state.
+    """
+
+    if link not in COPY_MODES:
+        raise DatasetOperationError(
+            "Unknown copy mode", context={"link": link, "expected": ", ".join(COPY_MODES)}
+        )
     card = _load_card(character_id)
     if _subset_is_nsfw(subset_name) and not card.nsfw_allowed:
         raise DatasetOperationError(
@@ -110,27 +325,158 @@ def add_images_to_dataset(character_id: str, images: Iterable[str], subset_name:
             context={"character_id": character_id, "subset": subset_name},
         )
 
-    target_dir = get_subset_dir(character_id, subset_name)
-    target_dir.mkdir(parents=True, exist_ok=True)
-
-    stored: List[str] = []
-    for image_path_str in images:
-        image_path = Path(image_path_str).expanduser().resolve()
-        if not image_path.exists():
+    sources: Sequence[Path] = [Path(image).expanduser().resolve() for image in images]
+    for source in sources:
+        if not source.is_file():
             raise DatasetOperationError(
                 "Image not found",
-                context={"character_id": character_id, "subset": subset_name, "image": str(image_path)},
+                context={"character_id": character_id, "subset": subset_name, "image": str(source)},
             )
-        # Avoid accidental overwrite by suffixing duplicates inside the chosen subset.
-        destination = target_dir / image_path.name
-        suffix_counter = 1
-        while destination.exists():
-            destination = target_dir / f"{image_path.stem}_{suffix_counter}{image_path.suffix}"
-            suffix_counter += 1
-        shutil.copy(image_path, destination)
-        stored.append(str(destination))
 
-    return stored
+    target_dir = get_subset_dir(character_id, subset_name)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    report = IngestReport()
+    with ThreadPoolExecutor(max_workers=max(1, workers or INGEST_WORKERS)) as pool:
+        entries = _sync_index(target_dir, perceptual, pool)
+        incoming = list(pool.map(lambda source: _describe_image(source, perceptual), sources))
+
+        by_digest = {str(entry["sha256"]): name for name, entry in entries.items()}
+        phashes = {name: int(str(entry["phash"]), 16) for name, entry in entries.items() if entry.get("phash")}
+        taken = set(entries)
+        planned = []
+        for source, entry in zip(sources, incoming):
+            existing = by_digest.get(str(entry["sha256"]))
+            if existing is not None:
+                report.duplicates.append({"image": str(source), "existing": str(target_dir / existing)})
+                continue
+            destination = _free_name(target_dir, source, taken)
+            taken.add(destination.name)
+            by_digest[str(entry["sha256"])] = destination.name
+            entry["source"] = str(source)
+            if entry.get("phash"):
+                value = int(str(entry["phash"]), 16)
+                if phashes:
+                    distance, match = min((bin(value ^ other).count("1"), name) for name, other in phashes.items())
+                    if distance <= near_distance:
+                        entry["near_duplicate_of"] = match
+                        report.near_duplicates.append(
+                            {"image": str(destination), "similar_to": str(target_dir / match), "distance": distance}
+                        )
+                phashes[destination.name] = value
+            planned.append((source, destination, entry))
+
+        try:
+            methods = list(pool.map(lambda item: _place(item[0], item[1], link), planned))
+        except OSError as exc:
+            raise DatasetOperationError(
+                "Failed to copy image into dataset",
+                context={"character_id": character_id, "subset": subset_name, "reason": str(exc)},
+            ) from exc
+
+    for (_, destination, entry), method in zip(planned, methods):
+        stat = destination.stat()
+        entry["size_bytes"], entry["mtime_ns"] = stat.st_size, stat.st_mtime_ns
+        entries[destination.name] = entry
+        report.added.append(str(destination))
+        report.methods[method] = report.methods.get(method, 0) + 1
+    index_path = _write_index(target_dir, entries)
+
+    logger.info(
+        "Ingested images",
+        extra={
+            "character_id": character_id,
+            "subset": subset_name,
+            "added": len(report.added),
+            "duplicates": len(report.duplicates),
+            "near_duplicates": len(report.near_duplicates),
+            "index": str(index_path),
+        },
+    )
+    return report
+
+
+def _caption_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _caption_status(caption_path: Path, text: str, entry: Dict[str, object], dry_run: bool) -> Tuple[str, str]:
+    """``(status, previous text)``; the file is read only when the index cannot vouch for it."""
+
+    try:
+        stat = caption_path.stat()
+    except FileNotFoundError:
+        return "created", ""
+    recorded = (entry.get("caption_size_bytes"), entry.get("caption_mtime_ns"))
+    if recorded == (stat.st_size, stat.st_mtime_ns) and entry.get("caption_sha256"):
+        if entry["caption_sha256"] == _caption_digest(text):
+            return "unchanged", text
+        if not dry_run:
+            return "updated", ""
+    previous = caption_path.read_text(encoding="utf-8")
+    if previous == text:
+        # Record the digest so the next run can skip reading this file.
+        entry.update(caption_sha256=_caption_digest(text), caption_size_bytes=stat.st_size, caption_mtime_ns=stat.st_mtime_ns)
+        return "unchanged", previous
+    return "updated", previous
+
+
+def _is_indexed_subset(directory: Path) -> bool:
+    """True for folders under ``DATASET_ROOT`` or that already carry an index."""
+
+    if (directory / INDEX_FILENAME).is_file():
+        return True
+    try:
+        directory.resolve().relative_to(DATASET_ROOT.resolve())
+    except ValueError:
+        return False
+    return True
+
+
+def write_captions(captions: Sequence[Tuple[Path, str]], *, dry_run: bool = False) -> List[CaptionChange]:
+    """Write ``(image, caption text)`` pairs, touching only captions whose text changed.
+
+    Each caption's SHA-256, size and mtime are kept in its subset's
+    ``dataset_index.json``, so an unchanged caption costs one ``stat`` and no
+    read or write. Images outside a dataset get no index; their captions are
+    read and compared instead. Changed captions are written to a temp file and
+    renamed into place, so trainers never see a half-written caption and
+    unchanged files keep their mtime. Results follow the input order.
+    """
+
+    changes: List[CaptionChange] = []
+    indexes: Dict[Path, Optional[Dict[str, Dict[str, object]]]] = {}
+    dirty = set()
+    for image, text in captions:
+        image = Path(image)
+        caption_path = image.with_suffix(".txt")
+        subset_dir = image.parent
+        if subset_dir not in indexes:
+            indexes[subset_dir] = _read_index(subset_dir) if _is_indexed_subset(subset_dir) else None
+        index = indexes[subset_dir]
+        entry = index.setdefault(image.name, {}) if index is not None else {}
+        before = dict(entry)
+        status, previous = _caption_status(caption_path, text, entry, dry_run)
+        diff = ""
+        if status != "unchanged" and dry_run:
+            diff = "\n".join(
+                difflib.unified_diff(
+                    previous.splitlines(), text.splitlines(), f"a/{caption_path.name}", f"b/{caption_path.name}", lineterm=""
+                )
+            )
+        elif status != "unchanged":
+            temp = caption_path.with_name(f".{caption_path.name}.tmp")
+            temp.write_text(text, encoding="utf-8")
+            os.replace(temp, caption_path)
+            stat = caption_path.stat()
+            entry.update(caption_sha256=_caption_digest(text), caption_size_bytes=stat.st_size, caption_mtime_ns=stat.st_mtime_ns)
+        if index is not None and entry != before:
+            dirty.add(subset_dir)
+        changes.append(CaptionChange(str(caption_path), status, diff))
+
+    if not dry_run:
+        for subset_dir in dirty:
+            _write_index(subset_dir, indexes[subset_dir])  # type: ignore[arg-type]
+    return changes
 
 
 def list_subset_images(character_id: str, subset_name: str) -> List[Path]:
@@ -145,6 +491,12 @@ def list_subset_images(character_id: str, subset_name: str) -> List[Path]:
 def generate_captions_for_dataset(character_id: str, subset_name: str) -> List[str]:
     """Generate training captions based on Character Card defaults and subset context."""
 
+    return [change.caption for change in update_subset_captions(character_id, subset_name)]
+
+
+def update_subset_captions(character_id: str, subset_name: str, *, dry_run: bool = False) -> List[CaptionChange]:
+    """Build each image's caption from the card and subset, writing only those that changed."""
+
     card = _load_card(character_id)
     if _subset_is_nsfw(subset_name) and not card.nsfw_allowed:
         raise DatasetOperationError(
@@ -154,33 +506,24 @@ def generate_captions_for_dataset(character_id: str, subset_name: str) -> List[s
 
     subset_dir = get_subset_dir(character_id, subset_name)
     subset_dir.mkdir(parents=True, exist_ok=True)
-    captions: List[str] = []
     subset_tags = [part.replace("_", " ") for part in Path(subset_name).parts if part.lower() not in {"base", "nsfw"}]
 
-    for image_path in list_subset_images(character_id, subset_name):
-        caption_parts: List[str] = []
-        if card.trigger_token:
-            caption_parts.append(card.trigger_token)
-        caption_parts.extend(card.anatomy_tags)
-        caption_parts.extend(card.wardrobe)
-        if card.default_prompt_snippet:
-            caption_parts.append(card.default_prompt_snippet)
-        caption_parts.extend(subset_tags)
-
-        # Deduplicate while preserving order
-        seen = set()
-        deduped_parts = []
-        for part in caption_parts:
-            if part and part not in seen:
-                deduped_parts.append(part)
-                seen.add(part)
-
-        caption_text = ", ".join(deduped_parts)
-        caption_path = subset_dir / f"{image_path.stem}.txt"
-        caption_path.write_text(caption_text, encoding="utf-8")
-        captions.append(str(caption_path))
-
-    if not captions:
+    caption_parts: List[str] = []
+    if card.trigger_token:
+        caption_parts.append(card.trigger_token)
+    caption_parts.extend(card.anatomy_tags)
+    caption_parts.extend(card.wardrobe)
+    if card.default_prompt_snippet:
+        caption_parts.append(card.default_prompt_snippet)
+    caption_parts.extend(subset_tags)
+    # Deduplicate while preserving order; every image in the subset shares this caption.
+    caption_text = ", ".join(part for part in dict.fromkeys(caption_parts) if part)
+
+    changes = write_captions(
+        [(image_path, caption_text) for image_path in list_subset_images(character_id, subset_name)], dry_run=dry_run
+    )
+
+    if not changes:
         logger.warning(
             "No images found for captioning",
             extra={"character_id": character_id, "subset": subset_name, "subset_dir": str(subset_dir)},
@@ -188,7 +531,13 @@ def generate_captions_for_dataset(character_id: str, subset_name: str) -> List[s
     else:
         logger.info(
             "Generated captions",
-            extra={"character_id": character_id, "subset": subset_name, "count": len(captions)},
+            extra={
+                "character_id": character_id,
+                "subset": subset_name,
+                "count": len(changes),
+                "changed": sum(change.changed for change in changes),
+                "dry_run": dry_run,
+            },
         )
 
-    return captions
+    return changes
@@ -0,0 +1,103 @@
+"""Stand-in image tagger for exercising Character Studio without a GPU model.
+
+- Purpose: speak every tagger contract ``tag_executor`` supports (one image per
+  run, ``path<TAB>tags`` batches from argv or stdin, and the long-lived
+  ``--worker`` JSON-lines protocol) with a simulated model load, so pools,
+  timeouts and restarts can be tested and benchmarked on any machine.
+- Assumptions: tags are derived from the file name, extension and (for PNGs)
+  the IHDR dimensions; they are deterministic for a given file.
+- Side effects: sleeps for ``--load-seconds`` on start; appends ``load`` lines to
+  ``--log`` when given. ``--crash-on``/``--hang-on``/``--malformed-on`` make
+  worker mode exit, stall or reply with ``"tags": null`` on matching images.
+
+Usage: python -m modules.runtime.character_studio.stand_in_tagger [--worker | --stdin] [IMAGE ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+
+def describe(path: Path) -> List[str]:
+    tags = [token for token in re.split(r"[\W_]+", path.stem.lower()) if token and not token.isdigit()]
+    suffix = path.suffix.lower().lstrip(".")
+    if suffix:
+        tags.append(suffix)
+    try:
+        with path.open("rb") as handle:
+            header = handle.read(24)
+    except OSError:
+        return tags + ["unreadable"]
+    if header[:8] == b"\x89PNG\r\n\x1a\n" and len(header) >= 24:
+        width, height = struct.unpack(">II", header[16:24])
+        tags.append("square" if width == height else "landscape" if width > height else "portrait")
+    return list(dict.fromkeys(tags))
+
+
+def _serve(args: argparse.Namespace) -> int:
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        op = request.get("op")
+        if op == "shutdown":
+            return 0
+        reply = {"id": request.get("id")}
+        if op == "ping":
+            reply["ok"] = True
+        elif op == "tag":
+            image = Path(str(request.get("image", "")))
+            if args.crash_on and args.crash_on in image.name:
+                print(f"stand-in tagger crashed on {image.name}", file=sys.stderr)
+                return 3
+            if args.hang_on and args.hang_on in image.name:
+                time.sleep(3600)
+            if args.malformed_on and args.malformed_on in image.name:
+                reply["tags"] = None
+            elif image.is_file():
+                reply["tags"] = describe(image)
+            else:
+                reply["error"] = f"No such image: {image}"
+        else:
+            reply["error"] = f"Unknown op: {op}"
+        print(json.dumps(reply), flush=True)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stand-in tagger for Character Studio tests and benchmarks")
+    parser.add_argument("images", nargs="*", help="Images to tag (one: plain tags; several: path<TAB>tags lines)")
+    parser.add_argument("--worker", action="store_true", help="Serve the JSON-lines worker protocol on stdin/stdout")
+    parser.add_argument("--stdin", action="store_true", help="Read image paths from stdin (batch contract)")
+    parser.add_argument("--load-seconds", type=float, default=0.2, help="Simulated model load time")
+    parser.add_argument("--log", help="Append a 'load' line here on every start")
+    parser.add_argument("--crash-on", help="Worker mode: exit when an image name contains this text")
+    parser.add_argument("--hang-on", help="Worker mode: stop answering when an image name contains this text")
+    parser.add_argument("--malformed-on", help="Worker mode: reply with null tags when an image name contains this text")
+    args = parser.parse_args(argv)
+
+    if args.log:
+        with open(args.log, "a", encoding="utf-8") as handle:
+            handle.write("load\n")
+    time.sleep(args.load_seconds)
+
+    if args.worker:
+        return _serve(args)
+    paths = [line.strip() for line in sys.stdin if line.strip()] if args.stdin else args.images
+    if len(paths) == 1 and not args.stdin:
+        print(", ".join(describe(Path(paths[0]))))
+        return 0
+    for path in paths:
+        print(f"{path}\t{', '.join(describe(Path(path)))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""Persistent cache of external tagger output for Character Studio.
+
+- Purpose: remember the raw tags a tagger produced for an image, keyed by the
+  image's SHA-256 and the tagger fingerprint, so re-tagging after a card or
+  ``extra_tags`` edit only re-applies the base tags instead of re-running the
+  model. Image digests are reused while a file's size and mtime are unchanged.
+- Assumptions: a tagger is deterministic for a given command line and the
+  files it references (script, weights); bump ``CHAR_STUDIO_TAGGER_VERSION``
+  when it changes in a way the fingerprint cannot see.
+- Side effects: maintains ``~/.cache/aihub/character_studio/tag_cache.sqlite``
+  (override with ``CHAR_STUDIO_TAG_CACHE``). Nothing is written next to the
+  dataset images.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from modules.runtime.downloads.hashing import file_sha256
+
+DEFAULT_DB_PATH = Path.home() / ".cache" / "aihub" / "character_studio" / "tag_cache.sqlite"
+# Stay well under SQLite's default limit of 999 bound parameters per statement.
+QUERY_CHUNK = 500
+HASH_WORKERS = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS image_digests (
+    path TEXT PRIMARY KEY,
+    size_bytes INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tags (
+    sha256 TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (sha256, fingerprint)
+);
+"""
+
+
+def default_db_path() -> Path:
+    return Path(os.environ.get("CHAR_STUDIO_TAG_CACHE") or DEFAULT_DB_PATH)
+
+
+def _chunks(items: Sequence[str]) -> Iterable[Sequence[str]]:
+    for start in range(0, len(items), QUERY_CHUNK):
+        yield items[start : start + QUERY_CHUNK]
+
+
+class TagCache:
+    """SQLite map of ``(image sha256, tagger fingerprint) -> tags``."""
+
+    def __init__(self, db_path: Optional[Path] = None) -> None:
+        self.db_path = Path(db_path) if db_path else default_db_path()
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def digests(self, images: Sequence[Path]) -> List[str]:
+        """SHA-256 per image, re-hashing (in parallel) only files whose size or mtime changed."""
+
+        keys = [str(Path(image).resolve()) for image in images]
+        stats = [os.stat(key) for key in keys]
+        known: Dict[str, Tuple[int, int, str]] = {}
+        with self._lock:
+            for chunk in _chunks(keys):
+                rows = self._conn.execute(
+                    f"SELECT path, size_bytes, mtime_ns, sha256 FROM image_digests WHERE path IN ({','.join('?' * len(chunk))})",
+                    list(chunk),
+                )
+                known.update({path: (size, mtime_ns, digest) for path, size, mtime_ns, digest in rows})
+
+        digests = [""] * len(keys)
+        stale: List[int] = []
+        for index, (key, stat) in enumerate(zip(keys, stats)):
+            record = known.get(key)
+            if record and record[:2] == (stat.st_size, stat.st_mtime_ns):
+                digests[index] = record[2]
+            else:
+                stale.append(index)
+        if stale:
+            # hashlib releases the GIL on large buffers, so threads overlap the reads and the hashing.
+            with ThreadPoolExecutor(max_workers=min(HASH_WORKERS, len(stale))) as pool:
+                fresh = list(pool.map(lambda index: file_sha256(Path(keys[index]), use_sidecar=False), stale))
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO image_digests (path, size_bytes, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+                    [(keys[index], stats[index].st_size, stats[index].st_mtime_ns, digest) for index, digest in zip(stale, fresh)],
+                )
+            for index, digest in zip(stale, fresh):
+                digests[index] = digest
+        return digests
+
+    def get_many(self, digests: Iterable[str], fingerprint: str) -> Dict[str, List[str]]:
+        unique = sorted(set(digests))
+        found: Dict[str, List[str]] = {}
+        with self._lock:
+            for chunk in _chunks(unique):
+                rows = self._conn.execute(
+                    f"SELECT sha256, tags FROM tags WHERE fingerprint = ? AND sha256 IN ({','.join('?' * len(chunk))})",
+                    [fingerprint, *chunk],
+                )
+                found.update({digest: json.loads(tags) for digest, tags in rows})
+        return found
+
+    def put_many(self, items: Dict[str, List[str]], fingerprint: str) -> None:
+        if not items:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tags (sha256, fingerprint, tags, created_at) VALUES (?, ?, ?, ?)",
+                [(digest, fingerprint, json.dumps(tags), now) for digest, tags in items.items()],
+            )
+
+    def clear(self, fingerprint: Optional[str] = None) -> int:
+        with self._lock, self._conn:
+            if fingerprint is None:
+                return self._conn.execute("DELETE FROM tags").rowcount
+            return self._conn.execute("DELETE FROM tags WHERE fingerprint = ?", (fingerprint,)).rowcount
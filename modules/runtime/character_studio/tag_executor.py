@@ -0,0 +1,244 @@
+"""Parallel execution of external taggers for Character Studio.
+
+- Purpose: run ``CHAR_STUDIO_TAGGER_CMD`` over a subset with a bounded number of
+  concurrent tagger processes, a per-image timeout, and an optional batch
+  contract so one process can tag many images.
+- Assumptions: taggers print comma or newline separated tags. Batch taggers
+  either take ``{images}`` (expanded to one argument per path) or read one
+  path per line on stdin (``mode="stdin"``) and print ``path<TAB>tags`` lines.
+  ``mode="worker"`` keeps the tagger running and speaks the JSON-lines
+  protocol in ``tagger_worker``.
+- Side effects: spawns tagger subprocesses; never writes caption files itself.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+MODES = ("auto", "image", "batch", "stdin", "worker")
+DEFAULT_TIMEOUT_SECONDS = 120.0
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_STARTUP_TIMEOUT_SECONDS = 300.0
+# Tagger arguments whose contents decide the output: scripts and model weights.
+FINGERPRINT_SUFFIXES = {".py", ".sh", ".onnx", ".pt", ".pth", ".ckpt", ".safetensors", ".bin", ".pb", ".tflite"}
+
+
+def _default_workers() -> int:
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+@dataclass
+class TaggerOptions:
+    """Concurrency and contract settings; ``from_env`` reads the ``CHAR_STUDIO_TAGGER_*`` overrides."""
+
+    workers: int = field(default_factory=_default_workers)
+    timeout: float = DEFAULT_TIMEOUT_SECONDS
+    batch_size: int = DEFAULT_BATCH_SIZE
+    mode: str = "auto"
+    # Worker mode only: how long a worker may take to load its model and answer the first ping.
+    startup_timeout: float = DEFAULT_STARTUP_TIMEOUT_SECONDS
+
+    def __post_init__(self) -> None:
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown tagger mode '{self.mode}'; expected one of {', '.join(MODES)}")
+        self.workers = max(1, int(self.workers))
+        self.batch_size = max(1, int(self.batch_size))
+        self.timeout = float(self.timeout)
+        self.startup_timeout = float(self.startup_timeout)
+
+    @classmethod
+    def from_env(
+        cls,
+        workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        mode: Optional[str] = None,
+    ) -> "TaggerOptions":
+        return cls(
+            workers=workers or int(os.getenv("CHAR_STUDIO_TAGGER_WORKERS") or _default_workers()),
+            timeout=timeout or float(os.getenv("CHAR_STUDIO_TAGGER_TIMEOUT") or DEFAULT_TIMEOUT_SECONDS),
+            batch_size=batch_size or int(os.getenv("CHAR_STUDIO_TAGGER_BATCH") or DEFAULT_BATCH_SIZE),
+            mode=mode or os.getenv("CHAR_STUDIO_TAGGER_MODE") or "auto",
+            startup_timeout=float(os.getenv("CHAR_STUDIO_TAGGER_STARTUP_TIMEOUT") or DEFAULT_STARTUP_TIMEOUT_SECONDS),
+        )
+
+
+@dataclass
+class TagResult:
+    image: str
+    tags: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    seconds: float = 0.0
+    caption: Optional[str] = None
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def parse_tag_output(output: str) -> List[str]:
+    """Parse comma or newline separated tag text from an external tagger."""
+
+    parsed: List[str] = []
+    for tag in output.replace("\n", ",").split(","):
+        stripped = tag.strip()
+        if stripped and stripped not in parsed:
+            parsed.append(stripped)
+    return parsed
+
+
+def _path_key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _text(stream: object) -> str:
+    if isinstance(stream, bytes):
+        return stream.decode("utf-8", errors="replace")
+    return stream or ""
+
+
+def _failure(completed: subprocess.CompletedProcess) -> str:
+    stderr = _text(completed.stderr).strip().splitlines()
+    detail = f": {stderr[-1]}" if stderr else ""
+    return f"Tagger exited with code {completed.returncode}{detail}"
+
+
+class TagExecutor:
+    """Tag images with an external command, returning one ``TagResult`` per image in input order."""
+
+    def __init__(self, command: str, subset: str = "", options: Optional[TaggerOptions] = None) -> None:
+        self.command = command
+        self.subset = subset
+        self.options = options or TaggerOptions.from_env()
+        self.parts = shlex.split(command)
+        mode = self.options.mode
+        if mode == "auto":
+            mode = "batch" if "{images}" in self.parts else "image"
+        if mode == "batch" and "{images}" not in self.parts:
+            raise ValueError("Batch tagger commands must contain a standalone {images} placeholder")
+        self.mode = mode
+        self._pool = None
+
+    def argv(self, images: Sequence[str]) -> List[str]:
+        """Expand placeholders for one invocation (``images`` holds one path in ``image`` mode)."""
+
+        argv: List[str] = []
+        for part in self.parts:
+            if part == "{images}":
+                argv.extend(images)
+            else:
+                argv.append(part.format(image=images[0] if self.mode == "image" else "", subset=self.subset))
+        return argv
+
+    def fingerprint(self) -> str:
+        """Identify this tagger's output for caching.
+
+        Covers the command line with ``{subset}`` expanded, the size and mtime of
+        arguments naming a script or weights file (``FINGERPRINT_SUFFIXES``), and
+        ``CHAR_STUDIO_TAGGER_VERSION``.
+        """
+
+        argv = [part if part == "{images}" else part.format(image="{image}", subset=self.subset) for part in self.parts]
+        files = {}
+        for part in argv:
+            if Path(part).suffix.lower() in FINGERPRINT_SUFFIXES and os.path.isfile(part):
+                stat = os.stat(part)
+                files[part] = [stat.st_size, stat.st_mtime_ns]
+        identity = {"argv": argv, "files": files, "version": os.getenv("CHAR_STUDIO_TAGGER_VERSION", "")}
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def executable_available(self) -> bool:
+        return bool(self.parts) and shutil.which(self.parts[0].format(image="", subset=self.subset)) is not None
+
+    def run(self, images: Sequence[Path]) -> List[TagResult]:
+        paths = [str(image) for image in images]
+        if self.mode == "worker":
+            return self._worker_pool().tag_many(paths, self.subset)
+        if self.mode == "image":
+            chunks = [[path] for path in paths]
+        else:
+            size = self.options.batch_size
+            chunks = [paths[start : start + size] for start in range(0, len(paths), size)]
+        runner = self._run_one if self.mode == "image" else self._run_batch
+        with ThreadPoolExecutor(max_workers=min(self.options.workers, len(chunks) or 1), thread_name_prefix="tagger") as pool:
+            return [result for chunk_results in pool.map(runner, chunks) for result in chunk_results]
+
+    def close(self) -> None:
+        """Stop worker-mode taggers; the executor restarts them if ``run`` is called again."""
+
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def __enter__(self) -> "TagExecutor":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _worker_pool(self):
+        if self._pool is None:
+            from .tagger_worker import TaggerWorkerPool
+
+            argv = [part.format(image="", subset=self.subset) for part in self.parts]
+            self._pool = TaggerWorkerPool(argv, self.options.workers, self.options.timeout, self.options.startup_timeout)
+        return self._pool
+
+    def _run_one(self, chunk: List[str]) -> List[TagResult]:
+        started = time.perf_counter()
+        result = TagResult(chunk[0])
+        try:
+            completed = subprocess.run(self.argv(chunk), capture_output=True, text=True, timeout=self.options.timeout)
+            if completed.returncode == 0:
+                result.tags = parse_tag_output(completed.stdout)
+            else:
+                result.error = _failure(completed)
+        except subprocess.TimeoutExpired:
+            result.error = f"Tagger timed out after {self.options.timeout:g}s"
+        except OSError as exc:
+            result.error = f"Tagger could not start: {exc}"
+        result.seconds = time.perf_counter() - started
+        return [result]
+
+    def _run_batch(self, chunk: List[str]) -> List[TagResult]:
+        started = time.perf_counter()
+        stdin = "".join(f"{path}\n" for path in chunk) if self.mode == "stdin" else None
+        timeout = self.options.timeout * len(chunk)
+        error = None
+        try:
+            completed = subprocess.run(self.argv(chunk), input=stdin, capture_output=True, text=True, timeout=timeout)
+            stdout = completed.stdout
+            if completed.returncode != 0:
+                error = _failure(completed)
+        except subprocess.TimeoutExpired as exc:
+            stdout = _text(exc.stdout)
+            error = f"Batch tagger timed out after {timeout:g}s"
+        except OSError as exc:
+            stdout, error = "", f"Tagger could not start: {exc}"
+
+        # Keep whatever lines were streamed before a crash or timeout.
+        tagged: Dict[str, List[str]] = {}
+        for line in stdout.splitlines():
+            path, sep, tags = line.partition("\t")
+            if sep:
+                tagged[_path_key(path)] = parse_tag_output(tags)
+        elapsed = (time.perf_counter() - started) / len(chunk)
+        results = []
+        for path in chunk:
+            tags = tagged.get(_path_key(path))
+            if tags is None:
+                results.append(TagResult(path, error=error or "Batch tagger returned no tags for this image", seconds=elapsed))
+            else:
+                results.append(TagResult(path, tags=tags, seconds=elapsed))
+        return results
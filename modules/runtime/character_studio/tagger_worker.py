@@ -0,0 +1,280 @@
+"""Long-lived tagger workers speaking line-delimited JSON over stdin/stdout.
+
+- Purpose: let model-backed taggers (WD14, BLIP, ...) load their weights once
+  and serve many images, instead of paying the load per image. A pool keeps N
+  workers alive, health-checks them, and restarts crashed ones.
+- Assumptions: a worker reads one JSON object per line on stdin and answers
+  each with one JSON line on stdout carrying the same ``id``:
+
+  - ``{"id": 1, "op": "ping"}`` -> ``{"id": 1, "ok": true}`` (sent on start, so
+    a worker may load its model before answering the first ping);
+  - ``{"id": 2, "op": "tag", "image": "/path.png", "subset": "base"}`` ->
+    ``{"id": 2, "tags": ["a", "b"]}`` (or ``"tags": "a, b"``) or
+    ``{"id": 2, "error": "reason"}``;
+  - ``{"op": "shutdown"}`` (or EOF on stdin) -> exit.
+
+  Anything else a worker prints on stdout must not be a JSON object with an
+  ``id``; stderr is kept only for error messages.
+- Side effects: spawns and kills tagger subprocesses.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import queue
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+from .tag_executor import TagResult, parse_tag_output
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STARTUP_TIMEOUT_SECONDS = 300.0
+DEFAULT_MAX_RESTARTS = 3
+STDERR_TAIL_LINES = 20
+_EOF = object()
+
+
+class WorkerError(RuntimeError):
+    """The worker crashed, could not start, or broke the protocol."""
+
+
+class WorkerTimeout(WorkerError):
+    """The worker did not answer in time and was killed."""
+
+
+class ImageRejected(Exception):
+    """The worker answered with an ``error`` for this image."""
+
+
+class TaggerWorker:
+    """One long-lived tagger child process."""
+
+    def __init__(self, argv: Sequence[str], startup_timeout: float = DEFAULT_STARTUP_TIMEOUT_SECONDS) -> None:
+        self.argv = list(argv)
+        self.startup_timeout = startup_timeout
+        self.served = 0
+        self._ids = itertools.count(1)
+        self._responses: "queue.Queue[object]" = queue.Queue()
+        self._stderr: deque = deque(maxlen=STDERR_TAIL_LINES)
+        self._process: Optional[subprocess.Popen] = None
+        # One request in flight per worker, so a health ping never steals a tag response.
+        self._lock = threading.Lock()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid if self._process else None
+
+    def start(self) -> None:
+        self._process = subprocess.Popen(
+            self.argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+        threading.Thread(target=self._read_stdout, args=(self._process,), name="tagger-worker-out", daemon=True).start()
+        threading.Thread(target=self._read_stderr, args=(self._process,), name="tagger-worker-err", daemon=True).start()
+        started = time.perf_counter()
+        self._call({"op": "ping"}, self.startup_timeout)
+        logger.info("Tagger worker %s ready in %.2fs", self.pid, time.perf_counter() - started)
+
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def ping(self, timeout: float = 5.0) -> bool:
+        try:
+            return bool(self._call({"op": "ping"}, timeout).get("ok"))
+        except WorkerError:
+            return False
+
+    def tag(self, image: str, subset: str, timeout: float) -> List[str]:
+        response = self._call({"op": "tag", "image": image, "subset": subset}, timeout)
+        self.served += 1
+        if response.get("error"):
+            raise ImageRejected(str(response["error"]))
+        tags = response.get("tags", [])
+        if isinstance(tags, str):
+            return parse_tag_output(tags)
+        if not isinstance(tags, list):
+            raise WorkerError(f"Malformed worker reply: 'tags' is {type(tags).__name__}, expected a list or string")
+        return parse_tag_output(",".join(str(tag) for tag in tags))
+
+    def close(self, timeout: float = 2.0) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            if process.poll() is None:
+                process.stdin.write(json.dumps({"op": "shutdown"}) + "\n")
+                process.stdin.close()
+                process.wait(timeout)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+
+    def _call(self, request: Dict[str, object], timeout: float) -> Dict[str, object]:
+        with self._lock:
+            return self._exchange(request, timeout)
+
+    def _exchange(self, request: Dict[str, object], timeout: float) -> Dict[str, object]:
+        process = self._process
+        if process is None or process.poll() is not None:
+            raise WorkerError(self._exit_reason())
+        request_id = next(self._ids)
+        try:
+            process.stdin.write(json.dumps({"id": request_id, **request}) + "\n")
+            process.stdin.flush()
+        except (OSError, ValueError) as exc:
+            raise WorkerError(f"Worker stdin closed: {exc}") from exc
+
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                message = self._responses.get(timeout=max(deadline - time.monotonic(), 0.001))
+            except queue.Empty:
+                # A stuck worker is useless to the pool; kill it so the slot restarts.
+                process.kill()
+                raise WorkerTimeout(f"Worker did not answer within {timeout:g}s") from None
+            if message is _EOF:
+                process.wait()
+                raise WorkerError(self._exit_reason())
+            if isinstance(message, dict) and message.get("id") == request_id:
+                return message
+
+    def _exit_reason(self) -> str:
+        code = self._process.returncode if self._process else None
+        tail = f": {self._stderr[-1]}" if self._stderr else ""
+        return f"Worker exited with code {code}{tail}"
+
+    def _read_stdout(self, process: subprocess.Popen) -> None:
+        for line in process.stdout:
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(message, dict):
+                self._responses.put(message)
+        self._responses.put(_EOF)
+
+    def _read_stderr(self, process: subprocess.Popen) -> None:
+        for line in process.stderr:
+            if line.strip():
+                self._stderr.append(line.rstrip())
+
+
+class TaggerWorkerPool:
+    """``size`` workers sharing a queue of images; results come back in input order."""
+
+    def __init__(
+        self,
+        argv: Sequence[str],
+        size: int,
+        timeout: float,
+        startup_timeout: float = DEFAULT_STARTUP_TIMEOUT_SECONDS,
+        max_restarts: int = DEFAULT_MAX_RESTARTS,
+    ) -> None:
+        self.argv = list(argv)
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.max_restarts = max_restarts
+        self._workers: List[Optional[TaggerWorker]] = [None] * max(1, size)
+        self._starts = [0] * len(self._workers)
+
+    def tag_many(self, images: Sequence[str], subset: str = "") -> List[TagResult]:
+        results: List[Optional[TagResult]] = [None] * len(images)
+        pending: "queue.Queue[int]" = queue.Queue()
+        for index in range(len(images)):
+            pending.put(index)
+
+        def serve(slot: int) -> None:
+            while True:
+                try:
+                    index = pending.get_nowait()
+                except queue.Empty:
+                    return
+                results[index] = self._tag(slot, images[index], subset)
+
+        threads = [
+            threading.Thread(target=serve, args=(slot,), name=f"tagger-pool-{slot}", daemon=True)
+            for slot in range(min(len(self._workers), len(images)))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # ``_tag`` never raises, but a slot left empty must still be reported, not dropped,
+        # so callers can zip the results with their inputs.
+        return [
+            result if result is not None else TagResult(image, error="Tagger worker returned no result")
+            for image, result in zip(images, results)
+        ]
+
+    def health(self) -> List[Dict[str, object]]:
+        report = []
+        for slot, worker in enumerate(self._workers):
+            report.append(
+                {
+                    "slot": slot,
+                    "pid": worker.pid if worker else None,
+                    "alive": bool(worker and worker.alive() and worker.ping()),
+                    "restarts": max(self._starts[slot] - 1, 0),
+                    "served": worker.served if worker else 0,
+                }
+            )
+        return report
+
+    def close(self) -> None:
+        for slot, worker in enumerate(self._workers):
+            if worker is not None:
+                worker.close()
+                self._workers[slot] = None
+
+    def _tag(self, slot: int, image: str, subset: str) -> TagResult:
+        started = time.perf_counter()
+        result = TagResult(image)
+        # One retry on a fresh worker after a crash; a timeout or a tagger-reported error is final.
+        for attempt in range(2):
+            try:
+                result.tags = self._worker(slot).tag(image, subset, self.timeout)
+                result.error = None
+                break
+            except ImageRejected as exc:
+                result.error = f"Tagger reported: {exc}"
+                break
+            except WorkerTimeout as exc:
+                result.error = str(exc)
+                break
+            except WorkerError as exc:
+                result.error = str(exc)
+            except Exception as exc:  # defensive: one bad reply must not stop the pool
+                result.error = f"Tagger worker failed: {exc}"
+                break
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def _worker(self, slot: int) -> TaggerWorker:
+        worker = self._workers[slot]
+        if worker is not None and worker.alive():
+            return worker
+        if worker is not None:
+            logger.warning("Tagger worker %s in slot %d exited; restarting", worker.pid, slot)
+            worker.close()
+            self._workers[slot] = None
+        if self._starts[slot] > self.max_restarts:
+            raise WorkerError(f"Worker slot {slot} gave up after {self.max_restarts} restarts")
+        self._starts[slot] += 1
+        worker = TaggerWorker(self.argv, self.startup_timeout)
+        try:
+            worker.start()
+        except (OSError, WorkerError) as exc:
+            worker.close()
+            raise WorkerError(f"Worker failed to start: {exc}") from exc
+        self._workers[slot] = worker
+        return worker
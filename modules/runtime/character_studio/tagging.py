@@ -8,10 +8,12 @@ import shlex
 import subprocess
 import tempfile
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from . import dataset
 from .models import CharacterCard, CharacterStudioError
+from .tag_cache import TagCache
+from .tag_executor import TagExecutor, TaggerOptions, TagResult, parse_tag_output
 
 logger = logging.getLogger(__name__)
 
@@ -24,33 +26,38 @@ def _load_card(character_id: str) -> CharacterCard:
     return CharacterCard.load(character_id)
 
 
-def _parse_tag_output(output: str) -> List[str]:
-    """Parse comma or newline separated tag text from an external tagger."""
-
-    raw_tags = output.replace("\n", ",").split(",")
-    parsed = []
-    for tag in raw_tags:
-        stripped = tag.strip()
-        if stripped and stripped not in parsed:
-            parsed.append(stripped)
-    return parsed
+_parse_tag_output = parse_tag_output
 
 
 def _write_caption(image_path: Path, tags: List[str]) -> str:
-    caption_text = ", ".join(tags)
-    caption_path = image_path.with_suffix(".txt")
-    caption_path.write_text(caption_text, encoding="utf-8")
-    return str(caption_path)
+    return dataset.write_captions([(image_path, ", ".join(tags))])[0].caption
 
 
-def auto_tag_images(
-    character_id: str, subset_name: str, *, tagger_cmd: Optional[str] = None, extra_tags: Optional[List[str]] = None
-) -> List[str]:
-    """Auto-tag images for a character subset using prompts or external models.
+def auto_tag_subset(
+    character_id: str,
+    subset_name: str,
+    *,
+    tagger_cmd: Optional[str] = None,
+    extra_tags: Optional[List[str]] = None,
+    options: Optional[TaggerOptions] = None,
+    cache: Optional[TagCache] = None,
+    refresh_cache: bool = False,
+) -> List[TagResult]:
+    """Tag every image in a subset and write captions, reporting each image's outcome.
 
     A custom external command can be supplied via ``tagger_cmd`` or the environment
-    variable ``CHAR_STUDIO_TAGGER_CMD``. The command is expanded with
-    ``str.format`` and receives ``{image}`` and ``{subset}`` placeholders.
+    variable ``CHAR_STUDIO_TAGGER_CMD``. Per-image commands receive ``{image}`` and
+    ``{subset}`` placeholders; a standalone ``{images}`` argument (or
+    ``CHAR_STUDIO_TAGGER_MODE=stdin``) switches to the batch contract described in
+    ``tag_executor``, and ``CHAR_STUDIO_TAGGER_MODE=worker`` keeps the tagger
+    running for the whole subset (``tagger_worker``). Results follow the subset's
+    image order; images whose tagger run failed or timed out keep their existing
+    caption and carry an ``error``.
+
+    Raw tagger output is cached by image content and tagger fingerprint
+    (``tag_cache``), so only new or changed images reach the tagger; the card's
+    base tags are merged on every run. ``refresh_cache`` re-tags everything and
+    ``CHAR_STUDIO_TAG_CACHE=off`` disables the cache.
     """
 
     card = _load_card(character_id)
@@ -69,44 +76,85 @@ def auto_tag_images(
     if extra_tags:
         base_tags.extend(extra_tags)
 
-    results: List[str] = []
     external_cmd = tagger_cmd or os.getenv("CHAR_STUDIO_TAGGER_CMD")
-
-    for image in images:
-        tags = list(dict.fromkeys(base_tags))
-        if external_cmd:
-            cmd = [part.format(image=str(image), subset=subset_name) for part in shlex.split(external_cmd)]
-            try:
-                completed = subprocess.run(cmd, capture_output=True, text=True, check=True)
-                generated_tags = _parse_tag_output(completed.stdout)
-                for tag in generated_tags:
-                    if tag not in tags:
-                        tags.append(tag)
-            except FileNotFoundError as exc:
-                raise TaggingError(
-                    "External tagger command not found",
-                    context={"character_id": character_id, "subset": subset_name, "command": cmd},
-                ) from exc
-            except subprocess.CalledProcessError as exc:
-                raise TaggingError(
-                    "External tagger failed",
-                    context={
-                        "character_id": character_id,
-                        "subset": subset_name,
-                        "command": cmd,
-                        "stderr": exc.stderr,
-                    },
-                ) from exc
-
-        results.append(_write_caption(image, tags))
-
+    if external_cmd:
+        try:
+            executor = TagExecutor(external_cmd, subset_name, options or TaggerOptions.from_env())
+        except ValueError as exc:
+            raise TaggingError(
+                str(exc), context={"character_id": character_id, "subset": subset_name, "command": external_cmd}
+            ) from exc
+        if not executor.executable_available():
+            raise TaggingError(
+                "External tagger command not found",
+                context={"character_id": character_id, "subset": subset_name, "command": executor.argv([str(images[0])])},
+            )
+        with executor:
+            results = _run_cached(executor, images, cache, refresh_cache)
+    else:
+        results = [TagResult(str(image)) for image in images]
+
+    tagged = [result for result in results if result.ok]
+    for result in tagged:
+        result.tags = list(dict.fromkeys(base_tags + result.tags))
+    # One pass so each subset index is read and saved once; unchanged captions are not rewritten.
+    changes = dataset.write_captions([(Path(result.image), ", ".join(result.tags)) for result in tagged])
+    for result, change in zip(tagged, changes):
+        result.caption = change.caption
+
+    failures = [result for result in results if not result.ok]
+    if failures:
+        logger.warning(
+            "Tagger failed for some images",
+            extra={"character_id": character_id, "subset": subset_name, "failed": {r.image: r.error for r in failures}},
+        )
     logger.info(
         "Tagged images",
-        extra={"character_id": character_id, "subset": subset_name, "count": len(results)},
+        extra={"character_id": character_id, "subset": subset_name, "count": len(results) - len(failures)},
     )
     return results
 
 
+def _run_cached(executor: TagExecutor, images: List[Path], cache: Optional[TagCache], refresh: bool) -> List[TagResult]:
+    if cache is None:
+        if os.getenv("CHAR_STUDIO_TAG_CACHE", "").lower() == "off":
+            return executor.run(images)
+        cache = TagCache()
+    fingerprint = executor.fingerprint()
+    digests = cache.digests(images)
+    known = {} if refresh else cache.get_many(digests, fingerprint)
+
+    # Tag each unseen image content once, even if the subset holds duplicates.
+    pending: Dict[str, Path] = {}
+    for image, digest in zip(images, digests):
+        if digest not in known and digest not in pending:
+            pending[digest] = image
+    fresh = dict(zip(pending, executor.run(list(pending.values())))) if pending else {}
+    cache.put_many({digest: result.tags for digest, result in fresh.items() if result.ok}, fingerprint)
+
+    results = []
+    for image, digest in zip(images, digests):
+        if digest in known:
+            results.append(TagResult(str(image), tags=list(known[digest]), cached=True))
+        else:
+            outcome = fresh[digest]
+            results.append(TagResult(str(image), tags=list(outcome.tags), error=outcome.error, seconds=outcome.seconds))
+    return results
+
+
+def auto_tag_images(
+    character_id: str, subset_name: str, *, tagger_cmd: Optional[str] = None, extra_tags: Optional[List[str]] = None
+) -> List[str]:
+    """Auto-tag images for a character subset and return the written caption paths.
+
+    See ``auto_tag_subset`` for the tagger contract; images the tagger failed on
+    are logged and skipped rather than aborting the subset.
+    """
+
+    results = auto_tag_subset(character_id, subset_name, tagger_cmd=tagger_cmd, extra_tags=extra_tags)
+    return [result.caption for result in results if result.caption]
+
+
 def edit_tags_for_image(image_path: str, new_tags: Optional[List[str]] = None) -> str:
     """Manual tag editing helper used by UI or CLI workflows."""
 
@@ -145,17 +193,37 @@ def bulk_edit_tags(
 ) -> List[str]:
     """Apply bulk tag edits across multiple images."""
 
+    return [change.caption for change in apply_tag_edits(image_paths, append_tags=append_tags, replace_with=replace_with)]
+
+
+def apply_tag_edits(
+    image_paths: Iterable[str],
+    *,
+    append_tags: Optional[List[str]] = None,
+    replace_with: Optional[List[str]] = None,
+    dry_run: bool = False,
+) -> List[dataset.CaptionChange]:
+    """Append or replace tags across images, rewriting only captions whose text changes.
+
+    ``dry_run`` reports the diffs without writing; see ``dataset.write_captions``.
+    """
+
     if append_tags and replace_with:
         raise TaggingError(
             "Use either append_tags or replace_with, not both",
             context={"append_tags": append_tags, "replace_with": replace_with},
         )
 
-    updated: List[str] = []
+    edits = []
     for image_path_str in image_paths:
         path = Path(image_path_str)
         if replace_with is not None:
-            updated.append(edit_tags_for_image(str(path), new_tags=list(dict.fromkeys(replace_with))))
+            if path.suffix.lower() not in dataset.IMAGE_EXTENSIONS:
+                raise TaggingError(
+                    "Tag edits expect an image path",
+                    context={"image_path": image_path_str, "suffix": path.suffix},
+                )
+            edits.append((path, ", ".join(dict.fromkeys(replace_with))))
             continue
 
         caption_path = path.with_suffix(".txt")
@@ -164,7 +232,12 @@ def bulk_edit_tags(
             existing_tags = _parse_tag_output(caption_path.read_text(encoding="utf-8"))
 
         merged = existing_tags + [tag for tag in (append_tags or []) if tag not in existing_tags]
-        updated.append(_write_caption(path, merged))
+        edits.append((path, ", ".join(merged)))
 
-    logger.info("Bulk tag edit complete", extra={"updated": len(updated)})
-    return updated
+    changes = dataset.write_captions(edits, dry_run=dry_run)
+    updated = sum(change.changed for change in changes)
+    logger.info(
+        "Bulk tag edit complete",
+        extra={"updated": updated, "unchanged": len(changes) - updated, "dry_run": dry_run},
+    )
+    return changes
@@ -0,0 +1,81 @@
+import json
+import os
+import struct
+import zlib
+
+import pytest
+
+from modules.runtime.character_studio import dataset, models
+from modules.runtime.character_studio.image_hash import image_size, perceptual_hash
+from modules.runtime.character_studio.models import CharacterCard
+
+
+@pytest.fixture()
+def sandbox(tmp_path, monkeypatch):
+    card_root = tmp_path / "cards"
+    dataset_root = tmp_path / "datasets"
+    monkeypatch.setattr(models, "CARD_STORAGE_ROOT", card_root)
+    monkeypatch.setattr(dataset, "CARD_STORAGE_ROOT", card_root)
+    monkeypatch.setattr(dataset, "DATASET_ROOT", dataset_root)
+    CharacterCard(id="ivy", name="Ivy", nsfw_allowed=False, anatomy_tags=["botanist"]).save()
+    sources = tmp_path / "captures"
+    sources.mkdir()
+    return sources, dataset_root / "characters" / "ivy" / "base"
+
+
+def _png(path, width, height, pixel):
+    def chunk(kind, body):
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    raw = b"".join(b"\x00" + b"".join(bytes(pixel(x, y)) for x in range(width)) for y in range(height))
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    path.write_bytes(b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b""))
+    return path
+
+
+def _gradient(shift=0):
+    return lambda x, y: (min(255, x * 4 + shift), min(255, y * 3 + shift), 90)
+
+
+def test_exact_duplicates_are_skipped_and_the_index_tracks_the_subset(sandbox):
+    sources, subset_dir = sandbox
+    first = _png(sources / "pose.png", 48, 32, _gradient())
+    copy = sources / "pose_copy.png"
+    copy.write_bytes(first.read_bytes())
+    other = _png(sources / "other.png", 16, 24, lambda x, y: (x * 8, 0, y * 8))
+
+    report = dataset.ingest_images("ivy", [str(first), str(copy), str(other)], "base")
+    again = dataset.add_images_to_dataset("ivy", [str(copy)], "base")
+
+    assert [os.path.basename(path) for path in report.added] == ["pose.png", "other.png"]
+    assert report.duplicates == [{"image": str(copy), "existing": str(subset_dir / "pose.png")}]
+    assert again == [] and sorted(path.name for path in subset_dir.glob("*.png")) == ["other.png", "pose.png"]
+
+    (subset_dir / "pose.txt").write_text("ivy", encoding="utf-8")
+    _png(subset_dir / "dropped_in.png", 20, 20, lambda x, y: (255, x, y))
+    entries = dataset.refresh_subset_index("ivy", "base")
+    index = json.loads((subset_dir / "dataset_index.json").read_text(encoding="utf-8"))["images"]
+
+    assert index == entries and sorted(index) == ["dropped_in.png", "other.png", "pose.png"]
+    assert (index["pose.png"]["width"], index["pose.png"]["height"]) == (48, 32)
+    assert index["pose.png"]["source"] == str(first) and index["pose.png"]["size_bytes"] == first.stat().st_size
+    assert [index[name]["caption"] for name in sorted(index)] == ["missing", "missing", "present"]
+
+
+def test_perceptual_hash_flags_near_duplicates_and_hardlinks_on_request(sandbox):
+    sources, subset_dir = sandbox
+    original = _png(sources / "garden.png", 64, 48, _gradient())
+    brighter = _png(sources / "garden_edit.png", 64, 48, _gradient(shift=6))
+    unrelated = _png(sources / "checks.png", 64, 48, lambda x, y: (255, 255, 255) if (x // 8 + y // 8) % 2 else (0, 0, 0))
+
+    dataset.ingest_images("ivy", [str(original)], "base")
+    report = dataset.ingest_images("ivy", [str(brighter), str(unrelated)], "base", perceptual=True, link="hardlink")
+
+    assert [os.path.basename(path) for path in report.added] == ["garden_edit.png", "checks.png"]
+    assert len(report.near_duplicates) == 1
+    assert report.near_duplicates[0]["similar_to"] == str(subset_dir / "garden.png")
+    assert report.near_duplicates[0]["distance"] <= dataset.NEAR_DUPLICATE_DISTANCE
+    assert report.methods == {"hardlink": 2} and os.path.samefile(unrelated, subset_dir / "checks.png")
+    index = dataset.load_subset_index("ivy", "base")
+    assert index["garden_edit.png"]["near_duplicate_of"] == "garden.png"
+    assert index["garden.png"]["phash"] == perceptual_hash(original) and image_size(unrelated) == (64, 48)
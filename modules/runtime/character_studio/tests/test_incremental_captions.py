@@ -0,0 +1,87 @@
+import json
+import os
+
+import pytest
+
+from modules.runtime.character_studio import card_cli, dataset, models, tagging
+from modules.runtime.character_studio.models import CharacterCard
+
+
+@pytest.fixture()
+def subset(tmp_path, monkeypatch):
+    card_root = tmp_path / "cards"
+    dataset_root = tmp_path / "datasets"
+    monkeypatch.setattr(models, "CARD_STORAGE_ROOT", card_root)
+    monkeypatch.setattr(card_cli, "CARD_STORAGE_ROOT", card_root)
+    monkeypatch.setattr(dataset, "CARD_STORAGE_ROOT", card_root)
+    monkeypatch.setattr(dataset, "DATASET_ROOT", dataset_root)
+    CharacterCard(id="kai", name="Kai", nsfw_allowed=False, trigger_token="kai_tok", anatomy_tags=["scar"]).save()
+    subset_dir = dataset_root / "characters" / "kai" / "base"
+    subset_dir.mkdir(parents=True)
+    for stem in ("a", "b", "c"):
+        (subset_dir / f"{stem}.png").write_bytes(stem.encode())
+    return subset_dir
+
+
+def _mtimes(subset_dir):
+    return {path.name: path.stat().st_mtime_ns for path in subset_dir.glob("*.txt")}
+
+
+def test_generate_captions_only_rewrites_changed_captions(subset):
+    first = dataset.update_subset_captions("kai", "base")
+    assert [change.status for change in first] == ["created"] * 3
+    before = _mtimes(subset)
+
+    assert [change.status for change in dataset.update_subset_captions("kai", "base")] == ["unchanged"] * 3
+    assert _mtimes(subset) == before
+    index = json.loads((subset / "dataset_index.json").read_text(encoding="utf-8"))["images"]
+    assert index["a.png"]["caption"] == "present" and len(index["a.png"]["caption_sha256"]) == 64
+
+    (subset / "b.txt").write_text("hand edited", encoding="utf-8")
+    card = CharacterCard.load("kai")
+    card.wardrobe = ["cloak"]
+    card.save()
+    preview = dataset.update_subset_captions("kai", "base", dry_run=True)
+
+    assert [change.status for change in preview] == ["updated"] * 3
+    assert "-kai_tok, scar\n+kai_tok, scar, cloak" in preview[0].diff and "-hand edited" in preview[1].diff
+    assert (subset / "a.txt").read_text(encoding="utf-8") == "kai_tok, scar"
+
+    (subset / "c.txt").write_text("kai_tok, scar, cloak", encoding="utf-8")
+    changes = dataset.update_subset_captions("kai", "base")
+    assert [change.status for change in changes] == ["updated", "updated", "unchanged"]
+    assert (subset / "b.txt").read_text(encoding="utf-8") == "kai_tok, scar, cloak"
+    assert not list(subset.glob(".*.tmp"))
+
+
+def test_edit_tags_appends_without_touching_captions_that_already_match(subset, capsys):
+    (subset / "a.txt").write_text("kai_tok, smiling", encoding="utf-8")
+    (subset / "b.txt").write_text("kai_tok", encoding="utf-8")
+    tagging.apply_tag_edits([str(subset / "a.png"), str(subset / "b.png")], append_tags=["smiling"])
+    before = _mtimes(subset)
+
+    card_cli.main(["edit-tags", "kai", "base", "--append", "smiling", "--dry-run"])
+    assert "+smiling" in capsys.readouterr().out and not (subset / "c.txt").exists()
+
+    card_cli.main(["edit-tags", "kai", "base", "--append", "smiling"])
+
+    assert "1 caption(s) written, 2 unchanged." in capsys.readouterr().out
+    assert (subset / "a.txt").read_text(encoding="utf-8") == "kai_tok, smiling"
+    assert (subset / "b.txt").read_text(encoding="utf-8") == "kai_tok, smiling"
+    assert {name: mtime for name, mtime in _mtimes(subset).items() if name != "c.txt"} == before
+    assert os.path.exists(subset / "c.txt")
+
+
+def test_captions_outside_a_dataset_get_no_index(subset, tmp_path):
+    pictures = tmp_path / "pictures"
+    pictures.mkdir()
+    (pictures / "me.png").write_bytes(b"me")
+
+    tagging.edit_tags_for_image(str(pictures / "me.png"), ["portrait"])
+    before = _mtimes(pictures)
+    changes = dataset.write_captions([(pictures / "me.png", "portrait")])
+
+    assert (pictures / "me.txt").read_text(encoding="utf-8") == "portrait"
+    assert [change.status for change in changes] == ["unchanged"] and _mtimes(pictures) == before
+    assert [change.status for change in dataset.write_captions([(pictures / "me.png", "selfie")])] == ["updated"]
+    assert sorted(path.name for path in pictures.iterdir()) == ["me.png", "me.txt"]
@@ -0,0 +1,108 @@
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from modules.runtime.character_studio import dataset, models, tagging
+from modules.runtime.character_studio.models import CharacterCard
+from modules.runtime.character_studio.tag_executor import TagExecutor, TaggerOptions
+
+TAGGER = textwrap.dedent(
+    """
+    import pathlib, sys, time
+
+    log = pathlib.Path(sys.argv[1])
+    with log.open("a") as handle:
+        handle.write("call\\n")
+    if sys.argv[2:3] == ["--solo"]:
+        stem = pathlib.Path(sys.argv[3]).stem
+        if stem == "broken":
+            sys.exit("cannot read image")
+        if stem == "slow":
+            time.sleep(5)
+        print(f"{stem}, solo")
+    else:
+        for path in sys.argv[2:] or [line.strip() for line in sys.stdin if line.strip()]:
+            stem = pathlib.Path(path).stem
+            if stem != "skipped":
+                print(f"{path}\\t{stem}, batched")
+    """
+)
+
+
+@pytest.fixture()
+def subset(tmp_path, monkeypatch):
+    card_root = tmp_path / "cards"
+    dataset_root = tmp_path / "datasets"
+    monkeypatch.setattr(models, "CARD_STORAGE_ROOT", card_root)
+    monkeypatch.setattr(dataset, "CARD_STORAGE_ROOT", card_root)
+    monkeypatch.setattr(dataset, "DATASET_ROOT", dataset_root)
+    monkeypatch.setenv("CHAR_STUDIO_TAG_CACHE", str(tmp_path / "tag_cache.sqlite"))
+    CharacterCard(id="eve", name="Eve", nsfw_allowed=False, trigger_token="eve_tok", anatomy_tags=["archer"]).save()
+    subset_dir = dataset_root / "characters" / "eve" / "base"
+    subset_dir.mkdir(parents=True)
+    script = tmp_path / "tagger.py"
+    script.write_text(TAGGER, encoding="utf-8")
+    return subset_dir, script, tmp_path / "calls.log"
+
+
+def _images(subset_dir, *stems):
+    for stem in stems:
+        (subset_dir / f"{stem}.png").write_bytes(stem.encode())
+
+
+def test_per_image_failures_are_reported_without_aborting(subset):
+    subset_dir, script, log = subset
+    _images(subset_dir, "a", "broken", "c", "slow", "e")
+    command = f"{sys.executable} {script} {log} --solo {{image}}"
+
+    results = tagging.auto_tag_subset(
+        "eve", "base", tagger_cmd=command, options=TaggerOptions(workers=4, timeout=1.0)
+    )
+
+    assert [Path(result.image).name for result in results] == ["a.png", "broken.png", "c.png", "e.png", "slow.png"]
+    assert [result.ok for result in results] == [True, False, True, True, False]
+    assert "cannot read image" in results[1].error and "timed out" in results[4].error
+    assert (subset_dir / "a.txt").read_text(encoding="utf-8") == "eve_tok, archer, a, solo"
+    assert not (subset_dir / "broken.txt").exists()
+
+
+@pytest.mark.parametrize("mode, placeholder", [("auto", "{images}"), ("stdin", "")])
+def test_batch_contract_tags_many_images_per_invocation(subset, mode, placeholder):
+    subset_dir, script, log = subset
+    _images(subset_dir, "a", "b", "c", "skipped", "e")
+    executor = TagExecutor(
+        f"{sys.executable} {script} {log} {placeholder}", "base", TaggerOptions(workers=2, batch_size=2, mode=mode)
+    )
+
+    results = executor.run(dataset.list_subset_images("eve", "base"))
+
+    assert executor.mode == ("batch" if mode == "auto" else "stdin")
+    assert log.read_text().count("call") == 3
+    assert [result.tags for result in results if result.ok] == [["a", "batched"], ["b", "batched"], ["c", "batched"], ["e", "batched"]]
+    assert Path(results[4].image).stem == "skipped" and results[4].error == "Batch tagger returned no tags for this image"
+
+
+def test_cached_tags_survive_card_edits_and_skip_the_tagger(subset):
+    subset_dir, script, log = subset
+    _images(subset_dir, "a", "b", "c")
+    command = f"{sys.executable} {script} {log} --solo {{image}}"
+    tagging.auto_tag_subset("eve", "base", tagger_cmd=command)
+    assert log.read_text().count("call") == 3
+
+    card = CharacterCard.load("eve")
+    card.anatomy_tags = ["ranger"]
+    card.save()
+    (subset_dir / "c.png").write_bytes(b"retouched")
+    results = tagging.auto_tag_subset("eve", "base", tagger_cmd=command, extra_tags=["outdoors"])
+
+    assert log.read_text().count("call") == 4
+    assert [result.cached for result in results] == [True, True, False]
+    assert (subset_dir / "a.txt").read_text(encoding="utf-8") == "eve_tok, ranger, outdoors, a, solo"
+
+    tagging.auto_tag_subset("eve", "base", tagger_cmd=command, refresh_cache=True)
+    assert log.read_text().count("call") == 7
+    script.write_text(script.read_text(encoding="utf-8") + "# v2\n", encoding="utf-8")
+    tagging.auto_tag_subset("eve", "base", tagger_cmd=command)
+    assert log.read_text().count("call") == 10
@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from modules.runtime.character_studio import stand_in_tagger
+from modules.runtime.character_studio.tag_executor import TagExecutor, TaggerOptions
+from modules.runtime.character_studio.tagger_worker import TaggerWorkerPool
+
+STAND_IN = Path(stand_in_tagger.__file__)
+
+
+@pytest.fixture()
+def images(tmp_path):
+    paths = []
+    for name in ("red_dress_01", "blue_cloak_02", "boom_03", "green_hat_04", "silver_mask_05"):
+        path = tmp_path / f"{name}.png"
+        path.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00\x00\x00\x0dIHDR" + (64).to_bytes(4, "big") + (32).to_bytes(4, "big"))
+        paths.append(path)
+    return paths
+
+
+def _argv(tmp_path, *extra):
+    return [sys.executable, str(STAND_IN), "--worker", "--load-seconds", "0.2", "--log", str(tmp_path / "loads.log"), *extra]
+
+
+def test_workers_load_once_and_tag_in_input_order(tmp_path, images):
+    with TagExecutor(
+        " ".join(_argv(tmp_path)), "base", TaggerOptions(workers=2, mode="worker", timeout=5, startup_timeout=10)
+    ) as executor:
+        results = executor.run(images)
+        health = executor._pool.health()
+
+    assert [Path(result.image).name for result in results] == [path.name for path in images]
+    assert results[0].tags == ["red", "dress", "png", "landscape"]
+    assert (tmp_path / "loads.log").read_text().count("load") == 2
+    assert [slot["alive"] for slot in health] == [True, True]
+    assert sum(slot["served"] for slot in health) == len(images)
+
+
+def test_crashes_restart_the_worker_and_hangs_time_out(tmp_path, images):
+    pool = TaggerWorkerPool(_argv(tmp_path, "--crash-on", "boom", "--hang-on", "mask"), size=1, timeout=1, startup_timeout=10)
+    try:
+        results = pool.tag_many([str(path) for path in images], "base")
+        health = pool.health()
+    finally:
+        pool.close()
+
+    assert [result.ok for result in results] == [True, True, False, True, False]
+    assert "crashed on boom_03.png" in results[2].error
+    assert "did not answer within 1s" in results[4].error
+    # First start, the retry after the crash, and a fresh worker for the image after the retry crashed too;
+    # the hung worker is killed and left down because nothing else is queued.
+    assert health[0]["restarts"] == 2 and not health[0]["alive"]
+    assert (tmp_path / "loads.log").read_text().count("load") == 3
+
+
+def test_malformed_replies_fail_only_their_image(tmp_path, images):
+    pool = TaggerWorkerPool(_argv(tmp_path, "--malformed-on", "cloak"), size=1, timeout=5, startup_timeout=10)
+    try:
+        results = pool.tag_many([str(path) for path in images], "base")
+    finally:
+        pool.close()
+
+    assert [Path(result.image).name for result in results] == [path.name for path in images]
+    assert [result.ok for result in results] == [True, False, True, True, True]
+    assert "Malformed worker reply" in results[1].error
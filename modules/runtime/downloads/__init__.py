@@ -0,0 +1 @@
+"""Python download helpers shared by the shell installers and the web launcher."""
@@ -0,0 +1,306 @@
+"""Content-addressed blob store shared by model and LoRA installs.
+
+- Purpose: keep one copy of each checkpoint, keyed by its manifest SHA-256, and
+  materialize it into every app folder (WebUI, KoboldAI, SillyTavern backends)
+  as a hardlink, reflink or symlink instead of another full copy.
+- Assumptions: blobs are immutable once stored; ingesting never copies data
+  across filesystems. A blob keeps its data alive after every installed copy
+  is deleted, so ``prune`` must run to give that space back.
+- Side effects: creates ``<root>/sha256/<aa>/<digest>`` entries, replaces
+  duplicate files with links when ``reclaim`` runs and deletes unreferenced
+  blobs when ``prune`` runs.
+"""
+from __future__ import annotations
+
+import argparse
+import errno
+import json
+import os
+import shutil
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from modules.runtime.downloads.hashing import file_sha256, normalize_checksum, record_verified_digest
+
+DEFAULT_STORE = Path.home() / "ai-hub" / "blobs"
+MATERIALIZE_MODES = ("auto", "hardlink", "reflink", "symlink", "copy")
+# Linux FICLONE ioctl (btrfs, XFS, bcachefs); other platforms fall through.
+_FICLONE = 0x40049409
+
+
+def store_from_env() -> Optional["BlobStore"]:
+    """Return the configured store, or ``None`` when ``AIHUB_BLOB_STORE`` disables it."""
+
+    value = os.environ.get("AIHUB_BLOB_STORE", "")
+    if value.lower() in {"0", "off", "false", "none"}:
+        return None
+    return BlobStore(Path(value).expanduser() if value else DEFAULT_STORE)
+
+
+def _reflink(source: Path, dest: Path) -> None:
+    import fcntl
+
+    with source.open("rb") as src, dest.open("wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            dest.unlink(missing_ok=True)
+            raise
+
+
+def _same_file(a: Path, b: Path) -> bool:
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+class BlobStore:
+    """Store files by SHA-256 and link them into install directories."""
+
+    def __init__(self, root: Path = DEFAULT_STORE) -> None:
+        self.root = root
+
+    def path_for(self, digest: str) -> Path:
+        digest = normalize_checksum(digest)
+        if len(digest) != 64 or any(char not in "0123456789abcdef" for char in digest):
+            raise ValueError(f"Invalid sha256 digest: {digest!r}")
+        return self.root / "sha256" / digest[:2] / digest
+
+    def has(self, digest: str) -> bool:
+        try:
+            return self.path_for(digest).is_file()
+        except ValueError:
+            return False
+
+    def ingest(self, path: Path, digest: Optional[str] = None) -> Optional[Path]:
+        """Hardlink ``path`` into the store; returns the blob path or ``None``.
+
+        ``digest`` should be the already-verified checksum; otherwise the file
+        is hashed (reusing its verified-hash sidecar when present). Files on a
+        different filesystem than the store are left alone rather than copied.
+        """
+
+        digest = normalize_checksum(digest) or file_sha256(path)
+        blob = self.path_for(digest)
+        if blob.is_file():
+            return blob
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, blob)
+        except FileExistsError:
+            return blob
+        except OSError as exc:
+            if exc.errno in {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP}:
+                return None
+            raise
+        return blob
+
+    def materialize(self, digest: str, dest: Path, mode: str = "auto") -> str:
+        """Place the blob for ``digest`` at ``dest`` and return the method used.
+
+        ``auto`` tries hardlink, then reflink, then symlink. An existing ``dest``
+        is replaced atomically; if it already is the blob nothing changes.
+        """
+
+        if mode not in MATERIALIZE_MODES:
+            raise ValueError(f"Unknown materialize mode: {mode}")
+        blob = self.path_for(digest)
+        if not blob.is_file():
+            raise FileNotFoundError(f"Blob {digest} is not in the store")
+        if _same_file(blob, dest) and not dest.is_symlink():
+            return "existing"
+
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        temp = dest.with_name(f".{dest.name}.blob-tmp")
+        temp.unlink(missing_ok=True)
+        attempts = ("hardlink", "reflink", "symlink") if mode == "auto" else (mode,)
+        for method in attempts:
+            try:
+                if method == "hardlink":
+                    os.link(blob, temp)
+                elif method == "reflink":
+                    _reflink(blob, temp)
+                elif method == "symlink":
+                    os.symlink(blob, temp)
+                else:
+                    shutil.copyfile(blob, temp)
+            except (OSError, ImportError):
+                temp.unlink(missing_ok=True)
+                continue
+            os.replace(temp, dest)
+            if method != "symlink":
+                record_verified_digest(dest, normalize_checksum(digest))
+            return method
+        raise OSError(f"Unable to materialize {blob} at {dest} using {', '.join(attempts)}")
+
+    def blobs(self) -> Iterable[Path]:
+        base = self.root / "sha256"
+        if not base.is_dir():
+            return []
+        return (path for path in base.glob("??/*") if path.is_file() and len(path.name) == 64)
+
+    def prune(self, roots: Sequence[Path] = (), dry_run: bool = False) -> Dict[str, object]:
+        """Delete blobs that no installed file links to any more.
+
+        A blob whose only hardlink is the store entry itself (``st_nlink == 1``)
+        is unreferenced, unless a symlink under ``roots`` still points at it.
+        """
+
+        symlinked = set()
+        for root in roots:
+            if not Path(root).is_dir():
+                continue
+            for path in Path(root).rglob("*"):
+                if path.is_symlink():
+                    symlinked.add(os.path.realpath(path))
+
+        removed: List[Dict[str, object]] = []
+        freed = 0
+        for blob in list(self.blobs()):
+            stat = blob.stat()
+            if stat.st_nlink > 1 or os.path.realpath(blob) in symlinked:
+                continue
+            if not dry_run:
+                blob.unlink()
+                try:
+                    blob.parent.rmdir()
+                except OSError:
+                    pass
+            removed.append({"sha256": blob.name, "size_bytes": stat.st_size})
+            freed += stat.st_size
+        return {"removed": removed, "freed_bytes": freed, "dry_run": dry_run}
+
+    def report(self, roots: Sequence[Path], extensions: Sequence[str] = (".safetensors", ".ckpt", ".gguf", ".bin", ".pth", ".pt")) -> Dict[str, object]:
+        """Group identical artifacts under ``roots`` and estimate reclaimable bytes.
+
+        Files are bucketed by size first, so only same-size candidates are hashed;
+        paths that already share an inode count once.
+        """
+
+        by_size: Dict[int, Dict[tuple, List[Path]]] = defaultdict(lambda: defaultdict(list))
+        for root in roots:
+            if not Path(root).is_dir():
+                continue
+            for path in Path(root).rglob("*"):
+                if path.is_symlink() or not path.is_file() or not path.name.lower().endswith(tuple(extensions)):
+                    continue
+                stat = path.stat()
+                by_size[stat.st_size][(stat.st_dev, stat.st_ino)].append(path)
+
+        groups = []
+        reclaimable = 0
+        for size, inodes in by_size.items():
+            if len(inodes) < 2:
+                continue
+            by_digest: Dict[str, List[List[Path]]] = defaultdict(list)
+            for paths in inodes.values():
+                by_digest[file_sha256(paths[0])].append(paths)
+            for digest, copies in by_digest.items():
+                if len(copies) < 2:
+                    continue
+                savings = size * (len(copies) - 1)
+                reclaimable += savings
+                groups.append(
+                    {
+                        "sha256": digest,
+                        "size_bytes": size,
+                        "copies": len(copies),
+                        "paths": [str(path) for paths in copies for path in paths],
+                        "reclaimable_bytes": savings,
+                        "stored": self.has(digest),
+                    }
+                )
+        groups.sort(key=lambda group: group["reclaimable_bytes"], reverse=True)
+        return {"groups": groups, "reclaimable_bytes": reclaimable}
+
+    def reclaim(self, report: Dict[str, object], mode: str = "auto", dry_run: bool = False) -> Dict[str, object]:
+        """Replace duplicate copies from ``report`` with links to a single blob."""
+
+        linked: List[Dict[str, str]] = []
+        skipped: List[Dict[str, str]] = []
+        freed = 0
+        for group in report.get("groups", []):  # type: ignore[union-attr]
+            digest = str(group["sha256"])
+            paths = [Path(path) for path in group["paths"]]
+            if dry_run:
+                linked.extend({"path": str(path), "method": "planned"} for path in paths[1:])
+                freed += int(group["reclaimable_bytes"])
+                continue
+            blob = self.path_for(digest)
+            if not blob.is_file():
+                for candidate in paths:
+                    if self.ingest(candidate, digest):
+                        break
+            if not blob.is_file():
+                skipped.extend({"path": str(path), "reason": "store on another filesystem"} for path in paths)
+                continue
+            for path in paths:
+                if _same_file(path, blob):
+                    continue
+                try:
+                    method = self.materialize(digest, path, mode)
+                except OSError as exc:
+                    skipped.append({"path": str(path), "reason": str(exc)})
+                    continue
+                linked.append({"path": str(path), "method": method})
+                if method != "copy":
+                    freed += int(group["size_bytes"])
+        return {"linked": linked, "skipped": skipped, "freed_bytes": freed, "dry_run": dry_run}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Content-addressed store for models and LoRAs")
+    parser.add_argument("--store", type=Path, default=None, help="Store root (default: $AIHUB_BLOB_STORE or ~/ai-hub/blobs)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest_cmd = sub.add_parser("ingest", help="Hardlink a verified file into the store")
+    ingest_cmd.add_argument("path", type=Path)
+    ingest_cmd.add_argument("--checksum", default="")
+
+    materialize_cmd = sub.add_parser("materialize", help="Link a stored blob to a destination path")
+    materialize_cmd.add_argument("checksum")
+    materialize_cmd.add_argument("dest", type=Path)
+    materialize_cmd.add_argument("--mode", choices=MATERIALIZE_MODES, default="auto")
+
+    for name, help_text in (("report", "List duplicate artifacts and reclaimable space"), ("reclaim", "Replace duplicates with links")):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("roots", nargs="+", type=Path)
+        if name == "reclaim":
+            cmd.add_argument("--mode", choices=MATERIALIZE_MODES, default="auto")
+            cmd.add_argument("--dry-run", action="store_true")
+
+    prune_cmd = sub.add_parser("prune", help="Delete blobs no installed file links to")
+    prune_cmd.add_argument("roots", nargs="*", type=Path, help="Install folders whose symlinks keep blobs alive")
+    prune_cmd.add_argument("--dry-run", action="store_true")
+
+    args = parser.parse_args(argv)
+    store = BlobStore(args.store) if args.store else store_from_env()
+    if store is None:
+        print("Blob store disabled via AIHUB_BLOB_STORE", file=sys.stderr)
+        return 2
+
+    try:
+        if args.command == "ingest":
+            blob = store.ingest(args.path, args.checksum)
+            result: Dict[str, object] = {"path": str(args.path), "blob": str(blob) if blob else None}
+        elif args.command == "materialize":
+            result = {"dest": str(args.dest), "method": store.materialize(args.checksum, args.dest, args.mode)}
+        elif args.command == "report":
+            result = store.report(args.roots)
+        elif args.command == "prune":
+            result = store.prune(args.roots, dry_run=args.dry_run)
+        else:
+            result = store.reclaim(store.report(args.roots), mode=args.mode, dry_run=args.dry_run)
+    except (OSError, ValueError) as exc:
+        print(json.dumps({"error": str(exc)}))
+        return 1
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
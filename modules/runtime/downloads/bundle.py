@@ -0,0 +1,192 @@
+"""Offline bundle builder for curated manifest selections.
+
+- Purpose: produce the directories that ``DOWNLOAD_OFFLINE_BUNDLE`` consumes,
+  plus a ``bundle_index.json`` listing each file's checksum and size so a
+  bundle can be verified or served by ``cache_proxy`` without re-hashing.
+- Assumptions: bundle directories are flat (``<bundle>/<filename>``), matching
+  the lookup in ``download_with_retries``.
+- Side effects: downloads or links files into the bundle directory and
+  rewrites its index atomically.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from modules.runtime.downloads.blobstore import store_from_env
+from modules.runtime.downloads.hashing import file_sha256, normalize_checksum
+from modules.runtime.downloads.scheduler import DownloadItem, DownloadScheduler, load_manifest_items, parse_rate
+from modules.runtime.downloads.status import StatusReporter
+
+INDEX_NAME = "bundle_index.json"
+INDEX_VERSION = 1
+
+
+class BundleIndex:
+    """Read/modify/write access to ``bundle_index.json`` keyed by filename."""
+
+    def __init__(self, bundle_dir: Path) -> None:
+        self.bundle_dir = bundle_dir
+        self.path = bundle_dir / INDEX_NAME
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, Dict[str, object]]:
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+        items = payload.get("items", []) if isinstance(payload, dict) else []
+        return {str(item["filename"]): item for item in items if isinstance(item, dict) and item.get("filename")}
+
+    def _write(self, entries: Dict[str, Dict[str, object]]) -> None:
+        self.bundle_dir.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": INDEX_VERSION,
+            "updated": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "items": sorted(entries.values(), key=lambda item: str(item["filename"])),
+        }
+        temp = self.path.with_name(self.path.name + ".tmp")
+        temp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(temp, self.path)
+
+    def add(self, filename: str, sha256: str, size_bytes: int, **extra: object) -> Dict[str, object]:
+        entry: Dict[str, object] = {"filename": filename, "sha256": normalize_checksum(sha256), "size_bytes": size_bytes, **extra}
+        with self._lock:
+            entries = self.load()
+            entries[filename] = entry
+            self._write(entries)
+        return entry
+
+    def find_by_checksum(self, checksum: str) -> Optional[Dict[str, object]]:
+        wanted = normalize_checksum(checksum)
+        if not wanted:
+            return None
+        for entry in self.load().values():
+            if entry.get("sha256") == wanted:
+                return entry
+        return None
+
+
+def build_bundle(
+    items: Iterable[DownloadItem],
+    bundle_dir: Path,
+    *,
+    source_dir: Optional[Path] = None,
+    scheduler: Optional[DownloadScheduler] = None,
+    manifest: str = "",
+) -> Dict[str, object]:
+    """Fetch ``items`` into ``bundle_dir`` and record them in the bundle index.
+
+    ``source_dir`` (e.g. an existing model folder or another bundle) is tried
+    before the network, using the scheduler's offline-bundle lookup.
+    """
+
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    queued = [
+        DownloadItem(item.name, item.url, bundle_dir / item.dest.name, item.checksum, list(item.mirrors), item.size_bytes, dict(item.headers))
+        for item in items
+    ]
+    scheduler = scheduler or DownloadScheduler()
+    if source_dir is not None:
+        scheduler.offline_bundle = source_dir
+    results = scheduler.run(queued)
+
+    index = BundleIndex(bundle_dir)
+    added: List[Dict[str, object]] = []
+    failed: List[Dict[str, object]] = []
+    for item, result in zip(queued, results):
+        if not result.ok:
+            failed.append(result.to_dict())
+            continue
+        digest = normalize_checksum(item.checksum) or file_sha256(item.dest)
+        added.append(index.add(item.dest.name, digest, item.dest.stat().st_size, name=item.name, manifest=manifest, url=item.url))
+    return {"bundle": str(bundle_dir), "items": added, "failed": failed}
+
+
+def verify_bundle(bundle_dir: Path) -> Dict[str, object]:
+    """Check every indexed file's size and SHA-256 (sidecars make repeats cheap)."""
+
+    problems: List[Dict[str, object]] = []
+    entries = BundleIndex(bundle_dir).load()
+    for filename, entry in entries.items():
+        path = bundle_dir / filename
+        if not path.is_file():
+            problems.append({"filename": filename, "issue": "missing"})
+        elif path.stat().st_size != entry.get("size_bytes"):
+            problems.append({"filename": filename, "issue": "size_mismatch"})
+        elif file_sha256(path) != entry.get("sha256"):
+            problems.append({"filename": filename, "issue": "checksum_mismatch"})
+    return {"checked": len(entries), "problems": problems}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build, verify, or serve offline download bundles")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build_cmd = sub.add_parser("build", help="Collect manifest entries into a bundle directory")
+    build_cmd.add_argument("--manifest", required=True, type=Path, action="append", help="models.json/loras.json (repeatable)")
+    build_cmd.add_argument("--names", default="", help="Newline or comma separated names (default: every manifest entry)")
+    build_cmd.add_argument("--out", required=True, type=Path, help="Bundle directory to create or extend")
+    build_cmd.add_argument("--source-dir", type=Path, default=None, help="Local directory to copy verified files from first")
+    build_cmd.add_argument("--workers", type=int, default=int(os.environ.get("DOWNLOAD_WORKERS", "4")))
+    build_cmd.add_argument("--bandwidth-limit", default=os.environ.get("DOWNLOAD_BANDWIDTH_LIMIT", "0"))
+    build_cmd.add_argument("--status-file", default=os.environ.get("DOWNLOAD_STATUS_FILE", ""))
+
+    verify_cmd = sub.add_parser("verify", help="Check bundle files against bundle_index.json")
+    verify_cmd.add_argument("bundle", type=Path)
+
+    serve_cmd = sub.add_parser("serve", help="Serve a bundle as a caching download mirror")
+    serve_cmd.add_argument("bundle", type=Path)
+    serve_cmd.add_argument("--host", default="0.0.0.0")
+    serve_cmd.add_argument("--port", type=int, default=8765)
+    serve_cmd.add_argument("--no-upstream", action="store_true", help="Only serve files already in the bundle")
+    serve_cmd.add_argument(
+        "--manifest-dir",
+        type=Path,
+        default=Path(__file__).resolve().parents[3] / "manifests",
+        help="Restrict upstream fills to hosts referenced by these manifests",
+    )
+    serve_cmd.add_argument("--allow-any-upstream", action="store_true", help="Fill the cache from any http(s) host")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        from modules.runtime.downloads.cache_proxy import manifest_hosts, serve_forever
+
+        allowed = None if args.allow_any_upstream else manifest_hosts(args.manifest_dir)
+        serve_forever(args.bundle, host=args.host, port=args.port, allow_upstream=not args.no_upstream, allowed_hosts=allowed)
+        return 0
+    if args.command == "verify":
+        result = verify_bundle(args.bundle)
+        print(json.dumps(result, indent=2))
+        return 1 if result["problems"] else 0
+
+    names = [name for name in args.names.replace(",", "\n").splitlines() if name.strip()]
+    reporter = StatusReporter(Path(args.status_file) if args.status_file else None)
+    scheduler = DownloadScheduler(
+        max_workers=args.workers,
+        bandwidth_limit=parse_rate(args.bandwidth_limit),
+        reporter=reporter,
+        blob_store=store_from_env(),
+    )
+    summary: Dict[str, object] = {"bundle": str(args.out), "items": [], "failed": []}
+    for manifest in args.manifest:
+        if names:
+            selected = names
+        else:
+            payload = json.loads(manifest.read_text(encoding="utf-8"))
+            selected = [str(entry.get("name")) for entry in payload.get("items", []) if isinstance(entry, dict)]
+        items = load_manifest_items(manifest, selected, args.out)
+        result = build_bundle(items, args.out, source_dir=args.source_dir, scheduler=scheduler, manifest=manifest.name)
+        summary["items"] += result["items"]  # type: ignore[operator]
+        summary["failed"] += result["failed"]  # type: ignore[operator]
+    print(json.dumps(summary, indent=2))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
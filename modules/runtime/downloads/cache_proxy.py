@@ -0,0 +1,433 @@
+"""LAN download cache that serves a bundle directory and fills it from upstream.
+
+- Purpose: let many machines use one host as a mirror so each multi-GB model is
+  pulled from the internet once. Clients request
+  ``/fetch?url=<upstream>&sha256=<digest>&name=<filename>``; cached files are
+  served directly (with ``Range`` support for resumes), misses are fetched
+  upstream once, verified, and added to the bundle index.
+- Assumptions: the cache directory is a bundle (see ``bundle.py``); concurrent
+  requests for the same file share a single upstream transfer. A miss is
+  streamed to every requester while it fills, but the final byte is held back
+  until the checksum verifies, so a client never receives a complete copy of a
+  bad file (it sees a truncated body instead).
+- Side effects: writes fetched files and ``bundle_index.json`` into the cache
+  directory; binds a TCP port while serving.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+import urllib.error
+import urllib.request
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple, Union
+from urllib.parse import parse_qs, urlparse
+
+from modules.runtime.downloads.bundle import BundleIndex
+from modules.runtime.downloads.hashing import HashingWriter, normalize_checksum, record_verified_digest
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 256 * 1024
+USER_AGENT = "AIHub-DownloadCache/1.0"
+_SAFE_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.+-]*$")
+
+
+def manifest_hosts(manifest_dir: Path) -> Set[str]:
+    """Hosts referenced by ``url``/``mirrors`` in the curated manifests."""
+
+    hosts: Set[str] = set()
+    for manifest in manifest_dir.glob("*.json"):
+        try:
+            payload = json.loads(manifest.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            continue
+        for item in payload.get("items", []) if isinstance(payload, dict) else []:
+            if not isinstance(item, dict):
+                continue
+            for url in [item.get("url")] + list(item.get("mirrors") or []):
+                if isinstance(url, str) and url:
+                    hosts.add(urlparse(url).netloc.lower())
+    return hosts
+
+
+class UpstreamError(Exception):
+    """Raised when the upstream transfer fails or does not match its checksum."""
+
+
+class _Fill:
+    """One upstream transfer into ``<file>.part`` that any number of clients stream while it runs.
+
+    Readers get bytes as soon as they are flushed to disk. When the upstream
+    length is known the last byte is only released after verification, which
+    keeps a ``Content-Length`` response from ever completing with bad data.
+    """
+
+    def __init__(self, cache: "DownloadCache", upstream: str, checksum: str, filename: str) -> None:
+        self.cache = cache
+        self.upstream = upstream
+        self.checksum = normalize_checksum(checksum)
+        self.filename = filename
+        self.dest = cache.cache_dir / filename
+        self.part = self.dest.with_name(self.dest.name + ".part")
+        self.size: Optional[int] = None
+        self.written = 0
+        self.started = False
+        self.verified = False
+        self.error: Optional[str] = None
+        self._cond = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.verified or self.error is not None
+
+    def _update(self, **changes: object) -> None:
+        with self._cond:
+            for key, value in changes.items():
+                setattr(self, key, value)
+            self._cond.notify_all()
+
+    def run(self) -> None:
+        request = urllib.request.Request(self.upstream, headers={"User-Agent": USER_AGENT})
+        try:
+            with urllib.request.urlopen(request, timeout=self.cache.timeout) as response:
+                length = response.headers.get("Content-Length")
+                self._update(started=True, size=int(length) if length and length.isdigit() else None)
+                with HashingWriter(self.part, resume=False) as writer:
+                    while True:
+                        # ``read1`` hands over whatever has arrived instead of
+                        # blocking for a full chunk, so followers see progress.
+                        chunk = response.read1(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        writer.write(chunk)
+                        writer.flush()
+                        self._update(written=writer.offset)
+            if self.size is not None and self.written != self.size:
+                raise UpstreamError(f"Upstream ended after {self.written} of {self.size} bytes for {self.upstream}")
+            digest = writer.hexdigest()
+            if self.checksum and digest != self.checksum:
+                raise UpstreamError(f"Checksum mismatch for {self.upstream}: expected {self.checksum}, got {digest}")
+            with self._cond:
+                # Readers open the file under this lock, so nothing holds the
+                # ``.part`` open while it is renamed (required on Windows).
+                os.replace(self.part, self.dest)
+            record_verified_digest(self.dest, digest)
+            self.cache.index.add(self.filename, digest, self.written, url=self.upstream)
+            logger.info("Cached %s from %s", self.filename, self.upstream)
+            self._update(verified=True, size=self.written)
+        except (OSError, urllib.error.URLError, UpstreamError) as exc:
+            with self._cond:
+                self.part.unlink(missing_ok=True)
+            message = str(exc) if isinstance(exc, UpstreamError) else f"Upstream fetch failed for {self.upstream}: {exc}"
+            self._update(started=True, error=message)
+        finally:
+            self.cache._finish_fill(self)
+
+    def wait_started(self) -> None:
+        with self._cond:
+            self._cond.wait_for(lambda: self.started)
+
+    def wait(self) -> Path:
+        with self._cond:
+            self._cond.wait_for(lambda: self.finished)
+        if self.error is not None:
+            raise UpstreamError(self.error)
+        return self.dest
+
+    def _readable(self) -> int:
+        if self.verified or self.size is None:
+            return self.written
+        return min(self.written, self.size - 1)
+
+    def read(self, offset: int, limit: int) -> bytes:
+        """Return up to ``limit`` bytes at ``offset``, blocking until they are released.
+
+        Returns ``b""`` at the end of a verified file; raises ``UpstreamError``
+        if the fill fails before the requested bytes are released.
+        """
+
+        with self._cond:
+            self._cond.wait_for(lambda: self._readable() > offset or self.finished)
+            if self._readable() <= offset:
+                if self.error is not None:
+                    raise UpstreamError(self.error)
+                return b""
+            with (self.dest if self.verified else self.part).open("rb") as handle:
+                handle.seek(offset)
+                return handle.read(min(limit, self._readable() - offset))
+
+
+class DownloadCache:
+    """Resolve cache hits and perform single-flight upstream fills."""
+
+    def __init__(
+        self, cache_dir: Path, allow_upstream: bool = True, timeout: float = 60.0, allowed_hosts: Optional[Iterable[str]] = None
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.allow_upstream = allow_upstream
+        # ``None`` allows any upstream; the CLI restricts fills to manifest hosts
+        # so the cache cannot be used as an open proxy on the LAN.
+        self.allowed_hosts = {host.lower() for host in allowed_hosts} if allowed_hosts is not None else None
+        self.timeout = timeout
+        self.index = BundleIndex(cache_dir)
+        self._fills: Dict[str, _Fill] = {}
+        self._fills_lock = threading.Lock()
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _filename(upstream: str, name: str) -> str:
+        candidate = name or os.path.basename(urlparse(upstream).path)
+        if not _SAFE_NAME.match(candidate or ""):
+            raise ValueError(f"Unsafe or missing filename: {candidate!r}")
+        return candidate
+
+    def lookup(self, upstream: str, checksum: str = "", name: str = "") -> Optional[Path]:
+        """Return the cached file for a request, preferring a checksum match."""
+
+        entry = self.index.find_by_checksum(checksum)
+        if entry is not None:
+            path = self.cache_dir / str(entry["filename"])
+            if path.is_file():
+                return path
+        if normalize_checksum(checksum):
+            return None
+        try:
+            filename = self._filename(upstream, name)
+        except ValueError:
+            return None
+        entry = self.index.load().get(filename)
+        path = self.cache_dir / filename
+        return path if entry is not None and path.is_file() else None
+
+    def open(self, upstream: str, checksum: str = "", name: str = "") -> Union[Path, _Fill]:
+        """Return a cached path, or the (possibly shared) in-progress fill for a miss."""
+
+        cached = self.lookup(upstream, checksum, name)
+        if cached is not None:
+            return cached
+        if not self.allow_upstream:
+            raise FileNotFoundError(upstream)
+        if self.allowed_hosts is not None and urlparse(upstream).netloc.lower() not in self.allowed_hosts:
+            raise PermissionError(f"Upstream host not allowed: {urlparse(upstream).netloc}")
+        filename = self._filename(upstream, name)
+        key = normalize_checksum(checksum) or filename
+        with self._fills_lock:
+            fill = self._fills.get(key)
+            if fill is None:
+                cached = self.lookup(upstream, checksum, name)
+                if cached is not None:
+                    return cached
+                fill = self._fills[key] = _Fill(self, upstream, checksum, filename)
+                threading.Thread(target=fill.run, name=f"cache-fill-{filename}", daemon=True).start()
+        return fill
+
+    def _finish_fill(self, fill: _Fill) -> None:
+        with self._fills_lock:
+            key = fill.checksum or fill.filename
+            if self._fills.get(key) is fill:
+                del self._fills[key]
+
+    def fetch(self, upstream: str, checksum: str = "", name: str = "") -> Path:
+        """Return a cached path, downloading from ``upstream`` on a miss."""
+
+        result = self.open(upstream, checksum, name)
+        return result if isinstance(result, Path) else result.wait()
+
+    def head_upstream(self, upstream: str) -> int:
+        request = urllib.request.Request(upstream, method="HEAD", headers={"User-Agent": USER_AGENT})
+        try:
+            with urllib.request.urlopen(request, timeout=min(self.timeout, 10.0)) as response:
+                return int(getattr(response, "status", 200))
+        except urllib.error.HTTPError as exc:
+            return exc.code
+        except (OSError, urllib.error.URLError):
+            return int(HTTPStatus.BAD_GATEWAY)
+
+
+def _parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    if not header:
+        return None
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    start_text, end_text = match.groups()
+    if start_text == "":
+        length = int(end_text)
+        return max(size - length, 0), size - 1
+    start = int(start_text)
+    end = min(int(end_text), size - 1) if end_text else size - 1
+    return start, end
+
+
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    """Serve ``/fetch`` and plain ``/<filename>`` requests from a ``DownloadCache``."""
+
+    cache: DownloadCache
+    protocol_version = "HTTP/1.1"
+
+    def _resolve(self, head: bool) -> Union[Path, _Fill, None]:
+        parsed = urlparse(self.path)
+        if parsed.path == "/fetch":
+            query = parse_qs(parsed.query)
+            upstream = (query.get("url") or [""])[0]
+            checksum = (query.get("sha256") or [""])[0]
+            name = (query.get("name") or [""])[0]
+            if not upstream.startswith(("http://", "https://")):
+                self.send_error(HTTPStatus.BAD_REQUEST, "url must be an http(s) URL")
+                return None
+            if head:
+                cached = self.cache.lookup(upstream, checksum, name)
+                if cached is None:
+                    allowed = self.cache.allow_upstream and (
+                        self.cache.allowed_hosts is None or urlparse(upstream).netloc.lower() in self.cache.allowed_hosts
+                    )
+                    status = self.cache.head_upstream(upstream) if allowed else int(HTTPStatus.NOT_FOUND)
+                    self.send_response(HTTPStatus.OK if status < 400 else HTTPStatus.BAD_GATEWAY)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return None
+                return cached
+            try:
+                result = self.cache.open(upstream, checksum, name)
+                if isinstance(result, _Fill):
+                    # Only wait for upstream response headers; the body is
+                    # streamed to this client while the cache fills.
+                    result.wait_started()
+                    if result.error is not None:
+                        raise UpstreamError(result.error)
+                return result
+            except ValueError as exc:
+                self.send_error(HTTPStatus.BAD_REQUEST, str(exc))
+            except FileNotFoundError:
+                self.send_error(HTTPStatus.NOT_FOUND, "Not cached and upstream fetching is disabled")
+            except PermissionError as exc:
+                self.send_error(HTTPStatus.FORBIDDEN, str(exc))
+            except UpstreamError as exc:
+                self.send_error(HTTPStatus.BAD_GATEWAY, str(exc))
+            return None
+
+        filename = parsed.path.lstrip("/")
+        path = self.cache.cache_dir / filename
+        if not _SAFE_NAME.match(filename) or filename not in self.cache.index.load() or not path.is_file():
+            self.send_error(HTTPStatus.NOT_FOUND, "Unknown bundle file")
+            return None
+        return path
+
+    def _send_file(self, path: Path, head: bool) -> None:
+        size = path.stat().st_size
+        byte_range = _parse_range(self.headers.get("Range"), size)
+        if byte_range is not None and byte_range[0] >= size:
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        start, end = byte_range if byte_range else (0, size - 1)
+        length = max(end - start + 1, 0)
+        self.send_response(HTTPStatus.PARTIAL_CONTENT if byte_range else HTTPStatus.OK)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        if byte_range:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        if head or not length:
+            return
+        with path.open("rb") as handle:
+            handle.seek(start)
+            remaining = length
+            while remaining > 0:
+                chunk = handle.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+
+    def _send_fill(self, fill: _Fill) -> None:
+        size = fill.size
+        byte_range = _parse_range(self.headers.get("Range"), size) if size is not None else None
+        if size is not None and byte_range is not None and byte_range[0] >= size:
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        start, end = byte_range if byte_range else (0, size - 1 if size is not None else None)
+        self.send_response(HTTPStatus.PARTIAL_CONTENT if byte_range else HTTPStatus.OK)
+        self.send_header("Content-Type", "application/octet-stream")
+        if end is not None:
+            self.send_header("Content-Length", str(max(end - start + 1, 0)))
+            self.send_header("Accept-Ranges", "bytes")
+        else:
+            # Unknown upstream length: chunked framing lets the client tell a
+            # verified end (terminating chunk) from an aborted fill.
+            self.send_header("Transfer-Encoding", "chunked")
+        if byte_range:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        offset = start
+        try:
+            while end is None or offset <= end:
+                chunk = fill.read(offset, CHUNK_SIZE if end is None else min(CHUNK_SIZE, end - offset + 1))
+                if not chunk:
+                    break
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk) if end is None else chunk)
+                offset += len(chunk)
+            if end is None:
+                self.wfile.write(b"0\r\n\r\n")
+        except UpstreamError as exc:
+            logger.warning("Aborting response for %s: %s", fill.filename, exc)
+            self.close_connection = True
+
+    def do_GET(self) -> None:  # noqa: N802
+        result = self._resolve(head=False)
+        if isinstance(result, _Fill):
+            self._send_fill(result)
+        elif result is not None:
+            self._send_file(result, head=False)
+
+    def do_HEAD(self) -> None:  # noqa: N802
+        path = self._resolve(head=True)
+        if isinstance(path, Path):
+            self._send_file(path, head=True)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        logger.debug("cache %s - %s", self.address_string(), format % args)
+
+
+def create_server(
+    cache_dir: Path,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    allow_upstream: bool = True,
+    allowed_hosts: Optional[Iterable[str]] = None,
+) -> ThreadingHTTPServer:
+    cache = DownloadCache(cache_dir, allow_upstream=allow_upstream, allowed_hosts=allowed_hosts)
+    handler = type("BoundCacheRequestHandler", (CacheRequestHandler,), {"cache": cache})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve_forever(
+    cache_dir: Path,
+    host: str = "0.0.0.0",
+    port: int = 8765,
+    allow_upstream: bool = True,
+    allowed_hosts: Optional[Iterable[str]] = None,
+) -> None:
+    server = create_server(cache_dir, host, port, allow_upstream, allowed_hosts)
+    print(f"AI Hub download cache serving {cache_dir} on http://{host}:{server.server_address[1]}")
+    print(f"Point clients at it with DOWNLOAD_CACHE_URL=http://<this-host>:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Shutting down download cache...")
+    finally:
+        server.server_close()
@@ -0,0 +1,453 @@
+"""SQLite catalog of installed models, LoRAs and caches.
+
+- Purpose: replace the per-artifact ``du``/``jq`` rewrites in
+  ``artifact_manager.sh`` with an indexed catalog that rescans incrementally and
+  can be queried by the shell helpers and the web launcher alike.
+- Assumptions: an artifact whose size, mtime_ns and inode are unchanged since
+  the last scan still has the recorded digest; the catalog is a local cache
+  that can be deleted and rebuilt at any time.
+- Side effects: maintains ``~/.config/aihub/artifacts.sqlite`` and, for
+  compatibility, exports ``artifacts.json`` with the legacy record shape.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from modules.runtime.downloads.hashing import file_sha256, read_verified_digest
+
+ARTIFACT_EXTENSIONS = (".safetensors", ".ckpt", ".gguf", ".bin", ".pth", ".pt")
+DEFAULT_CONFIG_DIR = Path.home() / ".config" / "aihub"
+DEFAULT_DB_PATH = DEFAULT_CONFIG_DIR / "artifacts.sqlite"
+DEFAULT_STATE_FILE = DEFAULT_CONFIG_DIR / "artifacts.json"
+# Matches ``find -maxdepth 2`` in artifact_manager.sh: the root plus one level.
+SCAN_DEPTH = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    path TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL DEFAULT 0,
+    mtime_ns INTEGER NOT NULL DEFAULT 0,
+    inode INTEGER NOT NULL DEFAULT 0,
+    target TEXT NOT NULL DEFAULT '',
+    sha256 TEXT,
+    hashed_size INTEGER,
+    hashed_mtime_ns INTEGER,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS artifacts_type ON artifacts(type);
+CREATE INDEX IF NOT EXISTS artifacts_status ON artifacts(status);
+"""
+
+COLUMNS = (
+    "path",
+    "type",
+    "status",
+    "size_bytes",
+    "mtime_ns",
+    "inode",
+    "target",
+    "sha256",
+    "hashed_size",
+    "hashed_mtime_ns",
+    "last_seen",
+)
+
+
+def default_roots() -> List[Tuple[str, Path]]:
+    """Directories scanned by ``artifact_manager.sh`` (``MODEL_DIRS``/``LORA_DIRS``)."""
+
+    home = Path.home()
+    model_dir = os.environ.get("aihub_model_dir") or str(home / "ai-hub" / "models")
+    lora_dir = os.environ.get("aihub_lora_dir") or str(home / "AI" / "LoRAs")
+    return [
+        ("model", Path(model_dir)),
+        ("model", home / "AI" / "WebUI" / "models" / "Stable-diffusion"),
+        ("lora", Path(lora_dir)),
+        ("lora", home / "AI" / "oobabooga" / "loras"),
+    ]
+
+
+def _now() -> str:
+    return datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _iter_candidates(root: Path, depth: int = SCAN_DEPTH) -> Iterator[os.DirEntry]:
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if depth > 1:
+                    yield from _iter_candidates(Path(entry.path), depth - 1)
+                continue
+        except OSError:
+            continue
+        if entry.name.lower().endswith(ARTIFACT_EXTENSIONS):
+            yield entry
+
+
+def _tree_size(root: Path) -> int:
+    total = 0
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = list(os.scandir(current))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                else:
+                    total += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+    return total
+
+
+class ArtifactCatalog:
+    """Incremental artifact index backed by SQLite."""
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, state_file: Optional[Path] = None) -> None:
+        self.db_path = db_path
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def _describe(path: Path, entry: Optional[os.DirEntry] = None) -> Dict[str, object]:
+        """Build the stat-derived fields for ``path`` without reading file contents."""
+
+        record: Dict[str, object] = {"path": str(path), "status": "missing", "size_bytes": 0, "mtime_ns": 0, "inode": 0, "target": ""}
+        try:
+            lstat = entry.stat(follow_symlinks=False) if entry is not None else path.lstat()
+        except OSError:
+            return record
+        is_link = (entry.is_symlink() if entry is not None else path.is_symlink())
+        if is_link:
+            record["target"] = os.path.realpath(path)
+            try:
+                stat = path.stat()
+            except OSError:
+                record["status"] = "symlink_broken"
+                return record
+            record["status"] = "symlink_ok"
+        else:
+            stat = lstat
+            record["status"] = "ok"
+        record.update(size_bytes=stat.st_size, mtime_ns=stat.st_mtime_ns, inode=stat.st_ino)
+        return record
+
+    def _load_rows(self, conn: sqlite3.Connection) -> Dict[str, sqlite3.Row]:
+        return {row["path"]: row for row in conn.execute("SELECT * FROM artifacts")}
+
+    def _upsert(self, conn: sqlite3.Connection, records: Sequence[Dict[str, object]]) -> None:
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        conn.executemany(
+            f"INSERT OR REPLACE INTO artifacts ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+            [tuple(record.get(column) for column in COLUMNS) for record in records],
+        )
+
+    def _merge(self, previous: Optional[sqlite3.Row], record: Dict[str, object], hash_files: bool) -> Dict[str, object]:
+        stamp = (record["size_bytes"], record["mtime_ns"])
+        if previous is not None and previous["sha256"] and (previous["hashed_size"], previous["hashed_mtime_ns"]) == stamp:
+            record.update(sha256=previous["sha256"], hashed_size=stamp[0], hashed_mtime_ns=stamp[1])
+            if previous["status"] == "corrupt":
+                record["status"] = "corrupt"
+            return record
+        if record["status"] in {"ok", "symlink_ok"}:
+            path = Path(str(record["path"]))
+            digest = read_verified_digest(path)
+            if digest is None and hash_files:
+                try:
+                    digest = file_sha256(path)
+                except OSError:
+                    digest = None
+            if digest:
+                record.update(sha256=digest, hashed_size=stamp[0], hashed_mtime_ns=stamp[1])
+        return record
+
+    def scan(
+        self, roots: Optional[Iterable[Tuple[str, Path]]] = None, cache_dirs: Iterable[Path] = (), hash_files: bool = False
+    ) -> Dict[str, int]:
+        """Record artifacts under ``roots``, touching only entries whose stat changed.
+
+        Unchanged files cost one ``lstat`` and are not rewritten. Catalogued
+        paths under a scanned root that disappeared are marked ``missing``.
+        """
+
+        roots = list(roots if roots is not None else default_roots())
+        seen_at = _now()
+        summary = {"scanned": 0, "changed": 0, "unchanged": 0, "missing": 0}
+        with self._lock, closing(self._connect()) as conn, conn:
+            existing = self._load_rows(conn)
+            changed: List[Dict[str, object]] = []
+            unchanged: List[str] = []
+            seen = set()
+            for artifact_type, root in roots:
+                for entry in _iter_candidates(Path(root)):
+                    path = Path(entry.path)
+                    key = str(path)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    summary["scanned"] += 1
+                    record = self._describe(path, entry)
+                    previous = existing.get(key)
+                    if (
+                        previous is not None
+                        and previous["type"] == artifact_type
+                        and previous["status"] in {record["status"], "corrupt"}
+                        and (previous["size_bytes"], previous["mtime_ns"], previous["inode"], previous["target"])
+                        == (record["size_bytes"], record["mtime_ns"], record["inode"], record["target"])
+                        and (previous["sha256"] or not hash_files)
+                    ):
+                        unchanged.append(key)
+                        continue
+                    record.update(type=artifact_type, last_seen=seen_at)
+                    changed.append(self._merge(previous, record, hash_files))
+
+            for cache_dir in cache_dirs:
+                cache_dir = Path(cache_dir)
+                if not cache_dir.is_dir():
+                    continue
+                key = str(cache_dir)
+                seen.add(key)
+                stat = cache_dir.stat()
+                changed.append(
+                    {
+                        "path": key,
+                        "type": "cache",
+                        "status": "ok",
+                        "size_bytes": _tree_size(cache_dir),
+                        "mtime_ns": stat.st_mtime_ns,
+                        "inode": stat.st_ino,
+                        "target": "",
+                        "last_seen": seen_at,
+                    }
+                )
+
+            root_prefixes = tuple(str(Path(root)) + os.sep for _, root in roots)
+            vanished = [
+                path
+                for path, row in existing.items()
+                if path not in seen and row["status"] != "missing" and row["type"] != "cache" and path.startswith(root_prefixes)
+            ]
+
+            self._upsert(conn, changed)
+            if unchanged:
+                conn.executemany("UPDATE artifacts SET last_seen = ? WHERE path = ?", [(seen_at, path) for path in unchanged])
+            if vanished:
+                conn.executemany(
+                    "UPDATE artifacts SET status = 'missing', size_bytes = 0 WHERE path = ?", [(path,) for path in vanished]
+                )
+            summary.update(changed=len(changed), unchanged=len(unchanged), missing=len(vanished))
+        self.export_state()
+        return summary
+
+    def record(self, artifact_type: str, path: Path, hash_files: bool = False) -> Dict[str, object]:
+        """Track a single path (``artifact_manager.sh --record``)."""
+
+        path = Path(path)
+        record = self._describe(path)
+        if path.is_dir() and record["status"] == "ok":
+            record["size_bytes"] = _tree_size(path)
+        record.update(type=artifact_type, last_seen=_now())
+        with self._lock, closing(self._connect()) as conn, conn:
+            previous = conn.execute("SELECT * FROM artifacts WHERE path = ?", (str(path),)).fetchone()
+            if not path.is_dir():
+                record = self._merge(previous, record, hash_files)
+            self._upsert(conn, [record])
+        self.export_state()
+        return record
+
+    def verify(self, paths: Optional[Iterable[Path]] = None, rehash: bool = False) -> Dict[str, object]:
+        """Check catalogued files against their recorded digests.
+
+        Files whose stat no longer matches the digest are re-hashed and reported
+        as ``changed``; ``rehash`` re-reads every file to catch silent corruption.
+        """
+
+        issues: List[Dict[str, object]] = []
+        checked = 0
+        with self._lock, closing(self._connect()) as conn, conn:
+            if paths is None:
+                rows = list(conn.execute("SELECT * FROM artifacts WHERE type != 'cache' AND status != 'missing'"))
+            else:
+                wanted = [str(Path(path)) for path in paths]
+                rows = [row for row in (conn.execute("SELECT * FROM artifacts WHERE path = ?", (key,)).fetchone() for key in wanted) if row]
+            updates: List[Dict[str, object]] = []
+            for row in rows:
+                checked += 1
+                path = Path(row["path"])
+                record = self._describe(path)
+                record.update(type=row["type"], last_seen=row["last_seen"])
+                if record["status"] in {"missing", "symlink_broken"}:
+                    issues.append({"path": row["path"], "issue": record["status"]})
+                    record.update(sha256=row["sha256"], hashed_size=row["hashed_size"], hashed_mtime_ns=row["hashed_mtime_ns"])
+                    updates.append(record)
+                    continue
+                stamp = (record["size_bytes"], record["mtime_ns"])
+                stale = (row["hashed_size"], row["hashed_mtime_ns"]) != stamp
+                if row["sha256"] and not stale and not rehash:
+                    continue
+                try:
+                    digest = file_sha256(path, use_sidecar=not rehash)
+                except OSError as exc:
+                    issues.append({"path": row["path"], "issue": "unreadable", "error": str(exc)})
+                    continue
+                if row["sha256"] and digest != row["sha256"]:
+                    issue = "changed" if stale else "corrupt"
+                    issues.append({"path": row["path"], "issue": issue, "expected": row["sha256"], "actual": digest})
+                    if issue == "corrupt":
+                        # Keep the known-good digest so the file stays flagged until replaced.
+                        record.update(status="corrupt", sha256=row["sha256"], hashed_size=stamp[0], hashed_mtime_ns=stamp[1])
+                        updates.append(record)
+                        continue
+                record.update(sha256=digest, hashed_size=stamp[0], hashed_mtime_ns=stamp[1])
+                updates.append(record)
+            self._upsert(conn, updates)
+        if updates:
+            self.export_state()
+        return {"checked": checked, "issues": issues}
+
+    def prune(self) -> Dict[str, object]:
+        """Drop catalog rows for artifacts that no longer exist on disk."""
+
+        with self._lock, closing(self._connect()) as conn, conn:
+            rows = list(conn.execute("SELECT path, status FROM artifacts"))
+            removed = [row["path"] for row in rows if row["status"] == "missing" or not os.path.lexists(row["path"])]
+            conn.executemany("DELETE FROM artifacts WHERE path = ?", [(path,) for path in removed])
+        if removed:
+            self.export_state()
+        return {"removed": removed}
+
+    def records(self, artifact_type: Optional[str] = None) -> List[Dict[str, object]]:
+        query = "SELECT * FROM artifacts"
+        params: Tuple[object, ...] = ()
+        if artifact_type:
+            query += " WHERE type = ?"
+            params = (artifact_type,)
+        with closing(self._connect()) as conn:
+            return [dict(row) for row in conn.execute(query + " ORDER BY path", params)]
+
+    def summary(self) -> Dict[str, object]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT type, COUNT(*) AS count, SUM(size_bytes) AS size_bytes, "
+                "SUM(CASE WHEN status IN ('missing', 'symlink_broken', 'corrupt') THEN 1 ELSE 0 END) AS problems "
+                "FROM artifacts GROUP BY type"
+            ).fetchall()
+        return {
+            row["type"]: {"count": row["count"], "size_bytes": row["size_bytes"] or 0, "problems": row["problems"] or 0}
+            for row in rows
+        }
+
+    def export_state(self) -> None:
+        """Write ``artifacts.json`` in the record shape ``artifact_manager.sh`` used."""
+
+        if not self.state_file:
+            return
+        last_maintenance = ""
+        try:
+            last_maintenance = json.loads(self.state_file.read_text(encoding="utf-8")).get("last_maintenance", "")
+        except (OSError, json.JSONDecodeError, AttributeError):
+            pass
+        records = [
+            {
+                "type": row["type"],
+                "path": row["path"],
+                "status": row["status"],
+                "size_bytes": row["size_bytes"],
+                "target": row["target"],
+                "sha256": row["sha256"],
+                "last_seen": row["last_seen"],
+            }
+            for row in self.records()
+        ]
+        payload = {"records": records, "last_maintenance": last_maintenance}
+        temp = self.state_file.with_name(self.state_file.name + ".tmp")
+        temp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(temp, self.state_file)
+
+
+def _parse_roots(values: Sequence[str]) -> Optional[List[Tuple[str, Path]]]:
+    if not values:
+        return None
+    roots = []
+    for value in values:
+        artifact_type, _, directory = value.partition("=")
+        if not directory:
+            raise SystemExit(f"Invalid --root '{value}'; expected TYPE=DIR")
+        roots.append((artifact_type, Path(directory).expanduser()))
+    return roots
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Incremental model/LoRA artifact catalog")
+    parser.add_argument("--db", type=Path, default=Path(os.environ.get("AIHUB_ARTIFACT_DB", str(DEFAULT_DB_PATH))))
+    parser.add_argument("--state-file", type=Path, default=None, help="Also export artifacts.json to this path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    scan_cmd = sub.add_parser("scan", help="Record artifacts whose stat changed since the last scan")
+    scan_cmd.add_argument("--root", action="append", default=[], help="TYPE=DIR to scan (repeatable; default: installer dirs)")
+    scan_cmd.add_argument("--cache-dir", action="append", default=[], type=Path, help="Cache directory to size (repeatable)")
+    scan_cmd.add_argument("--hash", action="store_true", help="Hash new or changed files (otherwise reuse verified sidecars)")
+
+    record_cmd = sub.add_parser("record", help="Track a single artifact path")
+    record_cmd.add_argument("type")
+    record_cmd.add_argument("path", type=Path)
+
+    verify_cmd = sub.add_parser("verify", help="Hash catalogued files and report changes or corruption")
+    verify_cmd.add_argument("paths", nargs="*", type=Path)
+    verify_cmd.add_argument("--rehash", action="store_true", help="Re-read every file even when its stat is unchanged")
+
+    sub.add_parser("prune", help="Drop catalog rows for artifacts that no longer exist")
+    list_cmd = sub.add_parser("list", help="Print catalogued records as JSON")
+    list_cmd.add_argument("--type", default=None)
+
+    args = parser.parse_args(argv)
+    catalog = ArtifactCatalog(args.db, state_file=args.state_file)
+    started = time.perf_counter()
+    if args.command == "scan":
+        result: Dict[str, object] = dict(catalog.scan(_parse_roots(args.root), args.cache_dir, hash_files=args.hash))
+    elif args.command == "record":
+        result = catalog.record(args.type, args.path)
+    elif args.command == "verify":
+        result = catalog.verify(args.paths or None, rehash=args.rehash)
+    elif args.command == "prune":
+        result = catalog.prune()
+    else:
+        result = {"items": catalog.records(args.type)}
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    print(json.dumps(result, indent=2))
+    if args.command == "verify" and result.get("issues"):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
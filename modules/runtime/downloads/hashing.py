@@ -0,0 +1,226 @@
+"""Streaming SHA-256 helpers and verified-hash sidecars for downloaded artifacts.
+
+- Purpose: hash bytes while they are written so a finished download needs no
+  second read, and remember verified digests so later checks cost one stat().
+- Assumptions: a file whose size and mtime_ns match its sidecar has not been
+  modified since it was hashed; anything else is re-hashed from disk.
+- Side effects: writes ``<file>.sha256.json`` next to verified files.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Tuple
+
+READ_CHUNK = 1024 * 1024
+SIDECAR_SUFFIX = ".sha256.json"
+
+
+def normalize_checksum(value: Optional[str]) -> str:
+    """Return a lowercase hex digest, or ``""`` when the manifest has none."""
+
+    text = (value or "").strip().lower()
+    return "" if text in {"", "null", "none"} else text
+
+
+def sidecar_path(path: Path) -> Path:
+    return path.with_name(path.name + SIDECAR_SUFFIX)
+
+
+def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def read_verified_digest(path: Path) -> Optional[str]:
+    """Return the recorded digest if the sidecar still describes ``path``."""
+
+    stamp = _stamp(path)
+    if stamp is None:
+        return None
+    try:
+        record = json.loads(sidecar_path(path).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(record, dict):
+        return None
+    if (record.get("size"), record.get("mtime_ns")) != stamp:
+        return None
+    digest = record.get("sha256")
+    return digest if isinstance(digest, str) and digest else None
+
+
+def record_verified_digest(path: Path, digest: str) -> None:
+    """Persist ``digest`` for ``path`` together with its current size and mtime."""
+
+    stamp = _stamp(path)
+    if stamp is None:
+        return
+    record = {"size": stamp[0], "mtime_ns": stamp[1], "sha256": digest.lower()}
+    target = sidecar_path(path)
+    temp = target.with_name(target.name + ".tmp")
+    try:
+        temp.write_text(json.dumps(record), encoding="utf-8")
+        os.replace(temp, target)
+    except OSError:
+        temp.unlink(missing_ok=True)
+
+
+def discard_verified_digest(path: Path) -> None:
+    sidecar_path(path).unlink(missing_ok=True)
+
+
+def hash_stream(handle: BinaryIO, hasher: Optional["hashlib._Hash"] = None, limit: Optional[int] = None):
+    """Feed ``handle`` (up to ``limit`` bytes) into ``hasher`` and return it."""
+
+    hasher = hasher or hashlib.sha256()
+    remaining = limit
+    while remaining is None or remaining > 0:
+        chunk = handle.read(READ_CHUNK if remaining is None else min(READ_CHUNK, remaining))
+        if not chunk:
+            break
+        hasher.update(chunk)
+        if remaining is not None:
+            remaining -= len(chunk)
+    return hasher
+
+
+def file_sha256(path: Path, use_sidecar: bool = True) -> str:
+    """Return the SHA-256 of ``path``, trusting a matching sidecar when allowed."""
+
+    if use_sidecar:
+        cached = read_verified_digest(path)
+        if cached:
+            return cached
+    with path.open("rb") as handle:
+        digest = hash_stream(handle).hexdigest()
+    if use_sidecar:
+        record_verified_digest(path, digest)
+    return digest
+
+
+def verify_file(path: Path, expected: Optional[str]) -> Tuple[bool, str]:
+    """Check ``path`` against ``expected``; returns ``(matches, actual_digest)``."""
+
+    actual = file_sha256(path)
+    matches = actual == normalize_checksum(expected)
+    if not matches:
+        discard_verified_digest(path)
+    return matches, actual
+
+
+class HashingWriter:
+    """Append to a ``.part`` file while hashing every byte written.
+
+    Resuming a partial file seeds the hash from the bytes already on disk; an
+    in-process checkpoint (``offset`` plus a copied hash object) avoids even
+    that read when the same writer's state is handed to a retry.
+    """
+
+    def __init__(self, path: Path, resume: bool = True, checkpoint: Optional[Tuple[int, object]] = None) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        present = path.stat().st_size if resume and path.exists() else 0
+        if checkpoint and checkpoint[0] == present:
+            self._hasher = checkpoint[1].copy()  # type: ignore[attr-defined]
+        elif present:
+            with path.open("rb") as handle:
+                self._hasher = hash_stream(handle, limit=present)
+        else:
+            self._hasher = hashlib.sha256()
+        self.offset = present
+        self._handle = path.open("ab" if present else "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._handle.write(chunk)
+        self._hasher.update(chunk)
+        self.offset += len(chunk)
+
+    def flush(self) -> None:
+        """Push buffered bytes to the OS so other readers of ``path`` see them."""
+
+        self._handle.flush()
+
+    def checkpoint(self) -> Tuple[int, object]:
+        return self.offset, self._hasher.copy()
+
+    def hexdigest(self) -> str:
+        return self._hasher.hexdigest()
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __enter__(self) -> "HashingWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class PrefixHasher:
+    """Hash a file written out of order (segmented downloads) as its contiguous prefix grows.
+
+    ``advance(frontier)`` hashes bytes ``[offset, frontier)`` right after they
+    land, while they are still in the page cache, so completing the download
+    needs no second pass over the file. Thread-safe; ``reset`` starts over when
+    the file is discarded.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.offset = 0
+        self._hasher = hashlib.sha256()
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.offset = 0
+            self._hasher = hashlib.sha256()
+
+    def advance(self, frontier: int) -> None:
+        with self._lock:
+            if frontier <= self.offset:
+                return
+            with self.path.open("rb") as handle:
+                handle.seek(self.offset)
+                hash_stream(handle, self._hasher, limit=frontier - self.offset)
+            self.offset = frontier
+
+    def hexdigest(self) -> str:
+        with self._lock:
+            return self._hasher.hexdigest()
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="SHA-256 helpers with verified-hash sidecars")
+    sub = parser.add_subparsers(dest="command", required=True)
+    digest_cmd = sub.add_parser("digest", help="Print the file digest, reusing a matching sidecar")
+    digest_cmd.add_argument("path", type=Path)
+    verify_cmd = sub.add_parser("verify", help="Exit 0 when the file matches the expected digest")
+    verify_cmd.add_argument("path", type=Path)
+    verify_cmd.add_argument("expected")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "digest":
+            print(file_sha256(args.path))
+            return 0
+        matches, actual = verify_file(args.path, args.expected)
+    except OSError as exc:
+        print(f"Unable to hash {args.path}: {exc}", file=sys.stderr)
+        return 2
+    result: Dict[str, object] = {"path": str(args.path), "sha256": actual, "ok": matches}
+    print(json.dumps(result))
+    return 0 if matches else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
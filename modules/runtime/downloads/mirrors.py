@@ -0,0 +1,224 @@
+"""Concurrent mirror probing and speed-ranked mirror ordering.
+
+- Purpose: probe every candidate URL for a download at once (TTFB plus
+  throughput on a small ``Range`` request), keep an exponentially decayed health
+  score per host, and try the fastest expected mirror first instead of always
+  starting with the manifest's primary URL.
+- Assumptions: a host's recent performance predicts its next transfer; older
+  samples lose half their weight every ``HALF_LIFE`` seconds.
+- Side effects: reads and rewrites ``~/.cache/aihub/mirror_health.json``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+from urllib.parse import urlparse
+
+PROBE_BYTES = 256 * 1024
+PROBE_TIMEOUT = 8.0
+HALF_LIFE = 24 * 3600.0
+# Transfer size used to turn (TTFB, throughput) into an expected duration.
+REFERENCE_BYTES = 64 * 1024 * 1024
+USER_AGENT = "AIHub-Downloader/1.0"
+
+
+def default_health_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / "aihub" / "mirror_health.json"
+
+
+@dataclass
+class ProbeResult:
+    url: str
+    ok: bool
+    ttfb_ms: float = 0.0
+    throughput_bps: float = 0.0
+    status: int = 0
+    error: str = ""
+
+
+@dataclass
+class HostHealth:
+    """Decayed running averages for one host."""
+
+    weight: float = 0.0
+    ttfb_ms: float = 0.0
+    throughput_bps: float = 0.0
+    failure_rate: float = 0.0
+    updated: float = 0.0
+
+    def observe(self, result: ProbeResult, now: float, half_life: float = HALF_LIFE) -> None:
+        decay = 0.5 ** (max(now - self.updated, 0.0) / half_life) if self.updated else 0.0
+        prior = self.weight * decay
+        total = prior + 1.0
+        failed = 0.0 if result.ok else 1.0
+        self.failure_rate = (self.failure_rate * prior + failed) / total
+        if result.ok:
+            # Failed probes carry no timing signal; only successes move the speed averages.
+            if self.throughput_bps:
+                self.ttfb_ms = (self.ttfb_ms * prior + result.ttfb_ms) / total
+                self.throughput_bps = (self.throughput_bps * prior + result.throughput_bps) / total
+            else:
+                self.ttfb_ms, self.throughput_bps = result.ttfb_ms, result.throughput_bps
+        self.weight = total
+        self.updated = now
+
+    def expected_seconds(self, size: int = REFERENCE_BYTES) -> float:
+        if not self.throughput_bps:
+            return float("inf")
+        seconds = self.ttfb_ms / 1000.0 + size / self.throughput_bps
+        # Hosts that often fail are penalised as if a retry were likely.
+        return seconds / max(1.0 - self.failure_rate, 0.05)
+
+
+def probe_url(url: str, nbytes: int = PROBE_BYTES, timeout: float = PROBE_TIMEOUT, headers: Optional[Dict[str, str]] = None) -> ProbeResult:
+    """Fetch the first ``nbytes`` of ``url`` and time the response."""
+
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, "Range": f"bytes=0-{nbytes - 1}", **(headers or {})})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            first_byte = time.perf_counter()
+            status = int(getattr(response, "status", 200))
+            received = 0
+            while received < nbytes:
+                chunk = response.read(min(64 * 1024, nbytes - received))
+                if not chunk:
+                    break
+                received += len(chunk)
+            finished = time.perf_counter()
+    except urllib.error.HTTPError as exc:
+        return ProbeResult(url, False, status=exc.code, error=str(exc))
+    except (OSError, urllib.error.URLError) as exc:
+        return ProbeResult(url, False, error=str(exc))
+    transfer = max(finished - first_byte, 1e-6)
+    return ProbeResult(url, True, ttfb_ms=(first_byte - started) * 1000.0, throughput_bps=received / transfer, status=status)
+
+
+class MirrorSelector:
+    """Probe candidate URLs concurrently and order them by expected download time."""
+
+    def __init__(
+        self,
+        health_path: Optional[Path] = None,
+        *,
+        probe: Callable[[str], ProbeResult] = probe_url,
+        max_workers: int = 8,
+        half_life: float = HALF_LIFE,
+    ) -> None:
+        self.health_path = health_path or default_health_path()
+        self.probe = probe
+        self.max_workers = max_workers
+        self.half_life = half_life
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc.lower()}"
+
+    def load(self) -> Dict[str, HostHealth]:
+        try:
+            payload = json.loads(self.health_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+        hosts = payload.get("hosts", {}) if isinstance(payload, dict) else {}
+        health: Dict[str, HostHealth] = {}
+        for host, values in hosts.items():
+            try:
+                health[host] = HostHealth(**values)
+            except TypeError:
+                continue
+        return health
+
+    def _save(self, health: Dict[str, HostHealth]) -> None:
+        self.health_path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.health_path.with_name(f"{self.health_path.name}.{os.getpid()}.tmp")
+        temp.write_text(json.dumps({"hosts": {host: asdict(value) for host, value in health.items()}}, indent=2), encoding="utf-8")
+        os.replace(temp, self.health_path)
+
+    def record(self, results: Sequence[ProbeResult]) -> Dict[str, HostHealth]:
+        now = time.time()
+        with self._lock:
+            health = self.load()
+            for result in results:
+                health.setdefault(self.host_key(result.url), HostHealth()).observe(result, now, self.half_life)
+            try:
+                self._save(health)
+            except OSError:
+                pass
+        return health
+
+    def rank(self, urls: Sequence[str], probe: bool = True) -> List[Dict[str, object]]:
+        """Return one entry per unique URL, fastest expected first and failures last.
+
+        Each entry has ``url``, ``ok`` (probe outcome, or ``None`` when not probed),
+        ``ttfb_ms``, ``throughput_bps`` and ``expected_seconds``.
+        """
+
+        unique = list(dict.fromkeys(url for url in urls if url))
+        if probe and unique:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique))) as pool:
+                results = list(pool.map(self.probe, unique))
+            health = self.record(results)
+            outcomes = {result.url: result for result in results}
+        else:
+            health = self.load()
+            outcomes = {}
+
+        ranked = []
+        for position, url in enumerate(unique):
+            stats = health.get(self.host_key(url), HostHealth())
+            outcome = outcomes.get(url)
+            ranked.append(
+                {
+                    "url": url,
+                    "ok": outcome.ok if outcome else None,
+                    "ttfb_ms": round(outcome.ttfb_ms if outcome else stats.ttfb_ms, 2),
+                    "throughput_bps": round(outcome.throughput_bps if outcome else stats.throughput_bps, 1),
+                    "expected_seconds": stats.expected_seconds(),
+                    "error": outcome.error if outcome else "",
+                    "_position": position,
+                }
+            )
+        # Failed probes sink; unknown hosts keep manifest order after measured ones.
+        ranked.sort(key=lambda entry: (entry["ok"] is False, entry["expected_seconds"], entry["_position"]))
+        for entry in ranked:
+            entry.pop("_position")
+            if entry["expected_seconds"] == float("inf"):
+                entry["expected_seconds"] = None
+        return ranked
+
+    def order(self, urls: Sequence[str], probe: bool = True) -> List[str]:
+        return [str(entry["url"]) for entry in self.rank(urls, probe)]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Probe download mirrors and print them fastest first")
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--health-file", type=Path, default=None)
+    parser.add_argument("--no-probe", action="store_true", help="Rank from persisted scores only")
+    parser.add_argument("--format", choices=("tsv", "json"), default="tsv", help="tsv prints '<ok|fail|unknown>\\t<url>' lines")
+    args = parser.parse_args(argv)
+
+    ranked = MirrorSelector(args.health_file).rank(args.urls, probe=not args.no_probe)
+    if args.format == "json":
+        print(json.dumps(ranked, indent=2))
+    else:
+        for entry in ranked:
+            state = "unknown" if entry["ok"] is None else ("ok" if entry["ok"] else "fail")
+            print(f"{state}\t{entry['url']}")
+    return 0 if any(entry["ok"] is not False for entry in ranked) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,543 @@
+"""Parallel download scheduler for curated manifest entries.
+
+- Purpose: fetch many manifest items concurrently (bounded worker pool, per-host
+  connection limits, shared bandwidth cap) instead of the one-at-a-time loop in
+  ``download_with_retries``.
+- Assumptions: entries follow the ``manifests/*.json`` item schema (``url``,
+  ``filename``, ``checksum``, optional ``mirrors``); transfers are plain HTTP(S)
+  GETs that may honour ``Range`` for resume.
+- Side effects: writes ``<dest>.part`` files that are renamed into place after
+  verification, and appends ``emit_status_event``-compatible JSONL events.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, urlparse
+
+from modules.runtime.downloads.blobstore import BlobStore, store_from_env
+from modules.runtime.downloads.hashing import (
+    HashingWriter,
+    PrefixHasher,
+    discard_verified_digest,
+    normalize_checksum,
+    record_verified_digest,
+    verify_file,
+)
+from modules.runtime.downloads.mirrors import MirrorSelector
+from modules.runtime.downloads.segmented import RangeNotSupported, SegmentedDownloader, segment_map_path
+from modules.runtime.downloads.status import StatusReporter
+
+CHUNK_SIZE = 256 * 1024
+USER_AGENT = "AIHub-Downloader/1.0"
+
+
+@dataclass
+class DownloadItem:
+    """One file to fetch, usually built from a manifest entry."""
+
+    name: str
+    url: str
+    dest: Path
+    checksum: str = ""
+    mirrors: List[str] = field(default_factory=list)
+    size_bytes: Optional[int] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_manifest_entry(cls, entry: Dict[str, object], dest_dir: Path, headers: Optional[Dict[str, str]] = None) -> "DownloadItem":
+        mirrors = entry.get("mirrors") or []
+        size = entry.get("size_bytes")
+        return cls(
+            name=str(entry.get("name") or entry.get("filename") or ""),
+            url=str(entry.get("url") or ""),
+            dest=dest_dir / str(entry.get("filename") or ""),
+            checksum=str(entry.get("checksum") or ""),
+            mirrors=[str(mirror) for mirror in mirrors if mirror] if isinstance(mirrors, list) else [],
+            size_bytes=int(size) if isinstance(size, (int, float)) and size else None,
+            headers=dict(headers or {}),
+        )
+
+    @property
+    def urls(self) -> List[str]:
+        return [self.url] + [mirror for mirror in self.mirrors if mirror != self.url]
+
+
+@dataclass
+class DownloadResult:
+    name: str
+    dest: Path
+    status: str
+    url: Optional[str] = None
+    bytes_downloaded: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in {"downloaded", "already_present", "offline_used", "blob_reused"}
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "name": self.name,
+            "dest": str(self.dest),
+            "status": self.status,
+            "url": self.url,
+            "bytes_downloaded": self.bytes_downloaded,
+            "error": self.error,
+        }
+
+
+class BandwidthLimiter:
+    """Shared byte-rate cap; each consumer reserves a time slot for its chunk."""
+
+    def __init__(self, bytes_per_second: float = 0) -> None:
+        self.bytes_per_second = bytes_per_second
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, nbytes: int) -> None:
+        if self.bytes_per_second <= 0 or nbytes <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot)
+            self._next_slot = start + nbytes / self.bytes_per_second
+            delay = self._next_slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class HostLimiter:
+    """Cap simultaneous connections per host across all workers."""
+
+    def __init__(self, per_host: int) -> None:
+        self.per_host = max(1, per_host)
+        self._semaphores: Dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    def slot(self, url: str) -> threading.Semaphore:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return self._semaphores[host]
+
+
+def cache_fetch_url(cache_url: str, upstream: str, checksum: str = "", filename: str = "") -> str:
+    """Build the mirror URL a client uses to fetch ``upstream`` through a LAN download cache (see ``cache_proxy``)."""
+
+    query = f"url={quote(upstream, safe='')}"
+    if normalize_checksum(checksum):
+        query += f"&sha256={normalize_checksum(checksum)}"
+    if filename:
+        query += f"&name={quote(filename, safe='')}"
+    return f"{cache_url.rstrip('/')}/fetch?{query}"
+
+
+class DownloadScheduler:
+    """Run manifest downloads on a bounded pool with per-host and bandwidth limits."""
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 4,
+        per_host: int = 2,
+        bandwidth_limit: float = 0,
+        retries: int = 3,
+        backoff: float = 5.0,
+        timeout: float = 30.0,
+        reporter: Optional[StatusReporter] = None,
+        offline_bundle: Optional[Path] = None,
+        blob_store: Optional[BlobStore] = None,
+        cache_url: str = "",
+        mirror_selector: Optional[MirrorSelector] = None,
+        segments: int = 1,
+    ) -> None:
+        self.max_workers = max(1, max_workers)
+        self.retries = max(1, retries)
+        self.backoff = backoff
+        self.timeout = timeout
+        self.reporter = reporter or StatusReporter()
+        self.offline_bundle = offline_bundle
+        self.blob_store = blob_store
+        self.cache_url = cache_url
+        self.mirror_selector = mirror_selector
+        self.hosts = HostLimiter(per_host)
+        self.bandwidth = BandwidthLimiter(bandwidth_limit)
+        # ``segments > 1`` fetches each file over that many Range connections. Every
+        # connection takes its own per-host slot, so ``per_host`` stays a hard cap.
+        self.segmented = (
+            SegmentedDownloader(
+                segments,
+                timeout=timeout,
+                reporter=self.reporter,
+                throttle=self.bandwidth.consume,
+                connection_slot=self.hosts.slot,
+            )
+            if segments > 1
+            else None
+        )
+        # Hash state of partially written files, keyed by ``.part`` path, so a
+        # retry in this process resumes hashing without re-reading the prefix.
+        self._checkpoints: Dict[Path, Tuple[int, object]] = {}
+        self._prefix_hashers: Dict[Path, PrefixHasher] = {}
+
+    def run(self, items: Iterable[DownloadItem]) -> List[DownloadResult]:
+        """Download every item and return results in input order."""
+
+        queued = list(items)
+        self.reporter.emit(
+            "info",
+            "scheduler_started",
+            f"Scheduling {len(queued)} downloads",
+            {"items": len(queued), "workers": self.max_workers, "per_host": self.hosts.per_host},
+        )
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="aihub-download") as pool:
+            results = list(pool.map(self._download_item, queued))
+        succeeded = sum(1 for result in results if result.ok)
+        self.reporter.emit(
+            "info" if succeeded == len(results) else "warning",
+            "scheduler_completed",
+            f"Completed {succeeded}/{len(results)} downloads",
+            {"succeeded": succeeded, "failed": len(results) - succeeded},
+        )
+        return results
+
+    def _download_item(self, item: DownloadItem) -> DownloadResult:
+        try:
+            return self._fetch(item)
+        except Exception as exc:  # pragma: no cover - defensive worker guard
+            self.reporter.emit("error", "download_failed", f"Unable to download {item.dest.name}", str(exc))
+            return DownloadResult(item.name, item.dest, "failed", error=str(exc))
+
+    def _verify(self, path: Path, checksum: str, remove_on_fail: bool = True, actual: Optional[str] = None) -> bool:
+        """Compare ``path`` with ``checksum``; ``actual`` skips hashing when already streamed."""
+
+        if not normalize_checksum(checksum):
+            self.reporter.log(f"Checksum not provided for {path.name}; skipping verification")
+            self.reporter.emit("info", "checksum_skipped", f"Checksum not provided for {path.name}")
+            return True
+        if actual is None:
+            matches, actual = verify_file(path, checksum)
+        else:
+            matches = actual == normalize_checksum(checksum)
+        if not matches:
+            self.reporter.emit("error", "checksum_failed", f"Checksum mismatch for {path.name}", actual)
+            self.reporter.log(f"Checksum mismatch for {path} (expected: {checksum}, got: {actual})")
+            if remove_on_fail:
+                path.unlink(missing_ok=True)
+                discard_verified_digest(path)
+            return False
+        self.reporter.log(f"Checksum verified for {path.name}")
+        self.reporter.emit("info", "checksum_ok", f"Verified checksum for {path.name}")
+        return True
+
+    def _try_blob_store(self, item: DownloadItem) -> bool:
+        """Link an already-stored copy of the checksum instead of downloading it again."""
+
+        if not self.blob_store or not self.blob_store.has(item.checksum):
+            return False
+        try:
+            method = self.blob_store.materialize(item.checksum, item.dest)
+        except OSError as exc:
+            self.reporter.log(f"Unable to reuse stored blob for {item.dest.name}: {exc}")
+            return False
+        blob = self.blob_store.path_for(item.checksum)
+        self.reporter.log(f"Linked {item.dest} to stored blob {blob} via {method}")
+        self.reporter.emit(
+            "info", "blob_reused", f"Reused stored copy of {item.dest.name}", {"path": str(item.dest), "blob": str(blob), "method": method}
+        )
+        return True
+
+    def _store_blob(self, path: Path, digest: str) -> None:
+        if not self.blob_store:
+            return
+        try:
+            self.blob_store.ingest(path, digest)
+        except (OSError, ValueError) as exc:
+            self.reporter.log(f"Unable to add {path.name} to the blob store: {exc}")
+
+    def _try_offline_bundle(self, item: DownloadItem) -> bool:
+        if not self.offline_bundle:
+            return False
+        candidate = self.offline_bundle / item.dest.name if self.offline_bundle.is_dir() else self.offline_bundle
+        if not candidate.is_file():
+            return False
+        self.reporter.emit("info", "offline_candidate", f"Validating offline bundle for {item.dest.name}", {"source": str(candidate)})
+        if not self._verify(candidate, item.checksum, remove_on_fail=False):
+            self.reporter.emit("warning", "offline_invalid", "Offline bundle checksum mismatch", str(candidate))
+            return False
+        item.dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(candidate, item.dest)
+        if normalize_checksum(item.checksum):
+            record_verified_digest(item.dest, normalize_checksum(item.checksum))
+        self.reporter.emit(
+            "info", "offline_used", f"Used offline bundle for {item.dest.name}", {"source": str(candidate), "dest": str(item.dest)}
+        )
+        return True
+
+    def _fetch(self, item: DownloadItem) -> DownloadResult:
+        dest = item.dest
+        if not item.url or not dest.name:
+            self.reporter.log(f"Skipping {item.name} due to missing URL or filename")
+            return DownloadResult(item.name, dest, "skipped", error="missing url or filename")
+
+        if dest.is_file() and self._verify(dest, item.checksum):
+            self.reporter.emit("info", "already_present", "Existing file verified; skipping download", {"path": str(dest)})
+            if normalize_checksum(item.checksum):
+                self._store_blob(dest, item.checksum)
+            return DownloadResult(item.name, dest, "already_present")
+
+        if normalize_checksum(item.checksum) and self._try_blob_store(item):
+            return DownloadResult(item.name, dest, "blob_reused")
+
+        if self._try_offline_bundle(item):
+            return DownloadResult(item.name, dest, "offline_used")
+
+        urls = item.urls
+        if self.mirror_selector is not None and len(urls) > 1:
+            urls = self._rank_mirrors(dest, urls)
+        if self.cache_url:
+            urls = [cache_fetch_url(self.cache_url, item.url, item.checksum, dest.name)] + urls
+        failures: List[str] = []
+        for idx, url in enumerate(urls):
+            label = f"mirror {idx + 1}/{len(urls)}"
+            detail = {"url": url, "label": label, "index": idx + 1, "total": len(urls)}
+            self.reporter.emit("info", "mirror_selected", f"Using mirror {label}", detail)
+            self.reporter.emit("info", "download_start", f"Starting download for {dest.name}", url)
+
+            backoff = self.backoff
+            for attempt in range(1, self.retries + 1):
+                if attempt > 1:
+                    self.reporter.emit("warning", "retry", f"Retry {attempt} for {dest.name}", "python")
+                    time.sleep(backoff)
+                    backoff *= 2
+                self.reporter.emit("info", "download_attempt", "Attempting download via python", url)
+                try:
+                    transferred, digest = self._transfer(item, url)
+                except (OSError, urllib.error.URLError) as exc:
+                    failures.append(f"Downloader error via python at {url} (attempt {attempt}): {exc}")
+                    self.reporter.emit("warning", "downloader_error", "Downloader error via python", url)
+                    continue
+
+                part_path = self._part_path(dest)
+                self._checkpoints.pop(part_path, None)
+                self._prefix_hashers.pop(part_path, None)
+                if self._verify(part_path, item.checksum, actual=digest):
+                    os.replace(part_path, dest)
+                    record_verified_digest(dest, digest)
+                    self._store_blob(dest, digest)
+                    self.reporter.log(f"Download succeeded with python from {url} ({label})")
+                    self.reporter.emit("info", "download_complete", f"Completed download for {dest.name}", "python")
+                    return DownloadResult(item.name, dest, "downloaded", url=url, bytes_downloaded=transferred)
+                failures.append(f"Checksum failed via python at {url}")
+
+            if idx + 1 < len(urls):
+                self.reporter.emit("warning", "mirror_fallback", f"Switching to next mirror for {dest.name}", url)
+
+        self.reporter.emit("error", "download_failed", f"Unable to download {dest.name}", " ".join(failures))
+        self.reporter.log(f"Download failed after attempting mirrors: {dest} (failures: {' '.join(failures)})")
+        return DownloadResult(item.name, dest, "failed", error="; ".join(failures))
+
+    def _rank_mirrors(self, dest: Path, urls: List[str]) -> List[str]:
+        assert self.mirror_selector is not None
+        ranked = self.mirror_selector.rank(urls)
+        for entry in ranked:
+            if entry["ok"] is False:
+                self.reporter.emit("warning", "mirror_unhealthy", f"Mirror probe failed for {dest.name}", {"url": entry["url"], "error": entry["error"]})
+        return [str(entry["url"]) for entry in ranked]
+
+    @staticmethod
+    def _part_path(dest: Path) -> Path:
+        return dest.with_name(dest.name + ".part")
+
+    def _transfer(self, item: DownloadItem, url: str) -> Tuple[int, str]:
+        """Stream ``url`` into ``<dest>.part`` and return ``(bytes_transferred, sha256)``.
+
+        Resumes with ``Range`` when a partial file exists; bytes are hashed as they
+        are written so the finished file is never read back for verification.
+        """
+
+        if self.segmented is not None and (item.size_bytes is None or item.size_bytes >= self.segmented.min_segment):
+            segmented = self._transfer_segmented(item, url)
+            if segmented is not None:
+                return segmented
+
+        part_path = self._part_path(item.dest)
+        part_path.parent.mkdir(parents=True, exist_ok=True)
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        headers = {"User-Agent": USER_AGENT, **item.headers}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            self.reporter.emit("info", "resume", f"Resuming existing file {item.dest.name}", {"bytes_present": offset})
+
+        transferred = 0
+        with self.hosts.slot(url):
+            request = urllib.request.Request(url, headers=headers)
+            try:
+                response = urllib.request.urlopen(request, timeout=self.timeout)
+            except urllib.error.HTTPError as exc:
+                if exc.code == 416 and offset:
+                    # The partial file is stale or already complete; start over next attempt.
+                    part_path.unlink(missing_ok=True)
+                    self._checkpoints.pop(part_path, None)
+                raise
+            with response:
+                resume = bool(offset) and getattr(response, "status", 200) == 206
+                writer = HashingWriter(part_path, resume=resume, checkpoint=self._checkpoints.get(part_path))
+                try:
+                    while True:
+                        chunk = response.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        self.bandwidth.consume(len(chunk))
+                        writer.write(chunk)
+                        transferred += len(chunk)
+                finally:
+                    writer.close()
+                    self._checkpoints[part_path] = writer.checkpoint()
+        return transferred, writer.hexdigest()
+
+    def _transfer_segmented(self, item: DownloadItem, url: str) -> Optional[Tuple[int, str]]:
+        """Fetch ``url`` over several Range connections; ``None`` when the server cannot serve ranges.
+
+        Segments land out of order, so the digest is built from the contiguous
+        prefix as segments complete rather than by re-reading the finished file.
+        """
+
+        assert self.segmented is not None
+        part_path = self._part_path(item.dest)
+        hasher = self._prefix_hashers.setdefault(part_path, PrefixHasher(part_path))
+        try:
+            transferred = self.segmented.download(url, part_path, item.headers, hasher=hasher)
+        except RangeNotSupported as exc:
+            self._prefix_hashers.pop(part_path, None)
+            self.reporter.emit("info", "segmented_fallback", f"Using a single connection for {item.dest.name}", str(exc))
+            if segment_map_path(part_path).exists():
+                # A preallocated part is not a contiguous prefix the streaming path could resume.
+                segment_map_path(part_path).unlink()
+                part_path.unlink(missing_ok=True)
+            return None
+        self._checkpoints.pop(part_path, None)
+        return transferred, hasher.hexdigest()
+
+
+_RATE = re.compile(r"(\d+(?:\.\d*)?|\.\d+)\s*([KMG]?)I?B?(?:/S|PS)?")
+
+
+def parse_rate(value: str) -> float:
+    """Parse ``0``, ``500K``, ``10M``, ``10MB/s`` or ``1G`` (bytes per second).
+
+    Raises ``ValueError`` for anything else.
+    """
+
+    text = str(value or "0").strip().upper()
+    match = _RATE.fullmatch(text)
+    if not match:
+        raise ValueError(f"Invalid rate {value!r}; expected a number with an optional K/M/G suffix, e.g. 500K or 10MB/s")
+    multipliers = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+    return float(match.group(1)) * multipliers[match.group(2)]
+
+
+def load_manifest_items(manifest_path: Path, names: Iterable[str], dest_dir: Path, headers: Optional[Dict[str, str]] = None) -> List[DownloadItem]:
+    payload = json.loads(manifest_path.read_text(encoding="utf-8"))
+    entries = {str(entry.get("name")): entry for entry in payload.get("items", []) if isinstance(entry, dict)}
+    items: List[DownloadItem] = []
+    for name in names:
+        name = name.strip()
+        if not name:
+            continue
+        entry = entries.get(name)
+        if entry is None:
+            continue
+        items.append(DownloadItem.from_manifest_entry(entry, dest_dir, headers))
+    return items
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Download curated manifest entries in parallel")
+    parser.add_argument("--manifest", required=True, type=Path, help="Path to models.json or loras.json")
+    parser.add_argument("--dest-dir", required=True, type=Path, help="Directory that receives downloaded files")
+    parser.add_argument("--names", default="", help="Newline or comma separated manifest names (default: all entries)")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("DOWNLOAD_WORKERS", "4")))
+    parser.add_argument("--per-host", type=int, default=int(os.environ.get("DOWNLOAD_PER_HOST", "2")))
+    parser.add_argument(
+        "--bandwidth-limit",
+        default=os.environ.get("DOWNLOAD_BANDWIDTH_LIMIT", "0"),
+        help="Global cap in bytes/second; accepts K/M/G suffixes (0 disables)",
+    )
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument(
+        "--segments",
+        type=int,
+        default=int(os.environ.get("DOWNLOAD_SCHEDULER_SEGMENTS", "1")),
+        help="Range connections per file, each taking a per-host slot (default 1: one stream per file)",
+    )
+    parser.add_argument("--header", action="append", default=[], help="Extra request header 'Name: value'")
+    parser.add_argument("--status-file", default=os.environ.get("DOWNLOAD_STATUS_FILE", ""))
+    parser.add_argument("--log-file", default=os.environ.get("DOWNLOAD_LOG_FILE", ""))
+    parser.add_argument("--offline-bundle", default=os.environ.get("DOWNLOAD_OFFLINE_BUNDLE", ""))
+    parser.add_argument("--no-blob-store", action="store_true", help="Do not reuse or record content-addressed blobs")
+    parser.add_argument(
+        "--no-mirror-probe",
+        action="store_true",
+        default=os.environ.get("DOWNLOAD_MIRROR_PROBE", "1") == "0",
+        help="Try mirrors in manifest order instead of ranking them by probed speed",
+    )
+    parser.add_argument(
+        "--cache-url", default=os.environ.get("DOWNLOAD_CACHE_URL", ""), help="LAN download cache tried before upstream URLs"
+    )
+    args = parser.parse_args(argv)
+    try:
+        bandwidth_limit = parse_rate(args.bandwidth_limit)
+    except ValueError as exc:
+        parser.error(f"--bandwidth-limit/DOWNLOAD_BANDWIDTH_LIMIT: {exc}")
+
+    headers: Dict[str, str] = {}
+    for header in args.header:
+        if ":" in header:
+            key, value = header.split(":", 1)
+            headers[key.strip()] = value.strip()
+
+    if args.names.strip():
+        names = args.names.replace(",", "\n").splitlines()
+    else:
+        payload = json.loads(args.manifest.read_text(encoding="utf-8"))
+        names = [str(entry.get("name")) for entry in payload.get("items", []) if isinstance(entry, dict)]
+
+    reporter = StatusReporter(Path(args.status_file) if args.status_file else None, Path(args.log_file) if args.log_file else None)
+    items = load_manifest_items(args.manifest, names, args.dest_dir, headers)
+    missing = sorted({name.strip() for name in names if name.strip()} - {item.name for item in items})
+    for name in missing:
+        reporter.log(f"No curated entry named {name} found in {args.manifest.name}")
+
+    scheduler = DownloadScheduler(
+        max_workers=args.workers,
+        per_host=args.per_host,
+        bandwidth_limit=bandwidth_limit,
+        retries=args.retries,
+        reporter=reporter,
+        offline_bundle=Path(args.offline_bundle) if args.offline_bundle else None,
+        blob_store=None if args.no_blob_store else store_from_env(),
+        cache_url=args.cache_url,
+        mirror_selector=None if args.no_mirror_probe else MirrorSelector(),
+        segments=args.segments,
+    )
+    results = scheduler.run(items)
+    print(json.dumps({"results": [result.to_dict() for result in results], "missing": missing}, indent=2))
+    return 0 if any(result.ok for result in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,350 @@
+"""Multi-connection HTTP Range downloader for hosts without aria2c.
+
+- Purpose: split a large file into byte ranges fetched over several
+  connections at once, writing each range in place into a preallocated sparse
+  ``.part`` file, so a single slow TCP stream no longer caps install speed.
+- Assumptions: the server answers ``Range`` requests with ``206`` and a
+  ``Content-Range`` total; servers that do not raise ``RangeNotSupported`` so
+  callers can fall back to a single stream. The ETag (or Last-Modified) seen
+  when planning must still match on resume, otherwise the part is restarted.
+- Side effects: writes ``<part>`` plus a ``<part>.segments.json`` map that
+  records per-segment progress and is removed once every segment is complete.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import re
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, ContextManager, Dict, List, Optional, Tuple
+
+from modules.runtime.downloads.hashing import PrefixHasher
+from modules.runtime.downloads.status import StatusReporter
+
+CHUNK_SIZE = 256 * 1024
+MIN_SEGMENT = 16 * 1024 * 1024
+MAP_SUFFIX = ".segments.json"
+# Persist the segment map (and emit progress) at most every this many bytes per segment.
+SAVE_EVERY = 8 * 1024 * 1024
+USER_AGENT = "AIHub-Downloader/1.0"
+_CONTENT_RANGE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+
+
+class RangeNotSupported(Exception):
+    """Raised when the server ignores ``Range`` or does not report a total size."""
+
+
+def segment_map_path(part_path: Path) -> Path:
+    return part_path.with_name(part_path.name + MAP_SUFFIX)
+
+
+@dataclass
+class Segment:
+    start: int
+    end: int  # inclusive
+    written: int = 0
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1
+
+    @property
+    def done(self) -> bool:
+        return self.written >= self.length
+
+
+class SegmentMap:
+    """Byte ranges of one download and how much of each has reached disk."""
+
+    def __init__(self, path: Path, url: str, size: int, validator: str, segments: List[Segment]) -> None:
+        self.path = path
+        self.url = url
+        self.size = size
+        self.validator = validator
+        self.segments = segments
+        self._lock = threading.Lock()
+
+    @classmethod
+    def plan(cls, path: Path, url: str, size: int, validator: str, connections: int, min_segment: int = MIN_SEGMENT) -> "SegmentMap":
+        count = max(1, min(connections, -(-size // max(min_segment, 1))))
+        step = max(1, -(-size // count))
+        segments = [Segment(start, min(start + step, size) - 1) for start in range(0, size, step)]
+        return cls(path, url, size, validator, segments)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["SegmentMap"]:
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            segments = [Segment(int(seg["start"]), int(seg["end"]), int(seg.get("written", 0))) for seg in payload["segments"]]
+            return cls(path, str(payload["url"]), int(payload["size"]), str(payload.get("validator", "")), segments)
+        except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+            return None
+
+    def credit_prefix(self, prefix: int) -> None:
+        """Mark bytes ``[0, prefix)`` as written (a partial single-stream download)."""
+
+        for seg in self.segments:
+            seg.written = min(max(prefix - seg.start, 0), seg.length)
+
+    @property
+    def written(self) -> int:
+        return sum(seg.written for seg in self.segments)
+
+    @property
+    def contiguous(self) -> int:
+        """Length of the prefix ``[0, n)`` that is fully on disk."""
+
+        for seg in self.segments:
+            if not seg.done:
+                return seg.start + seg.written
+        return self.size
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {"url": self.url, "size": self.size, "validator": self.validator, "segments": [asdict(seg) for seg in self.segments]}
+            temp = self.path.with_name(self.path.name + ".tmp")
+            temp.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(temp, self.path)
+
+
+def probe_ranges(url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 30.0) -> Tuple[int, str]:
+    """Return ``(total_size, validator)`` for ``url`` or raise ``RangeNotSupported``."""
+
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, **(headers or {}), "Range": "bytes=0-0"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        status = int(getattr(response, "status", 200))
+        content_range = response.headers.get("Content-Range", "")
+        validator = response.headers.get("ETag") or response.headers.get("Last-Modified") or ""
+        response.read(1)
+    match = _CONTENT_RANGE.match(content_range)
+    if status != 206 or not match or match.group(3) == "*":
+        raise RangeNotSupported(f"{url} does not support byte ranges (status {status})")
+    return int(match.group(3)), validator
+
+
+def preallocate(path: Path, size: int) -> None:
+    """Size ``path`` to ``size`` bytes without writing data (sparse where supported)."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("r+b" if path.exists() else "wb") as handle:
+        handle.truncate(size)
+
+
+class SegmentedDownloader:
+    """Download one URL over ``connections`` parallel Range requests."""
+
+    def __init__(
+        self,
+        connections: int = 4,
+        *,
+        min_segment: int = MIN_SEGMENT,
+        timeout: float = 30.0,
+        reporter: Optional[StatusReporter] = None,
+        throttle: Optional[Callable[[int], None]] = None,
+        connection_slot: Optional[Callable[[str], ContextManager]] = None,
+    ) -> None:
+        self.connections = max(1, connections)
+        self.min_segment = min_segment
+        self.timeout = timeout
+        self.reporter = reporter or StatusReporter()
+        # Called with each chunk size before it is written (e.g. a shared bandwidth limiter).
+        self.throttle = throttle
+        # Held around every HTTP connection (probe and each segment), e.g. a per-host limiter.
+        self.connection_slot = connection_slot
+
+    def _slot(self, url: str) -> ContextManager:
+        return self.connection_slot(url) if self.connection_slot is not None else contextlib.nullcontext()
+
+    def download(
+        self, url: str, part_path: Path, headers: Optional[Dict[str, str]] = None, hasher: Optional[PrefixHasher] = None
+    ) -> int:
+        """Fill ``part_path`` from ``url`` and return the bytes transferred by this call.
+
+        Progress survives failures in the segment map, so calling again resumes
+        only the missing ranges. Raises ``RangeNotSupported`` before touching
+        ``part_path`` when the server cannot serve ranges. ``hasher`` is advanced
+        over the contiguous prefix whenever a segment makes progress, so the
+        digest is ready when the last segment lands.
+        """
+
+        headers = dict(headers or {})
+        with self._slot(url):
+            size, validator = probe_ranges(url, headers, self.timeout)
+        map_path = segment_map_path(part_path)
+        segment_map = SegmentMap.load(map_path)
+        present = part_path.stat().st_size if part_path.exists() else 0
+        if segment_map is None or segment_map.size != size or segment_map.validator != validator or present != size:
+            segment_map = SegmentMap.plan(map_path, url, size, validator, self.connections, self.min_segment)
+            if present and present <= size and not map_path.exists():
+                # A single-stream partial file is a valid prefix; keep it.
+                segment_map.credit_prefix(present)
+            elif present:
+                part_path.unlink()
+            if hasher is not None:
+                hasher.reset()
+            # Save the map before sizing the file so a full-length part never exists without one.
+            segment_map.save()
+            preallocate(part_path, size)
+
+        resumed = segment_map.written
+        pending = [index for index, seg in enumerate(segment_map.segments) if not seg.done]
+        self.reporter.emit(
+            "info",
+            "segmented_start",
+            f"Downloading {part_path.name} over {min(len(pending), self.connections)} connections",
+            {"url": url, "size": size, "segments": len(segment_map.segments), "pending": len(pending), "bytes_present": resumed},
+        )
+        errors: List[BaseException] = []
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(len(pending), self.connections), thread_name_prefix="aihub-segment") as pool:
+                futures = [pool.submit(self._fetch_segment, url, part_path, segment_map, index, headers, hasher) for index in pending]
+                for future in futures:
+                    exc = future.exception()
+                    if exc is not None:
+                        errors.append(exc)
+        segment_map.save()
+        transferred = segment_map.written - resumed
+        if errors:
+            if isinstance(errors[0], (OSError, RangeNotSupported)):
+                raise errors[0]
+            # e.g. http.client.IncompleteRead: surface as a retryable transport error.
+            raise ConnectionError(f"Segmented download of {url} failed: {errors[0]}") from errors[0]
+        map_path.unlink(missing_ok=True)
+        if hasher is not None:
+            hasher.advance(size)
+        self.reporter.emit("info", "segmented_complete", f"All segments of {part_path.name} downloaded", {"size": size, "bytes_downloaded": transferred})
+        return transferred
+
+    def _fetch_segment(
+        self,
+        url: str,
+        part_path: Path,
+        segment_map: SegmentMap,
+        index: int,
+        headers: Dict[str, str],
+        hasher: Optional[PrefixHasher] = None,
+    ) -> None:
+        seg = segment_map.segments[index]
+        offset = seg.start + seg.written
+        request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, **headers, "Range": f"bytes={offset}-{seg.end}"})
+        detail = {"segment": index, "start": seg.start, "end": seg.end}
+        with self._slot(url), urllib.request.urlopen(request, timeout=self.timeout) as response:
+            match = _CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+            if int(getattr(response, "status", 200)) != 206 or not match or int(match.group(1)) != offset:
+                raise RangeNotSupported(f"Server ignored range {offset}-{seg.end} for {url}")
+            received, unsaved = seg.written, 0
+            with part_path.open("r+b") as handle:
+                handle.seek(offset)
+                try:
+                    while received < seg.length:
+                        chunk = response.read(min(CHUNK_SIZE, seg.length - received))
+                        if not chunk:
+                            break
+                        if self.throttle is not None:
+                            self.throttle(len(chunk))
+                        handle.write(chunk)
+                        received += len(chunk)
+                        unsaved += len(chunk)
+                        if unsaved >= SAVE_EVERY:
+                            handle.flush()
+                            seg.written, unsaved = received, 0
+                            segment_map.save()
+                            if hasher is not None:
+                                hasher.advance(segment_map.contiguous)
+                            self.reporter.emit("info", "segment_progress", f"Segment {index} of {part_path.name}", {**detail, "written": received})
+                finally:
+                    # Only bytes that reached the file are credited, so a resume never skips data.
+                    handle.flush()
+                    seg.written = received
+        if not seg.done:
+            raise ConnectionError(f"Segment {index} of {url} ended early at {seg.start + seg.written}")
+        if hasher is not None:
+            # Hash whatever this segment completed of the prefix while it is still in the page cache.
+            hasher.advance(segment_map.contiguous)
+        self.reporter.emit("info", "segment_complete", f"Segment {index} of {part_path.name} complete", {**detail, "written": seg.written})
+
+
+def _stream(url: str, part_path: Path, headers: Dict[str, str], timeout: float) -> int:
+    """Single-connection fallback that appends to ``part_path`` like ``wget --continue``."""
+
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    request_headers = {"User-Agent": USER_AGENT, **headers}
+    if offset:
+        request_headers["Range"] = f"bytes={offset}-"
+    transferred = 0
+    try:
+        response = urllib.request.urlopen(urllib.request.Request(url, headers=request_headers), timeout=timeout)
+    except urllib.error.HTTPError as exc:
+        if exc.code == 416 and offset:
+            return 0
+        raise
+    resumed = bool(offset) and getattr(response, "status", 200) == 206
+    start = offset if resumed else 0
+    if resumed:
+        match = _CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+        total = int(match.group(3)) if match and match.group(3) != "*" else None
+    else:
+        length = response.headers.get("Content-Length", "")
+        total = int(length) if length.isdigit() else None
+    with response, part_path.open("ab" if resumed else "wb") as handle:
+        while True:
+            chunk = response.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            handle.write(chunk)
+            transferred += len(chunk)
+    # ``read`` returns b"" on an early close instead of raising; keep the part for a resume.
+    if total is not None and start + transferred != total:
+        raise ConnectionError(f"Stream of {url} ended early at {start + transferred} of {total} bytes")
+    return transferred
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Download a file over several HTTP Range connections")
+    parser.add_argument("url")
+    parser.add_argument("dest", type=Path)
+    parser.add_argument("--connections", type=int, default=int(os.environ.get("DOWNLOAD_SEGMENTS", "4")))
+    parser.add_argument("--min-segment", type=int, default=MIN_SEGMENT, help="Smallest range worth its own connection (bytes)")
+    parser.add_argument("--header", action="append", default=[], help="Extra request header 'Name: value'")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--status-file", default=os.environ.get("DOWNLOAD_STATUS_FILE", ""))
+    args = parser.parse_args(argv)
+
+    headers: Dict[str, str] = {}
+    for header in args.header:
+        if ":" in header:
+            key, value = header.split(":", 1)
+            headers[key.strip()] = value.strip()
+
+    reporter = StatusReporter(Path(args.status_file) if args.status_file else None)
+    part_path = args.dest.with_name(args.dest.name + ".part")
+    if args.dest.exists() and not part_path.exists():
+        # Continue a partial file left behind by wget or an earlier run.
+        os.replace(args.dest, part_path)
+    downloader = SegmentedDownloader(args.connections, min_segment=args.min_segment, timeout=args.timeout, reporter=reporter)
+    try:
+        try:
+            downloader.download(args.url, part_path, headers)
+        except RangeNotSupported as exc:
+            reporter.emit("warning", "segmented_fallback", f"Falling back to a single connection for {args.dest.name}", str(exc))
+            if segment_map_path(part_path).exists():
+                # A preallocated part is not a contiguous prefix, so the stream starts over.
+                segment_map_path(part_path).unlink()
+                part_path.unlink(missing_ok=True)
+            _stream(args.url, part_path, headers, args.timeout)
+    except (OSError, urllib.error.URLError) as exc:
+        reporter.log(f"Segmented download failed for {args.url}: {exc}")
+        return 1
+    os.replace(part_path, args.dest)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
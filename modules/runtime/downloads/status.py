@@ -0,0 +1,57 @@
+"""Status and log writers matching ``download_helpers.sh``.
+
+``emit_status_event`` in the shell helpers appends one JSON object per line to
+``DOWNLOAD_STATUS_FILE`` and ``download_log`` appends ``$(date): message`` to
+``DOWNLOAD_LOG_FILE``. Python download code writes through ``StatusReporter``
+so the web launcher reads a single schema regardless of which side emitted it.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+
+class StatusReporter:
+    """Append structured status events and log lines for installer jobs."""
+
+    def __init__(self, status_file: Optional[Path] = None, log_file: Optional[Path] = None) -> None:
+        self.status_file = Path(status_file) if status_file else None
+        self.log_file = Path(log_file) if log_file else None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "StatusReporter":
+        status_file = os.environ.get("DOWNLOAD_STATUS_FILE") or None
+        log_file = os.environ.get("DOWNLOAD_LOG_FILE") or os.environ.get("LOG_FILE") or None
+        return cls(Path(status_file) if status_file else None, Path(log_file) if log_file else None)
+
+    def _append(self, path: Path, text: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # One write() per line on an O_APPEND handle keeps lines intact when
+        # shell helpers append to the same file concurrently.
+        with self._lock, path.open("a", encoding="utf-8") as handle:
+            handle.write(text)
+
+    def emit(self, level: str, event: str, message: str, detail: object = "") -> None:
+        if not self.status_file:
+            return
+        payload = {
+            "timestamp": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "level": level,
+            "event": event,
+            "message": message,
+            "detail": "" if detail is None else detail,
+        }
+        self._append(self.status_file, json.dumps(payload, separators=(",", ":")) + "\n")
+
+    def log(self, message: str) -> None:
+        if not self.log_file:
+            print(message, file=sys.stderr)
+            return
+        self._append(self.log_file, f"{time.strftime('%a %b %d %H:%M:%S %Z %Y')}: {message}\n")
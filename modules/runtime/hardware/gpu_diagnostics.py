@@ -2,20 +2,39 @@
 
 The helper is intentionally defensive: it only attempts commands that are
 present on the host and returns structured data with backend hints rather than
-failing when a given tool is unavailable.
+failing when a given tool is unavailable. Within one probe every external
+command runs at most once (toolkit detection and device enumeration share the
+outputs), and ``DiagnosticsCache`` keeps the last snapshot so callers such as
+the web launcher do not re-probe on every request.
 """
 from __future__ import annotations
 
 import json
+import logging
+import os
 import platform
 import re
 import shutil
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
+logger = logging.getLogger(__name__)
+
+NVIDIA_QUERY = ["nvidia-smi", "--query-gpu=name,memory.total,driver_version", "--format=csv,noheader,nounits"]
+# Every command a probe may run, keyed by the tool whose presence gates it.
+PROBE_COMMANDS: Dict[str, List[List[str]]] = {
+    "nvidia-smi": [["nvidia-smi"], NVIDIA_QUERY],
+    "rocminfo": [["rocminfo"]],
+    "sycl-ls": [["sycl-ls", "--version"], ["sycl-ls"]],
+}
+DEFAULT_PROBE_TTL_SECONDS = 300.0
+
 
 @dataclass
 class CommandResult:
@@ -80,6 +99,41 @@ def _command_exists(command: str) -> bool:
     return shutil.which(command) is not None
 
 
+class _ProbeSession:
+    """Run each command at most once per probe and share the result between callers."""
+
+    def __init__(self, runner: CommandRunner, command_exists: CommandExists) -> None:
+        self._runner = runner
+        self._command_exists = command_exists
+        self._results: Dict[Tuple[str, ...], CommandResult] = {}
+        self._exists: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def exists(self, command: str) -> bool:
+        if command not in self._exists:
+            self._exists[command] = self._command_exists(command)
+        return self._exists[command]
+
+    def run(self, command: List[str]) -> CommandResult:
+        key = tuple(command)
+        with self._lock:
+            cached = self._results.get(key)
+        if cached is None:
+            cached = self._runner(command)
+            with self._lock:
+                cached = self._results.setdefault(key, cached)
+        return cached
+
+    def prefetch(self) -> None:
+        """Start every applicable probe command at once; slow vendor tools then overlap."""
+
+        commands = [command for tool, group in PROBE_COMMANDS.items() if self.exists(tool) for command in group]
+        if len(commands) < 2:
+            return
+        with ThreadPoolExecutor(max_workers=len(commands), thread_name_prefix="gpu-probe") as pool:
+            list(pool.map(self.run, commands))
+
+
 def _detect_system_info() -> SystemInfo:
     system = platform.system()
     is_wsl = False
@@ -236,8 +290,9 @@ def collect_gpu_diagnostics(
 ) -> Dict[str, object]:
     """Gather GPU inventory and backend hints using available tooling."""
 
-    command_exists = command_exists or _command_exists
-    runner = runner or _default_runner
+    session = _ProbeSession(runner or _default_runner, command_exists or _command_exists)
+    session.prefetch()
+    runner, command_exists = session.run, session.exists
     system_info = system_info or _detect_system_info()
 
     devices: List[GPUDevice] = []
@@ -246,7 +301,7 @@ def collect_gpu_diagnostics(
     toolkits = _detect_toolkits(runner=runner, command_exists=command_exists, system_info=system_info)
 
     if command_exists("nvidia-smi"):
-        result = runner(["nvidia-smi", "--query-gpu=name,memory.total,driver_version", "--format=csv,noheader,nounits"])
+        result = runner(NVIDIA_QUERY)
         if result.returncode == 0 and result.stdout:
             devices.extend(_parse_nvidia_smi(result.stdout, system_info))
         else:
@@ -298,6 +353,90 @@ def collect_gpu_diagnostics(
     }
 
 
+class DiagnosticsCache:
+    """Serve the last diagnostics snapshot immediately and re-probe in the background once it is older than the TTL.
+
+    The first ``get`` probes synchronously; ``get(refresh=True)`` waits for a
+    fresh probe. Concurrent callers share a single in-flight probe.
+    """
+
+    def __init__(
+        self,
+        collect: Callable[[], Dict[str, object]] = collect_gpu_diagnostics,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        self._collect = collect
+        if ttl_seconds is None:
+            ttl_seconds = float(os.environ.get("AIHUB_GPU_PROBE_TTL", DEFAULT_PROBE_TTL_SECONDS))
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[Dict[str, object]] = None
+        self._probed_at = 0.0
+        self._probe_seconds = 0.0
+        self._inflight: Optional[threading.Event] = None
+        self._lock = threading.Lock()
+
+    def get(self, refresh: bool = False) -> Dict[str, object]:
+        with self._lock:
+            wait = self._snapshot is None or refresh
+            expired = self._snapshot is not None and time.time() - self._probed_at >= self.ttl_seconds
+            done, owner = self._start() if wait or expired else (None, False)
+        if owner and not wait:
+            threading.Thread(target=self._probe, args=(done,), name="gpu-probe-refresh", daemon=True).start()
+        elif owner:
+            self._probe(done)
+        elif wait:
+            done.wait()
+        return self._view()
+
+    def prime(self) -> None:
+        """Probe in the background so the first request is already served from the cache."""
+
+        with self._lock:
+            if self._snapshot is not None:
+                return
+            done, owner = self._start()
+        if owner:
+            threading.Thread(target=self._probe, args=(done,), name="gpu-probe-refresh", daemon=True).start()
+
+    def _start(self) -> Tuple[threading.Event, bool]:
+        """Return the in-flight probe's event, creating one (owner=True) if none is running."""
+
+        if self._inflight is not None:
+            return self._inflight, False
+        self._inflight = threading.Event()
+        return self._inflight, True
+
+    def _probe(self, done: threading.Event) -> None:
+        started = time.perf_counter()
+        try:
+            snapshot = self._collect()
+        except Exception as exc:  # keep serving the previous snapshot
+            logger.warning("GPU diagnostics probe failed: %s", exc)
+            snapshot = None
+        with self._lock:
+            if snapshot is not None or self._snapshot is None:
+                self._snapshot = snapshot or {"gpus": [], "summary": {"notes": ["GPU diagnostics probe failed."]}}
+                self._probed_at = time.time()
+                self._probe_seconds = time.perf_counter() - started
+            self._inflight = None
+        done.set()
+
+    def _view(self) -> Dict[str, object]:
+        with self._lock:
+            age = time.time() - self._probed_at
+            return {
+                **(self._snapshot or {}),
+                "cache": {
+                    "probed_at": self._probed_at,
+                    "age_seconds": round(age, 3),
+                    "ttl_seconds": self.ttl_seconds,
+                    "stale": age >= self.ttl_seconds,
+                    "refreshing": self._inflight is not None,
+                    "probe_seconds": round(self._probe_seconds, 3),
+                },
+            }
+
+
 def format_summary(payload: Dict[str, object]) -> str:
     summary = payload.get("summary", {}) if isinstance(payload, dict) else {}
     gpus = payload.get("gpus", []) if isinstance(payload, dict) else []
@@ -0,0 +1,169 @@
+"""SQLite-backed store for runtime ``Task`` records.
+
+- Purpose: keep launcher task history across restarts with indexed queries by
+  status, kind and creation order, keyset pagination, and bounded growth (TTL
+  plus a cap on finished tasks), so a long-running launcher holds only active
+  tasks in memory.
+- Assumptions: rows are ``serialize_task`` JSON plus a few indexed columns;
+  ``pending``/``running`` rows found on startup belong to a previous process
+  that stopped before finishing them.
+- Side effects: maintains ``~/.cache/aihub/web_launcher/tasks.sqlite`` (override
+  with ``AIHUB_TASK_DB``) and deletes expired finished rows.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from modules.runtime.models.tasks import FINISHED_STATUSES, Task, serialize_task, task_from_dict
+
+DEFAULT_DB_PATH = Path.home() / ".cache" / "aihub" / "web_launcher" / "tasks.sqlite"
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_FINISHED = 2000
+EVICT_INTERVAL_SECONDS = 60.0
+MAX_PAGE_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    finished_at REAL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_status_seq ON tasks(status, seq);
+CREATE INDEX IF NOT EXISTS tasks_kind_seq ON tasks(kind, seq);
+CREATE INDEX IF NOT EXISTS tasks_created ON tasks(created_at);
+CREATE INDEX IF NOT EXISTS tasks_finished ON tasks(finished_at) WHERE finished_at IS NOT NULL;
+"""
+
+
+def default_db_path() -> Path:
+    return Path(os.environ.get("AIHUB_TASK_DB") or DEFAULT_DB_PATH)
+
+
+class TaskStore:
+    """Durable task index; every state change is an upsert of the serialized task."""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_finished: int = DEFAULT_MAX_FINISHED,
+        evict_interval: float = EVICT_INTERVAL_SECONDS,
+    ) -> None:
+        self.db_path = Path(db_path) if db_path else default_db_path()
+        self.ttl_seconds = ttl_seconds
+        self.max_finished = max_finished
+        self.evict_interval = evict_interval
+        self._lock = threading.Lock()
+        self._last_evict = 0.0
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One shared connection: task updates are small and frequent, so reconnecting per write would dominate.
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def put(self, task: Task) -> None:
+        finished_at = time.time() if task.status in FINISHED_STATUSES else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO tasks (id, kind, status, created_at, updated_at, finished_at, body)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    status = excluded.status,
+                    updated_at = excluded.updated_at,
+                    finished_at = excluded.finished_at,
+                    body = excluded.body
+                """,
+                (task.id, task.kind, task.status, task.created_at, task.updated_at, finished_at, json.dumps(serialize_task(task))),
+            )
+        if finished_at is not None and finished_at - self._last_evict >= self.evict_interval:
+            self.evict(finished_at)
+
+    def get(self, task_id: str) -> Optional[Task]:
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return task_from_dict(json.loads(row["body"])) if row else None
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        kind: Optional[str] = None,
+        created_after: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[int] = None,
+    ) -> Tuple[List[Task], Optional[int]]:
+        """Return newest-first tasks and the cursor for the next page (``None`` on the last page)."""
+
+        clauses: List[str] = []
+        params: List[object] = []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind)
+        if created_after:
+            clauses.append("created_at >= ?")
+            params.append(created_after)
+        if cursor is not None:
+            clauses.append("seq < ?")
+            params.append(cursor)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT seq, body FROM tasks {where} ORDER BY seq DESC LIMIT ?", (*params, limit + 1)
+            ).fetchall()
+        next_cursor = rows[limit - 1]["seq"] if len(rows) > limit else None
+        return [task_from_dict(json.loads(row["body"])) for row in rows[:limit]], next_cursor
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS total FROM tasks GROUP BY status").fetchall()
+        return {row["status"]: row["total"] for row in rows}
+
+    def unfinished(self) -> List[Task]:
+        """``pending`` and ``running`` tasks, oldest first, for recovery after a restart."""
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT body FROM tasks WHERE status IN ('pending', 'running') ORDER BY seq"
+            ).fetchall()
+        return [task_from_dict(json.loads(row["body"])) for row in rows]
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """Drop finished tasks older than the TTL and beyond ``max_finished``; return rows removed."""
+
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            self._last_evict = now
+            removed = self._conn.execute(
+                "DELETE FROM tasks WHERE finished_at IS NOT NULL AND finished_at < ?", (now - self.ttl_seconds,)
+            ).rowcount
+            removed += self._conn.execute(
+                """
+                DELETE FROM tasks WHERE seq IN (
+                    SELECT seq FROM tasks WHERE finished_at IS NOT NULL ORDER BY finished_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_finished,),
+            ).rowcount
+        return removed
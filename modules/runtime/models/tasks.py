@@ -20,7 +20,8 @@ class Task:
     error: Optional[str] = None
 
 
-STATUSES = {"pending", "running", "completed", "failed"}
+STATUSES = {"pending", "running", "completed", "failed", "cancelled"}
+FINISHED_STATUSES = {"completed", "failed", "cancelled"}
 
 
 def _timestamp() -> str:
@@ -53,6 +54,12 @@ def mark_failed(task: Task, error: str) -> Task:
     return task
 
 
+def mark_cancelled(task: Task) -> Task:
+    task.status = "cancelled"
+    task.updated_at = _timestamp()
+    return task
+
+
 def serialize_task(task: Task) -> Dict[str, object]:
     return asdict(task)
 
@@ -1,10 +1,20 @@
-"""Lightweight registry for runtime tools surfaced through the launcher and UI."""
+"""Lightweight registry for runtime tools surfaced through the launcher and UI.
+
+Default tools are declared in ``tools.json`` next to this module, so listing
+them imports nothing; a tool's service module is imported the first time a
+task for it runs (``load_services``) and dependency checks run on first lookup.
+"""
 from __future__ import annotations
 
+import importlib
 import importlib.util
+import json
 import logging
+import time
 from dataclasses import asdict, dataclass, field
-from typing import Dict, Iterable, List, Optional
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +32,10 @@ class ToolSpec:
     dependencies: Iterable[str] = field(default_factory=tuple)
     available: bool = True
     availability_error: Optional[str] = None
+    # Dotted module holding ``request_from_payload`` and the ``run``/``batch`` callables.
+    services: Optional[str] = None
+    run: Optional[str] = None
+    batch: Optional[str] = None
 
     def to_dict(self) -> Dict[str, object]:
         payload = asdict(self)
@@ -29,38 +43,80 @@ class ToolSpec:
         return payload
 
 
+TOOLS_FILE = Path(__file__).with_name("tools.json")
+SHELL_DIR = Path(__file__).resolve().parents[1] / "shell"
+
 tools: Dict[str, ToolSpec] = {}
+_resolved: Set[str] = set()
+_dependency_cache: Dict[str, bool] = {}
+_defaults_loaded = False
+# Bumped on every registry change so HTTP caches can key on it.
+_generation = 0
+_changed_at = time.time()
+
+
+def _touch() -> None:
+    global _generation, _changed_at
+    _generation += 1
+    _changed_at = time.time()
+
+
+def registry_version() -> Tuple[int, float]:
+    """Return ``(generation, changed_at)``; both change whenever a tool is (re)registered."""
+
+    return _generation, _changed_at
+
+
+def _dependency_present(dependency: str) -> bool:
+    if dependency not in _dependency_cache:
+        try:
+            _dependency_cache[dependency] = importlib.util.find_spec(dependency) is not None
+        except (ImportError, ValueError):
+            _dependency_cache[dependency] = False
+    return _dependency_cache[dependency]
 
 
 def _dependencies_missing(dependencies: Iterable[str]) -> List[str]:
-    missing: List[str] = []
-    for dependency in dependencies:
-        if not dependency:
-            continue
-        if importlib.util.find_spec(dependency) is None:
-            missing.append(dependency)
-    return missing
+    return [dependency for dependency in dependencies if dependency and not _dependency_present(dependency)]
 
 
-def register_tool(spec: ToolSpec) -> ToolSpec:
-    """Register a tool while gracefully handling missing dependencies."""
+def _resolve(spec: ToolSpec) -> ToolSpec:
+    """Check dependencies once per registration; ``find_spec`` results are cached across tools."""
 
+    if spec.id in _resolved:
+        return spec
     try:
         missing = _dependencies_missing(spec.dependencies)
         if missing:
             spec.available = False
             spec.availability_error = f"Missing dependencies: {', '.join(sorted(set(missing)))}"
-        tools[spec.id] = spec
     except Exception as exc:  # pragma: no cover - defensive guard
         spec.available = False
         spec.availability_error = f"Registration failed: {exc}"
-        tools[spec.id] = spec
-        logger.warning("Failed to register tool %s: %s", spec.id, exc)
+        logger.warning("Failed to resolve tool %s: %s", spec.id, exc)
+    _resolved.add(spec.id)
+    return spec
+
+
+def register_tool(spec: ToolSpec) -> ToolSpec:
+    """Register a tool; dependency availability is resolved on first lookup."""
+
+    tools[spec.id] = spec
+    _resolved.discard(spec.id)
+    _touch()
     return spec
 
 
+def load_services(spec: ToolSpec) -> ModuleType:
+    """Import (on first use) and return the tool's service module."""
+
+    if not spec.services:
+        raise ValueError(f"Tool {spec.id} is not yet wired to the launcher")
+    return importlib.import_module(spec.services)
+
+
 def list_tools(kind: Optional[str] = None, available_only: bool = False) -> List[ToolSpec]:
-    registered = list(tools.values())
+    registered = [_resolve(tool) for tool in tools.values()]
     if kind:
         registered = [tool for tool in registered if tool.kind == kind]
     if available_only:
@@ -69,21 +125,42 @@ def list_tools(kind: Optional[str] = None, available_only: bool = False) -> List
 
 
 def get_tool(tool_id: str) -> Optional[ToolSpec]:
-    return tools.get(tool_id)
+    spec = tools.get(tool_id)
+    return _resolve(spec) if spec else None
 
 
 def reset_registry() -> None:
+    global _defaults_loaded
     tools.clear()
-
-
-def load_default_tools() -> None:
-    """Import tool packages to populate the registry."""
-
-    # Imports are intentionally local to avoid import cycles during bootstrap.
-    from modules.runtime.audio import asr as audio_asr  # noqa: F401
-    from modules.runtime.audio import tts as audio_tts  # noqa: F401
-    from modules.runtime.audio import voice_profiles as audio_voice_profiles  # noqa: F401
-    from modules.runtime.video import img2vid as video_img2vid  # noqa: F401
-    from modules.runtime.video import txt2vid as video_txt2vid  # noqa: F401
-
-    _ = (audio_asr, audio_tts, audio_voice_profiles, video_img2vid, video_txt2vid)
+    _resolved.clear()
+    _defaults_loaded = False
+    _touch()
+
+
+def _spec_from_declaration(entry: Dict[str, object]) -> ToolSpec:
+    command = entry.get("cli_command")
+    return ToolSpec(
+        id=str(entry["id"]),
+        label=str(entry.get("label", entry["id"])),
+        description=str(entry.get("description", "")),
+        kind=str(entry.get("kind", "")),
+        entrypoint=str(entry.get("entrypoint", "")),
+        cli_command=[str(part).format(shell_dir=SHELL_DIR) for part in command] if isinstance(command, list) else None,
+        dependencies=tuple(entry.get("dependencies") or ()),
+        services=entry.get("services"),
+        run=entry.get("run"),
+        batch=entry.get("batch"),
+    )
+
+
+def load_default_tools(path: Optional[Path] = None) -> None:
+    """Register the tools declared in ``tools.json`` without importing their packages."""
+
+    global _defaults_loaded
+    if _defaults_loaded and path is None:
+        return
+    declarations = json.loads((path or TOOLS_FILE).read_text(encoding="utf-8"))
+    for entry in declarations.get("tools", []):
+        register_tool(_spec_from_declaration(entry))
+    if path is None:
+        _defaults_loaded = True
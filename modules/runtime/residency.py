@@ -0,0 +1,261 @@
+"""Keep runtime tool models loaded between tasks, within a memory budget.
+
+- Purpose: tools register a loader per model family (``tts`` voices, ``asr``
+  languages, video pipelines); callers ask for ``(name, variant)`` and get the
+  resident instance when there is one, so only the first task pays the load.
+  Least-recently-used models are evicted when the resident total exceeds the
+  budget; pinned and in-use models are never evicted.
+- Assumptions: loaders report a model's footprint through ``size`` (or a
+  ``resident_bytes`` attribute). The budget is RAM on CPU-only hosts; GPU hosts
+  should set ``AIHUB_MODEL_BUDGET_MB`` to their VRAM headroom.
+- Side effects: holds model objects in memory; calls each loader's ``unload``
+  hook on eviction.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+Key = Tuple[str, str]
+DEFAULT_VARIANT = "default"
+FALLBACK_BUDGET_BYTES = 8 * 1024**3
+
+
+def default_budget_bytes() -> int:
+    """``AIHUB_MODEL_BUDGET_MB`` if set, else half of physical RAM."""
+
+    configured = os.environ.get("AIHUB_MODEL_BUDGET_MB")
+    if configured:
+        return int(float(configured) * 1024**2)
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 2
+    except (AttributeError, ValueError, OSError):
+        return FALLBACK_BUDGET_BYTES
+
+
+@dataclass
+class ModelLoader:
+    load: Callable[[str], object]
+    size: Optional[Callable[[object], int]] = None
+    unload: Optional[Callable[[object], None]] = None
+    # Expected footprint, used to make room before loading (avoids a transient overshoot).
+    estimate_bytes: int = 0
+
+    def footprint(self, model: object) -> int:
+        if self.size is not None:
+            return int(self.size(model))
+        return int(getattr(model, "resident_bytes", 0) or 0)
+
+
+@dataclass
+class ModelStats:
+    loads: int = 0
+    hits: int = 0
+    evictions: int = 0
+    load_seconds: float = 0.0
+    last_load_seconds: float = 0.0
+
+
+@dataclass
+class _Entry:
+    model: object
+    size_bytes: int
+    users: int = 0
+
+
+class ModelResidency:
+    """LRU cache of loaded models bounded by ``budget_bytes``."""
+
+    def __init__(self, budget_bytes: Optional[int] = None) -> None:
+        self.budget_bytes = default_budget_bytes() if budget_bytes is None else budget_bytes
+        self._loaders: Dict[str, ModelLoader] = {}
+        self._entries: "OrderedDict[Key, _Entry]" = OrderedDict()
+        self._stats: Dict[Key, ModelStats] = {}
+        self._pins: Set[Key] = set()
+        self._load_locks: Dict[Key, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def register_loader(
+        self,
+        name: str,
+        load: Callable[[str], object],
+        size: Optional[Callable[[object], int]] = None,
+        unload: Optional[Callable[[object], None]] = None,
+        estimate_bytes: int = 0,
+    ) -> None:
+        with self._lock:
+            self._loaders[name] = ModelLoader(load, size, unload, estimate_bytes)
+
+    def get(self, name: str, variant: str = DEFAULT_VARIANT) -> object:
+        """Return the resident model, loading it (once, even under concurrency) on a miss."""
+
+        return self._acquire((name, variant), hold=False)
+
+    @contextmanager
+    def use(self, name: str, variant: str = DEFAULT_VARIANT) -> Iterator[object]:
+        """Like ``get`` but keeps the model from being evicted until the block exits."""
+
+        key = (name, variant)
+        model = self._acquire(key, hold=True)
+        try:
+            yield model
+        finally:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.users -= 1
+                released = self._make_room(0)
+            self._unload(released)
+
+    def pin(self, name: str, variant: str = DEFAULT_VARIANT, preload: bool = True) -> None:
+        with self._lock:
+            self._pins.add((name, variant))
+        if preload:
+            self.get(name, variant)
+
+    def unpin(self, name: str, variant: str = DEFAULT_VARIANT) -> None:
+        with self._lock:
+            self._pins.discard((name, variant))
+            released = self._make_room(0)
+        self._unload(released)
+
+    def evict(self, name: Optional[str] = None, variant: Optional[str] = None) -> int:
+        """Drop matching models that are not in use (pins included); return how many were dropped."""
+
+        with self._lock:
+            keys = [
+                key
+                for key, entry in self._entries.items()
+                if (name is None or key[0] == name) and (variant is None or key[1] == variant) and entry.users == 0
+            ]
+            released = [self._pop(key) for key in keys]
+        self._unload(released)
+        return len(released)
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(entry.size_bytes for entry in self._entries.values())
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            models = []
+            for key, stats in sorted(self._stats.items()):
+                entry = self._entries.get(key)
+                models.append(
+                    {
+                        "name": key[0],
+                        "variant": key[1],
+                        "resident": entry is not None,
+                        "pinned": key in self._pins,
+                        "size_bytes": entry.size_bytes if entry else 0,
+                        **asdict(stats),
+                    }
+                )
+            hits = sum(stats.hits for stats in self._stats.values())
+            loads = sum(stats.loads for stats in self._stats.values())
+            return {
+                "budget_bytes": self.budget_bytes,
+                "resident_bytes": sum(entry.size_bytes for entry in self._entries.values()),
+                "hit_rate": hits / (hits + loads) if hits + loads else 0.0,
+                "models": models,
+            }
+
+    def _acquire(self, key: Key, hold: bool) -> object:
+        with self._lock:
+            model = self._hit(key, hold)
+            if model is not None:
+                return model
+            loader = self._loaders.get(key[0])
+            if loader is None:
+                raise KeyError(f"No model loader registered for '{key[0]}'")
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                model = self._hit(key, hold)
+                if model is not None:
+                    return model
+                released = self._make_room(loader.estimate_bytes)
+            self._unload(released)
+
+            started = time.perf_counter()
+            model = loader.load(key[1])
+            elapsed = time.perf_counter() - started
+            size = loader.footprint(model)
+            with self._lock:
+                self._entries[key] = _Entry(model, size, users=1 if hold else 0)
+                stats = self._stats.setdefault(key, ModelStats())
+                stats.loads += 1
+                stats.load_seconds += elapsed
+                stats.last_load_seconds = elapsed
+                released = self._make_room(0, keep=key)
+            self._unload(released)
+            logger.info("Loaded model %s/%s in %.2fs (%d bytes)", key[0], key[1], elapsed, size)
+            return model
+
+    def _hit(self, key: Key, hold: bool) -> Optional[object]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        self._stats[key].hits += 1
+        if hold:
+            entry.users += 1
+        return entry.model
+
+    def _make_room(self, incoming: int, keep: Optional[Key] = None) -> List[Tuple[Key, object]]:
+        """Pop LRU evictable entries until ``incoming`` more bytes fit; caller unloads them outside the lock."""
+
+        released: List[Tuple[Key, object]] = []
+        total = sum(entry.size_bytes for entry in self._entries.values())
+        for key in list(self._entries):
+            if total + incoming <= self.budget_bytes:
+                break
+            entry = self._entries[key]
+            if key == keep or key in self._pins or entry.users:
+                continue
+            total -= entry.size_bytes
+            released.append(self._pop(key))
+        if total + incoming > self.budget_bytes:
+            logger.warning(
+                "Model residency over budget (%d of %d bytes); remaining models are pinned or in use",
+                total + incoming,
+                self.budget_bytes,
+            )
+        return released
+
+    def _pop(self, key: Key) -> Tuple[Key, object]:
+        entry = self._entries.pop(key)
+        self._stats[key].evictions += 1
+        return key, entry.model
+
+    def _unload(self, released: List[Tuple[Key, object]]) -> None:
+        for (name, variant), model in released:
+            loader = self._loaders.get(name)
+            if loader is not None and loader.unload is not None:
+                try:
+                    loader.unload(model)
+                except Exception as exc:  # pragma: no cover - defensive guard
+                    logger.warning("Unloading model %s/%s failed: %s", name, variant, exc)
+
+
+_default: Optional[ModelResidency] = None
+_default_lock = threading.Lock()
+
+
+def default_residency() -> ModelResidency:
+    """Process-wide manager shared by the runtime tools."""
+
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = ModelResidency()
+        return _default
@@ -0,0 +1,335 @@
+"""Background execution engine for runtime tool tasks.
+
+- Purpose: accept tool tasks as ``pending`` and run them off the request thread
+  on per-lane worker pools (one lane per tool ``kind``, e.g. ``audio`` and
+  ``video``), so a long video render neither blocks the HTTP server nor queues
+  ahead of short audio jobs.
+- Assumptions: a runner is ``callable(task) -> Task`` that drives the task
+  through ``mark_running``/``mark_succeeded``/``mark_failed``; a batch runner is
+  ``callable(tasks, on_result)`` and calls ``on_result(task)`` as each item
+  finishes. Runners on ``process`` lanes must be picklable (module-level
+  functions or ``functools.partial`` over them); their returned tasks are copied
+  back, so batch items on those lanes settle together when the job returns.
+- Side effects: starts daemon worker threads (and, for ``process`` lanes, a
+  ``ProcessPoolExecutor``) lazily on the first submit to a lane; with a
+  ``TaskStore`` attached, writes every state change through to it.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from modules.runtime.models.tasks import (
+    Task,
+    mark_cancelled,
+    mark_failed,
+    mark_running,
+    serialize_task,
+    task_from_dict,
+)
+from modules.runtime.models.task_store import TaskStore
+
+logger = logging.getLogger(__name__)
+
+Runner = Callable[[Task], Optional[Task]]
+BatchRunner = Callable[[List[Task], Callable[[Task], None]], object]
+LANE_MODES = ("thread", "process")
+DEFAULT_MAX_QUEUE = 32
+DEFAULT_MAX_RETAINED = 500
+
+
+class TaskQueueFull(RuntimeError):
+    """Raised by ``TaskEngine.submit`` when the lane's queue is at capacity."""
+
+
+class TaskStateError(RuntimeError):
+    """Raised when an operation does not apply to the task's current status."""
+
+
+@dataclass
+class LaneConfig:
+    workers: int = 1
+    mode: str = "thread"
+    max_queue: int = DEFAULT_MAX_QUEUE
+
+
+DEFAULT_LANES: Dict[str, LaneConfig] = {
+    "audio": LaneConfig(workers=2),
+    "video": LaneConfig(workers=1),
+}
+
+
+def parse_lanes(spec: str, max_queue: int = DEFAULT_MAX_QUEUE) -> Dict[str, LaneConfig]:
+    """Parse ``"audio=2,video=1:process"`` (``kind=workers[:mode]``) into lane configs."""
+
+    lanes: Dict[str, LaneConfig] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        kind, _, setting = item.partition("=")
+        workers_text, _, mode = setting.partition(":")
+        mode = mode or "thread"
+        if not kind or not workers_text.isdigit() or int(workers_text) < 1 or mode not in LANE_MODES:
+            raise ValueError(f"Invalid lane spec '{item}'; expected kind=workers[:thread|process]")
+        lanes[kind.strip()] = LaneConfig(workers=int(workers_text), mode=mode, max_queue=max_queue)
+    return lanes
+
+
+def lanes_from_env() -> Dict[str, LaneConfig]:
+    lanes = {kind: LaneConfig(config.workers, config.mode, config.max_queue) for kind, config in DEFAULT_LANES.items()}
+    max_queue = int(os.environ.get("AIHUB_TASK_QUEUE", str(DEFAULT_MAX_QUEUE)))
+    for config in lanes.values():
+        config.max_queue = max_queue
+    lanes.update(parse_lanes(os.environ.get("AIHUB_TASK_WORKERS", ""), max_queue))
+    return lanes
+
+
+def _run_detached(runner: Runner, task_payload: Dict[str, object]) -> Dict[str, object]:
+    """Process-pool entrypoint: rebuild the task, run it, and ship the result back as a dict."""
+
+    task = task_from_dict(task_payload)
+    return serialize_task(runner(task) or task)
+
+
+def _run_detached_batch(runner: BatchRunner, task_payloads: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    tasks = [task_from_dict(payload) for payload in task_payloads]
+    runner(tasks, lambda task: None)
+    return [serialize_task(task) for task in tasks]
+
+
+@dataclass
+class _Job:
+    tasks: List[Task]
+    runner: Callable
+    batched: bool = False
+
+
+class _Lane:
+    def __init__(self, name: str, config: LaneConfig, engine: "TaskEngine") -> None:
+        self.name = name
+        self.config = config
+        self.engine = engine
+        self.queue: "queue.Queue[Optional[_Job]]" = queue.Queue(maxsize=config.max_queue)
+        self.threads: List[threading.Thread] = []
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.running = 0
+
+    def start(self) -> None:
+        if self.threads:
+            return
+        if self.config.mode == "process":
+            self.pool = ProcessPoolExecutor(max_workers=self.config.workers)
+        for index in range(self.config.workers):
+            thread = threading.Thread(target=self._work, name=f"task-{self.name}-{index}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self, wait: bool) -> None:
+        for _ in self.threads:
+            self.queue.put(None)
+        if wait:
+            for thread in self.threads:
+                thread.join()
+        if self.pool is not None:
+            self.pool.shutdown(wait=wait)
+
+    def _work(self) -> None:
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            active = self.engine._begin(job.tasks, self)
+            if not active:
+                continue
+            try:
+                self._execute(job, active)
+            except Exception as exc:
+                logger.exception("Task job %s failed in lane %s", active[0].id, self.name)
+                for task in active:
+                    if task.status == "running":
+                        mark_failed(task, str(exc))
+            finally:
+                self.engine._finish(active, self)
+
+    def _execute(self, job: _Job, active: List[Task]) -> None:
+        if job.batched:
+            if self.pool is None:
+                job.runner(active, self.engine._settle)
+                return
+            payloads = [serialize_task(task) for task in active]
+            for task, payload in zip(active, self.pool.submit(_run_detached_batch, job.runner, payloads).result()):
+                _copy_state(task_from_dict(payload), task)
+            return
+        task = active[0]
+        if self.pool is None:
+            returned = job.runner(task)
+            if returned is not None and returned is not task:
+                _copy_state(returned, task)
+            return
+        _copy_state(task_from_dict(self.pool.submit(_run_detached, job.runner, serialize_task(task)).result()), task)
+
+
+def _copy_state(source: Task, target: Task) -> None:
+    target.status = source.status
+    target.result = source.result
+    target.error = source.error
+    target.updated_at = source.updated_at
+
+
+class TaskEngine:
+    """Bounded per-lane queues feeding worker pools, plus an in-memory index of recent tasks.
+
+    With a ``store``, finished tasks are not kept in memory at all and lookups
+    fall through to the store.
+    """
+
+    def __init__(
+        self,
+        lanes: Optional[Dict[str, LaneConfig]] = None,
+        max_retained: int = DEFAULT_MAX_RETAINED,
+        store: Optional[TaskStore] = None,
+    ) -> None:
+        self.lane_configs = dict(lanes if lanes is not None else DEFAULT_LANES)
+        self.max_retained = 0 if store is not None else max_retained
+        self.store = store
+        self._lanes: Dict[str, _Lane] = {}
+        self._tasks: "OrderedDict[str, Task]" = OrderedDict()
+        # Ids whose final state has been recorded, oldest first. Runners set the final status
+        # themselves before ``_finish`` runs, so ``task.status`` alone does not mean "settled".
+        self._settled: "OrderedDict[str, None]" = OrderedDict()
+        self._changed = threading.Condition()
+        self._closed = False
+
+    def _lane(self, name: str) -> _Lane:
+        lane = self._lanes.get(name)
+        if lane is None:
+            config = self.lane_configs.get(name) or LaneConfig()
+            lane = self._lanes[name] = _Lane(name, config, self)
+            lane.start()
+        return lane
+
+    def submit(self, task: Task, runner: Runner, lane: str = "default") -> Task:
+        """Queue ``task`` (left ``pending``) on ``lane``; raise ``TaskQueueFull`` instead of blocking."""
+
+        self._enqueue(_Job([task], runner), lane)
+        return task
+
+    def submit_batch(self, tasks: List[Task], runner: BatchRunner, lane: str = "default") -> List[Task]:
+        """Queue ``tasks`` as one job (one queue slot, one worker) that ``runner`` executes together."""
+
+        self._enqueue(_Job(list(tasks), runner, batched=True), lane)
+        return tasks
+
+    def _enqueue(self, job: _Job, lane: str) -> None:
+        with self._changed:
+            if self._closed:
+                raise TaskStateError("Task engine is shut down")
+            target = self._lane(lane)
+            try:
+                target.queue.put_nowait(job)
+            except queue.Full:
+                raise TaskQueueFull(f"Task queue for '{lane}' is full ({target.config.max_queue} pending)") from None
+            for task in job.tasks:
+                self._tasks[task.id] = task
+                self._persist(task)
+            self._evict()
+
+    def get(self, task_id: str) -> Optional[Task]:
+        with self._changed:
+            task = self._tasks.get(task_id)
+        if task is None and self.store is not None:
+            task = self.store.get(task_id)
+        return task
+
+    def list(self) -> List[Task]:
+        with self._changed:
+            return list(self._tasks.values())
+
+    def cancel(self, task_id: str) -> Task:
+        """Cancel a pending task; running and finished tasks raise ``TaskStateError``."""
+
+        with self._changed:
+            task = self._tasks.get(task_id)
+            if task is None and self.store is not None:
+                task = self.store.get(task_id)
+            if task is None:
+                raise KeyError(task_id)
+            if task.status != "pending":
+                raise TaskStateError(f"Task {task_id} is {task.status} and can no longer be cancelled")
+            mark_cancelled(task)
+            self._persist(task)
+            self._settled[task.id] = None
+            self._evict()
+            self._changed.notify_all()
+            return task
+
+    def wait(self, task_id: str, timeout: Optional[float] = None) -> Optional[Task]:
+        """Block until the task finishes (or ``timeout`` elapses) and return it."""
+
+        with self._changed:
+            self._changed.wait_for(
+                lambda: task_id not in self._tasks or task_id in self._settled, timeout
+            )
+        return self.get(task_id)
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        with self._changed:
+            return {
+                name: {
+                    "mode": lane.config.mode,
+                    "workers": lane.config.workers,
+                    "queued": lane.queue.qsize(),
+                    "max_queue": lane.config.max_queue,
+                    "running": lane.running,
+                }
+                for name, lane in self._lanes.items()
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._changed:
+            self._closed = True
+            lanes = list(self._lanes.values())
+        for lane in lanes:
+            lane.stop(wait)
+
+    def _begin(self, tasks: List[Task], lane: _Lane) -> List[Task]:
+        """Mark the job's still-pending tasks running; cancelled ones are skipped."""
+
+        with self._changed:
+            active = [task for task in tasks if task.status == "pending"]
+            for task in active:
+                mark_running(task)
+                self._persist(task)
+            if active:
+                lane.running += 1
+                self._changed.notify_all()
+            return active
+
+    def _settle(self, task: Task) -> None:
+        with self._changed:
+            if task.id in self._settled or task.id not in self._tasks:
+                return
+            self._persist(task)
+            self._settled[task.id] = None
+            self._evict()
+            self._changed.notify_all()
+
+    def _finish(self, tasks: List[Task], lane: _Lane) -> None:
+        with self._changed:
+            lane.running -= 1
+        for task in tasks:
+            self._settle(task)
+
+    def _persist(self, task: Task) -> None:
+        if self.store is not None:
+            self.store.put(task)
+
+    def _evict(self) -> None:
+        # Only settled tasks are dropped; queued and running ones stay addressable.
+        while len(self._tasks) > self.max_retained and self._settled:
+            task_id, _ = self._settled.popitem(last=False)
+            self._tasks.pop(task_id, None)
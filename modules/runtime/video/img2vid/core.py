@@ -2,18 +2,29 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
+from modules.runtime.residency import default_residency
 from .models import ImageToVideoRequest, ImageToVideoResult
 
 
 OUTPUT_DIR = Path.home() / ".cache/aihub/video/img2vid"
 
 
+def _load_pipeline(variant: str) -> Dict[str, str]:
+    # Placeholder for loading the img2vid pipeline; real backends return the model here.
+    return {"pipeline": "img2vid", "variant": variant}
+
+
+default_residency().register_loader("img2vid", _load_pipeline)
+
+
 def generate_video(request: ImageToVideoRequest, task_id: Optional[str] = None) -> ImageToVideoResult:
     if not request.image_path.exists():
         raise FileNotFoundError(f"Image not found: {request.image_path}")
 
+    # Keeps the pipeline resident across tasks; the placeholder writes a stub instead of running it.
+    default_residency().get("img2vid")
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     video_name = f"{task_id or request.image_path.stem}.mp4"
     video_path = OUTPUT_DIR / video_name
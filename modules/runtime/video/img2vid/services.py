@@ -2,8 +2,9 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Optional
 
-from modules.runtime.models.tasks import mark_failed, mark_running, mark_succeeded, new_task
+from modules.runtime.models.tasks import Task, mark_failed, mark_running, mark_succeeded, new_task
 from .core import generate_video
 from .models import ImageToVideoRequest
 
@@ -11,8 +12,8 @@ from .models import ImageToVideoRequest
 TASK_KIND = "img2vid"
 
 
-def run_img2vid(request: ImageToVideoRequest):
-    task = new_task(TASK_KIND, payload=request.to_dict())
+def run_img2vid(request: ImageToVideoRequest, task: Optional[Task] = None):
+    task = task or new_task(TASK_KIND, payload=request.to_dict())
     mark_running(task)
     try:
         result = generate_video(request, task_id=task.id)
@@ -22,13 +23,16 @@ def run_img2vid(request: ImageToVideoRequest):
     return task
 
 
-def run_img2vid_from_payload(payload):
+def request_from_payload(payload) -> ImageToVideoRequest:
     image_path_value = payload.get("image_path") or payload.get("path")
     if not image_path_value:
         raise ValueError("image_path is required for img2vid")
-    request = ImageToVideoRequest(
+    return ImageToVideoRequest(
         image_path=Path(image_path_value),
         prompt=payload.get("prompt"),
         frames=int(payload.get("frames", 16)),
     )
-    return run_img2vid(request)
+
+
+def run_img2vid_from_payload(payload):
+    return run_img2vid(request_from_payload(payload))
@@ -2,15 +2,26 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
+from modules.runtime.residency import default_residency
 from .models import TextToVideoRequest, TextToVideoResult
 
 
 OUTPUT_DIR = Path.home() / ".cache/aihub/video/txt2vid"
 
 
+def _load_pipeline(variant: str) -> Dict[str, str]:
+    # Placeholder for loading the txt2vid pipeline; real backends return the model here.
+    return {"pipeline": "txt2vid", "variant": variant}
+
+
+default_residency().register_loader("txt2vid", _load_pipeline)
+
+
 def generate_video(request: TextToVideoRequest, task_id: Optional[str] = None) -> TextToVideoResult:
+    # Keeps the pipeline resident across tasks; the placeholder writes a stub instead of running it.
+    default_residency().get("txt2vid")
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     video_name = f"{task_id or 'txt2vid-job'}.mp4"
     video_path = OUTPUT_DIR / video_name
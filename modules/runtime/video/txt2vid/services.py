@@ -1,7 +1,9 @@
 """Service helpers for txt2vid tasks."""
 from __future__ import annotations
 
-from modules.runtime.models.tasks import mark_failed, mark_running, mark_succeeded, new_task
+from typing import Optional
+
+from modules.runtime.models.tasks import Task, mark_failed, mark_running, mark_succeeded, new_task
 from .core import generate_video
 from .models import TextToVideoRequest
 
@@ -9,8 +11,8 @@ from .models import TextToVideoRequest
 TASK_KIND = "txt2vid"
 
 
-def run_txt2vid(request: TextToVideoRequest):
-    task = new_task(TASK_KIND, payload=request.to_dict())
+def run_txt2vid(request: TextToVideoRequest, task: Optional[Task] = None):
+    task = task or new_task(TASK_KIND, payload=request.to_dict())
     mark_running(task)
     try:
         result = generate_video(request, task_id=task.id)
@@ -20,9 +22,12 @@ def run_txt2vid(request: TextToVideoRequest):
     return task
 
 
-def run_txt2vid_from_payload(payload):
+def request_from_payload(payload) -> TextToVideoRequest:
     prompt = payload.get("prompt")
     if not prompt:
         raise ValueError("prompt is required for txt2vid")
-    request = TextToVideoRequest(prompt=prompt, duration=int(payload.get("duration", 4)))
-    return run_txt2vid(request)
+    return TextToVideoRequest(prompt=prompt, duration=int(payload.get("duration", 4)))
+
+
+def run_txt2vid_from_payload(payload):
+    return run_txt2vid(request_from_payload(payload))
@@ -0,0 +1,249 @@
+"""asyncio serving core for the web launcher (``serve --engine async``).
+
+- Purpose: accept connections on one event loop with HTTP/1.1 keep-alive, so idle
+  and long-lived clients (dashboards, the installer SSE stream) cost a coroutine
+  instead of an OS thread. Route handling is unchanged: each request is replayed
+  through ``LauncherRequestHandler`` on a bounded worker pool.
+- Assumptions: request bodies carry ``Content-Length`` (the UI and CLI never send
+  chunked uploads); responses produced by the handler always include
+  ``Content-Length`` so connections can be reused.
+- Side effects: binds a TCP port; runs blocking route handlers on at most
+  ``max_concurrency`` worker threads.
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.message import Message
+from email.parser import BytesHeaderParser
+from http import HTTPStatus
+from pathlib import Path
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from modules.runtime.web_launcher.responses import sse_chunk
+from modules.runtime.web_launcher.server import LauncherRequestHandler, WebLauncherAPI, is_authorized
+
+logger = logging.getLogger(__name__)
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 16 * 1024 * 1024
+STREAM_POLL_INTERVAL = 0.5
+STREAM_KEEPALIVE_INTERVAL = 15.0
+
+
+class _BufferedLauncherHandler(LauncherRequestHandler):
+    """Run one already-read request through the launcher routes into a byte buffer."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        self.rfile = io.BytesIO(self.request)
+        self.wfile = io.BytesIO()
+
+    def handle(self) -> None:
+        self.close_connection = True
+        self.handle_one_request()
+
+    def finish(self) -> None:
+        return
+
+
+class AsyncLauncherServer:
+    """Serve the launcher API and static UI from an asyncio event loop."""
+
+    def __init__(
+        self,
+        api: WebLauncherAPI,
+        static_dir: Path,
+        auth_token: Optional[str] = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 3939,
+        max_concurrency: int = 32,
+        keepalive_timeout: float = 15.0,
+    ) -> None:
+        self.api = api
+        self.static_dir = static_dir
+        self.auth_token = auth_token
+        self.host = host
+        self.port = port
+        self.max_concurrency = max(1, max_concurrency)
+        self.keepalive_timeout = keepalive_timeout
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="aihub-web")
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port, limit=MAX_HEADER_BYTES)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_background(self) -> "AsyncLauncherServer":
+        """Run the event loop on a daemon thread and return once the port is bound."""
+
+        ready = threading.Event()
+        errors: list = []
+
+        def runner() -> None:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start())
+            except Exception as exc:  # pragma: no cover - surfaced to the caller below
+                errors.append(exc)
+                ready.set()
+                return
+            ready.set()
+            try:
+                loop.run_until_complete(self.serve_forever())
+            except asyncio.CancelledError:
+                pass
+            finally:
+                loop.close()
+
+        self._thread = threading.Thread(target=runner, name="aihub-web-async", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+        return self
+
+    async def _shutdown(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        for task in asyncio.all_tasks():
+            if task is not asyncio.current_task():
+                task.cancel()
+
+    def stop(self) -> None:
+        """Stop a server started with ``start_background``."""
+
+        if self._loop is not None and self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=5)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._executor.shutdown(wait=False)
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[bytes, Message]]:
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.keepalive_timeout)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            return None
+        _, _, header_block = head.partition(b"\r\n")
+        headers = BytesHeaderParser().parsebytes(header_block)
+        length_text = headers.get("Content-Length", "0") or "0"
+        length = int(length_text) if length_text.isdigit() else 0
+        if length > MAX_BODY_BYTES:
+            raise ValueError("Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return head + body, headers
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = writer.get_extra_info("peername") or ("", 0)
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except (ValueError, asyncio.LimitOverrunError, asyncio.IncompleteReadError):
+                    writer.write(_status_only(HTTPStatus.REQUEST_ENTITY_TOO_LARGE))
+                    await writer.drain()
+                    return
+                if request is None:
+                    return
+                raw, headers = request
+                request_line = raw.split(b"\r\n", 1)[0].decode("latin-1")
+                method, _, rest = request_line.partition(" ")
+                target = rest.rsplit(" ", 1)[0]
+                if method == "GET" and urlparse(target).path == "/api/installations/stream":
+                    await self._stream_installations(writer, target, headers)
+                    return
+                if "chunked" in (headers.get("Transfer-Encoding") or "").lower():
+                    writer.write(_status_only(HTTPStatus.LENGTH_REQUIRED))
+                    await writer.drain()
+                    return
+                assert self._slots is not None
+                async with self._slots:
+                    response, close = await asyncio.get_running_loop().run_in_executor(self._executor, self._dispatch, raw, peer)
+                writer.write(response)
+                await writer.drain()
+                if close:
+                    return
+        except (ConnectionError, asyncio.CancelledError):
+            return
+        finally:
+            writer.close()
+
+    def _dispatch(self, raw: bytes, peer: Tuple[str, int]) -> Tuple[bytes, bool]:
+        handler = _BufferedLauncherHandler(raw, peer, None, api=self.api, static_dir=self.static_dir, auth_token=self.auth_token)
+        return handler.wfile.getvalue(), bool(handler.close_connection)
+
+    async def _stream_installations(self, writer: asyncio.StreamWriter, target: str, headers: Message) -> None:
+        """Async counterpart of ``LauncherRequestHandler._stream_installations``.
+
+        Polls the broker without blocking (``timeout=0``) so an open stream holds
+        no worker thread between updates.
+        """
+
+        query = parse_qs(urlparse(target).query)
+        if not is_authorized(self.auth_token, headers, (query.get("token") or [None])[0]):
+            body = b'{"error":"Unauthorized"}'
+            writer.write(
+                b"HTTP/1.1 401 Unauthorized\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("ascii")
+                + body
+            )
+            await writer.drain()
+            return
+        last_event_id = headers.get("Last-Event-ID", "") or ""
+        after: Optional[int] = int(last_event_id) if last_event_id.isdigit() else None
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+            b"X-Accel-Buffering: no\r\nConnection: close\r\n\r\n"
+        )
+        loop = asyncio.get_running_loop()
+        idle = 0.0
+        while not writer.is_closing():
+            cursor, messages = self.api.installation_updates(after, timeout=0)
+            if messages or messages is None or after is None or idle >= STREAM_KEEPALIVE_INTERVAL:
+                writer.write(sse_chunk(cursor, messages, after).encode("utf-8"))
+                await writer.drain()
+                idle = 0.0
+            after = cursor
+            started = loop.time()
+            await asyncio.sleep(STREAM_POLL_INTERVAL)
+            idle += loop.time() - started
+
+
+def _status_only(status: HTTPStatus) -> bytes:
+    return f"HTTP/1.1 {status.value} {status.phrase}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode("ascii")
+
+
+def run_async_server(
+    api: WebLauncherAPI,
+    static_dir: Path,
+    host: str = "127.0.0.1",
+    port: int = 3939,
+    auth_token: Optional[str] = None,
+    max_concurrency: int = 32,
+) -> None:
+    server = AsyncLauncherServer(api, static_dir, auth_token, host=host, port=port, max_concurrency=max_concurrency)
+    token_note = " with bearer token auth" if auth_token else ""
+    print(f"AI Hub web launcher (async engine) running on http://{host}:{port}{token_note}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("Shutting down web launcher...")
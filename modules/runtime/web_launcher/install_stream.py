@@ -0,0 +1,179 @@
+"""Shared follower for installer status/log files used by the SSE endpoint.
+
+- Purpose: tail each install job's ``.status.jsonl`` and log file by byte offset
+  from a single background thread and fan new lines out to every
+  ``/api/installations/stream`` subscriber.
+- Assumptions: installers only append to their files (``emit_status_event`` and
+  shell redirection); a file shrinking below the saved offset means it was
+  truncated and is re-read from the start. ``\r``-redrawn progress bars (curl,
+  pip) are reduced to their latest frame, as a terminal would show them.
+- Side effects: starts one daemon thread on first subscription; reads only the
+  bytes appended since the previous poll, regardless of how many clients listen.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+StreamMessage = Tuple[int, Dict[str, object]]
+# An unterminated line longer than this is published as-is instead of being held.
+MAX_PARTIAL_BYTES = 64 * 1024
+
+
+def _last_frame(line: bytes) -> bytes:
+    """The text a terminal would show for ``line`` after its ``\r`` redraws."""
+
+    frames = [frame for frame in line.split(b"\r") if frame]
+    return frames[-1] if frames else b""
+
+
+class FileFollower:
+    """Return complete lines appended to a file since the previous read."""
+
+    def __init__(self, path: Optional[Path]) -> None:
+        self.path = path
+        self.offset = 0
+        self._partial = b""
+
+    def read_new_lines(self) -> List[str]:
+        if not self.path:
+            return []
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return []
+        if size < self.offset:
+            self.offset = 0
+            self._partial = b""
+        if size == self.offset:
+            return []
+
+        with self.path.open("rb") as handle:
+            handle.seek(self.offset)
+            chunk = handle.read(size - self.offset)
+        self.offset += len(chunk)
+
+        data = self._partial + chunk
+        *complete, tail = data.split(b"\n")
+        lines = [_last_frame(line) for line in complete]
+        # A progress bar redraws with ``\r`` and may never write ``\n``; publish its
+        # latest finished frame and keep only the frame being drawn. A trailing
+        # ``\r`` is held back in case it is the first half of ``\r\n``.
+        cut = tail.rfind(b"\r", 0, len(tail) - 1)
+        if cut >= 0:
+            frame = _last_frame(tail[:cut])
+            if frame:
+                lines.append(frame)
+            tail = tail[cut + 1 :]
+        if len(tail) > MAX_PARTIAL_BYTES:
+            lines.append(tail)
+            tail = b""
+        self._partial = tail
+        return [line.decode("utf-8", errors="ignore") for line in lines]
+
+
+class InstallEventBroker:
+    """Poll followed job files once and buffer new lines for stream subscribers."""
+
+    def __init__(self, poll_interval: float = 1.0, backlog: int = 1000) -> None:
+        self.poll_interval = poll_interval
+        self._messages: Deque[StreamMessage] = deque(maxlen=backlog)
+        self._sequence = 0
+        self._jobs: Dict[str, Tuple[FileFollower, FileFollower]] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def cursor(self) -> int:
+        with self._condition:
+            return self._sequence
+
+    def watch(self, job_id: str, status_path: Optional[Path], log_path: Optional[Path], job: Optional[Dict[str, object]] = None) -> None:
+        """Start following a job's files; ``job`` is announced to subscribers when given."""
+
+        with self._condition:
+            self._jobs[job_id] = (FileFollower(status_path), FileFollower(log_path))
+            if job is not None:
+                self._publish_locked({"type": "job", "job": job_id, "data": job})
+
+    def unwatch(self, job_id: str, job: Optional[Dict[str, object]] = None) -> None:
+        """Drain remaining lines for a finished job, announce its final state, and stop following it."""
+
+        with self._condition:
+            followers = self._jobs.pop(job_id, None)
+            if followers:
+                self._drain_locked(job_id, *followers)
+            if job is not None:
+                self._publish_locked({"type": "job", "job": job_id, "data": job})
+
+    def poll(self) -> int:
+        """Read newly appended bytes for every followed job; returns messages published."""
+
+        with self._condition:
+            before = self._sequence
+            for job_id, (status_follower, log_follower) in list(self._jobs.items()):
+                self._drain_locked(job_id, status_follower, log_follower)
+            return self._sequence - before
+
+    def wait(self, after: int, timeout: float) -> Optional[List[StreamMessage]]:
+        """Block until messages newer than ``after`` exist or ``timeout`` elapses.
+
+        Returns ``None`` when ``after`` is no longer covered by the buffer (evicted
+        or from a previous server run) so the caller can resync from a snapshot.
+        """
+
+        self._ensure_thread()
+        with self._condition:
+            if self._sequence == after:
+                self._condition.wait(timeout)
+            return self._messages_after_locked(after)
+
+    def _messages_after_locked(self, after: int) -> Optional[List[StreamMessage]]:
+        if after > self._sequence:
+            return None
+        if after == self._sequence:
+            return []
+        if self._messages and self._messages[0][0] > after + 1:
+            return None
+        return [message for message in self._messages if message[0] > after]
+
+    def _drain_locked(self, job_id: str, status_follower: FileFollower, log_follower: FileFollower) -> None:
+        for line in status_follower.read_new_lines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self._publish_locked({"type": "status", "job": job_id, "data": event})
+        lines = log_follower.read_new_lines()
+        if lines:
+            self._publish_locked({"type": "log", "job": job_id, "data": lines})
+
+    def _publish_locked(self, message: Dict[str, object]) -> None:
+        self._sequence += 1
+        self._messages.append((self._sequence, message))
+        self._condition.notify_all()
+
+    def _ensure_thread(self) -> None:
+        with self._condition:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="install-event-broker", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                self.poll()
+            except Exception as exc:  # pragma: no cover - defensive polling guard
+                logger.warning("Install event polling failed: %s", exc)
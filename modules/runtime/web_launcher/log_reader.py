@@ -0,0 +1,210 @@
+"""Bounded readers for installer logs and status-event files.
+
+- Purpose: return the tail of large installer logs and page through
+  ``.status.jsonl`` files without reading or decoding the whole file.
+- Assumptions: logs and status files are append-only while a job runs; a file
+  smaller than its persisted index was truncated and gets re-indexed.
+- Side effects: ``StatusEventIndex`` persists line offsets next to the status
+  file (``<name>.status.jsonl.idx``) so later readers skip already-indexed bytes.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = 64 * 1024
+# Upper bound on bytes scanned for a tail, so a log without newlines (e.g.
+# carriage-return progress bars) cannot force a full-file read.
+MAX_TAIL_BYTES = 4 * 1024 * 1024
+
+
+def tail_bytes(path: Path, lines: int = 20, block_size: int = BLOCK_SIZE, max_bytes: int = MAX_TAIL_BYTES) -> bytes:
+    """Return the last ``lines`` lines of ``path`` by reading blocks backward from EOF."""
+
+    if lines <= 0:
+        return b""
+    try:
+        handle = path.open("rb")
+    except OSError:
+        return b""
+
+    with handle:
+        end = handle.seek(0, os.SEEK_END)
+        position = end
+        data = b""
+        newlines = 0
+        # A trailing newline terminates the last line rather than starting a new one.
+        wanted = lines + 1
+        while position > 0 and newlines < wanted and end - position < max_bytes:
+            step = min(block_size, position)
+            position -= step
+            handle.seek(position)
+            block = handle.read(step)
+            newlines += block.count(b"\n")
+            data = block + data
+
+    parts = data.split(b"\n")
+    trailing_newline = data.endswith(b"\n")
+    if trailing_newline:
+        parts = parts[:-1]
+    selected = parts[-lines:]
+    return b"\n".join(selected) + (b"\n" if trailing_newline and selected else b"")
+
+
+def tail_text(path: Path, lines: int = 20, block_size: int = BLOCK_SIZE) -> str:
+    return tail_bytes(path, lines, block_size).decode("utf-8", errors="ignore")
+
+
+def _decode_events(raw_lines: List[bytes]) -> List[Dict[str, object]]:
+    events: List[Dict[str, object]] = []
+    for raw in raw_lines:
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            event = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+        if isinstance(event, dict):
+            events.append(event)
+    return events
+
+
+def tail_events(path: Path, limit: int = 50, block_size: int = BLOCK_SIZE) -> List[Dict[str, object]]:
+    """Decode only the last ``limit`` JSONL events of a status file."""
+
+    return _decode_events(tail_bytes(path, limit, block_size).split(b"\n"))
+
+
+class StatusEventIndex:
+    """Persisted line-offset index for a ``.status.jsonl`` file.
+
+    The index stores the end offset of every complete line as native-endian
+    uint64 values; it is a local cache and never shared between hosts. Byte
+    offsets double as paging cursors: ``page(after=...)`` seeks straight to the
+    requested line boundary.
+    """
+
+    def __init__(self, status_path: Path, index_path: Optional[Path] = None) -> None:
+        self.status_path = status_path
+        self.index_path = index_path or status_path.with_name(status_path.name + ".idx")
+        self._line_ends = array("Q")
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    @property
+    def indexed_bytes(self) -> int:
+        return self._line_ends[-1] if self._line_ends else 0
+
+    def _load(self) -> None:
+        self._loaded = True
+        self._line_ends = array("Q")
+        try:
+            raw = self.index_path.read_bytes()
+        except OSError:
+            return
+        usable = len(raw) - len(raw) % self._line_ends.itemsize
+        self._line_ends.frombytes(raw[:usable])
+        if self._line_ends and not self._ends_with_newline(self._line_ends[-1]):
+            # The status file was replaced since the index was written; rebuild it.
+            self._line_ends = array("Q")
+            self._persist(self._line_ends, rewrite=True)
+
+    def _ends_with_newline(self, offset: int) -> bool:
+        try:
+            with self.status_path.open("rb") as handle:
+                handle.seek(offset - 1)
+                return handle.read(1) == b"\n"
+        except OSError:
+            return False
+
+    def _persist(self, new_entries: array, rewrite: bool) -> None:
+        try:
+            with self.index_path.open("wb" if rewrite else "ab") as handle:
+                new_entries.tofile(handle)
+        except OSError as exc:
+            logger.warning("Unable to persist status index %s: %s", self.index_path, exc)
+
+    def refresh(self) -> int:
+        """Index bytes appended since the last refresh and return the total line count."""
+
+        with self._lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> int:
+        if not self._loaded:
+            self._load()
+        try:
+            size = self.status_path.stat().st_size
+        except OSError:
+            return len(self._line_ends)
+
+        rewrite = False
+        if size < self.indexed_bytes:
+            self._line_ends = array("Q")
+            rewrite = True
+        start = self.indexed_bytes
+        if size == start:
+            if rewrite:
+                self._persist(array("Q"), rewrite=True)
+            return len(self._line_ends)
+
+        new_entries = array("Q")
+        with self.status_path.open("rb") as handle:
+            handle.seek(start)
+            chunk = handle.read(size - start)
+        cursor = 0
+        while True:
+            newline = chunk.find(b"\n", cursor)
+            if newline == -1:
+                break
+            cursor = newline + 1
+            new_entries.append(start + cursor)
+
+        if new_entries or rewrite:
+            self._line_ends.extend(new_entries)
+            self._persist(new_entries, rewrite=rewrite)
+        return len(self._line_ends)
+
+    def _line_number_at(self, offset: int) -> int:
+        """Return the index of the first line that ends after ``offset``."""
+
+        ends = self._line_ends
+        low, high = 0, len(ends)
+        while low < high:
+            mid = (low + high) // 2
+            if ends[mid] <= offset:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def page(self, after: int = 0, limit: int = 50) -> Dict[str, object]:
+        """Return up to ``limit`` events starting at byte offset ``after``.
+
+        ``next`` is the cursor to pass as ``after`` for the following page and
+        ``total`` is the number of indexed lines in the file.
+        """
+
+        with self._lock:
+            total = self._refresh_locked()
+            first = self._line_number_at(max(after, 0))
+            last = min(first + max(limit, 0), total)
+            start = self._line_ends[first - 1] if 0 < first <= total else 0
+            end = self._line_ends[last - 1] if last > 0 else 0
+            indexed = self.indexed_bytes
+        if first >= last:
+            next_cursor = after if first < total else max(after, indexed)
+            return {"events": [], "next": next_cursor, "total": total}
+
+        with self.status_path.open("rb") as handle:
+            handle.seek(start)
+            chunk = handle.read(end - start)
+        return {"events": _decode_events(chunk.split(b"\n")), "next": end, "total": total}
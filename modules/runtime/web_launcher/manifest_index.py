@@ -0,0 +1,172 @@
+"""In-memory index of validated curated manifests for the web launcher.
+
+- Purpose: parse and validate ``manifests/<name>.json`` once and serve repeat
+  lookups (by slug or display name) from memory.
+- Assumptions: manifests are small JSON documents rewritten in place or
+  atomically replaced; a change in mtime, size, or inode marks them stale.
+- Side effects: none beyond reading manifest files when their stat changes.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FileStamp = Tuple[int, int, int]
+
+
+def slugify(value: str) -> str:
+    normalized = re.sub(r"[^a-zA-Z0-9]+", "-", value.strip().lower())
+    return normalized.strip("-")
+
+
+def _file_stamp(path: Path) -> Optional[FileStamp]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def validate_manifest(manifest_path: Path) -> Dict[str, object]:
+    """Parse a manifest file and annotate each entry with health details."""
+
+    base_payload = {"source": None, "items": [], "errors": [], "has_errors": False}
+    if not manifest_path.exists():
+        message = f"Manifest {manifest_path.name} not found"
+        return {**base_payload, "errors": [message], "has_errors": True}
+
+    try:
+        payload = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as exc:
+        message = f"Failed to parse {manifest_path.name}: {exc}"
+        logger.warning(message)
+        return {**base_payload, "errors": [message], "has_errors": True}
+
+    if not isinstance(payload, dict):
+        message = f"Manifest {manifest_path.name} must be a JSON object"
+        logger.warning(message)
+        return {**base_payload, "errors": [message], "has_errors": True}
+
+    errors: List[str] = []
+    source = payload.get("source")
+    items = payload.get("items", [])
+
+    if not isinstance(items, list):
+        message = f"Manifest {manifest_path.name} items must be a list"
+        logger.warning(message)
+        return {**base_payload, "source": source, "errors": [message], "has_errors": True}
+
+    validated_items: List[Dict[str, object]] = []
+    for idx, item in enumerate(items):
+        if not isinstance(item, dict):
+            message = f"{manifest_path.name} items[{idx}] is not an object"
+            logger.warning(message)
+            errors.append(message)
+            continue
+
+        entry = dict(item)
+        entry.setdefault("tags", [])
+        entry.setdefault("license", "")
+        entry.setdefault("notes", "")
+        entry.setdefault("version", "")
+        entry.setdefault("size_bytes", None)
+        entry.setdefault("checksum", "")
+
+        issues: List[str] = []
+        name_value = entry.get("name")
+        if not isinstance(name_value, str) or not name_value.strip():
+            issues.append("Manifest entries must include a name")
+        entry_slug = entry.get("slug") or (name_value and slugify(name_value))
+        entry["slug"] = entry_slug or ""
+        if not entry["slug"]:
+            issues.append("Manifest entries must include a slug or valid name")
+
+        if not entry.get("url") and not entry.get("filename"):
+            issues.append("Entries should include a download url or filename")
+        if not isinstance(entry.get("tags"), list):
+            issues.append("tags must be a list")
+            entry["tags"] = []
+
+        entry["health"] = "ok" if not issues else "warning"
+        entry["issues"] = issues
+        if issues:
+            errors.extend([f"{manifest_path.name} {entry['name'] or entry['slug']}: {msg}" for msg in issues])
+
+        validated_items.append(entry)
+
+    return {
+        "source": source,
+        "items": validated_items,
+        "errors": errors,
+        "has_errors": bool(errors),
+    }
+
+
+@dataclass
+class _ManifestSnapshot:
+    stamp: Optional[FileStamp]
+    payload: Dict[str, object]
+    by_slug: Dict[str, Dict[str, object]] = field(default_factory=dict)
+    by_name: Dict[str, Dict[str, object]] = field(default_factory=dict)
+
+
+class ManifestIndex:
+    """Cache validated manifests keyed by slug and name, reloading on file change."""
+
+    def __init__(self, manifest_dir: Path) -> None:
+        self.manifest_dir = manifest_dir
+        self._snapshots: Dict[str, _ManifestSnapshot] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, name: str) -> Path:
+        return self.manifest_dir / f"{name}.json"
+
+    def _snapshot(self, name: str) -> _ManifestSnapshot:
+        path = self._path(name)
+        stamp = _file_stamp(path)
+        with self._lock:
+            cached = self._snapshots.get(name)
+            if cached is not None and cached.stamp == stamp:
+                return cached
+
+            payload = validate_manifest(path)
+            snapshot = _ManifestSnapshot(stamp=stamp, payload=payload)
+            for item in payload.get("items", []):
+                slug = item.get("slug") or slugify(str(item.get("name", "")))
+                snapshot.by_slug[slug] = item
+                item_name = item.get("name")
+                if isinstance(item_name, str):
+                    snapshot.by_name[item_name] = item
+            self._snapshots[name] = snapshot
+            return snapshot
+
+    def load(self, name: str) -> Dict[str, object]:
+        """Return the validated manifest payload; the top-level dict is safe to mutate."""
+
+        payload = self._snapshot(name).payload
+        return {**payload, "items": list(payload.get("items", [])), "errors": list(payload.get("errors", []))}
+
+    def count(self, name: str) -> int:
+        return len(self._snapshot(name).payload.get("items", []))
+
+    def get(self, name: str, item_id: str) -> Optional[Dict[str, object]]:
+        """Look up an entry by slug (``item_id`` is normalized first)."""
+
+        return self._snapshot(name).by_slug.get(slugify(item_id))
+
+    def find_by_name(self, name: str, item_name: str) -> Optional[Dict[str, object]]:
+        return self._snapshot(name).by_name.get(item_name)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        with self._lock:
+            if name is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(name, None)
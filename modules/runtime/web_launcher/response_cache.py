@@ -0,0 +1,112 @@
+"""Pre-encoded response cache for read-mostly launcher endpoints.
+
+- Purpose: keep the encoded JSON (and a gzip copy) of responses such as
+  ``/api/status`` and ``/api/manifests`` keyed by route, query and a version stamp
+  of the files they are built from, so browser polls cost a few ``stat()`` calls
+  instead of reloading and re-serializing. Clients holding a current copy get
+  ``304`` via strong ``ETag``s.
+- Assumptions: each cached route's ``version`` callable stamps every source the
+  payload depends on; a stamp that did not change means the payload did not.
+- Side effects: holds up to ``max_entries`` encoded bodies in memory.
+"""
+from __future__ import annotations
+
+import gzip
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate
+from http import HTTPStatus
+from typing import Callable, Dict, Optional, Tuple
+
+from modules.runtime.web_launcher.responses import GZIP_LEVEL, GZIP_MIN_BYTES, accepts_gzip, encode_json
+from modules.runtime.web_launcher.router import Middleware, Next, Request, Response, Version, etag_for, not_modified
+
+
+@dataclass
+class CachedBody:
+    identity: bytes
+    gzipped: Optional[bytes]
+    etag: str
+    last_modified: float
+
+
+class ResponseCache:
+    """LRU of encoded 200 responses keyed by ``(route, path?query, version token)``."""
+
+    def __init__(self, max_entries: int = 128) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str], CachedBody]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[CachedBody]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return entry
+
+    def put(self, key: Tuple[str, str, str], entry: CachedBody) -> None:
+        with self._lock:
+            # A new version of the same route/query supersedes older ones.
+            for stale in [existing for existing in self._entries if existing[:2] == key[:2] and existing != key]:
+                del self._entries[stale]
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def cached(version: Callable[[Request], Optional[Version]]) -> Middleware:
+    """Serve the route from ``request.api.response_cache`` while ``version(request)`` is unchanged."""
+
+    def middleware(request: Request, call_next: Next) -> Response:
+        cache: Optional[ResponseCache] = getattr(request.api, "response_cache", None)
+        stamp = version(request) if cache is not None else None
+        if stamp is None:
+            return call_next(request)
+        token, last_modified = stamp
+        etag = etag_for(request, token)
+        # The gzip representation is a different byte sequence, so it gets its own strong tag.
+        gzip_etag = etag[:-1] + '-gz"'
+        validators = {"Cache-Control": "no-cache"}
+        if last_modified:
+            validators["Last-Modified"] = formatdate(last_modified, usegmt=True)
+        wants_gzip = accepts_gzip(request.headers.get("Accept-Encoding"))
+        for candidate in (etag, gzip_etag):
+            if not_modified(request.headers, candidate, last_modified):
+                return Response(int(HTTPStatus.NOT_MODIFIED), None, {**validators, "ETag": candidate}, body=b"")
+
+        route = request.route.name if request.route else request.path
+        key = (route, request.path + "?" + "&".join(f"{k}={v}" for k in sorted(request.query) for v in request.query[k]), token)
+        entry = cache.get(key)
+        if entry is None:
+            response = call_next(request)
+            if response.status != HTTPStatus.OK or response.body is not None:
+                return response
+            identity = encode_json(response.payload)
+            gzipped = gzip.compress(identity, compresslevel=GZIP_LEVEL, mtime=0) if len(identity) >= GZIP_MIN_BYTES else None
+            entry = CachedBody(identity, gzipped, etag, last_modified)
+            cache.put(key, entry)
+
+        headers = {**validators, "Content-Type": "application/json", "Vary": "Accept-Encoding"}
+        if wants_gzip and entry.gzipped is not None:
+            headers.update({"Content-Encoding": "gzip", "ETag": gzip_etag})
+            return Response(int(HTTPStatus.OK), None, headers, body=entry.gzipped)
+        headers["ETag"] = etag
+        return Response(int(HTTPStatus.OK), None, headers, body=entry.identity)
+
+    return middleware
@@ -0,0 +1,51 @@
+"""Response encoding shared by the threaded and asyncio web launcher engines.
+
+- Purpose: serialize API payloads as compact JSON, gzip large bodies for clients
+  that accept it, and format Server-Sent Event chunks identically on both engines.
+- Assumptions: bodies under ``GZIP_MIN_BYTES`` are not worth compressing; the
+  browser UI and ``curl --compressed`` both advertise ``gzip``.
+- Side effects: none.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+from typing import Dict, List, Optional, Tuple
+
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 5
+
+
+def encode_json(payload: object) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in {"gzip", "*"}:
+            return params.replace(" ", "").lower() not in {"q=0", "q=0.0", "q=0.00", "q=0.000"}
+    return False
+
+
+def encode_body(body: bytes, accept_encoding: Optional[str], content_type: str = "application/json") -> Tuple[bytes, Dict[str, str]]:
+    """Return ``(body, headers)``, gzip-compressed when large enough and accepted."""
+
+    headers = {"Content-Type": content_type, "Vary": "Accept-Encoding"}
+    if len(body) >= GZIP_MIN_BYTES and accepts_gzip(accept_encoding):
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+        headers["Content-Encoding"] = "gzip"
+    headers["Content-Length"] = str(len(body))
+    return body, headers
+
+
+def sse_chunk(cursor: int, messages: Optional[List[Tuple[int, Dict[str, object]]]], after: Optional[int]) -> str:
+    """Format one ``/api/installations/stream`` write for ``WebLauncherAPI.installation_updates`` output."""
+
+    if messages is None:
+        return f"id: {cursor}\nevent: reset\ndata: {{}}\n\n"
+    if messages:
+        return "".join(f"id: {seq}\nevent: {message['type']}\ndata: {json.dumps(message)}\n\n" for seq, message in messages)
+    if after is None:
+        return f"id: {cursor}\nevent: ready\ndata: {{}}\n\n"
+    return ": keepalive\n\n"
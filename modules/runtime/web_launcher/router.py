@@ -0,0 +1,273 @@
+"""Declarative route table for the web launcher JSON API.
+
+- Purpose: map ``(method, path template)`` pairs such as
+  ``GET /api/manifests/<manifest_type>/<item_id>`` to handler functions, compiled
+  once into an exact-path lookup plus per-method regexes, with composable
+  middleware (auth, timing) wrapped around each route, plus the ETag helpers
+  ``response_cache.cached`` uses for conditional GET.
+- Assumptions: handlers are synchronous and return a JSON-serializable payload,
+  a ``(payload, status)`` tuple, or a ``Response``; ``HTTPError`` and
+  ``ValueError`` raised by handlers become JSON error responses.
+- Side effects: none; transports (``LauncherRequestHandler``) write the
+  ``Response`` returned by ``Router.dispatch``.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Pattern, Sequence, Tuple
+from urllib.parse import unquote
+
+CONVERTERS: Dict[str, Tuple[str, Callable[[str], object]]] = {
+    "str": (r"[^/]+", unquote),
+    "int": (r"\d+", int),
+    "path": (r".+", unquote),
+}
+_PARAM = re.compile(r"<(?:(\w+):)?(\w+)>")
+
+
+class HTTPError(Exception):
+    """Raised by handlers or middleware to return ``{"error": message}`` with ``status``."""
+
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None) -> None:
+        super().__init__(message)
+        self.status = int(status)
+        self.message = message
+        self.headers = headers or {}
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: Dict[str, List[str]] = field(default_factory=dict)
+    headers: Mapping[str, str] = field(default_factory=dict)
+    read_body: Callable[[], Dict] = dict
+    api: object = None
+    auth_token: Optional[str] = None
+    params: Dict[str, object] = field(default_factory=dict)
+    route: Optional["Route"] = None
+    _body: Optional[Dict] = None
+
+    def json(self) -> Dict:
+        if self._body is None:
+            self._body = self.read_body()
+        return self._body
+
+    def arg(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return (self.query.get(name) or [default])[0]
+
+
+@dataclass
+class Response:
+    status: int = int(HTTPStatus.OK)
+    payload: object = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    # Pre-encoded body; when set, ``payload`` is ignored by the transport.
+    body: Optional[bytes] = None
+
+
+Handler = Callable[[Request], object]
+Next = Callable[[Request], Response]
+Middleware = Callable[[Request, Next], Response]
+
+
+def _as_response(result: object) -> Response:
+    if isinstance(result, Response):
+        return result
+    if isinstance(result, tuple) and len(result) == 2:
+        payload, status = result
+        return Response(int(status), payload)
+    return Response(int(HTTPStatus.OK), result)
+
+
+def error_response(status: int, message: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(int(status), {"error": message}, dict(headers or {}))
+
+
+@dataclass
+class Route:
+    method: str
+    template: str
+    handler: Handler
+    name: str
+    middleware: Tuple[Middleware, ...] = ()
+    pattern: Optional[Pattern[str]] = None
+    converters: Dict[str, Callable[[str], object]] = field(default_factory=dict)
+    call: Optional[Next] = None
+
+    def compile(self) -> None:
+        converters: Dict[str, Callable[[str], object]] = {}
+        regex, position = "", 0
+        for match in _PARAM.finditer(self.template):
+            kind, name = match.group(1) or "str", match.group(2)
+            if kind not in CONVERTERS:
+                raise ValueError(f"Unknown path converter '{kind}' in {self.template}")
+            regex += re.escape(self.template[position : match.start()]) + f"(?P<{name}>{CONVERTERS[kind][0]})"
+            converters[name] = CONVERTERS[kind][1]
+            position = match.end()
+        if converters:
+            self.pattern = re.compile(regex + re.escape(self.template[position:]) + r"\Z")
+        self.converters = converters
+
+        call: Next = lambda request: _as_response(self.handler(request))  # noqa: E731
+        for middleware in reversed(self.middleware):
+            call = (lambda mw, nxt: lambda request: mw(request, nxt))(middleware, call)
+        self.call = call
+
+    def match(self, path: str) -> Optional[Dict[str, object]]:
+        if self.pattern is None:
+            return {} if path == self.template else None
+        found = self.pattern.match(path)
+        if not found:
+            return None
+        try:
+            return {name: self.converters[name](value) for name, value in found.groupdict().items()}
+        except ValueError:
+            return None
+
+
+class Router:
+    """Method + path-template table compiled once, with global and per-route middleware."""
+
+    def __init__(self, middleware: Sequence[Middleware] = ()) -> None:
+        self.middleware = tuple(middleware)
+        self.routes: List[Route] = []
+        self._static: Dict[Tuple[str, str], Route] = {}
+        self._dynamic: Dict[str, List[Route]] = {}
+        self._dispatch: Optional[Next] = None
+
+    def add(self, method: str, template: str, handler: Handler, *, name: str = "", middleware: Sequence[Middleware] = ()) -> Route:
+        route = Route(method.upper(), template, handler, name or handler.__name__.strip("_"), tuple(middleware))
+        self.routes.append(route)
+        self._dispatch = None
+        return route
+
+    def route(self, method: str, template: str, **options) -> Callable[[Handler], Handler]:
+        def decorator(handler: Handler) -> Handler:
+            self.add(method, template, handler, **options)
+            return handler
+
+        return decorator
+
+    def get(self, template: str, **options) -> Callable[[Handler], Handler]:
+        return self.route("GET", template, **options)
+
+    def post(self, template: str, **options) -> Callable[[Handler], Handler]:
+        return self.route("POST", template, **options)
+
+    def compile(self) -> "Router":
+        self._static.clear()
+        self._dynamic.clear()
+        for route in self.routes:
+            route.compile()
+            if route.pattern is None:
+                self._static.setdefault((route.method, route.template), route)
+            else:
+                self._dynamic.setdefault(route.method, []).append(route)
+
+        call: Next = self._call_route
+        for middleware in reversed(self.middleware):
+            call = (lambda mw, nxt: lambda request: mw(request, nxt))(middleware, call)
+        self._dispatch = call
+        return self
+
+    def match(self, method: str, path: str) -> Tuple[Route, Dict[str, object]]:
+        """Return the route and converted params, or raise ``HTTPError`` 404/405."""
+
+        if self._dispatch is None:
+            self.compile()
+        route = self._static.get((method, path))
+        if route is not None:
+            return route, {}
+        for route in self._dynamic.get(method, ()):
+            params = route.match(path)
+            if params is not None:
+                return route, params
+        allowed = sorted(
+            {candidate.method for candidate in self.routes if candidate.method != method and candidate.match(path) is not None}
+        )
+        if allowed:
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Method not allowed", {"Allow": ", ".join(allowed)})
+        raise HTTPError(HTTPStatus.NOT_FOUND, "Unknown API endpoint")
+
+    def _call_route(self, request: Request) -> Response:
+        route, request.params = self.match(request.method, request.path)
+        request.route = route
+        assert route.call is not None
+        return route.call(request)
+
+    def dispatch(self, request: Request) -> Response:
+        if self._dispatch is None:
+            self.compile()
+        assert self._dispatch is not None
+        try:
+            return self._dispatch(request)
+        except HTTPError as exc:
+            return error_response(exc.status, exc.message, exc.headers)
+        except ValueError as exc:
+            return error_response(HTTPStatus.BAD_REQUEST, str(exc))
+        except Exception as exc:  # pragma: no cover - defensive routing guard
+            return error_response(HTTPStatus.INTERNAL_SERVER_ERROR, str(exc))
+
+
+def timing(request: Request, call_next: Next) -> Response:
+    """Report handler time as ``Server-Timing: app;dur=<ms>``."""
+
+    started = time.perf_counter()
+    response = call_next(request)
+    response.headers["Server-Timing"] = f"app;dur={(time.perf_counter() - started) * 1000:.2f}"
+    return response
+
+
+def require_auth(check: Callable[[Request], bool]) -> Middleware:
+    def middleware(request: Request, call_next: Next) -> Response:
+        if not check(request):
+            return error_response(HTTPStatus.UNAUTHORIZED, "Unauthorized")
+        return call_next(request)
+
+    return middleware
+
+
+Version = Tuple[str, float]
+
+
+def file_version(paths: Iterable[Path]) -> Version:
+    """Version stamp ``(token, last_modified)`` from the stat of each path (missing files count too)."""
+
+    parts: List[str] = []
+    newest = 0.0
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            parts.append(f"{path}:missing")
+            continue
+        parts.append(f"{path}:{stat.st_mtime_ns}:{stat.st_size}:{stat.st_ino}")
+        newest = max(newest, stat.st_mtime)
+    return "|".join(parts), newest
+
+
+def etag_for(request: Request, token: str) -> str:
+    query = "&".join(f"{key}={value}" for key in sorted(request.query) for value in request.query[key])
+    route = request.route.name if request.route else request.path
+    return '"' + hashlib.sha1(f"{route}|{request.path}?{query}|{token}".encode("utf-8")).hexdigest()[:24] + '"'
+
+
+def not_modified(headers: Mapping[str, str], etag: str, last_modified: float) -> bool:
+    if_none_match = headers.get("If-None-Match")
+    if if_none_match:
+        tags = {tag.strip()[2:] if tag.strip().startswith("W/") else tag.strip() for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if_modified_since = headers.get("If-Modified-Since")
+    if if_modified_since and last_modified:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError, IndexError):
+            return False
+    return False
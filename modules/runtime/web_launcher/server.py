@@ -9,6 +9,7 @@
 """
 
 import argparse
+import functools
 import json
 import logging
 import os
@@ -22,28 +23,39 @@ from http import HTTPStatus
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, urlparse
 
 from modules.config_service import config_service
 from modules.runtime.character_studio.registry import CharacterCardRegistry
-from modules.runtime.hardware.gpu_diagnostics import collect_gpu_diagnostics
+from modules.runtime.downloads import catalog as artifact_catalog
+from modules.runtime.hardware.gpu_diagnostics import DiagnosticsCache, collect_gpu_diagnostics
 from modules.runtime.prompt_builder import compiler
 from modules.runtime.prompt_builder.services import UIIntegrationHooks
-from modules.runtime.registry import get_tool, list_tools, load_default_tools
-from modules.runtime.models.tasks import serialize_task, Task
-from modules.runtime.audio.tts import services as tts_services
-from modules.runtime.audio.asr import services as asr_services
-from modules.runtime.audio.voice_profiles import services as voice_profiles_services
-from modules.runtime.video.img2vid import services as img2vid_services
-from modules.runtime.video.txt2vid import services as txt2vid_services
+from modules.runtime.registry import get_tool, list_tools, load_default_tools, load_services, registry_version
+from modules.runtime.residency import default_residency
+from modules.runtime.models.task_store import TaskStore
+from modules.runtime.models.tasks import STATUSES, Task, mark_failed, new_task, serialize_task
+from modules.runtime.task_engine import TaskEngine, TaskQueueFull, TaskStateError, lanes_from_env
+from modules.runtime.web_launcher.install_stream import InstallEventBroker
+from modules.runtime.web_launcher.log_reader import StatusEventIndex, tail_events, tail_text
+from modules.runtime.web_launcher.manifest_index import ManifestIndex
+from modules.runtime.web_launcher.response_cache import ResponseCache, cached
+from modules.runtime.web_launcher.responses import encode_body, encode_json, sse_chunk
+from modules.runtime.web_launcher.router import (
+    HTTPError,
+    Request,
+    Response,
+    Router,
+    Version,
+    file_version,
+    require_auth,
+    timing,
+)
 
 
 logger = logging.getLogger(__name__)
 
-
-def _slugify(value: str) -> str:
-    normalized = re.sub(r"[^a-zA-Z0-9]+", "-", value.strip().lower())
-    return normalized.strip("-")
+MAX_BATCH_ITEMS = 1000
 
 
 PAIRING_SCHEMA: Dict[str, object] = {
@@ -117,11 +129,16 @@ class WebLauncherAPI:
         config_path: Optional[Path] = None,
         log_dir: Optional[Path] = None,
         history_path: Optional[Path] = None,
+        artifact_db: Optional[Path] = None,
+        task_engine: Optional[TaskEngine] = None,
+        task_db: Optional[Path] = None,
+        recover_tasks: bool = False,
     ):
         self.project_root = project_root
         self.modules_dir = project_root / "modules"
         self.shell_dir = self.modules_dir / "shell"
         self.manifest_dir = project_root / "manifests"
+        self._manifest_index = ManifestIndex(self.manifest_dir)
         self.config_path = config_path or Path(config_service.DEFAULT_CONFIG_PATH)
         self._ui_hooks = UIIntegrationHooks()
         self._card_registry = CharacterCardRegistry()
@@ -131,9 +148,21 @@ class WebLauncherAPI:
         self._log_dir.mkdir(parents=True, exist_ok=True)
         self._history_path.parent.mkdir(parents=True, exist_ok=True)
         self._install_jobs: Dict[str, InstallJob] = {}
-        self._tasks: Dict[str, Task] = {}
+        self._install_events = InstallEventBroker()
+        self.config_revision = 0
+        self.response_cache = ResponseCache()
+        self._status_indexes: Dict[Path, StatusEventIndex] = {}
+        self.task_store = task_engine.store if task_engine else TaskStore(task_db)
+        self.task_engine = task_engine or TaskEngine(lanes_from_env(), store=self.task_store)
         self._lock = threading.Lock()
+        self._artifact_db = artifact_db or Path(os.environ.get("AIHUB_ARTIFACT_DB", str(artifact_catalog.DEFAULT_DB_PATH)))
+        self._artifact_catalog: Optional[artifact_catalog.ArtifactCatalog] = None
+        self.gpu_cache = DiagnosticsCache(self._probe_gpu)
         load_default_tools()
+        # Only the long-running server may adopt unfinished tasks; a CLI call or the
+        # startup profiler would otherwise steal work from a live server and die mid-task.
+        if recover_tasks:
+            self._recover_tasks()
 
     def _build_action_map(self) -> Dict[str, ActionSpec]:
         actions: Iterable[Tuple[str, str, str, str]] = (
@@ -186,77 +215,7 @@ class WebLauncherAPI:
         }
 
     def _load_manifest(self, name: str) -> Dict[str, object]:
-        manifest_path = self.manifest_dir / f"{name}.json"
-        base_payload = {"source": None, "items": [], "errors": [], "has_errors": False}
-        if not manifest_path.exists():
-            message = f"Manifest {manifest_path.name} not found"
-            return {**base_payload, "errors": [message], "has_errors": True}
-
-        try:
-            payload = json.loads(manifest_path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError as exc:
-            message = f"Failed to parse {manifest_path.name}: {exc}"
-            logger.warning(message)
-            return {**base_payload, "errors": [message], "has_errors": True}
-
-        if not isinstance(payload, dict):
-            message = f"Manifest {manifest_path.name} must be a JSON object"
-            logger.warning(message)
-            return {**base_payload, "errors": [message], "has_errors": True}
-
-        errors: List[str] = []
-        source = payload.get("source")
-        items = payload.get("items", [])
-
-        if not isinstance(items, list):
-            message = f"Manifest {manifest_path.name} items must be a list"
-            logger.warning(message)
-            return {**base_payload, "source": source, "errors": [message], "has_errors": True}
-
-        validated_items: List[Dict[str, object]] = []
-        for idx, item in enumerate(items):
-            if not isinstance(item, dict):
-                message = f"{manifest_path.name} items[{idx}] is not an object"
-                logger.warning(message)
-                errors.append(message)
-                continue
-
-            entry = dict(item)
-            entry.setdefault("tags", [])
-            entry.setdefault("license", "")
-            entry.setdefault("notes", "")
-            entry.setdefault("version", "")
-            entry.setdefault("size_bytes", None)
-            entry.setdefault("checksum", "")
-
-            issues: List[str] = []
-            name_value = entry.get("name")
-            if not isinstance(name_value, str) or not name_value.strip():
-                issues.append("Manifest entries must include a name")
-            entry_slug = entry.get("slug") or (name_value and _slugify(name_value))
-            entry["slug"] = entry_slug or ""
-            if not entry["slug"]:
-                issues.append("Manifest entries must include a slug or valid name")
-
-            if not entry.get("url") and not entry.get("filename"):
-                issues.append("Entries should include a download url or filename")
-            if not isinstance(entry.get("tags"), list):
-                issues.append("tags must be a list")
-                entry["tags"] = []
-
-            entry["health"] = "ok" if not issues else "warning"
-            entry["issues"] = issues
-            if issues:
-                errors.extend([f"{manifest_path.name} {entry['name'] or entry['slug']}: {msg}" for msg in issues])
-
-            validated_items.append(entry)
-
-        return {
-            "source": source,
-            "items": validated_items,
-            "errors": errors,
-            "has_errors": bool(errors),
-        }
+        return self._manifest_index.load(name)
 
     def get_manifests(self) -> Dict[str, object]:
         models_manifest = self._load_manifest("models")
@@ -277,21 +236,16 @@ class WebLauncherAPI:
         return manifest
 
     def get_manifest_item(self, manifest_type: str, item_id: str) -> Dict[str, object]:
-        manifest = self.list_manifest(manifest_type)
-        index = {item.get("slug") or _slugify(item.get("name", "")): item for item in manifest.get("items", [])}
-        normalized = _slugify(item_id)
-        if normalized not in index:
+        if manifest_type not in {"models", "loras"}:
+            raise ValueError("Manifest type must be 'models' or 'loras'")
+        item = self._manifest_index.get(manifest_type, item_id)
+        if item is None:
             raise ValueError(f"Manifest item '{item_id}' not found in {manifest_type}")
-        return {"item": index[normalized], "type": manifest_type, "source": manifest.get("source"), "errors": manifest.get("errors", [])}
+        manifest = self._load_manifest(manifest_type)
+        return {"item": item, "type": manifest_type, "source": manifest.get("source"), "errors": manifest.get("errors", [])}
 
     def _tail_log(self, log_path: Path, lines: int = 20) -> str:
-        if not log_path.exists():
-            return ""
-        with log_path.open("r", encoding="utf-8", errors="ignore") as handle:
-            content = handle.readlines()
-        if len(content) <= lines:
-            return "".join(content)
-        return "".join(content[-lines:])
+        return tail_text(log_path, lines)
 
     def _append_status_event(
         self, path: Path, level: str, event: str, message: str, detail: Optional[object] = None
@@ -310,21 +264,35 @@ class WebLauncherAPI:
             handle.write(json.dumps(payload))
             handle.write("\n")
 
-    def _load_status_events(self, path: Path, limit: int = 50) -> List[Dict[str, object]]:
-        if not path or not path.exists():
+    def _load_status_events(self, path: Optional[Path], limit: int = 50) -> List[Dict[str, object]]:
+        if not path:
             return []
+        return tail_events(path, limit)
 
-        events: List[Dict[str, object]] = []
-        with path.open("r", encoding="utf-8", errors="ignore") as handle:
-            for line in handle:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    events.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
-        return events[-limit:]
+    def _status_index(self, status_path: Path) -> StatusEventIndex:
+        with self._lock:
+            index = self._status_indexes.get(status_path)
+            if index is None:
+                index = StatusEventIndex(status_path)
+                self._status_indexes[status_path] = index
+            return index
+
+    def get_installation_events(self, job_id: str, after: int = 0, limit: int = 50) -> Dict[str, object]:
+        """Page a job's status events by byte-offset cursor using the persisted index."""
+
+        with self._lock:
+            job = self._install_jobs.get(job_id)
+        if job and job.status_path:
+            status_path = job.status_path
+        elif re.fullmatch(r"[A-Za-z0-9_.-]+", job_id) and not job_id.startswith("."):
+            status_path = self._log_dir / f"{job_id}.status.jsonl"
+        else:
+            raise ValueError(f"Unknown installation: {job_id}")
+        if not status_path.exists():
+            raise ValueError(f"Unknown installation: {job_id}")
+
+        page = self._status_index(status_path).page(after=max(after, 0), limit=max(1, min(limit, 500)))
+        return {"id": job_id, "after": after, **page}
 
     def _load_history(self) -> List[Dict[str, object]]:
         if not self._history_path.exists():
@@ -364,14 +332,16 @@ class WebLauncherAPI:
             self._append_status_event(job.status_path, level, "installer_completed", message, {"returncode": job.returncode})
         with self._lock:
             self._install_jobs[job.id] = job
+        self._install_events.unwatch(job.id, job.to_dict())
         self._record_history(job)
 
     def _start_job(self, *, models: List[str], loras: List[str], script_name: str) -> InstallJob:
         job_id = f"{Path(script_name).stem}-{uuid.uuid4().hex[:8]}"
         log_path = self._log_dir / f"{job_id}.log"
         status_path = self._log_dir / f"{job_id}.status.jsonl"
-        if status_path.exists():
-            status_path.unlink()
+        for stale_path in (status_path, status_path.with_name(status_path.name + ".idx")):
+            if stale_path.exists():
+                stale_path.unlink()
         env = {
             **os.environ,
             "HEADLESS": "1",
@@ -411,10 +381,11 @@ class WebLauncherAPI:
             process=process,
         )
 
-        monitor = threading.Thread(target=self._monitor_job, args=(job,), daemon=True)
-        monitor.start()
         with self._lock:
             self._install_jobs[job.id] = job
+        self._install_events.watch(job.id, status_path, log_path, job.to_dict())
+        monitor = threading.Thread(target=self._monitor_job, args=(job,), daemon=True)
+        monitor.start()
         return job
 
     def start_installation(self, models: Optional[List[str]] = None, loras: Optional[List[str]] = None) -> List[Dict[str, object]]:
@@ -459,6 +430,17 @@ class WebLauncherAPI:
             "history": self._load_history(),
         }
 
+    def installation_updates(self, after: Optional[int] = None, timeout: float = 15.0) -> Tuple[int, Optional[List[Tuple[int, Dict[str, object]]]]]:
+        """Wait for status/log lines appended after ``after``; ``None`` means the client must resync."""
+
+        if after is None:
+            return self._install_events.cursor, []
+        messages = self._install_events.wait(after, timeout)
+        if messages is None:
+            return self._install_events.cursor, None
+        cursor = messages[-1][0] if messages else after
+        return cursor, messages
+
     def _load_config(self) -> Dict[str, object]:
         loaded = config_service.load_config(str(self.config_path), env_prefix="", overrides=[])
         if loaded.migrated:
@@ -469,6 +451,8 @@ class WebLauncherAPI:
         config = self._load_config()
         config_service.deep_set(config, "selection", selection)
         config_service.save_config(config, str(self.config_path))
+        # Same-size rewrites within one mtime tick are invisible to stat-based version stamps.
+        self.config_revision += 1
         return selection
 
     def get_pairings(self) -> Dict[str, object]:
@@ -495,14 +479,10 @@ class WebLauncherAPI:
         if not isinstance(selection_loras, list):
             raise ValueError("loras must be a list of names")
 
-        manifests = self.get_manifests()
-        model_index = {item.get("name"): item for item in manifests.get("models", {}).get("items", [])}
-        lora_index = {item.get("name"): item for item in manifests.get("loras", {}).get("items", [])}
-
-        if selection_model and selection_model not in model_index:
+        if selection_model and self._manifest_index.find_by_name("models", selection_model) is None:
             raise ValueError(f"Unknown model '{selection_model}'")
 
-        invalid_loras = [name for name in selection_loras if name not in lora_index]
+        invalid_loras = [name for name in selection_loras if self._manifest_index.find_by_name("loras", name) is None]
         if invalid_loras:
             raise ValueError(f"Unknown LoRA entries: {', '.join(invalid_loras)}")
 
@@ -529,33 +509,121 @@ class WebLauncherAPI:
         return {"items": tools, "available_count": len(available), "total": len(tools)}
 
     def create_task(self, tool_id: str, payload: Dict[str, object]) -> Dict[str, object]:
+        lane, task_payload, runner = self._task_runner(tool_id, payload)
+        task = new_task(tool_id, payload=task_payload)
+        self.task_engine.submit(task, runner, lane=lane)
+        return serialize_task(task)
+
+    def _task_runner(self, tool_id: str, payload: Dict[str, object]):
+        """Return ``(lane, stored payload, runner)`` for a tool task; raises ``ValueError`` on bad input."""
+
+        tool = self._require_tool(tool_id)
+        # The service module (and its backend) is imported on the first task for this tool.
+        services = load_services(tool)
+        if not tool.run or not hasattr(services, tool.run):
+            raise ValueError(f"Tool {tool_id} is not yet wired to the launcher")
+        run = getattr(services, tool.run)
+        if not hasattr(services, "request_from_payload"):
+            return tool.kind, {}, run
+        # Payloads are validated here so bad input is a 400, not a failed task.
+        request = services.request_from_payload(payload)
+        return tool.kind, request.to_dict(), functools.partial(run, request)
+
+    def create_task_batch(self, tool_id: str, items: List[Dict[str, object]]) -> Dict[str, object]:
+        """Queue one job per voice (TTS) or language (ASR) group; each item still gets its own task."""
+
+        tool = self._require_tool(tool_id)
+        if not tool.batch:
+            batchable = sorted(spec.id for spec in list_tools() if spec.batch)
+            raise ValueError(f"Batch submission supports {', '.join(batchable)}, not {tool_id}")
+        if not isinstance(items, list) or not items:
+            raise ValueError("items must be a non-empty list of payloads")
+        if len(items) > MAX_BATCH_ITEMS:
+            raise ValueError(f"A batch holds at most {MAX_BATCH_ITEMS} items")
+        service = load_services(tool)
+        run_batch = getattr(service, tool.batch)
+
+        groups: Dict[str, List[Tuple[Task, object]]] = {}
+        tasks: List[Task] = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                raise ValueError(f"items[{index}] must be a JSON object")
+            try:
+                request = service.request_from_payload(item)
+            except ValueError as exc:
+                raise ValueError(f"items[{index}]: {exc}") from exc
+            task = new_task(tool_id, payload=request.to_dict())
+            tasks.append(task)
+            groups.setdefault(service.batch_key(request), []).append((task, request))
+
+        queued: List[Task] = []
+        try:
+            for members in groups.values():
+                runner = functools.partial(_run_batch_group, run_batch, {task.id: request for task, request in members})
+                queued.extend(self.task_engine.submit_batch([task for task, _ in members], runner, lane=tool.kind))
+        except TaskQueueFull:
+            # All or nothing: withdraw the groups that made it into the queue.
+            for task in queued:
+                try:
+                    self.task_engine.cancel(task.id)
+                except (KeyError, TaskStateError):
+                    pass
+            raise
+        return {
+            "tool": tool_id,
+            "groups": [{"key": key, "tasks": [task.id for task, _ in members]} for key, members in groups.items()],
+            "tasks": [serialize_task(task) for task in tasks],
+        }
+
+    def _require_tool(self, tool_id: str):
         tool = get_tool(tool_id)
         if not tool:
             raise ValueError(f"Unknown tool: {tool_id}")
         if not tool.available:
             raise ValueError(tool.availability_error or f"Tool {tool_id} is unavailable")
+        return tool
 
-        if tool_id == "tts":
-            task = tts_services.run_text_to_speech_from_payload(payload)
-        elif tool_id == "asr":
-            task = asr_services.run_asr_from_payload(payload)
-        elif tool_id == "voice_profiles":
-            task = voice_profiles_services.list_voice_profiles()
-        elif tool_id == "img2vid":
-            task = img2vid_services.run_img2vid_from_payload(payload)
-        elif tool_id == "txt2vid":
-            task = txt2vid_services.run_txt2vid_from_payload(payload)
-        else:
-            raise ValueError(f"Tool {tool_id} is not yet wired to the launcher")
+    def _recover_tasks(self) -> None:
+        """Re-queue tasks a previous launcher process left pending or running."""
 
-        with self._lock:
-            self._tasks[task.id] = task
+        if self.task_engine.store is None:
+            return
+        for task in self.task_engine.store.unfinished():
+            try:
+                lane, _, runner = self._task_runner(task.kind, task.payload)
+                task.status = "pending"
+                self.task_engine.submit(task, runner, lane=lane)
+            except (ValueError, TaskQueueFull, TaskStateError) as exc:
+                self.task_engine.store.put(mark_failed(task, f"Not recovered after restart: {exc}"))
+
+    def get_task(self, task_id: str) -> Dict[str, object]:
+        task = self.task_engine.get(task_id)
+        if task is None:
+            raise KeyError(task_id)
         return serialize_task(task)
 
-    def list_tasks(self) -> Dict[str, object]:
-        with self._lock:
-            tasks = [serialize_task(task) for task in self._tasks.values()]
-        return {"items": tasks}
+    def cancel_task(self, task_id: str) -> Dict[str, object]:
+        return serialize_task(self.task_engine.cancel(task_id))
+
+    def list_tasks(
+        self,
+        status: Optional[str] = None,
+        kind: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[int] = None,
+    ) -> Dict[str, object]:
+        if status and status not in STATUSES:
+            raise ValueError(f"Unknown task status: {status}")
+        if self.task_store is None:
+            tasks = [serialize_task(task) for task in self.task_engine.list()]
+            return {"items": tasks, "next": None, "lanes": self.task_engine.stats()}
+        page, next_cursor = self.task_store.query(status=status, kind=kind, limit=limit, cursor=cursor)
+        return {
+            "items": [serialize_task(task) for task in page],
+            "next": next_cursor,
+            "counts": self.task_store.counts(),
+            "lanes": self.task_engine.stats(),
+        }
 
     def compile_prompt(self, scene_json: Dict[str, object], feedback: Optional[str] = None) -> Dict[str, object]:
         if not isinstance(scene_json, dict):
@@ -576,18 +644,45 @@ class WebLauncherAPI:
         return {"scene": updated}
 
     def status(self) -> Dict[str, object]:
-        manifests = self.get_manifests()
         return {
             "actions": self.list_actions(),
             "manifest_counts": {
-                "models": len(manifests.get("models", {}).get("items", [])),
-                "loras": len(manifests.get("loras", {}).get("items", [])),
+                "models": self._manifest_index.count("models"),
+                "loras": self._manifest_index.count("loras"),
             },
             "characters": len(self.list_characters()),
             "tools": self.list_tools(),
         }
 
-    def gpu_diagnostics(self) -> Dict[str, object]:
+    def _artifacts(self) -> artifact_catalog.ArtifactCatalog:
+        if self._artifact_catalog is None:
+            self._artifact_catalog = artifact_catalog.ArtifactCatalog(self._artifact_db)
+        return self._artifact_catalog
+
+    def list_artifacts(self, artifact_type: Optional[str] = None) -> Dict[str, object]:
+        artifacts = self._artifacts()
+        return {"items": artifacts.records(artifact_type), "summary": artifacts.summary()}
+
+    def run_artifact_maintenance(self, operation: str, payload: Optional[Dict[str, object]] = None) -> Dict[str, object]:
+        payload = payload or {}
+        artifacts = self._artifacts()
+        if operation == "scan":
+            return artifacts.scan(hash_files=bool(payload.get("hash", False)))
+        if operation == "verify":
+            paths = payload.get("paths")
+            if paths is not None and not isinstance(paths, list):
+                raise ValueError("paths must be a list of artifact paths")
+            return artifacts.verify([Path(str(path)) for path in paths] if paths else None, rehash=bool(payload.get("rehash", False)))
+        if operation == "prune":
+            return artifacts.prune()
+        raise ValueError(f"Unknown artifact operation: {operation}")
+
+    def gpu_diagnostics(self, refresh: bool = False) -> Dict[str, object]:
+        """Cached GPU snapshot; re-probed in the background after ``AIHUB_GPU_PROBE_TTL`` or on ``refresh``."""
+
+        return self.gpu_cache.get(refresh=refresh)
+
+    def _probe_gpu(self) -> Dict[str, object]:
         script_path = self.shell_dir / "gpu_diagnostics.sh"
         env = {**os.environ, "HEADLESS": "1"}
         if script_path.exists():
@@ -610,6 +705,200 @@ class WebLauncherAPI:
         return collect_gpu_diagnostics()
 
 
+def _gpu_diagnostics(request: Request) -> object:
+    return request.api.gpu_diagnostics(refresh=request.arg("refresh", "0").lower() in {"1", "true", "yes"})
+
+
+def _installation_events(request: Request) -> object:
+    after, limit = request.arg("after", "0"), request.arg("limit", "50")
+    if not after.isdigit() or not limit.isdigit():
+        raise ValueError("after and limit must be non-negative integers")
+    try:
+        return request.api.get_installation_events(request.params["job_id"], after=int(after), limit=int(limit))
+    except ValueError as exc:
+        raise HTTPError(HTTPStatus.NOT_FOUND, str(exc)) from exc
+
+
+def _trigger_action(request: Request) -> object:
+    return request.api.trigger_action(request.json().get("action")), HTTPStatus.ACCEPTED
+
+
+def _compile_prompt(request: Request) -> object:
+    payload = request.json()
+    return request.api.compile_prompt(payload.get("scene", payload), payload.get("feedback"))
+
+
+def _apply_feedback(request: Request) -> object:
+    payload = request.json()
+    return request.api.apply_feedback(payload.get("scene", payload), payload.get("feedback", ""))
+
+
+def _start_installation(request: Request) -> object:
+    payload = request.json()
+    jobs = request.api.start_installation(models=payload.get("models", []), loras=payload.get("loras", []))
+    return {"jobs": jobs}, HTTPStatus.ACCEPTED
+
+
+def _create_task(request: Request) -> object:
+    payload = request.json()
+    try:
+        task = request.api.create_task(payload.get("tool"), payload.get("payload", payload))
+    except TaskQueueFull as exc:
+        raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, str(exc), {"Retry-After": "1"}) from exc
+    return Response(int(HTTPStatus.ACCEPTED), {"task": task}, {"Location": f"/api/tasks/{task['id']}"})
+
+
+def _list_tasks(request: Request) -> object:
+    limit, cursor = request.arg("limit", "50"), request.arg("cursor")
+    if not limit.isdigit() or (cursor is not None and not cursor.isdigit()):
+        raise ValueError("limit and cursor must be non-negative integers")
+    return request.api.list_tasks(
+        status=request.arg("status"),
+        kind=request.arg("kind"),
+        limit=int(limit),
+        cursor=int(cursor) if cursor is not None else None,
+    )
+
+
+def _run_batch_group(run_batch, requests_by_id: Dict[str, object], tasks: List[Task], on_result) -> None:
+    run_batch([requests_by_id[task.id] for task in tasks], tasks, on_result)
+
+
+def _create_task_batch(request: Request) -> object:
+    payload = request.json()
+    try:
+        batch = request.api.create_task_batch(payload.get("tool"), payload.get("items"))
+    except TaskQueueFull as exc:
+        raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, str(exc), {"Retry-After": "1"}) from exc
+    return batch, HTTPStatus.ACCEPTED
+
+
+def _task_detail(request: Request) -> object:
+    try:
+        return {"task": request.api.get_task(request.params["task_id"])}
+    except KeyError as exc:
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"Unknown task: {request.params['task_id']}") from exc
+
+
+def _cancel_task(request: Request) -> object:
+    try:
+        return {"task": request.api.cancel_task(request.params["task_id"])}
+    except KeyError as exc:
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"Unknown task: {request.params['task_id']}") from exc
+    except TaskStateError as exc:
+        raise HTTPError(HTTPStatus.CONFLICT, str(exc)) from exc
+
+
+def _manifest_paths(api: "WebLauncherAPI") -> List[Path]:
+    return [api.manifest_dir / "models.json", api.manifest_dir / "loras.json"]
+
+
+def _card_paths(api: "WebLauncherAPI") -> List[Path]:
+    root = api._card_registry.storage_root
+    return [root] + sorted(root.glob("*/card.json"))
+
+
+def _combine(*versions: Version) -> Version:
+    return "|".join(token for token, _ in versions), max(modified for _, modified in versions)
+
+
+def _manifest_version(request: Request) -> Optional[Version]:
+    return file_version(_manifest_paths(request.api))
+
+
+def _tools_version(request: Request) -> Optional[Version]:
+    generation, changed_at = registry_version()
+    return f"tools:{generation}", changed_at
+
+
+def _characters_version(request: Request) -> Optional[Version]:
+    return file_version(_card_paths(request.api))
+
+
+def _status_version(request: Request) -> Optional[Version]:
+    return _combine(_manifest_version(request), _characters_version(request), _tools_version(request))
+
+
+def _pairings_version(request: Request) -> Optional[Version]:
+    config_token, config_modified = file_version([request.api.config_path])
+    return _combine((f"{config_token}:{request.api.config_revision}", config_modified), _manifest_version(request))
+
+
+def build_api_router() -> Router:
+    """Route table for ``/api/*``; every route requires the bearer token when one is configured."""
+
+    router = Router(middleware=[timing, require_auth(lambda request: is_authorized(request.auth_token, request.headers))])
+    manifests = [cached(_manifest_version)]
+    add = router.add
+
+    add("GET", "/api/status", lambda request: request.api.status(), name="status", middleware=[cached(_status_version)])
+    add("GET", "/api/manifests", lambda request: request.api.get_manifests(), name="manifests", middleware=manifests)
+    add(
+        "GET",
+        "/api/manifests/<manifest_type>",
+        lambda request: request.api.list_manifest(request.params["manifest_type"]),
+        name="manifest",
+        middleware=manifests,
+    )
+    add(
+        "GET",
+        "/api/manifests/<manifest_type>/<item_id>",
+        lambda request: request.api.get_manifest_item(request.params["manifest_type"], request.params["item_id"]),
+        name="manifest_item",
+        middleware=manifests,
+    )
+    add(
+        "GET",
+        "/api/characters",
+        lambda request: {"items": request.api.list_characters()},
+        name="characters",
+        middleware=[cached(_characters_version)],
+    )
+    add("GET", "/api/actions", lambda request: {"items": request.api.list_actions()}, name="actions")
+    add("GET", "/api/installations", lambda request: request.api.list_installations(), name="installations")
+    add("GET", "/api/installations/<job_id>/events", _installation_events)
+    add("GET", "/api/tools", lambda request: request.api.list_tools(), name="tools", middleware=[cached(_tools_version)])
+    add("GET", "/api/tasks", _list_tasks)
+    add("GET", "/api/tasks/<task_id>", _task_detail)
+    add("GET", "/api/runtime/models", lambda request: default_residency().stats(), name="model_residency")
+    add("GET", "/api/hardware/gpu", _gpu_diagnostics, name="gpu")
+    add("GET", "/api/hardware/gpu/diagnostics", _gpu_diagnostics, name="gpu_diagnostics")
+    add(
+        "GET",
+        "/api/pairings",
+        lambda request: request.api.get_pairings(),
+        name="pairings",
+        middleware=[cached(_pairings_version)],
+    )
+    add("GET", "/api/artifacts", lambda request: request.api.list_artifacts(request.arg("type")), name="artifacts")
+
+    add("POST", "/api/actions", _trigger_action)
+    add("POST", "/api/prompt/compile", _compile_prompt)
+    add("POST", "/api/prompt/feedback", _apply_feedback)
+    add("POST", "/api/installations", _start_installation)
+    add("POST", "/api/tasks", _create_task)
+    add("POST", "/api/tasks/batch", _create_task_batch)
+    add("POST", "/api/tasks/<task_id>/cancel", _cancel_task)
+    add("POST", "/api/pairings", lambda request: request.api.update_pairings(request.json()), name="update_pairings")
+    add(
+        "POST",
+        "/api/artifacts/<operation>",
+        lambda request: request.api.run_artifact_maintenance(request.params["operation"], request.json()),
+        name="artifact_maintenance",
+    )
+    return router.compile()
+
+
+def is_authorized(auth_token: Optional[str], headers, query_token: Optional[str] = None) -> bool:
+    """Check a bearer token, ``X-AIHUB-TOKEN`` header, or ``?token=`` against ``auth_token``."""
+
+    if not auth_token:
+        return True
+    header = headers.get("Authorization", "")
+    alt_header = headers.get("X-AIHUB-TOKEN", "")
+    return header == f"Bearer {auth_token}" or alt_header == auth_token or query_token == auth_token
+
+
 class LauncherRequestHandler(SimpleHTTPRequestHandler):
     """Serve static assets and JSON APIs for the web launcher."""
 
@@ -620,28 +909,26 @@ class LauncherRequestHandler(SimpleHTTPRequestHandler):
 
     def do_GET(self) -> None:  # noqa: N802
         parsed = urlparse(self.path)
+        if parsed.path == "/api/installations/stream":
+            self._stream_installations(parse_qs(parsed.query))
+            return
         if parsed.path.startswith("/api/"):
-            self._handle_api_get(parsed.path)
+            self._dispatch_api("GET", parsed.path, parse_qs(parsed.query))
             return
         super().do_GET()
 
     def do_POST(self) -> None:  # noqa: N802
         parsed = urlparse(self.path)
         if parsed.path.startswith("/api/"):
-            self._handle_api_post(parsed.path)
+            self._dispatch_api("POST", parsed.path, parse_qs(parsed.query))
             return
         self.send_error(HTTPStatus.NOT_FOUND, "Unsupported POST path")
 
-    def _is_authorized(self) -> bool:
-        if not self.auth_token:
-            return True
-        expected = f"Bearer {self.auth_token}"
-        header = self.headers.get("Authorization", "")
-        alt_header = self.headers.get("X-AIHUB-TOKEN", "")
-        return header == expected or alt_header == self.auth_token
+    def _is_authorized(self, query_token: Optional[str] = None) -> bool:
+        return is_authorized(self.auth_token, self.headers, query_token)
 
-    def _require_auth(self) -> bool:
-        if self._is_authorized():
+    def _require_auth(self, query_token: Optional[str] = None) -> bool:
+        if self._is_authorized(query_token):
             return True
         self._send_json({"error": "Unauthorized"}, status=HTTPStatus.UNAUTHORIZED)
         return False
@@ -654,103 +941,86 @@ class LauncherRequestHandler(SimpleHTTPRequestHandler):
             return {}
         return json.loads(raw_body.decode("utf-8"))
 
-    def _send_json(self, payload: Dict, status: HTTPStatus = HTTPStatus.OK) -> None:
-        response = json.dumps(payload, indent=2).encode("utf-8")
+    def _send_json(self, payload: Dict, status: HTTPStatus = HTTPStatus.OK, extra_headers: Optional[Dict[str, str]] = None) -> None:
+        response, headers = encode_body(encode_json(payload), self.headers.get("Accept-Encoding"))
         self.send_response(status)
-        self.send_header("Content-Type", "application/json")
-        self.send_header("Content-Length", str(len(response)))
+        for name, value in {**(extra_headers or {}), **headers}.items():
+            self.send_header(name, value)
         self.end_headers()
         self.wfile.write(response)
 
-    def _handle_api_get(self, path: str) -> None:
-        if not self._require_auth():
+    def _dispatch_api(self, method: str, path: str, query: Dict[str, List[str]]) -> None:
+        request = Request(
+            method, path, query, self.headers, read_body=self._read_json_body, api=self.api, auth_token=self.auth_token
+        )
+        response = API_ROUTER.dispatch(request)
+        if response.body is None:
+            self._send_json(response.payload, status=HTTPStatus(response.status), extra_headers=response.headers)
             return
-        try:
-            if path.startswith("/api/manifests/"):
-                _, _, manifest_type, *rest = path.strip("/").split("/")
-                if rest:
-                    self._send_json(self.api.get_manifest_item(manifest_type, rest[0]))
-                else:
-                    self._send_json(self.api.list_manifest(manifest_type))
-                return
-            if path == "/api/status":
-                self._send_json(self.api.status())
-            elif path == "/api/manifests":
-                self._send_json(self.api.get_manifests())
-            elif path == "/api/characters":
-                self._send_json({"items": self.api.list_characters()})
-            elif path == "/api/actions":
-                self._send_json({"items": self.api.list_actions()})
-            elif path == "/api/installations":
-                self._send_json(self.api.list_installations())
-            elif path == "/api/tools":
-                self._send_json(self.api.list_tools())
-            elif path == "/api/tasks":
-                self._send_json(self.api.list_tasks())
-            elif path in {"/api/hardware/gpu", "/api/hardware/gpu/diagnostics"}:
-                self._send_json(self.api.gpu_diagnostics())
-            elif path == "/api/pairings":
-                self._send_json(self.api.get_pairings())
-            else:
-                self.send_error(HTTPStatus.NOT_FOUND, "Unknown API endpoint")
-        except Exception as exc:  # pragma: no cover - defensive routing guard
-            self._send_json({"error": str(exc)}, status=HTTPStatus.INTERNAL_SERVER_ERROR)
-
-    def _handle_api_post(self, path: str) -> None:
-        if not self._require_auth():
+        self.send_response(response.status)
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        if response.status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Length", str(len(response.body)))
+        self.end_headers()
+        if response.status != HTTPStatus.NOT_MODIFIED:
+            self.wfile.write(response.body)
+
+    def _stream_installations(self, query: Dict[str, List[str]]) -> None:
+        """Push installer status events and log lines as Server-Sent Events."""
+
+        # EventSource cannot set headers, so the stream also accepts ?token=.
+        if not self._require_auth((query.get("token") or [None])[0]):
             return
+        last_event_id = self.headers.get("Last-Event-ID", "")
+        after: Optional[int] = int(last_event_id) if last_event_id.isdigit() else None
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("X-Accel-Buffering", "no")
+        self.end_headers()
+        self.close_connection = True
+
         try:
-            if path == "/api/actions":
-                payload = self._read_json_body()
-                action_id = payload.get("action")
-                result = self.api.trigger_action(action_id)
-                self._send_json(result, status=HTTPStatus.ACCEPTED)
-            elif path == "/api/prompt/compile":
-                payload = self._read_json_body()
-                scene_payload = payload.get("scene", payload)
-                feedback = payload.get("feedback")
-                result = self.api.compile_prompt(scene_payload, feedback)
-                self._send_json(result)
-            elif path == "/api/prompt/feedback":
-                payload = self._read_json_body()
-                scene_payload = payload.get("scene", payload)
-                feedback = payload.get("feedback", "")
-                result = self.api.apply_feedback(scene_payload, feedback)
-                self._send_json(result)
-            elif path == "/api/installations":
-                payload = self._read_json_body()
-                models = payload.get("models", [])
-                loras = payload.get("loras", [])
-                jobs = self.api.start_installation(models=models, loras=loras)
-                self._send_json({"jobs": jobs}, status=HTTPStatus.ACCEPTED)
-            elif path == "/api/tasks":
-                payload = self._read_json_body()
-                tool_id = payload.get("tool")
-                task_payload = payload.get("payload", payload)
-                task = self.api.create_task(tool_id, task_payload)
-                self._send_json({"task": task}, status=HTTPStatus.ACCEPTED)
-            elif path == "/api/pairings":
-                payload = self._read_json_body()
-                result = self.api.update_pairings(payload)
-                self._send_json(result)
-            else:
-                self.send_error(HTTPStatus.NOT_FOUND, "Unknown API endpoint")
-        except ValueError as exc:
-            self._send_json({"error": str(exc)}, status=HTTPStatus.BAD_REQUEST)
-        except Exception as exc:  # pragma: no cover - defensive routing guard
-            self._send_json({"error": str(exc)}, status=HTTPStatus.INTERNAL_SERVER_ERROR)
+            while True:
+                cursor, messages = self.api.installation_updates(after)
+                self.wfile.write(sse_chunk(cursor, messages, after).encode("utf-8"))
+                self.wfile.flush()
+                after = cursor
+        except (BrokenPipeError, ConnectionResetError):
+            return
 
     def log_message(self, format: str, *args) -> None:  # noqa: A003
         # Keep launcher output minimal; rely on action log files instead.
         return
 
 
-def run_server(host: str = "127.0.0.1", port: int = 3939, auth_token: Optional[str] = None) -> None:
-    """Start the threaded HTTP server for the web launcher."""
+API_ROUTER = build_api_router()
+
+
+def run_server(
+    host: str = "127.0.0.1",
+    port: int = 3939,
+    auth_token: Optional[str] = None,
+    engine: str = "threaded",
+    max_concurrency: int = 32,
+) -> None:
+    """Start the web launcher on the threaded (default) or asyncio engine."""
 
     project_root = Path(__file__).resolve().parents[3]
     static_dir = Path(__file__).parent / "static"
-    api = WebLauncherAPI(project_root=project_root)
+    api = WebLauncherAPI(project_root=project_root, recover_tasks=True)
+    api.gpu_cache.prime()
+
+    if engine == "async":
+        from modules.runtime.web_launcher.async_server import run_async_server
+
+        try:
+            run_async_server(api, static_dir, host=host, port=port, auth_token=auth_token, max_concurrency=max_concurrency)
+        finally:
+            api.task_engine.shutdown(wait=False)
+        return
 
     def handler(*args, **kwargs):
         return LauncherRequestHandler(
@@ -767,10 +1037,18 @@ def run_server(host: str = "127.0.0.1", port: int = 3939, auth_token: Optional[s
     except KeyboardInterrupt:
         print("Shutting down web launcher...")
         server.shutdown()
+        api.task_engine.shutdown(wait=False)
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="AI Hub web launcher")
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const="-",
+        metavar="PATH",
+        help="Write a JSON cold-start profile (import tree, first-request timings) to PATH (default: stdout) and exit",
+    )
     subparsers = parser.add_subparsers(dest="command")
 
     serve_parser = subparsers.add_parser("serve", help="Run the web launcher server")
@@ -781,6 +1059,18 @@ def main() -> None:
         default=os.environ.get("AIHUB_WEB_TOKEN"),
         help="Optional bearer token required for API requests",
     )
+    serve_parser.add_argument(
+        "--engine",
+        choices=("threaded", "async"),
+        default=os.environ.get("AIHUB_WEB_ENGINE", "threaded"),
+        help="threaded: one thread per connection; async: asyncio keep-alive core with a bounded worker pool",
+    )
+    serve_parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=int(os.environ.get("AIHUB_WEB_MAX_CONCURRENCY", "32")),
+        help="Requests handled at once by the async engine",
+    )
 
     install_parser = subparsers.add_parser("install", help="Trigger curated installs without the UI")
     install_parser.add_argument("--models", nargs="*", default=[], help="Curated model names to install")
@@ -788,6 +1078,10 @@ def main() -> None:
     install_parser.add_argument("--wait", action="store_true", help="Block until installers complete")
 
     args = parser.parse_args()
+    if args.profile_startup:
+        from modules.startup_profile import run_profile_flag
+
+        raise SystemExit(run_profile_flag("web_launcher", args.profile_startup))
     command = args.command or "serve"
 
     project_root = Path(__file__).resolve().parents[3]
@@ -797,6 +1091,8 @@ def main() -> None:
             host=getattr(args, "host", "127.0.0.1"),
             port=getattr(args, "port", 3939),
             auth_token=getattr(args, "auth_token", None),
+            engine=getattr(args, "engine", "threaded"),
+            max_concurrency=getattr(args, "max_concurrency", 32),
         )
         return
 
@@ -39,6 +39,9 @@ const selectedModels = new Set();
 const selectedLoras = new Set();
 const activeTags = new Set();
 let authToken = localStorage.getItem("aihubAuthToken") || "";
+const installState = { jobs: [], history: [] };
+let installRenderPending = false;
+let installPollTimer = null;
 
 function setPanelLoading(container, message) {
   container.innerHTML = `<div class="placeholder"><span class="spinner" aria-hidden="true"></span> ${message}</div>`;
@@ -931,6 +934,33 @@ function renderJobs(jobs) {
       .join("");
   }
 
+function renderInstallations() {
+  installProgress.innerHTML = "";
+
+  const runningContainer = document.createElement("div");
+  runningContainer.innerHTML = `
+    <h3>Running</h3>
+    ${renderJobs(installState.jobs.filter((j) => j.status === "running"))}
+  `;
+
+  const historyContainer = document.createElement("div");
+  historyContainer.appendChild(renderHistory(installState.history));
+
+  installProgress.appendChild(runningContainer);
+  installProgress.appendChild(historyContainer);
+
+  installProgress.querySelectorAll("button[data-models]").forEach((btn) => {
+    btn.addEventListener("click", () => {
+      selectedModels.clear();
+      selectedLoras.clear();
+      JSON.parse(btn.dataset.models || "[]").forEach((name) => selectedModels.add(name));
+      JSON.parse(btn.dataset.loras || "[]").forEach((name) => selectedLoras.add(name));
+      installResult.textContent = "Loaded selection from history.";
+      renderManifestTable();
+    });
+  });
+}
+
 async function refreshInstallations(showLoading = false) {
   if (showLoading) {
     setPanelLoading(installProgress, "Loading installers…");
@@ -938,30 +968,9 @@ async function refreshInstallations(showLoading = false) {
 
   try {
     const installs = await fetchJson("/api/installations");
-    installProgress.innerHTML = "";
-
-    const runningContainer = document.createElement("div");
-    runningContainer.innerHTML = `
-      <h3>Running</h3>
-      ${renderJobs((installs.jobs || []).filter((j) => j.status === "running"))}
-    `;
-
-    const historyContainer = document.createElement("div");
-    historyContainer.appendChild(renderHistory(installs.history || []));
-
-    installProgress.appendChild(runningContainer);
-    installProgress.appendChild(historyContainer);
-
-    installProgress.querySelectorAll("button[data-models]").forEach((btn) => {
-      btn.addEventListener("click", () => {
-        selectedModels.clear();
-        selectedLoras.clear();
-        JSON.parse(btn.dataset.models || "[]").forEach((name) => selectedModels.add(name));
-        JSON.parse(btn.dataset.loras || "[]").forEach((name) => selectedLoras.add(name));
-        installResult.textContent = "Loaded selection from history.";
-        renderManifestTable();
-      });
-    });
+    installState.jobs = installs.jobs || [];
+    installState.history = installs.history || [];
+    renderInstallations();
   } catch (err) {
     statusPill.textContent = "API error";
     setPanelError(installProgress, `Failed to load installers: ${err.message}`, () => refreshInstallations(true));
@@ -969,6 +978,70 @@ async function refreshInstallations(showLoading = false) {
   }
 }
 
+function scheduleInstallRender() {
+  if (installRenderPending) return;
+  installRenderPending = true;
+  requestAnimationFrame(() => {
+    installRenderPending = false;
+    renderInstallations();
+  });
+}
+
+function applyInstallMessage(message) {
+  let job = installState.jobs.find((entry) => entry.id === message.job);
+  if (message.type === "job") {
+    if (job) {
+      Object.assign(job, message.data, { events: job.events, log_tail: job.log_tail });
+    } else {
+      installState.jobs.push({ ...message.data });
+    }
+    if (message.data.status !== "running") {
+      refreshInstallations().catch(() => {});
+      return;
+    }
+    scheduleInstallRender();
+    return;
+  }
+  if (!job) return;
+
+  if (message.type === "status") {
+    const event = message.data;
+    job.events = [...(job.events || []), event].slice(-50);
+    if (event.level === "error") job.last_error = event;
+    if (event.event === "mirror_selected" || event.event === "offline_used") job.last_mirror = event;
+  } else if (message.type === "log") {
+    const lines = (job.log_tail || "").split("\n").filter((line) => line !== "");
+    job.log_tail = lines.concat(message.data).slice(-20).join("\n") + "\n";
+  }
+  scheduleInstallRender();
+}
+
+function startInstallPolling() {
+  if (installPollTimer) return;
+  installPollTimer = setInterval(() => {
+    refreshInstallations().catch(() => {});
+  }, 5000);
+}
+
+function startInstallStream() {
+  if (!window.EventSource) {
+    startInstallPolling();
+    return;
+  }
+  const query = authToken ? `?token=${encodeURIComponent(authToken)}` : "";
+  const source = new EventSource(`/api/installations/stream${query}`);
+  ["job", "status", "log"].forEach((type) => {
+    source.addEventListener(type, (event) => applyInstallMessage(JSON.parse(event.data)));
+  });
+  // The server asks for a full snapshot when our cursor fell out of its buffer.
+  source.addEventListener("reset", () => refreshInstallations().catch(() => {}));
+  source.addEventListener("error", () => {
+    if (source.readyState === EventSource.CLOSED) {
+      startInstallPolling();
+    }
+  });
+}
+
 bootstrap();
 addCharacterRow();
 
@@ -984,6 +1057,4 @@ if (pairButton) {
 if (gpuRefresh) {
   gpuRefresh.addEventListener("click", () => loadGpuDiagnostics(true));
 }
-setInterval(() => {
-  refreshInstallations().catch(() => {});
-}, 5000);
+startInstallStream();
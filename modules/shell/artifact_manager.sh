@@ -1,9 +1,11 @@
 #!/bin/bash
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+ROOT_DIR="$(cd "$SCRIPT_DIR/../.." && pwd)"
 CONFIG_DIR="$HOME/.config/aihub"
 LOG_FILE="$CONFIG_DIR/install.log"
 STATE_FILE="$CONFIG_DIR/artifacts.json"
+CATALOG_DB="${AIHUB_ARTIFACT_DB:-$CONFIG_DIR/artifacts.sqlite}"
 CONFIG_STATE_FILE="${CONFIG_STATE_FILE:-$CONFIG_DIR/config.yaml}"
 CONFIG_ENV_FILE="${CONFIG_ENV_FILE:-$CONFIG_DIR/installer.conf}"
 
@@ -12,6 +14,9 @@ DO_SCAN=0
 DO_PRUNE=0
 DO_ROTATE=0
 DO_VERIFY=0
+DO_VERIFY_HASHES=0
+DO_DEDUP_REPORT=0
+DO_RECLAIM=0
 AUTO_MODE=0
 ARTIFACT_RECORD_TYPE=""
 ARTIFACT_RECORD_PATH=""
@@ -26,6 +31,8 @@ touch "$LOG_FILE"
 MODEL_DIRS=("${aihub_model_dir:-$HOME/ai-hub/models}" "$HOME/AI/WebUI/models/Stable-diffusion")
 LORA_DIRS=("${aihub_lora_dir:-$HOME/AI/LoRAs}" "$HOME/AI/oobabooga/loras")
 CACHE_DIRS=("$HOME/.cache/aihub" "/tmp/aihub" "/tmp/civitai_cache")
+# Extra app folders that often hold copies of the same checkpoints/LoRAs.
+DEDUP_DIRS=("$HOME/AI/KoboldAI/models" "$HOME/AI/oobabooga/models" "$HOME/AI/oobabooga/lora")
 LOG_ROTATE_THRESHOLD_MB="${artifacts_log_rotate_mb:-5}"
 CACHE_RETENTION_DAYS="${artifacts_cache_retention_days:-7}"
 MODEL_THRESHOLD_GB="${artifacts_model_threshold_gb:-150}"
@@ -49,6 +56,14 @@ human_size() {
   printf "%s %s" "$value" "${units[$unit]}"
 }
 
+# Run the Python artifact catalog (modules/runtime/downloads/catalog.py).
+# Returns non-zero when python3 is unavailable so callers can fall back to jq.
+artifact_catalog() {
+  command -v python3 >/dev/null 2>&1 || return 127
+  PYTHONPATH="$ROOT_DIR${PYTHONPATH:+:$PYTHONPATH}" \
+    python3 -m modules.runtime.downloads.catalog --db "$CATALOG_DB" --state-file "$STATE_FILE" "$@"
+}
+
 ensure_state_file() {
   if [[ ! -f "$STATE_FILE" ]]; then
     echo '{"records": [], "last_maintenance": ""}' >"$STATE_FILE"
@@ -72,6 +87,14 @@ record_artifact() {
   local type="$1" path="$2"
   local size=0 status="missing" target=""
 
+  local record
+  if record=$(artifact_catalog record "$type" "$path"); then
+    status=$(echo "$record" | jq -r '.status' 2>/dev/null || echo "unknown")
+    size=$(echo "$record" | jq -r '.size_bytes' 2>/dev/null || echo 0)
+    log_msg "Tracked $type: $path (${status}, $(human_size "${size:-0}"))"
+    return
+  fi
+
   if [[ -L "$path" ]]; then
     target=$(readlink -f "$path" || true)
     if [[ -e "$path" ]]; then
@@ -98,6 +121,18 @@ scan_dir_for_artifacts() {
 }
 
 scan_artifacts() {
+  local args=(scan)
+  for dir in "${MODEL_DIRS[@]}"; do args+=(--root "model=$dir"); done
+  for dir in "${LORA_DIRS[@]}"; do args+=(--root "lora=$dir"); done
+  for dir in "${CACHE_DIRS[@]}"; do args+=(--cache-dir "$dir"); done
+
+  local summary
+  if summary=$(artifact_catalog "${args[@]}"); then
+    log_msg "Artifact catalog updated: $(echo "$summary" | jq -c '{scanned, changed, unchanged, missing, elapsed_ms}' 2>/dev/null || echo "$summary")"
+    return
+  fi
+
+  log_msg "Artifact catalog unavailable; falling back to per-file scan."
   for dir in "${MODEL_DIRS[@]}"; do
     scan_dir_for_artifacts "model" "$dir"
   done
@@ -128,6 +163,40 @@ prune_old_artifacts() {
   if [[ $removed -eq 0 ]]; then
     log_msg "No cached artifacts qualified for pruning (retention ${CACHE_RETENTION_DAYS}d)."
   fi
+
+  local pruned
+  if pruned=$(artifact_catalog prune); then
+    log_msg "Dropped $(echo "$pruned" | jq '.removed | length' 2>/dev/null || echo 0) missing artifact(s) from the catalog."
+  fi
+
+  prune_blob_store
+}
+
+# Delete content-addressed blobs whose installed copies are all gone; without
+# this, removing a model from every app folder frees no disk space.
+prune_blob_store() {
+  command -v python3 >/dev/null 2>&1 || return
+  local roots=()
+  for dir in "${MODEL_DIRS[@]}" "${LORA_DIRS[@]}" "${DEDUP_DIRS[@]}"; do
+    [[ -d "$dir" ]] && roots+=("$dir")
+  done
+  local result
+  if result=$(PYTHONPATH="$ROOT_DIR${PYTHONPATH:+:$PYTHONPATH}" python3 -m modules.runtime.downloads.blobstore prune "${roots[@]}" 2>/dev/null); then
+    log_msg "Pruned $(echo "$result" | jq '.removed | length' 2>/dev/null || echo 0) unreferenced blob(s); freed $(human_size "$(echo "$result" | jq -r '.freed_bytes' 2>/dev/null || echo 0)")."
+  fi
+}
+
+verify_artifact_hashes() {
+  local report
+  if report=$(artifact_catalog verify); then
+    log_msg "Artifact hashes verified: $(echo "$report" | jq -r '.checked' 2>/dev/null) checked, no issues."
+  elif [[ -n "$report" ]]; then
+    while IFS= read -r issue; do
+      log_msg "Artifact issue: $issue"
+    done < <(echo "$report" | jq -r '.issues[] | "\(.issue): \(.path)"' 2>/dev/null)
+  else
+    log_msg "Artifact catalog unavailable; skipping hash verification."
+  fi
 }
 
 rotate_logs() {
@@ -170,6 +239,33 @@ verify_symlinks() {
   fi
 }
 
+dedup_artifacts() {
+  local action="$1"
+  local roots=()
+  for dir in "${MODEL_DIRS[@]}" "${LORA_DIRS[@]}" "${DEDUP_DIRS[@]}"; do
+    [[ -d "$dir" ]] && roots+=("$dir")
+  done
+  if [[ ${#roots[@]} -eq 0 ]]; then
+    log_msg "No model or LoRA directories found for deduplication."
+    return
+  fi
+
+  local result
+  if ! result=$(PYTHONPATH="$ROOT_DIR${PYTHONPATH:+:$PYTHONPATH}" python3 -m modules.runtime.downloads.blobstore "$action" "${roots[@]}"); then
+    log_msg "Blob store $action failed: ${result:-python3 unavailable}"
+    return
+  fi
+
+  if [[ "$action" == "report" ]]; then
+    while IFS= read -r line; do
+      log_msg "Duplicate: $line"
+    done < <(echo "$result" | jq -r '.groups[] | "\(.copies) copies of \(.sha256[0:12]) (\(.size_bytes) bytes): \(.paths | join(", "))"')
+    log_msg "Reclaimable by deduplication: $(human_size "$(echo "$result" | jq -r '.reclaimable_bytes')")"
+  else
+    log_msg "Deduplicated $(echo "$result" | jq '.linked | length') file(s); freed $(human_size "$(echo "$result" | jq -r '.freed_bytes')")."
+  fi
+}
+
 total_size_warning() {
   local total_models=0 total_loras=0
   for dir in "${MODEL_DIRS[@]}"; do
@@ -228,9 +324,12 @@ Usage: $(basename "$0") [options]
 
 Options:
   --scan              Record current artifacts (models, LoRAs, caches).
-  --prune             Remove stale caches and partial downloads.
+  --prune             Remove stale caches, partial downloads and unreferenced store blobs.
   --rotate-logs       Rotate install.log when above threshold.
   --verify-links      Check symlinks for tracked models/LoRAs.
+  --verify-hashes     Re-hash catalogued files whose size/mtime changed and report mismatches.
+  --dedup-report      List identical models/LoRAs stored more than once.
+  --reclaim           Replace duplicate copies with links into the content-addressed store.
   --auto              Run all maintenance steps in headless mode.
   --record <type> <path>  Track a specific artifact path.
   --schedule-days <n> Persist preferred maintenance cadence in config.
@@ -245,6 +344,9 @@ while [[ $# -gt 0 ]]; do
     --prune) DO_PRUNE=1 ;;
     --rotate-logs) DO_ROTATE=1 ;;
     --verify-links) DO_VERIFY=1 ;;
+    --verify-hashes) DO_VERIFY_HASHES=1 ;;
+    --dedup-report) DO_DEDUP_REPORT=1 ;;
+    --reclaim) DO_RECLAIM=1 ;;
     --auto) DO_SCAN=1; DO_PRUNE=1; DO_ROTATE=1; DO_VERIFY=1; AUTO_MODE=1 ;;
     --record)
       ARTIFACT_RECORD_TYPE="$2"
@@ -272,7 +374,7 @@ if [[ -n "$ARTIFACT_RECORD_TYPE" && -n "$ARTIFACT_RECORD_PATH" ]]; then
   exit 0
 fi
 
-if [[ $DO_SCAN -eq 0 && $DO_PRUNE -eq 0 && $DO_ROTATE -eq 0 && $DO_VERIFY -eq 0 ]]; then
+if [[ $DO_SCAN -eq 0 && $DO_PRUNE -eq 0 && $DO_ROTATE -eq 0 && $DO_VERIFY -eq 0 && $DO_VERIFY_HASHES -eq 0 && $DO_DEDUP_REPORT -eq 0 && $DO_RECLAIM -eq 0 ]]; then
   if [[ "$HEADLESS" -eq 1 ]]; then
     DO_SCAN=1; DO_PRUNE=1; DO_ROTATE=1; DO_VERIFY=1; AUTO_MODE=1
   else
@@ -284,6 +386,9 @@ fi
 [[ $DO_PRUNE -eq 1 ]] && prune_old_artifacts
 [[ $DO_ROTATE -eq 1 ]] && rotate_logs
 [[ $DO_VERIFY -eq 1 ]] && verify_symlinks
+[[ $DO_VERIFY_HASHES -eq 1 ]] && verify_artifact_hashes
+[[ $DO_DEDUP_REPORT -eq 1 ]] && dedup_artifacts report
+[[ $DO_RECLAIM -eq 1 ]] && dedup_artifacts reclaim
 
 total_size_warning
 update_last_maintenance
@@ -4,6 +4,11 @@ set -euo pipefail
 DOWNLOAD_STATUS_FILE="${DOWNLOAD_STATUS_FILE:-}"
 DOWNLOAD_LOG_FILE="${DOWNLOAD_LOG_FILE:-${LOG_FILE:-}}"
 DOWNLOAD_OFFLINE_BUNDLE="${DOWNLOAD_OFFLINE_BUNDLE:-${AIHUB_OFFLINE_BUNDLE:-${OFFLINE_BUNDLE_PATH:-}}}"
+DOWNLOAD_WORKERS="${DOWNLOAD_WORKERS:-4}"
+DOWNLOAD_PER_HOST="${DOWNLOAD_PER_HOST:-2}"
+DOWNLOAD_BANDWIDTH_LIMIT="${DOWNLOAD_BANDWIDTH_LIMIT:-0}"
+DOWNLOAD_CACHE_URL="${DOWNLOAD_CACHE_URL:-}"
+DOWNLOAD_HELPERS_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)"
 
 # Write a message to the installer log or stdout.
 download_log() {
@@ -34,30 +39,34 @@ emit_status_event() {
     '{timestamp:$ts, level:$lvl, event:$ev, message:$msg, detail: ((($detail_json | select(length>0) | try fromjson catch $detail) // $detail) // "")}' >> "$DOWNLOAD_STATUS_FILE"
 }
 
-check_mirror_health() {
-  local url="$1" label="${2:-mirror}";
-  if python3 - "$url" <<'PY'
-import sys
-import urllib.error
-import urllib.request
-url = sys.argv[1]
-try:
-    with urllib.request.urlopen(urllib.request.Request(url, method="HEAD"), timeout=8) as resp:
-        code = getattr(resp, "status", 0) or getattr(resp, "code", 0)
-        if code and int(code) >= 400:
-            sys.exit(1)
-except Exception:
-    sys.exit(1)
-PY
-  then
+# Probe URLs concurrently in one interpreter and print "<ok|fail|unknown>\t<url>"
+# lines, fastest expected mirror first (modules/runtime/downloads/mirrors.py).
+# Health scores persist in ~/.cache/aihub/mirror_health.json.
+rank_mirrors() {
+  command -v python3 >/dev/null 2>&1 || return 127
+  PYTHONPATH="$DOWNLOAD_HELPERS_ROOT${PYTHONPATH:+:$PYTHONPATH}" \
+    python3 -m modules.runtime.downloads.mirrors "$@"
+}
+
+report_mirror_health() {
+  local state="$1" url="$2" label="${3:-mirror}"
+  if [ "$state" = "fail" ]; then
+    download_log "Mirror failed health check ($label): $url"
+    emit_status_event "warning" "mirror_unreachable" "Mirror did not respond" "$label"
+    return 1
+  fi
+  if [ "$state" = "ok" ]; then
     download_log "Mirror healthy ($label): $url"
     emit_status_event "info" "mirror_healthy" "Mirror responded" "$label"
-    return 0
   fi
+  return 0
+}
 
-  download_log "Mirror failed health check ($label): $url"
-  emit_status_event "warning" "mirror_unreachable" "Mirror did not respond" "$label"
-  return 1
+check_mirror_health() {
+  local url="$1" label="${2:-mirror}"
+  local state
+  state=$(rank_mirrors "$url" 2>/dev/null | cut -f1)
+  report_mirror_health "${state:-fail}" "$url" "$label"
 }
 
 run_downloader() {
@@ -92,12 +101,41 @@ run_downloader() {
       [ -n "$header" ] && args+=(--header="$header")
       wget "${args[@]}" "$url"
       ;;
+    segmented)
+      # Multi-connection Range downloader (modules/runtime/downloads/segmented.py);
+      # falls back to one stream when the server ignores Range.
+      local args=(--connections "${DOWNLOAD_SEGMENTS:-4}" --status-file "${DOWNLOAD_STATUS_FILE:-}")
+      [ -n "$header" ] && args+=(--header "$header")
+      PYTHONPATH="$DOWNLOAD_HELPERS_ROOT${PYTHONPATH:+:$PYTHONPATH}" \
+        python3 -m modules.runtime.downloads.segmented "${args[@]}" "$url" "$dest"
+      ;;
     *)
       return 1
       ;;
   esac
 }
 
+# Print the SHA-256 of a file. The Python helper reuses and refreshes the
+# <file>.sha256.json sidecar (size + mtime + digest), so untouched files are
+# re-verified with a single stat() instead of a full read.
+file_sha256() {
+  local file="$1"
+  if command -v python3 >/dev/null 2>&1 && \
+    PYTHONPATH="$DOWNLOAD_HELPERS_ROOT${PYTHONPATH:+:$PYTHONPATH}" \
+      python3 -m modules.runtime.downloads.hashing digest "$file" 2>/dev/null; then
+    return 0
+  fi
+  sha256sum "$file" | awk '{print $1}'
+}
+
+# Run the content-addressed blob store CLI (modules/runtime/downloads/blobstore.py).
+# AIHUB_BLOB_STORE overrides the store root (default ~/ai-hub/blobs); "off" disables it.
+blob_store_cli() {
+  command -v python3 >/dev/null 2>&1 || return 127
+  PYTHONPATH="$DOWNLOAD_HELPERS_ROOT${PYTHONPATH:+:$PYTHONPATH}" \
+    python3 -m modules.runtime.downloads.blobstore "$@"
+}
+
 verify_checksum() {
   local file="$1" expected="$2" remove_on_fail="${3:-1}"
   if [ -z "$expected" ] || [ "$expected" = "null" ]; then
@@ -107,10 +145,12 @@ verify_checksum() {
   fi
 
   local actual
-  actual=$(sha256sum "$file" | awk '{print $1}')
+  actual=$(file_sha256 "$file")
+  expected=$(echo "$expected" | tr '[:upper:]' '[:lower:]')
   if [ "$actual" != "$expected" ]; then
     emit_status_event "error" "checksum_failed" "Checksum mismatch for $(basename "$file")" "$actual"
     download_log "Checksum mismatch for $file (expected: $expected, got: $actual); removing corrupt download"
+    rm -f "$file.sha256.json"
     if [ "$remove_on_fail" -eq 1 ]; then
       rm -f "$file"
     fi
@@ -159,6 +199,13 @@ download_with_retries() {
     return 0
   fi
 
+  if [ -n "$expected_checksum" ] && [ "$expected_checksum" != "null" ] && \
+    blob_store_cli materialize "$expected_checksum" "$dest" >/dev/null 2>&1; then
+    emit_status_event "info" "blob_reused" "Reused stored copy of $dest_basename" "" "{\"path\": \"$dest\"}"
+    download_log "Linked $dest from the blob store (checksum $expected_checksum)"
+    return 0
+  fi
+
   if [ -n "$offline_bundle" ] && [ -f "$offline_bundle" ]; then
     emit_status_event "info" "offline_candidate" "Validating offline bundle for $dest_basename" "" "{\"source\": \"$offline_bundle\"}"
     if verify_checksum "$offline_bundle" "$expected_checksum" 0; then
@@ -179,16 +226,45 @@ download_with_retries() {
     done <<< "$mirror_list"
   fi
 
+  # Probe every candidate at once and try the fastest expected mirror first.
+  local ranked_urls=() url_states=() ranked state ranked_url
+  ranked=$(rank_mirrors "${urls[@]}" 2>/dev/null || true)
+  while IFS=$'\t' read -r state ranked_url; do
+    [ -n "$ranked_url" ] || continue
+    ranked_urls+=("$ranked_url")
+    url_states+=("$state")
+  done <<< "$ranked"
+  if [ ${#ranked_urls[@]} -gt 0 ]; then
+    urls=("${ranked_urls[@]}")
+  else
+    url_states=()
+    for ranked_url in "${urls[@]}"; do url_states+=("unknown"); done
+  fi
+
+  if [ -n "$DOWNLOAD_CACHE_URL" ]; then
+    # The LAN download cache (modules/runtime/downloads/cache_proxy.py) is tried
+    # first and not probed: a probe on a cache miss would trigger the upstream fill.
+    local cache_query
+    cache_query=$(jq -rn --arg u "$url" --arg n "$dest_basename" --arg c "$expected_checksum" \
+      '"url=\($u|@uri)&name=\($n|@uri)" + (if ($c | length) > 0 and $c != "null" then "&sha256=\($c|ascii_downcase)" else "" end)')
+    urls=("${DOWNLOAD_CACHE_URL%/}/fetch?$cache_query" "${urls[@]}")
+    url_states=("unknown" "${url_states[@]}")
+  fi
+
   command -v aria2c >/dev/null 2>&1 && downloaders+=(aria2c)
+  if [ ${#downloaders[@]} -eq 0 ] && command -v python3 >/dev/null 2>&1; then
+    # Without aria2c, split large files across several connections before trying single-stream wget.
+    downloaders+=(segmented)
+  fi
   command -v wget >/dev/null 2>&1 && downloaders+=(wget)
 
   for idx in "${!urls[@]}"; do
     current_url="${urls[$idx]}"
     local mirror_label="mirror $((idx + 1))/${#urls[@]}"
     local detail_json
-    detail_json=$(jq -nc --arg url "$current_url" --arg label "$mirror_label" --argjson index "$((idx + 1))" --argjson total "${#urls[@]}" '{url:$url,label:$label,index:$index,total:$total}')
+    detail_json=$(jq -nc --arg url "$current_url" --arg mirror_label "$mirror_label" --argjson index "$((idx + 1))" --argjson total "${#urls[@]}" '{url:$url,label:$mirror_label,index:$index,total:$total}')
 
-    if ! check_mirror_health "$current_url" "$mirror_label"; then
+    if ! report_mirror_health "${url_states[$idx]}" "$current_url" "$mirror_label"; then
       failures+=("Health check failed for $current_url")
       emit_status_event "warning" "mirror_unhealthy" "Skipping mirror after failed probe" "" "$detail_json"
       if (( idx + 1 < ${#urls[@]} )); then
@@ -230,6 +306,9 @@ download_with_retries() {
           if verify_checksum "$dest" "$expected_checksum"; then
             download_log "Download succeeded with $downloader from $current_url (${mirror_label})"
             emit_status_event "info" "download_complete" "Completed download for $(basename "$dest")" "$downloader"
+            if [ -n "$expected_checksum" ] && [ "$expected_checksum" != "null" ]; then
+              blob_store_cli ingest "$dest" --checksum "$expected_checksum" >/dev/null 2>&1 || true
+            fi
             return 0
           else
             failures+=("Checksum failed via $downloader at $current_url")
@@ -258,3 +337,28 @@ download_with_retries() {
   download_log "Download failed after attempting ${downloaders[*]} and mirrors: $dest (failures: ${failures[*]})"
   return 1
 }
+
+
+# Download several curated manifest entries concurrently via the Python scheduler.
+# Usage: run_download_scheduler manifest dest_dir names [header]
+# Emits the same status events as download_with_retries; returns 0 if any item succeeded.
+run_download_scheduler() {
+  local manifest="$1" dest_dir="$2" names="$3" header="${4:-}"
+  local args=(
+    --manifest "$manifest"
+    --dest-dir "$dest_dir"
+    --names "$names"
+    --workers "$DOWNLOAD_WORKERS"
+    --per-host "$DOWNLOAD_PER_HOST"
+    --bandwidth-limit "$DOWNLOAD_BANDWIDTH_LIMIT"
+  )
+  [ -n "$header" ] && args+=(--header "$header")
+  [ -n "$DOWNLOAD_STATUS_FILE" ] && args+=(--status-file "$DOWNLOAD_STATUS_FILE")
+  [ -n "$DOWNLOAD_LOG_FILE" ] && args+=(--log-file "$DOWNLOAD_LOG_FILE")
+  [ -n "$DOWNLOAD_OFFLINE_BUNDLE" ] && args+=(--offline-bundle "$DOWNLOAD_OFFLINE_BUNDLE")
+  [ -n "$DOWNLOAD_CACHE_URL" ] && args+=(--cache-url "$DOWNLOAD_CACHE_URL")
+
+  download_log "Scheduling parallel downloads ($DOWNLOAD_WORKERS workers, $DOWNLOAD_PER_HOST per host) from $(basename "$manifest")"
+  PYTHONPATH="$DOWNLOAD_HELPERS_ROOT${PYTHONPATH:+:$PYTHONPATH}" \
+    python3 -m modules.runtime.downloads.scheduler "${args[@]}" >/dev/null
+}
@@ -10,7 +10,8 @@ TMP_SELECTED_TAGS="/tmp/lora_selected_tags.txt"
 TMP_MATCHES="/tmp/lora_filtered_results.txt"
 TMP_SOURCE_INFO="/tmp/civitai_lora_source.txt"
 INSTALL_DIR="$HOME/AI/LoRAs"
-MANIFEST_DIR="$SCRIPT_DIR/../manifests"
+ROOT_DIR="$(cd "$SCRIPT_DIR/../.." && pwd)"
+MANIFEST_DIR="$ROOT_DIR/manifests"
 LORA_MANIFEST="$MANIFEST_DIR/loras.json"
 FORCE_CURATED_SELECTION=0
 HEADLESS="${HEADLESS:-0}"
@@ -192,6 +193,12 @@ install_curated_loras_by_name() {
   local names_raw="$1"
   local download_success=false
 
+  if [[ "$HEADLESS" -eq 1 && "${AIHUB_PARALLEL_DOWNLOADS:-1}" != "0" ]]; then
+    mkdir -p "$INSTALL_DIR"
+    run_download_scheduler "$LORA_MANIFEST" "$INSTALL_DIR" "$names_raw"
+    return
+  fi
+
   while IFS= read -r name; do
     [ -z "$name" ] && continue
     local item
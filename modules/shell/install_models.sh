@@ -7,7 +7,8 @@ LOG_FILE="$HOME/.config/aihub/install.log"
 MODEL_DIR="$HOME/ai-hub/models"
 WEBUI_SD_DIR="$HOME/AI/WebUI/models/Stable-diffusion"
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
-MANIFEST_DIR="$SCRIPT_DIR/../manifests"
+ROOT_DIR="$(cd "$SCRIPT_DIR/../.." && pwd)"
+MANIFEST_DIR="$ROOT_DIR/manifests"
 MODEL_MANIFEST="$MANIFEST_DIR/models.json"
 HEADLESS="${HEADLESS:-0}"
 FORCE_CURATED_SELECTION=0
@@ -198,6 +199,12 @@ install_curated_models_by_name() {
   local names_raw="$1"
   local download_success=false
 
+  if [[ "$HEADLESS" -eq 1 && "${AIHUB_PARALLEL_DOWNLOADS:-1}" != "0" ]]; then
+    mkdir -p "$MODEL_DIR"
+    run_download_scheduler "$MODEL_MANIFEST" "$MODEL_DIR" "$names_raw"
+    return
+  fi
+
   while IFS= read -r name; do
     [ -z "$name" ] && continue
     local item
@@ -0,0 +1,255 @@
+"""Cold-start profiler for the AI Hub entry points.
+
+- Purpose: back the ``--profile-startup`` flag of the web launcher,
+  ``launcher/aihub_menu.py`` and ``modules/config_service/config_service.py``.
+  Each profile runs the entry point in a fresh interpreter under
+  ``-X importtime`` and records a per-module import tree (self and cumulative
+  time), a breakdown of the first request or command the entry point serves,
+  and the wall time of the whole cold start.
+- Assumptions: the child interpreter is ``sys.executable`` started from the
+  project root; the first-request probes call the same functions the entry
+  points call on startup and only read configuration (the web launcher probe
+  also creates its cache directories, as a real start would).
+- Side effects: spawns one short-lived Python process per profile and writes
+  the JSON report to the requested path (or stdout for ``-``).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+TARGET_MODULES = {
+    "web_launcher": "modules.runtime.web_launcher.server",
+    "menu": "launcher.aihub_menu",
+    "config_service": "modules.config_service.config_service",
+}
+WEB_FIRST_REQUESTS = ("/api/status", "/api/tools", "/api/manifests", "/api/characters")
+SLOWEST_IMPORTS = 15
+PHASES_MARKER = "AIHUB_STARTUP_PHASES "
+
+
+class PhaseTimer:
+    """Record named, sequential wall-clock phases in milliseconds."""
+
+    def __init__(self) -> None:
+        self.phases: List[Dict[str, object]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        entry: Dict[str, object] = {"name": name}
+        try:
+            yield
+        except Exception as exc:
+            entry["error"] = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            entry["ms"] = round((time.perf_counter() - started) * 1000, 3)
+            self.phases.append(entry)
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, object]]:
+    """Turn ``-X importtime`` output into a tree of ``{module, self_ms, cumulative_ms, children}`` nodes.
+
+    CPython prints children before their parent, one level deeper; pending nodes
+    are collected per depth and adopted by the next line one level up.
+    """
+
+    pending: Dict[int, List[Dict[str, object]]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        node = {
+            "module": name.strip(),
+            "self_ms": int(fields[0]) / 1000,
+            "cumulative_ms": int(fields[1]) / 1000,
+            "children": pending.pop(depth + 1, []),
+        }
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def _walk(nodes: List[Dict[str, object]]) -> Iterator[Dict[str, object]]:
+    for node in nodes:
+        yield node
+        yield from _walk(node["children"])  # type: ignore[arg-type]
+
+
+def find_module(tree: List[Dict[str, object]], module: str) -> Optional[Dict[str, object]]:
+    return next((node for node in _walk(tree) if node["module"] == module), None)
+
+
+def _import(module: str):
+    # A plain ``__import__`` goes through the C import path that ``-X importtime``
+    # instruments; ``importlib.import_module`` would hide the target's own line.
+    __import__(module)
+    return sys.modules[module]
+
+
+def _probe_web_launcher(timer: PhaseTimer) -> None:
+    with timer.phase("import"):
+        server = _import(TARGET_MODULES["web_launcher"])
+        from modules.runtime.web_launcher.router import Request
+    with timer.phase("api_init"):
+        api = server.WebLauncherAPI(project_root=PROJECT_ROOT)
+    try:
+        for path in WEB_FIRST_REQUESTS:
+            with timer.phase(f"GET {path}"):
+                server.API_ROUTER.dispatch(Request("GET", path, api=api))
+    finally:
+        api.task_engine.shutdown(wait=False)
+
+
+def _probe_menu(timer: PhaseTimer) -> None:
+    with timer.phase("import"):
+        menu = _import(TARGET_MODULES["menu"])
+    with timer.phase("parse_args"):
+        menu.build_argument_parser().parse_args([])
+    with timer.phase("detect_gpu"):
+        menu.detect_gpu()
+    with timer.phase("load_manifests"):
+        menu.load_manifests()
+
+
+def _probe_config_service(timer: PhaseTimer) -> None:
+    with timer.phase("import"):
+        service = _import(TARGET_MODULES["config_service"])
+    with timer.phase("parse_args"):
+        args = service.build_arg_parser().parse_args(["export", "--format", "json"])
+    with timer.phase("load_config"):
+        loaded = service.load_config(args.config, args.env_prefix, args.overrides)
+    with timer.phase("export"):
+        json.dumps(loaded.data)
+
+
+PROBES: Dict[str, Callable[[PhaseTimer], None]] = {
+    "web_launcher": _probe_web_launcher,
+    "menu": _probe_menu,
+    "config_service": _probe_config_service,
+}
+
+
+def _run_child(target: str) -> int:
+    timer = PhaseTimer()
+    error = None
+    try:
+        PROBES[target](timer)
+    except (Exception, SystemExit) as exc:  # reported in the profile instead of a traceback
+        error = f"{type(exc).__name__}: {exc}"
+    sys.stdout.write(PHASES_MARKER + json.dumps({"phases": timer.phases, "error": error}) + "\n")
+    return 0
+
+
+def profile_startup(target: str, budget_ms: Optional[float] = None) -> Dict[str, object]:
+    """Cold-start ``target`` in a child interpreter and return the profile report."""
+
+    if target not in PROBES:
+        raise ValueError(f"Unknown startup target '{target}'; expected one of {', '.join(sorted(PROBES))}")
+    command = [sys.executable, "-X", "importtime", "-m", "modules.startup_profile", "--child", target]
+    started = time.perf_counter()
+    completed = subprocess.run(command, cwd=PROJECT_ROOT, capture_output=True, text=True)
+    cold_start_ms = round((time.perf_counter() - started) * 1000, 3)
+
+    child: Dict[str, object] = {"phases": [], "error": None}
+    for line in completed.stdout.splitlines():
+        if line.startswith(PHASES_MARKER):
+            child = json.loads(line[len(PHASES_MARKER) :])
+    if completed.returncode != 0 and not child["error"]:
+        messages = [line for line in completed.stderr.splitlines() if line.strip() and not line.startswith("import time:")]
+        child["error"] = messages[-1] if messages else f"exit code {completed.returncode}"
+
+    tree = parse_importtime(completed.stderr)
+    nodes = list(_walk(tree))
+    slowest = sorted(nodes, key=lambda node: node["self_ms"], reverse=True)[:SLOWEST_IMPORTS]
+    phases = child["phases"]
+    report: Dict[str, object] = {
+        "target": target,
+        "module": TARGET_MODULES[target],
+        "python": sys.version.split()[0],
+        "cold_start_ms": cold_start_ms,
+        "imports": {
+            "count": len(nodes),
+            "total_ms": round(sum(node["cumulative_ms"] for node in tree), 3),
+            "slowest": [{"module": node["module"], "self_ms": node["self_ms"]} for node in slowest],
+            "tree": tree,
+        },
+        "first_request": {
+            "phases": phases,
+            "total_ms": round(sum(phase["ms"] for phase in phases), 3),  # type: ignore[union-attr]
+        },
+        "error": child["error"],
+    }
+    if budget_ms is not None:
+        report["budget_ms"] = budget_ms
+        report["over_budget"] = cold_start_ms > budget_ms
+    return report
+
+
+def write_report(report: Dict[str, object], output: str) -> None:
+    text = json.dumps(report, indent=2) + "\n"
+    if output == "-":
+        sys.stdout.write(text)
+        return
+    path = Path(output).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    budget = f" (over the {report['budget_ms']:.0f} ms budget)" if report.get("over_budget") else ""
+    print(f"[startup] {report['target']}: cold start {report['cold_start_ms']:.0f} ms{budget}; profile written to {path}", file=sys.stderr)
+
+
+def _suffixed(output: str, target: str) -> str:
+    path = Path(output)
+    return str(path.with_name(f"{path.stem}.{target}{path.suffix or '.json'}"))
+
+
+def run_profile_flag(target: str, output: str) -> int:
+    """Handle an entry point's ``--profile-startup [PATH]`` flag."""
+
+    budget = os.environ.get("AIHUB_STARTUP_BUDGET_MS")
+    report = profile_startup(target, budget_ms=float(budget) if budget else None)
+    write_report(report, output)
+    return 1 if report["error"] or report.get("over_budget") else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Profile AI Hub entry point cold starts")
+    parser.add_argument("targets", nargs="*", help=f"Entry points to profile: {', '.join(sorted(PROBES))} (default: all)")
+    parser.add_argument("--output", default="-", help="Where to write the JSON report (default: stdout)")
+    parser.add_argument("--budget-ms", type=float, help="Fail when a cold start takes longer than this")
+    parser.add_argument("--child", choices=sorted(PROBES), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        return _run_child(args.child)
+    unknown = sorted(set(args.targets) - set(PROBES))
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(unknown)}")
+    reports = [profile_startup(target, args.budget_ms) for target in args.targets or sorted(PROBES)]
+    if len(reports) == 1:
+        write_report(reports[0], args.output)
+    elif args.output == "-":
+        write_report({"profiles": reports}, "-")
+    else:
+        for report in reports:
+            write_report(report, _suffixed(args.output, str(report["target"])))
+    return 1 if any(report["error"] or report.get("over_budget") for report in reports) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
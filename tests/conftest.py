@@ -6,3 +6,34 @@ ROOT = Path(__file__).resolve().parent.parent
 ROOT_STR = str(ROOT)
 if ROOT_STR not in sys.path:
     sys.path.insert(0, ROOT_STR)
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_blob_store(tmp_path, monkeypatch):
+    """Keep download tests from linking files into the real ~/ai-hub/blobs store."""
+
+    monkeypatch.setenv("AIHUB_BLOB_STORE", str(tmp_path / "blob-store"))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_task_store(tmp_path, monkeypatch):
+    """Keep launcher tests from recording tasks in the real ~/.cache task database."""
+
+    monkeypatch.setenv("AIHUB_TASK_DB", str(tmp_path / "tasks.sqlite"))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_user_cache(tmp_path, monkeypatch):
+    """Keep mirror-health scores (and other XDG cache files) out of the real ~/.cache."""
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg-cache"))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_tool_outputs(tmp_path, monkeypatch):
+    """Keep placeholder TTS/video tools from writing into the real ~/.cache/aihub."""
+
+    for module, name in (("audio.tts", "tts"), ("video.txt2vid", "txt2vid"), ("video.img2vid", "img2vid")):
+        monkeypatch.setattr(f"modules.runtime.{module}.core.OUTPUT_DIR", tmp_path / "tool-outputs" / name)
@@ -0,0 +1,106 @@
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from modules.runtime.downloads.blobstore import BlobStore  # noqa: E402
+from modules.runtime.downloads.scheduler import DownloadItem, DownloadScheduler  # noqa: E402
+from modules.runtime.downloads.status import StatusReporter  # noqa: E402
+
+
+def test_ingest_and_materialize_share_one_inode(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    source = tmp_path / "webui" / "model.safetensors"
+    source.parent.mkdir()
+    source.write_bytes(b"checkpoint")
+    digest = hashlib.sha256(b"checkpoint").hexdigest()
+
+    blob = store.ingest(source, digest.upper())
+    assert blob == store.path_for(digest)
+    assert store.has(digest)
+
+    kobold = tmp_path / "kobold" / "model.safetensors"
+    assert store.materialize(digest, kobold) == "hardlink"
+    assert os.path.samefile(kobold, source)
+    assert store.materialize(digest, kobold) == "existing"
+
+    linked = tmp_path / "tavern" / "model.safetensors"
+    assert store.materialize(digest, linked, mode="symlink") == "symlink"
+    assert linked.resolve() == blob.resolve()
+
+    with pytest.raises(ValueError):
+        store.path_for("../../etc/passwd")
+
+
+def test_prune_removes_only_unreferenced_blobs(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    digests = {}
+    for name in ("kept", "linked", "deleted"):
+        source = tmp_path / "webui" / f"{name}.safetensors"
+        source.parent.mkdir(exist_ok=True)
+        source.write_bytes(name.encode())
+        digests[name] = hashlib.sha256(name.encode()).hexdigest()
+        store.ingest(source, digests[name])
+    tavern = tmp_path / "tavern" / "linked.safetensors"
+    store.materialize(digests["linked"], tavern, mode="symlink")
+    (tmp_path / "webui" / "linked.safetensors").unlink()
+    (tmp_path / "webui" / "deleted.safetensors").unlink()
+
+    preview = store.prune([tmp_path / "tavern"], dry_run=True)
+    assert [entry["sha256"] for entry in preview["removed"]] == [digests["deleted"]]
+    assert store.has(digests["deleted"])
+
+    result = store.prune([tmp_path / "tavern"])
+    assert result["freed_bytes"] == len(b"deleted")
+    assert not store.has(digests["deleted"])
+    assert store.has(digests["kept"]) and tavern.read_bytes() == b"linked"
+
+
+def test_report_and_reclaim_duplicates(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    webui = tmp_path / "webui"
+    kobold = tmp_path / "kobold"
+    webui.mkdir()
+    kobold.mkdir()
+    for directory in (webui, kobold):
+        (directory / "shared.safetensors").write_bytes(b"same weights")
+    (webui / "unique.safetensors").write_bytes(b"diff weights")  # same size, different content
+    os.link(webui / "shared.safetensors", webui / "shared-alias.safetensors")
+
+    report = store.report([webui, kobold])
+    assert len(report["groups"]) == 1
+    group = report["groups"][0]
+    assert group["copies"] == 2
+    assert group["reclaimable_bytes"] == len(b"same weights")
+
+    planned = store.reclaim(report, dry_run=True)
+    assert planned["dry_run"] and not os.path.samefile(webui / "shared.safetensors", kobold / "shared.safetensors")
+
+    result = store.reclaim(report)
+    assert result["freed_bytes"] == len(b"same weights")
+    assert os.path.samefile(webui / "shared.safetensors", kobold / "shared.safetensors")
+    assert store.report([webui, kobold])["groups"] == []
+
+
+def test_scheduler_reuses_stored_blob_instead_of_downloading(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    original = tmp_path / "models" / "base.ckpt"
+    original.parent.mkdir()
+    original.write_bytes(b"base checkpoint")
+    digest = hashlib.sha256(b"base checkpoint").hexdigest()
+    store.ingest(original, digest)
+
+    status_file = tmp_path / "status.jsonl"
+    scheduler = DownloadScheduler(reporter=StatusReporter(status_file), blob_store=store, retries=1, backoff=0)
+    # The URL is unreachable: success proves no network fetch happened.
+    item = DownloadItem("Base", "http://127.0.0.1:9/base.ckpt", tmp_path / "webui" / "base.ckpt", digest.upper())
+    result = scheduler.run([item])[0]
+
+    assert result.status == "blob_reused"
+    assert os.path.samefile(item.dest, original)
+    assert '"event":"blob_reused"' in status_file.read_text()
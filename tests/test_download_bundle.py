@@ -0,0 +1,171 @@
+import hashlib
+import http.client
+import json
+import sys
+import threading
+import urllib.error
+import urllib.request
+from functools import partial
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from modules.runtime.downloads import bundle  # noqa: E402
+from modules.runtime.downloads.cache_proxy import create_server  # noqa: E402
+from modules.runtime.downloads.scheduler import DownloadItem, DownloadScheduler, cache_fetch_url  # noqa: E402
+from modules.runtime.downloads.status import StatusReporter  # noqa: E402
+
+
+class _CountingHandler(SimpleHTTPRequestHandler):
+    hits = []
+
+    def do_GET(self):  # noqa: N802 - http.server API
+        type(self).hits.append(self.path)
+        super().do_GET()
+
+    def log_message(self, format, *args):  # noqa: A002 - http.server API
+        return
+
+
+def _serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+@pytest.fixture()
+def upstream(tmp_path):
+    directory = tmp_path / "upstream"
+    directory.mkdir()
+    handler = type("Handler", (_CountingHandler,), {"hits": []})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(handler, directory=str(directory)))
+    thread = _serve(server)
+    yield directory, f"http://127.0.0.1:{server.server_address[1]}", handler
+    server.shutdown()
+    thread.join(timeout=5)
+
+
+@pytest.fixture()
+def cache(tmp_path, upstream):
+    _, base_url, _ = upstream
+    server = create_server(tmp_path / "cache", port=0, allowed_hosts=[base_url.split("//", 1)[1]])
+    thread = _serve(server)
+    yield tmp_path / "cache", f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    thread.join(timeout=5)
+
+
+def _publish(directory: Path, name: str, payload: bytes) -> str:
+    (directory / name).write_bytes(payload)
+    return hashlib.sha256(payload).hexdigest().upper()
+
+
+def test_bundle_build_writes_index_and_verifies(tmp_path, upstream, capsys):
+    directory, base_url, _ = upstream
+    manifest = tmp_path / "models.json"
+    items = []
+    for name in ("alpha", "beta"):
+        checksum = _publish(directory, f"{name}.safetensors", name.encode() * 100)
+        items.append({"name": name, "url": f"{base_url}/{name}.safetensors", "filename": f"{name}.safetensors", "checksum": checksum})
+    manifest.write_text(json.dumps({"items": items}), encoding="utf-8")
+    out = tmp_path / "bundle"
+
+    assert bundle.main(["build", "--manifest", str(manifest), "--out", str(out)]) == 0
+    index = json.loads((out / "bundle_index.json").read_text(encoding="utf-8"))
+    assert [(item["filename"], item["size_bytes"]) for item in index["items"]] == [("alpha.safetensors", 500), ("beta.safetensors", 400)]
+    assert index["items"][0]["sha256"] == items[0]["checksum"].lower()
+
+    capsys.readouterr()
+    assert bundle.main(["verify", str(out)]) == 0
+    (out / "beta.safetensors").write_bytes(b"x" * 400)
+    (out / "beta.safetensors.sha256.json").unlink()
+    capsys.readouterr()
+    assert bundle.main(["verify", str(out)]) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report["problems"] == [{"filename": "beta.safetensors", "issue": "checksum_mismatch"}]
+
+
+def test_cache_fetches_upstream_once_and_serves_ranges(tmp_path, upstream, cache):
+    directory, base_url, handler = upstream
+    cache_dir, cache_url = cache
+    checksum = _publish(directory, "model.ckpt", b"0123456789" * 1000)
+    item_url = f"{base_url}/model.ckpt"
+
+    for machine in ("a", "b", "c"):
+        scheduler = DownloadScheduler(reporter=StatusReporter(), cache_url=cache_url, retries=1, backoff=0)
+        result = scheduler.run([DownloadItem("Model", item_url, tmp_path / machine / "model.ckpt", checksum)])[0]
+        assert result.status == "downloaded"
+        assert result.url.startswith(cache_url)
+        assert (tmp_path / machine / "model.ckpt").read_bytes() == b"0123456789" * 1000
+
+    assert handler.hits == ["/model.ckpt"]
+    assert json.loads((cache_dir / "bundle_index.json").read_text())["items"][0]["sha256"] == checksum.lower()
+
+    request = urllib.request.Request(cache_fetch_url(cache_url, item_url, checksum), headers={"Range": "bytes=9990-"})
+    with urllib.request.urlopen(request) as response:
+        assert response.status == 206
+        assert response.read() == b"0123456789"
+
+
+def test_cache_rejects_bad_checksums_and_foreign_hosts(tmp_path, upstream, cache):
+    directory, base_url, _ = upstream
+    cache_dir, cache_url = cache
+    _publish(directory, "tampered.bin", b"not what the manifest says")
+
+    # Depending on timing the fill fails before headers (502) or mid-stream;
+    # either way the client must never see a complete body.
+    try:
+        with urllib.request.urlopen(cache_fetch_url(cache_url, f"{base_url}/tampered.bin", "0" * 64)) as response:
+            response.read()
+        outcome = "complete"
+    except urllib.error.HTTPError as exc:
+        outcome = exc.code
+    except http.client.IncompleteRead:
+        outcome = "truncated"
+    assert outcome in (502, "truncated")
+    assert not (cache_dir / "tampered.bin").exists()
+
+    with pytest.raises(urllib.error.HTTPError) as forbidden:
+        urllib.request.urlopen(cache_fetch_url(cache_url, "http://example.invalid/file.bin"))
+    assert forbidden.value.code == 403
+
+
+def test_cache_streams_a_cold_miss_while_it_fills(tmp_path):
+    half = b"x" * 4096
+    release = threading.Event()
+
+    class SlowHandler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802 - http.server API
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(half) * 2))
+            self.end_headers()
+            self.wfile.write(half)
+            self.wfile.flush()
+            release.wait(timeout=10)
+            self.wfile.write(half)
+
+        def log_message(self, format, *args):  # noqa: A002 - http.server API
+            return
+
+    slow = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    server = create_server(tmp_path / "cache", port=0)
+    threads = [_serve(slow), _serve(server)]
+    item_url = f"http://127.0.0.1:{slow.server_address[1]}/big.bin"
+    try:
+        with urllib.request.urlopen(cache_fetch_url(f"http://127.0.0.1:{server.server_address[1]}", item_url), timeout=5) as response:
+            assert response.headers["Content-Length"] == str(len(half) * 2)
+            assert response.read(len(half)) == half
+            assert not (tmp_path / "cache" / "big.bin").exists()
+            release.set()
+            assert response.read() == half
+        assert (tmp_path / "cache" / "big.bin").read_bytes() == half * 2
+    finally:
+        release.set()
+        for running in (slow, server):
+            running.shutdown()
+        for thread in threads:
+            thread.join(timeout=5)
@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from modules.runtime.downloads import hashing  # noqa: E402
+from modules.runtime.downloads.hashing import HashingWriter, file_sha256, sidecar_path, verify_file  # noqa: E402
+
+
+def test_sidecar_skips_rehash_until_file_changes(tmp_path, monkeypatch):
+    target = tmp_path / "model.safetensors"
+    target.write_bytes(b"weights" * 1000)
+    expected = hashlib.sha256(target.read_bytes()).hexdigest()
+
+    assert verify_file(target, expected.upper()) == (True, expected)
+    record = json.loads(sidecar_path(target).read_text())
+    assert record["size"] == target.stat().st_size
+    assert record["sha256"] == expected
+
+    def _no_reads(*_args, **_kwargs):
+        raise AssertionError("verified file should not be re-read")
+
+    monkeypatch.setattr(hashing, "hash_stream", _no_reads)
+    assert file_sha256(target) == expected
+    monkeypatch.undo()
+
+    target.write_bytes(b"tampered")
+    stat = target.stat()
+    os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    matches, actual = verify_file(target, expected)
+    assert not matches
+    assert actual == hashlib.sha256(b"tampered").hexdigest()
+    assert not sidecar_path(target).exists()
+
+
+def test_hashing_writer_resumes_partial_files(tmp_path):
+    part = tmp_path / "model.bin.part"
+    payload = os.urandom(300_000)
+
+    with HashingWriter(part) as writer:
+        writer.write(payload[:100_000])
+        checkpoint = writer.checkpoint()
+
+    with HashingWriter(part, checkpoint=checkpoint) as writer:
+        writer.write(payload[100_000:200_000])
+
+    # A new process has no checkpoint and seeds the hash from the bytes on disk.
+    with HashingWriter(part) as writer:
+        assert writer.offset == 200_000
+        writer.write(payload[200_000:])
+        digest = writer.hexdigest()
+
+    assert part.read_bytes() == payload
+    assert digest == hashlib.sha256(payload).hexdigest()
+
+    with HashingWriter(part, resume=False) as writer:
+        writer.write(b"fresh")
+    assert part.read_bytes() == b"fresh"
+    assert writer.hexdigest() == hashlib.sha256(b"fresh").hexdigest()
+
+
+def test_shell_verify_checksum_accepts_uppercase_and_writes_sidecar(tmp_path):
+    target = tmp_path / "lora.safetensors"
+    target.write_bytes(b"lora")
+    checksum = hashlib.sha256(b"lora").hexdigest().upper()
+    script = f"""
+set -euo pipefail
+source "{ROOT}/modules/shell/downloads/download_helpers.sh"
+verify_checksum "{target}" "{checksum}"
+"""
+    result = subprocess.run(["bash", "-c", script], cwd=tmp_path, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr + result.stdout
+    assert json.loads(sidecar_path(target).read_text())["sha256"] == checksum.lower()
@@ -0,0 +1,215 @@
+import hashlib
+import json
+import subprocess
+import sys
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from modules.runtime.downloads.scheduler import (  # noqa: E402
+    BandwidthLimiter,
+    DownloadItem,
+    DownloadScheduler,
+    main,
+    parse_rate,
+)
+from modules.runtime.downloads.status import StatusReporter  # noqa: E402
+
+
+class _TrackingHandler(SimpleHTTPRequestHandler):
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    delay = 0.0
+
+    def do_GET(self):  # noqa: N802 - http.server API
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            time.sleep(cls.delay)
+            super().do_GET()
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def log_message(self, format, *args):  # noqa: A002 - http.server API
+        return
+
+
+def _start_server(directory: Path, delay: float = 0.0):
+    handler_cls = type("Handler", (_TrackingHandler,), {"active": 0, "peak": 0, "lock": threading.Lock(), "delay": delay})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(handler_cls, directory=str(directory)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, thread, handler_cls
+
+
+def _load_events(status_file: Path):
+    return [json.loads(line) for line in status_file.read_text().splitlines() if line.strip()]
+
+
+def _publish(directory: Path, name: str, payload: bytes) -> str:
+    (directory / name).write_bytes(payload)
+    return hashlib.sha256(payload).hexdigest().upper()
+
+
+def test_parallel_downloads_verify_and_emit_status_schema(tmp_path):
+    server_dir = tmp_path / "server"
+    server_dir.mkdir()
+    checksums = {f"model-{idx}.bin": _publish(server_dir, f"model-{idx}.bin", bytes([idx]) * 4096) for idx in range(4)}
+    server, thread, _ = _start_server(server_dir)
+    port = server.server_address[1]
+
+    status_file = tmp_path / "status.jsonl"
+    reporter = StatusReporter(status_file, tmp_path / "download.log")
+    items = [
+        DownloadItem(name, f"http://127.0.0.1:{port}/{name}", tmp_path / "models" / name, checksum)
+        for name, checksum in checksums.items()
+    ]
+    # Leftover bytes from an interrupted run must be replaced when the server ignores Range.
+    (tmp_path / "models").mkdir()
+    (tmp_path / "models" / "model-0.bin.part").write_bytes(b"stale")
+
+    results = DownloadScheduler(max_workers=4, per_host=4, reporter=reporter, backoff=0).run(items)
+    server.shutdown()
+    thread.join(timeout=5)
+
+    assert [result.status for result in results] == ["downloaded"] * 4
+    for name in checksums:
+        assert (tmp_path / "models" / name).read_bytes() == (server_dir / name).read_bytes()
+        assert not (tmp_path / "models" / f"{name}.part").exists()
+        assert (tmp_path / "models" / f"{name}.sha256.json").exists()
+
+    events = _load_events(status_file)
+    assert all(set(event) == {"timestamp", "level", "event", "message", "detail"} for event in events)
+    names = [event["event"] for event in events]
+    assert names.count("download_complete") == 4
+    assert names.count("checksum_ok") == 4
+    assert "resume" in names
+
+    rerun = DownloadScheduler(reporter=reporter).run(items)
+    assert [result.status for result in rerun] == ["already_present"] * 4
+
+
+def test_mirror_fallback_and_failure(tmp_path):
+    server_dir = tmp_path / "server"
+    server_dir.mkdir()
+    checksum = _publish(server_dir, "file.bin", b"mirror success")
+    server, thread, _ = _start_server(server_dir)
+    port = server.server_address[1]
+
+    status_file = tmp_path / "status.jsonl"
+    scheduler = DownloadScheduler(retries=1, backoff=0, reporter=StatusReporter(status_file), timeout=5)
+    ok = DownloadItem(
+        "mirrored",
+        f"http://127.0.0.1:{port}/missing.bin",
+        tmp_path / "out.bin",
+        checksum,
+        mirrors=[f"http://127.0.0.1:{port}/file.bin"],
+    )
+    bad = DownloadItem("corrupt", f"http://127.0.0.1:{port}/file.bin", tmp_path / "bad.bin", "0" * 64)
+    results = scheduler.run([ok, bad])
+    server.shutdown()
+    thread.join(timeout=5)
+
+    assert results[0].status == "downloaded"
+    assert results[0].url.endswith("/file.bin")
+    assert results[1].status == "failed"
+    assert not (tmp_path / "bad.bin").exists()
+
+    events = _load_events(status_file)
+    selected = [event["detail"] for event in events if event["event"] == "mirror_selected"]
+    assert {"url": f"http://127.0.0.1:{port}/file.bin", "label": "mirror 2/2", "index": 2, "total": 2} in selected
+    assert any(event["event"] == "mirror_fallback" for event in events)
+    assert any(event["event"] == "checksum_failed" for event in events)
+    assert any(event["event"] == "download_failed" for event in events)
+
+
+def test_per_host_limit_caps_concurrent_connections(tmp_path):
+    server_dir = tmp_path / "server"
+    server_dir.mkdir()
+    server, thread, handler = _start_server(server_dir, delay=0.2)
+    port = server.server_address[1]
+    items = []
+    for idx in range(6):
+        checksum = _publish(server_dir, f"f{idx}.bin", b"x" * 128)
+        items.append(DownloadItem(f"f{idx}", f"http://127.0.0.1:{port}/f{idx}.bin", tmp_path / f"f{idx}.bin", checksum))
+
+    results = DownloadScheduler(max_workers=6, per_host=2, reporter=StatusReporter()).run(items)
+    server.shutdown()
+    thread.join(timeout=5)
+
+    assert all(result.ok for result in results)
+    assert handler.peak == 2
+
+
+def test_bandwidth_limiter_spreads_shared_budget():
+    limiter = BandwidthLimiter(bytes_per_second=100_000)
+    started = time.monotonic()
+    workers = [threading.Thread(target=limiter.consume, args=(10_000,)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert time.monotonic() - started >= 0.35
+    assert parse_rate("2M") == 2 * 1024 * 1024
+    assert parse_rate("500k") == 500 * 1024
+    assert parse_rate("0") == 0
+    assert parse_rate("10MB/s") == parse_rate("10M") == parse_rate("10mb") == 10 * 1024 * 1024
+    assert parse_rate("500K/s") == parse_rate("500KiB/s") == 500 * 1024
+    assert parse_rate("1.5G") == 1.5 * 1024**3
+    with pytest.raises(ValueError):
+        parse_rate("fast")
+    with pytest.raises(SystemExit) as rejected:
+        main(["--manifest", "models.json", "--dest-dir", ".", "--bandwidth-limit", "fast"])
+    assert rejected.value.code == 2
+
+
+def test_shell_helper_delegates_to_scheduler(tmp_path):
+    server_dir = tmp_path / "server"
+    server_dir.mkdir()
+    checksum = _publish(server_dir, "lora.safetensors", b"lora weights")
+    server, thread, _ = _start_server(server_dir)
+    port = server.server_address[1]
+
+    manifest = tmp_path / "loras.json"
+    manifest.write_text(
+        json.dumps(
+            {
+                "items": [
+                    {
+                        "name": "Test LoRA",
+                        "url": f"http://127.0.0.1:{port}/lora.safetensors",
+                        "filename": "lora.safetensors",
+                        "checksum": checksum,
+                    }
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    status_file = tmp_path / "status.jsonl"
+    script = f"""
+set -euo pipefail
+source "{ROOT}/modules/shell/downloads/download_helpers.sh"
+DOWNLOAD_STATUS_FILE="{status_file}"
+DOWNLOAD_LOG_FILE="{tmp_path / 'download.log'}"
+run_download_scheduler "{manifest}" "{tmp_path / 'loras'}" "Test LoRA"
+"""
+    result = subprocess.run(["bash", "-c", script], cwd=tmp_path, capture_output=True, text=True)
+    server.shutdown()
+    thread.join(timeout=5)
+
+    assert result.returncode == 0, result.stderr
+    assert (tmp_path / "loras" / "lora.safetensors").read_bytes() == b"lora weights"
+    assert any(event["event"] == "download_complete" for event in _load_events(status_file))
@@ -1,4 +1,6 @@
 import sys
+import threading
+from collections import Counter
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
@@ -6,6 +8,7 @@ sys.path.append(str(Path(__file__).resolve().parents[1]))
 from modules.runtime.hardware.gpu_diagnostics import (  # noqa: E402
     collect_gpu_diagnostics,
     CommandResult,
+    DiagnosticsCache,
     SystemInfo,
 )
 
@@ -87,3 +90,52 @@ def test_cpu_fallback_schema_when_no_gpu_tools():
     assert summary["has_gpu"] is False
     assert summary["cpu_fallback"]["expected"] is True
     assert summary["toolkits"]["cuda"]["detected"] is False
+
+
+def test_each_probe_command_runs_once():
+    responses = {
+        "nvidia-smi": "CUDA Version: 12.2",
+        "nvidia-smi --query-gpu=name,memory.total,driver_version --format=csv,noheader,nounits": "NVIDIA RTX 4090,24576,535.54",
+        "rocminfo": "ROCm version: 6.0\nName: AMD Radeon 7900 XT",
+        "sycl-ls": "-  level_zero:gpu:0: Intel(R) Arc(TM) A770 Graphics",
+        "sycl-ls --version": "sycl-ls version 1.2.3",
+    }
+    calls = Counter()
+    run = _runner_factory(responses)
+
+    def counting_runner(command):
+        calls[" ".join(command)] += 1
+        return run(command)
+
+    payload = collect_gpu_diagnostics(
+        runner=counting_runner,
+        command_exists=lambda cmd: True,
+        system_info=SystemInfo(platform="Linux", is_wsl=False),
+    )
+
+    assert calls == Counter({key: 1 for key in responses})
+    assert len(payload["gpus"]) == 3
+    assert payload["summary"]["toolkits"]["rocm"]["version"] == "6.0"
+
+
+def test_cache_serves_stale_snapshot_while_refreshing():
+    release = threading.Event()
+    probes = []
+
+    def collect():
+        probes.append(len(probes))
+        if len(probes) == 2:
+            release.wait(5)
+        return {"gpus": [], "summary": {"probe": len(probes)}}
+
+    cache = DiagnosticsCache(collect, ttl_seconds=0)
+    assert cache.get()["summary"]["probe"] == 1
+
+    stale = cache.get()
+    assert stale["summary"]["probe"] == 1 and stale["cache"]["refreshing"] is True
+    release.set()
+    assert cache.get(refresh=True)["summary"]["probe"] in (2, 3)
+
+    cache.ttl_seconds = 3600
+    settled = cache.get()
+    assert settled["cache"]["stale"] is False and settled["summary"]["probe"] == len(probes)
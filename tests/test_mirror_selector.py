@@ -0,0 +1,84 @@
+import json
+import sys
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from modules.runtime.downloads.mirrors import HALF_LIFE, HostHealth, MirrorSelector, ProbeResult, probe_url  # noqa: E402
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):  # noqa: A002 - http.server API
+        return
+
+
+@pytest.fixture()
+def file_server(tmp_path):
+    (tmp_path / "file.bin").write_bytes(b"x" * 4096)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(_QuietHandler, directory=str(tmp_path)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    thread.join(timeout=5)
+
+
+def _fake_probe(speeds):
+    def probe(url):
+        throughput = speeds[MirrorSelector.host_key(url)]
+        if throughput is None:
+            return ProbeResult(url, False, error="connection refused")
+        return ProbeResult(url, True, ttfb_ms=50.0, throughput_bps=throughput)
+
+    return probe
+
+
+def test_rank_orders_by_expected_speed_and_sinks_failures(tmp_path):
+    speeds = {"https://slow.example": 1e6, "https://fast.example": 50e6, "https://down.example": None}
+    selector = MirrorSelector(tmp_path / "health.json", probe=_fake_probe(speeds))
+    urls = ["https://down.example/a.ckpt", "https://slow.example/a.ckpt", "https://fast.example/a.ckpt", "https://slow.example/a.ckpt"]
+
+    ranked = selector.rank(urls)
+
+    assert [entry["url"] for entry in ranked] == [
+        "https://fast.example/a.ckpt",
+        "https://slow.example/a.ckpt",
+        "https://down.example/a.ckpt",
+    ]
+    assert ranked[-1]["ok"] is False and ranked[-1]["expected_seconds"] is None
+    persisted = json.loads((tmp_path / "health.json").read_text())["hosts"]
+    assert persisted["https://down.example"]["failure_rate"] == 1.0
+    # Without probing, the persisted scores alone reproduce the order.
+    assert selector.order(urls, probe=False)[:2] == ["https://fast.example/a.ckpt", "https://slow.example/a.ckpt"]
+
+
+def test_health_scores_decay_towards_recent_samples():
+    health = HostHealth()
+    health.observe(ProbeResult("https://m.example/x", True, ttfb_ms=10.0, throughput_bps=100.0), now=1000.0)
+    health.observe(ProbeResult("https://m.example/x", True, ttfb_ms=10.0, throughput_bps=300.0), now=1000.0)
+    assert health.throughput_bps == pytest.approx(200.0)
+
+    # One half-life later the old samples count as a single observation.
+    health.observe(ProbeResult("https://m.example/x", True, ttfb_ms=10.0, throughput_bps=800.0), now=1000.0 + HALF_LIFE)
+    assert health.throughput_bps == pytest.approx(500.0)
+    health.observe(ProbeResult("https://m.example/x", False), now=1000.0 + HALF_LIFE)
+    assert 0 < health.failure_rate < 0.5
+    assert health.throughput_bps == pytest.approx(500.0)
+
+
+def test_real_probe_measures_local_server_and_dead_port(tmp_path, file_server):
+    good = probe_url(f"{file_server}/file.bin", nbytes=1024)
+    assert good.ok and good.throughput_bps > 0 and good.ttfb_ms >= 0
+    assert not probe_url(f"{file_server}/missing.bin").ok
+
+    selector = MirrorSelector(tmp_path / "health.json")
+    assert selector.order(["http://127.0.0.1:9/file.bin", f"{file_server}/file.bin"]) == [
+        f"{file_server}/file.bin",
+        "http://127.0.0.1:9/file.bin",
+    ]
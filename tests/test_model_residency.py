@@ -0,0 +1,92 @@
+import threading
+import time
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from modules.runtime.audio.tts.core import SpeechSession  # noqa: E402
+from modules.runtime.residency import ModelResidency, default_residency  # noqa: E402
+
+MB = 1024 * 1024
+
+
+class CPUBackend:
+    """Test backend whose 'weights' are a bytearray in RAM and whose load takes a measurable moment."""
+
+    def __init__(self, size_bytes=MB, delay=0.02):
+        self.size_bytes = size_bytes
+        self.delay = delay
+        self.loads = []
+        self.unloaded = []
+
+    def load(self, variant):
+        time.sleep(self.delay)
+        self.loads.append(variant)
+        return bytearray(self.size_bytes)
+
+    def unload(self, model):
+        self.unloaded.append(len(model))
+
+
+def _manager(budget, backend):
+    manager = ModelResidency(budget_bytes=budget)
+    manager.register_loader("cpu", backend.load, size=len, unload=backend.unload)
+    return manager
+
+
+def test_second_call_skips_the_load_and_stats_report_it():
+    backend = CPUBackend()
+    manager = _manager(4 * MB, backend)
+
+    first = manager.get("cpu", "small")
+    started = time.perf_counter()
+    second = manager.get("cpu", "small")
+    assert second is first and time.perf_counter() - started < backend.delay
+    assert backend.loads == ["small"]
+
+    stats = manager.stats()
+    model = stats["models"][0]
+    assert (model["loads"], model["hits"], model["resident"]) == (1, 1, True)
+    assert model["load_seconds"] >= backend.delay and stats["hit_rate"] == 0.5
+    assert stats["resident_bytes"] == MB
+
+
+def test_lru_eviction_respects_budget_pins_and_users():
+    backend = CPUBackend(delay=0)
+    manager = _manager(3 * MB, backend)
+    manager.pin("cpu", "pinned")
+    manager.get("cpu", "a")
+    with manager.use("cpu", "busy"):
+        manager.get("cpu", "a")
+        manager.get("cpu", "b")
+        resident = {model["variant"] for model in manager.stats()["models"] if model["resident"]}
+        assert resident == {"pinned", "busy", "b"} and backend.unloaded == [MB]
+    assert manager.resident_bytes() <= 3 * MB
+
+    manager.get("cpu", "c")
+    resident = {model["variant"] for model in manager.stats()["models"] if model["resident"]}
+    assert "pinned" in resident and "busy" not in resident
+
+    manager.unpin("cpu", "pinned")
+    assert manager.evict("cpu") == 3 and manager.resident_bytes() == 0
+
+
+def test_concurrent_misses_load_once():
+    backend = CPUBackend(delay=0.05)
+    manager = _manager(4 * MB, backend)
+    threads = [threading.Thread(target=manager.get, args=("cpu", "shared")) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert backend.loads == ["shared"]
+    assert manager.stats()["models"][0]["hits"] == 7
+
+
+def test_tts_sessions_reuse_the_resident_voice():
+    SpeechSession("residency-test")
+    loads = [m["loads"] for m in default_residency().stats()["models"] if m["variant"] == "residency-test"]
+    SpeechSession("residency-test")
+    after = [m for m in default_residency().stats()["models"] if m["variant"] == "residency-test"]
+    assert loads == [1] and after[0]["loads"] == 1 and after[0]["hits"] >= 1
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from modules.runtime.downloads.hashing import PrefixHasher  # noqa: E402
+from modules.runtime.downloads.scheduler import DownloadItem, DownloadScheduler  # noqa: E402
+from modules.runtime.downloads.segmented import (  # noqa: E402
+    RangeNotSupported,
+    SegmentedDownloader,
+    SegmentMap,
+    main,
+    segment_map_path,
+)
+from modules.runtime.downloads.status import StatusReporter  # noqa: E402
+
+PAYLOAD = os.urandom(256 * 1024 + 123)
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    """Serve ``PAYLOAD`` with optional Range support and a one-shot mid-transfer drop."""
+
+    protocol_version = "HTTP/1.1"
+    ranges = True
+    drop_after = None  # bytes to send for the next ranged request starting past 0 before closing
+    drop_full = None  # bytes to send for the next plain (no Range) request before closing
+    requests = []
+    delay = 0.0  # seconds to hold each response open, so concurrent connections overlap
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_GET(self):  # noqa: N802 - http.server API
+        handler = type(self)
+        with handler.lock:
+            handler.active += 1
+            handler.peak = max(handler.peak, handler.active)
+        try:
+            self._respond()
+        finally:
+            with handler.lock:
+                handler.active -= 1
+
+    def _respond(self):
+        header = self.headers.get("Range", "")
+        type(self).requests.append(header)
+        if type(self).delay:
+            time.sleep(type(self).delay)
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", header)
+        if not (self.ranges and match):
+            start, end, status = 0, len(PAYLOAD) - 1, 200
+        else:
+            start = int(match.group(1))
+            end = min(int(match.group(2) or len(PAYLOAD) - 1), len(PAYLOAD) - 1)
+            status = 206
+        body = PAYLOAD[start : end + 1]
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(PAYLOAD)}")
+        self.end_headers()
+        if status == 200 and not header and type(self).drop_full is not None:
+            self.wfile.write(body[: type(self).drop_full])
+            type(self).drop_full = None
+            self.close_connection = True
+            return
+        drop = type(self).drop_after
+        if status == 206 and start > 0 and drop is not None:
+            type(self).drop_after = None
+            self.wfile.write(body[:drop])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002 - http.server API
+        return
+
+
+@pytest.fixture()
+def range_server():
+    handler = type("Handler", (_RangeHandler,), {"requests": [], "lock": threading.Lock()})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/model.ckpt", handler
+    server.shutdown()
+    thread.join(timeout=5)
+
+
+def _events(status_file):
+    return [json.loads(line) for line in status_file.read_text().splitlines()]
+
+
+def test_segments_download_in_parallel_into_preallocated_file(tmp_path, range_server):
+    url, handler = range_server
+    status_file = tmp_path / "status.jsonl"
+    part = tmp_path / "model.ckpt.part"
+    downloader = SegmentedDownloader(4, min_segment=32 * 1024, reporter=StatusReporter(status_file))
+
+    assert downloader.download(url, part) == len(PAYLOAD)
+    assert part.read_bytes() == PAYLOAD
+    assert not segment_map_path(part).exists()
+    ranged = [header for header in handler.requests if header != "bytes=0-0"]
+    assert len(ranged) == 4 and all(header.startswith("bytes=") for header in ranged)
+    completed = sorted(event["detail"]["segment"] for event in _events(status_file) if event["event"] == "segment_complete")
+    assert completed == [0, 1, 2, 3]
+
+
+def test_interrupted_segment_resumes_from_segment_map(tmp_path, range_server):
+    url, handler = range_server
+    part = tmp_path / "model.ckpt.part"
+    handler.drop_after = 1000
+    downloader = SegmentedDownloader(4, min_segment=32 * 1024)
+
+    with pytest.raises(OSError):
+        downloader.download(url, part)
+    saved = SegmentMap.load(segment_map_path(part))
+    assert saved is not None and saved.size == len(PAYLOAD) and saved.validator == '"v1"'
+    assert part.stat().st_size == len(PAYLOAD)
+    assert sum(not seg.done for seg in saved.segments) == 1
+
+    handler.requests.clear()
+    transferred = downloader.download(url, part)
+    assert transferred == len(PAYLOAD) - saved.written
+    assert len([header for header in handler.requests if header != "bytes=0-0"]) == 1
+    assert hashlib.sha256(part.read_bytes()).digest() == hashlib.sha256(PAYLOAD).digest()
+
+
+def test_servers_without_ranges_fall_back_to_one_stream(tmp_path, range_server):
+    url, handler = range_server
+    handler.ranges = False
+    with pytest.raises(RangeNotSupported):
+        SegmentedDownloader(4).download(url, tmp_path / "model.ckpt.part")
+    assert not (tmp_path / "model.ckpt.part").exists()
+
+    scheduler = DownloadScheduler(segments=4, retries=1, backoff=0)
+    item = DownloadItem("Model", url, tmp_path / "models" / "model.ckpt", hashlib.sha256(PAYLOAD).hexdigest())
+    assert scheduler.run([item])[0].status == "downloaded"
+    assert item.dest.read_bytes() == PAYLOAD
+
+    dest = tmp_path / "cli" / "model.ckpt"
+    dest.parent.mkdir()
+    handler.drop_full = 1000
+    assert main([url, str(dest), "--connections", "3"]) == 1
+    assert not dest.exists() and (tmp_path / "cli" / "model.ckpt.part").stat().st_size == 1000
+    assert main([url, str(dest), "--connections", "3"]) == 0
+    assert dest.read_bytes() == PAYLOAD
+
+
+def test_scheduler_uses_segments_and_verifies_checksum(tmp_path, range_server):
+    url, handler = range_server
+    status_file = tmp_path / "status.jsonl"
+    scheduler = DownloadScheduler(segments=3, retries=1, backoff=0, reporter=StatusReporter(status_file))
+    scheduler.segmented.min_segment = 16 * 1024
+    item = DownloadItem("Model", url, tmp_path / "model.ckpt", hashlib.sha256(PAYLOAD).hexdigest().upper())
+
+    result = scheduler.run([item])[0]
+    assert result.status == "downloaded" and result.bytes_downloaded == len(PAYLOAD)
+    assert item.dest.read_bytes() == PAYLOAD
+    events = [event["event"] for event in _events(status_file)]
+    assert events.count("segment_complete") == 3 and "download_complete" in events
+
+
+def test_scheduler_segments_share_the_per_host_cap_and_hash_as_they_land(tmp_path, range_server, monkeypatch):
+    url, handler = range_server
+    handler.delay = 0.05
+    frontiers = []
+    real_advance = PrefixHasher.advance
+    monkeypatch.setattr(PrefixHasher, "advance", lambda self, frontier: frontiers.append(frontier) or real_advance(self, frontier))
+    monkeypatch.setattr("modules.runtime.downloads.scheduler.verify_file", lambda *args: pytest.fail("file was re-read"))
+    scheduler = DownloadScheduler(per_host=2, segments=4, retries=1, backoff=0)
+    scheduler.segmented.min_segment = 16 * 1024
+    item = DownloadItem("Model", url, tmp_path / "model.ckpt", hashlib.sha256(PAYLOAD).hexdigest())
+
+    assert scheduler.run([item])[0].status == "downloaded"
+    assert item.dest.read_bytes() == PAYLOAD
+    assert handler.peak == 2
+    assert len(frontiers) >= 4 and frontiers[-1] == len(PAYLOAD)
@@ -91,8 +91,11 @@ download_with_retries "http://127.0.0.1:9/file.bin" "{dest}" "" "{checksum}" "{m
 
     assert result.returncode == 0
     events = _load_events(status_file)
-    assert any(event.get("event") == "mirror_fallback" for event in events)
-    assert any(event.get("event") == "mirror_selected" and str(event.get("detail", {})).find(str(port)) != -1 for event in events)
+    # Mirrors are probed up front, so the unreachable primary is ranked last and never attempted.
+    selected = [event["detail"] for event in events if event.get("event") == "mirror_selected"]
+    assert selected[0]["url"] == f"http://127.0.0.1:{port}/file.bin"
+    assert selected[0]["index"] == 1
+    assert not any(event.get("event") == "download_attempt" and ":9/" in str(event.get("detail")) for event in events)
     assert dest.read_bytes() == payload
 
 
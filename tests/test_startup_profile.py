@@ -0,0 +1,61 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from modules.startup_profile import find_module, parse_importtime, profile_startup  # noqa: E402
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       280 |        400 | _frozen_importlib_external
+import time:        40 |         40 |     _json
+import time:       400 |        440 |   json.decoder
+import time:       300 |        300 |   json.encoder
+import time:       200 |        940 | json
+"""
+
+
+def test_importtime_output_becomes_a_tree():
+    tree = parse_importtime(SAMPLE)
+    assert [node["module"] for node in tree] == ["_frozen_importlib_external", "json"]
+    json_node = find_module(tree, "json")
+    assert [child["module"] for child in json_node["children"]] == ["json.decoder", "json.encoder"]
+    assert find_module(tree, "_json")["self_ms"] == 0.04 and json_node["cumulative_ms"] == 0.94
+
+
+def _isolate_home(monkeypatch, path):
+    # Path.home() reads USERPROFILE on Windows and HOME elsewhere.
+    monkeypatch.setenv("HOME", str(path))
+    monkeypatch.setenv("USERPROFILE", str(path))
+
+
+def test_web_launcher_startup_profile_covers_imports_and_first_request(tmp_path, monkeypatch):
+    # Timing budgets are enforced by tools/benchmarks/startup.py, not the unit suite.
+    _isolate_home(monkeypatch, tmp_path)
+    report = profile_startup("web_launcher")
+
+    assert report["error"] is None
+    assert [phase["name"] for phase in report["first_request"]["phases"]][:3] == ["import", "api_init", "GET /api/status"]
+    tree = report["imports"]["tree"]
+    assert find_module(tree, "modules.runtime.web_launcher.server") is not None
+    # Tool services are imported when a task runs, never on the startup path.
+    assert find_module(tree, "modules.runtime.audio.tts.services") is None
+
+
+def test_profile_startup_flag_writes_json(tmp_path, monkeypatch):
+    _isolate_home(monkeypatch, tmp_path)
+    output = tmp_path / "config_profile.json"
+    completed = subprocess.run(
+        [sys.executable, "modules/config_service/config_service.py", "--profile-startup", str(output)],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    assert completed.returncode == 0, completed.stderr
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["target"] == "config_service" and report["imports"]["count"] > 0
+    assert find_module(report["imports"]["tree"], "modules.config_service.config_service") is not None
@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from modules.runtime.audio.asr import cli as asr_cli  # noqa: E402
+from modules.runtime.audio.tts import services as tts_services  # noqa: E402
+from modules.runtime.task_engine import LaneConfig, TaskEngine  # noqa: E402
+from modules.runtime.web_launcher import server  # noqa: E402
+from modules.runtime.web_launcher.router import Request  # noqa: E402
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+class _CountingSession(tts_services.SpeechSession):
+    voices = []
+
+    def __init__(self, voice=None):
+        super().__init__(voice)
+        _CountingSession.voices.append(self.voice)
+
+
+def test_batch_groups_by_voice_and_reports_each_item(monkeypatch):
+    monkeypatch.setattr(tts_services, "SpeechSession", _CountingSession)
+    _CountingSession.voices = []
+    requests = [tts_services.request_from_payload({"text": f"line {n}", "voice": "bard" if n % 2 else None}) for n in range(5)]
+    reported = []
+
+    tasks = tts_services.run_text_to_speech_batch(requests, on_result=lambda task: reported.append(task.id))
+
+    assert _CountingSession.voices == ["default", "bard"]
+    assert [task.status for task in tasks] == ["completed"] * 5
+    assert reported == [tasks[n].id for n in (0, 2, 4, 1, 3)]
+    assert tasks[1].result["voice"] == "bard" and tasks[0].payload["text"] == "line 0"
+
+
+def test_batch_endpoint_queues_one_job_per_group(tmp_path):
+    engine = TaskEngine({"audio": LaneConfig(workers=1, max_queue=2)})
+    api = server.WebLauncherAPI(project_root=PROJECT_ROOT, config_path=tmp_path / "config.yaml", log_dir=tmp_path / "logs", task_engine=engine)
+    items = [{"text": f"line {n}", "voice": "bard" if n % 2 else "sage"} for n in range(6)]
+    try:
+        response = server.API_ROUTER.dispatch(
+            Request("POST", "/api/tasks/batch", read_body=lambda: {"tool": "tts", "items": items}, api=api)
+        )
+        assert response.status == 202
+        assert [group["key"] for group in response.payload["groups"]] == ["sage", "bard"]
+        for task in response.payload["tasks"]:
+            assert engine.wait(task["id"], timeout=5).status == "completed"
+
+        bad = server.API_ROUTER.dispatch(
+            Request("POST", "/api/tasks/batch", read_body=lambda: {"tool": "tts", "items": [{"text": "ok"}, {}]}, api=api)
+        )
+        assert bad.status == 400 and bad.payload["error"].startswith("items[1]")
+        unsupported = server.API_ROUTER.dispatch(
+            Request("POST", "/api/tasks/batch", read_body=lambda: {"tool": "txt2vid", "items": [{}]}, api=api)
+        )
+        assert unsupported.status == 400
+    finally:
+        engine.shutdown(wait=False)
+
+
+def test_asr_cli_streams_jsonl_batches(tmp_path, monkeypatch, capsys):
+    clip = tmp_path / "scene_one.wav"
+    clip.write_bytes(b"")
+    batch = tmp_path / "batch.jsonl"
+    batch.write_text(
+        "\n".join(json.dumps(item) for item in ({"source_path": str(clip), "language": "en"}, {"source_path": str(tmp_path / "missing.wav")})),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(sys, "argv", ["asr", "--payload-file", str(batch)])
+
+    asr_cli.main()
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["status"] for line in lines] == ["completed", "failed"]
+    assert lines[0]["result"]["transcript"] == "Transcript for scene one"
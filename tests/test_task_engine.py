@@ -0,0 +1,102 @@
+import functools
+import json
+import threading
+import time
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from modules.runtime.models.tasks import mark_succeeded, new_task  # noqa: E402
+from modules.runtime.task_engine import LaneConfig, TaskEngine, TaskQueueFull, TaskStateError, parse_lanes  # noqa: E402
+from modules.runtime.web_launcher import server  # noqa: E402
+from modules.runtime.web_launcher.router import Request  # noqa: E402
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _blocking(gate, task):
+    gate.wait(5)
+    return mark_succeeded(task, {"gate": True})
+
+
+def _echo(task):
+    return mark_succeeded(task, {"echo": task.payload.get("value")})
+
+
+def _until_running(task, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while task.status == "pending" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return task.status
+
+
+@pytest.fixture()
+def engine():
+    instance = TaskEngine({"audio": LaneConfig(workers=1, max_queue=2), "video": LaneConfig(workers=1, max_queue=1)})
+    yield instance
+    instance.shutdown(wait=False)
+
+
+def test_busy_video_lane_does_not_starve_audio(engine):
+    gate = threading.Event()
+    render = engine.submit(new_task("txt2vid"), functools.partial(_blocking, gate), lane="video")
+    speech = engine.submit(new_task("tts", {"value": "hi"}), _echo, lane="audio")
+
+    assert engine.wait(speech.id, timeout=5).result == {"echo": "hi"}
+    assert _until_running(render) == "running" and engine.stats()["video"]["running"] == 1
+    gate.set()
+    assert engine.wait(render.id, timeout=5).status == "completed"
+
+
+def test_full_queue_rejects_and_pending_tasks_cancel(engine):
+    gate = threading.Event()
+    running = engine.submit(new_task("txt2vid"), functools.partial(_blocking, gate), lane="video")
+    assert _until_running(running) == "running"
+    queued = engine.submit(new_task("txt2vid"), _echo, lane="video")
+    with pytest.raises(TaskQueueFull):
+        engine.submit(new_task("txt2vid"), _echo, lane="video")
+
+    assert engine.cancel(queued.id).status == "cancelled"
+    with pytest.raises(TaskStateError):
+        engine.cancel(running.id)
+    gate.set()
+    engine.wait(running.id, timeout=5)
+    assert engine.get(queued.id).status == "cancelled" and queued.result is None
+
+
+def test_process_lane_copies_results_back():
+    engine = TaskEngine({"video": LaneConfig(workers=1, mode="process")})
+    try:
+        task = engine.submit(new_task("txt2vid", {"value": 3}), _echo, lane="video")
+        assert engine.wait(task.id, timeout=30).result == {"echo": 3}
+    finally:
+        engine.shutdown()
+    assert parse_lanes("audio=2, video=1:process")["video"] == LaneConfig(workers=1, mode="process")
+    with pytest.raises(ValueError):
+        parse_lanes("video=0")
+
+
+def test_task_routes_return_pending_then_finished_task(tmp_path):
+    api = server.WebLauncherAPI(project_root=PROJECT_ROOT, config_path=tmp_path / "config.yaml", log_dir=tmp_path / "logs")
+    try:
+        bad = server.API_ROUTER.dispatch(Request("POST", "/api/tasks", read_body=lambda: {"tool": "tts", "payload": {}}, api=api))
+        assert bad.status == 400
+
+        body = {"tool": "tts", "payload": {"text": "hello"}}
+        created = server.API_ROUTER.dispatch(Request("POST", "/api/tasks", read_body=lambda: body, api=api))
+        task_id = created.payload["task"]["id"]
+        assert created.status == 202 and created.headers["Location"] == f"/api/tasks/{task_id}"
+        assert created.payload["task"]["status"] in {"pending", "running", "completed"}
+
+        api.task_engine.wait(task_id, timeout=5)
+        detail = server.API_ROUTER.dispatch(Request("GET", f"/api/tasks/{task_id}", api=api))
+        assert detail.payload["task"]["status"] == "completed"
+        assert json.loads(json.dumps(api.list_tasks()))["lanes"]["audio"]["workers"] >= 1
+
+        assert server.API_ROUTER.dispatch(Request("GET", "/api/tasks/missing", api=api)).status == 404
+        assert server.API_ROUTER.dispatch(Request("POST", f"/api/tasks/{task_id}/cancel", api=api)).status == 409
+    finally:
+        api.task_engine.shutdown(wait=False)
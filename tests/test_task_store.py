@@ -0,0 +1,86 @@
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from modules.runtime.models.task_store import TaskStore  # noqa: E402
+from modules.runtime.models.tasks import mark_running, mark_succeeded, new_task  # noqa: E402
+from modules.runtime.task_engine import LaneConfig, TaskEngine  # noqa: E402
+from modules.runtime.web_launcher import server  # noqa: E402
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _finished(store, kind, count):
+    tasks = [mark_succeeded(new_task(kind), {"n": index}) for index in range(count)]
+    for task in tasks:
+        store.put(task)
+    return tasks
+
+
+def test_queries_filter_and_paginate_newest_first(tmp_path):
+    store = TaskStore(tmp_path / "tasks.sqlite")
+    audio = _finished(store, "tts", 5)
+    video = _finished(store, "txt2vid", 2)
+    store.put(new_task("tts"))
+
+    page, cursor = store.query(kind="tts", status="completed", limit=2)
+    assert [task.id for task in page] == [audio[4].id, audio[3].id] and cursor is not None
+    rest, last = store.query(kind="tts", status="completed", limit=10, cursor=cursor)
+    assert [task.id for task in rest] == [task.id for task in reversed(audio[:3])] and last is None
+    assert store.get(video[0].id).result == {"n": 0}
+    assert store.counts() == {"completed": 7, "pending": 1}
+
+
+def test_eviction_applies_ttl_and_cap_to_finished_tasks_only(tmp_path):
+    store = TaskStore(tmp_path / "tasks.sqlite", ttl_seconds=60, max_finished=3, evict_interval=3600)
+    store.put(new_task("tts"))
+    finished = _finished(store, "tts", 5)
+
+    assert store.evict() == 2
+    assert [task.id for task in store.query(status="completed")[0]] == [task.id for task in reversed(finished[2:])]
+    assert store.evict(now=10**12) == 3
+    assert store.counts() == {"pending": 1}
+
+
+def test_unfinished_tasks_are_requeued_on_startup(tmp_path):
+    db = tmp_path / "tasks.sqlite"
+    previous = TaskStore(db)
+    interrupted = mark_running(new_task("tts", {"text": "hello", "voice": None, "metadata": {}}))
+    queued = new_task("txt2vid", {"prompt": "waves", "duration": 2})
+    orphan = new_task("no_such_tool")
+    for task in (interrupted, queued, orphan):
+        previous.put(task)
+    previous.close()
+
+    bystander = server.WebLauncherAPI(project_root=PROJECT_ROOT, config_path=tmp_path / "config.yaml", log_dir=tmp_path / "logs", task_db=db)
+    try:
+        assert bystander.get_task(interrupted.id)["status"] == "running"
+        assert bystander.task_engine.store.counts() == {"pending": 2, "running": 1}
+    finally:
+        bystander.task_engine.shutdown(wait=False)
+
+    api = server.WebLauncherAPI(
+        project_root=PROJECT_ROOT, config_path=tmp_path / "config.yaml", log_dir=tmp_path / "logs", task_db=db, recover_tasks=True
+    )
+    try:
+        assert api.task_engine.wait(interrupted.id, timeout=5).status == "completed"
+        assert api.task_engine.wait(queued.id, timeout=5).status == "completed"
+        assert "Not recovered" in api.get_task(orphan.id)["error"]
+        listing = api.list_tasks(status="completed", limit=1)
+        assert len(listing["items"]) == 1 and listing["next"] is not None
+        assert listing["counts"] == {"completed": 2, "failed": 1}
+    finally:
+        api.task_engine.shutdown(wait=False)
+
+
+def test_engine_with_store_keeps_no_finished_tasks_in_memory(tmp_path):
+    engine = TaskEngine({"audio": LaneConfig(workers=2)}, store=TaskStore(tmp_path / "tasks.sqlite"))
+    try:
+        tasks = [engine.submit(new_task("tts"), lambda task: mark_succeeded(task, {}), lane="audio") for _ in range(20)]
+        for task in tasks:
+            assert engine.wait(task.id, timeout=5).status == "completed"
+        assert engine.list() == []
+        assert engine.store.counts() == {"completed": 20}
+    finally:
+        engine.shutdown()
@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from modules.runtime import registry  # noqa: E402
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture()
+def clean_registry():
+    registry.reset_registry()
+    yield registry
+    registry.reset_registry()
+    registry.load_default_tools()
+
+
+def test_declared_tools_register_without_importing_packages():
+    script = (
+        "import sys\n"
+        "from modules.runtime.registry import list_tools, load_default_tools\n"
+        "load_default_tools()\n"
+        "print(','.join(tool.id for tool in list_tools()))\n"
+        "print(any(name.startswith(('modules.runtime.audio', 'modules.runtime.video')) for name in sys.modules))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    assert output.stdout.split() == ["asr,tts,voice_profiles,img2vid,txt2vid", "False"]
+
+
+def test_service_module_is_imported_on_first_task(tmp_path):
+    script = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        "from modules.runtime.web_launcher.server import WebLauncherAPI\n"
+        f"api = WebLauncherAPI(Path('.'), config_path=Path(r'{tmp_path}') / 'config.yaml', log_dir=Path(r'{tmp_path}') / 'logs')\n"
+        "before = 'modules.runtime.audio.tts.services' in sys.modules\n"
+        "api.list_tools()\n"
+        "listed = 'modules.runtime.audio.tts.services' in sys.modules\n"
+        "task = api.create_task('tts', {'text': 'hi'})\n"
+        "print(before, listed, 'modules.runtime.audio.tts.services' in sys.modules, api.task_engine.wait(task['id'], 5).status)\n"
+    )
+    # The TTS task writes under Path.home(); point both HOME and USERPROFILE at tmp.
+    env = dict(os.environ, HOME=str(tmp_path), USERPROFILE=str(tmp_path))
+    output = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True, env=env)
+    assert output.stdout.split() == ["False", "False", "True", "completed"]
+
+
+def test_dependency_checks_are_lazy_and_cached(clean_registry, monkeypatch):
+    calls = []
+    real_find_spec = registry.importlib.util.find_spec
+    monkeypatch.setattr(registry.importlib.util, "find_spec", lambda name: calls.append(name) or real_find_spec(name))
+    registry._dependency_cache.clear()
+
+    for tool_id in ("heavy_a", "heavy_b"):
+        registry.register_tool(
+            registry.ToolSpec(tool_id, tool_id, "", "audio", "", dependencies=("aihub_missing_backend", "json"))
+        )
+    assert calls == []
+
+    spec = registry.get_tool("heavy_a")
+    assert spec.available is False and spec.availability_error == "Missing dependencies: aihub_missing_backend"
+    registry.get_tool("heavy_a")
+    assert [tool.available for tool in registry.list_tools()] == [False, False]
+    assert sorted(calls) == ["aihub_missing_backend", "json"]
@@ -0,0 +1,88 @@
+import gzip
+import http.client
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from modules.runtime.web_launcher import server  # noqa: E402
+from modules.runtime.web_launcher.async_server import AsyncLauncherServer  # noqa: E402
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+STATIC_DIR = PROJECT_ROOT / "modules" / "runtime" / "web_launcher" / "static"
+
+
+def _api(tmp_path):
+    return server.WebLauncherAPI(
+        project_root=PROJECT_ROOT,
+        config_path=tmp_path / "config.yaml",
+        log_dir=tmp_path / "logs",
+        history_path=tmp_path / "history.json",
+        artifact_db=tmp_path / "artifacts.sqlite",
+    )
+
+
+@pytest.fixture()
+def async_server(tmp_path):
+    instance = AsyncLauncherServer(_api(tmp_path), STATIC_DIR, "secret", port=0, max_concurrency=4).start_background()
+    yield instance
+    instance.stop()
+
+
+def test_keep_alive_serves_compact_json_on_one_connection(async_server):
+    connection = http.client.HTTPConnection("127.0.0.1", async_server.port, timeout=5)
+    headers = {"Authorization": "Bearer secret"}
+
+    connection.request("GET", "/api/actions", headers=headers)
+    first = connection.getresponse()
+    body = first.read()
+    assert first.status == 200
+    assert first.getheader("Connection") != "close"
+    socket_before = connection.sock
+
+    connection.request("GET", "/api/actions", headers=headers)
+    second = connection.getresponse()
+    assert second.status == 200 and second.read() == body
+    assert connection.sock is socket_before
+    assert b"\n" not in body and json.loads(body)["items"]
+
+    connection.request("GET", "/api/actions")
+    unauthorized = connection.getresponse()
+    assert unauthorized.status == 401 and json.loads(unauthorized.read()) == {"error": "Unauthorized"}
+    connection.close()
+
+
+def test_large_json_is_gzipped_when_accepted(async_server):
+    connection = http.client.HTTPConnection("127.0.0.1", async_server.port, timeout=5)
+    connection.request("GET", "/api/manifests", headers={"Authorization": "Bearer secret", "Accept-Encoding": "gzip"})
+    response = connection.getresponse()
+    raw = response.read()
+    assert response.getheader("Content-Encoding") == "gzip"
+    assert int(response.getheader("Content-Length")) == len(raw)
+    manifests = json.loads(gzip.decompress(raw))
+
+    connection.request("GET", "/api/manifests", headers={"Authorization": "Bearer secret"})
+    plain = connection.getresponse()
+    assert plain.getheader("Content-Encoding") is None
+    assert json.loads(plain.read()) == manifests
+    connection.close()
+
+
+def test_post_body_errors_and_install_stream(async_server):
+    connection = http.client.HTTPConnection("127.0.0.1", async_server.port, timeout=5)
+    body = json.dumps({"action": "does-not-exist"})
+    connection.request("POST", "/api/actions", body=body, headers={"Authorization": "Bearer secret", "Content-Type": "application/json"})
+    response = connection.getresponse()
+    assert response.status == 400 and "error" in json.loads(response.read())
+    connection.close()
+
+    stream = http.client.HTTPConnection("127.0.0.1", async_server.port, timeout=5)
+    stream.request("GET", "/api/installations/stream?token=secret")
+    events = stream.getresponse()
+    assert events.status == 200 and events.getheader("Content-Type") == "text/event-stream"
+    assert events.fp.readline().startswith(b"id: ")
+    assert events.fp.readline() == b"event: ready\n"
+    stream.close()
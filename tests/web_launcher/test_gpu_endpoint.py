@@ -4,6 +4,7 @@ import sys
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 
 from modules.runtime.web_launcher import server  # noqa: E402
+from modules.runtime.web_launcher.router import Request  # noqa: E402
 
 
 def test_gpu_endpoint_delegates_to_helper(monkeypatch):
@@ -21,3 +22,24 @@ def test_gpu_endpoint_delegates_to_helper(monkeypatch):
 
     assert called["count"] == 1
     assert diagnostics["gpus"][0]["name"] == "Test"
+
+
+def test_gpu_endpoint_serves_cached_snapshot_until_refresh(monkeypatch, tmp_path):
+    called = {"count": 0}
+
+    def fake_collect():
+        called["count"] += 1
+        return {"summary": {"probe": called["count"]}, "gpus": []}
+
+    monkeypatch.setattr(server, "collect_gpu_diagnostics", fake_collect)
+    project_root = Path(__file__).resolve().parents[2]
+    api = server.WebLauncherAPI(project_root=project_root, config_path=tmp_path / "config.yaml", log_dir=tmp_path / "logs")
+    api.shell_dir = tmp_path
+
+    first = server.API_ROUTER.dispatch(Request("GET", "/api/hardware/gpu", api=api))
+    again = server.API_ROUTER.dispatch(Request("GET", "/api/hardware/gpu/diagnostics", api=api))
+    assert called["count"] == 1 and again.payload["summary"]["probe"] == 1
+    assert first.payload["cache"]["stale"] is False
+
+    refreshed = server.API_ROUTER.dispatch(Request("GET", "/api/hardware/gpu", query={"refresh": ["1"]}, api=api))
+    assert called["count"] == 2 and refreshed.payload["summary"]["probe"] == 2
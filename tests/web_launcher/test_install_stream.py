@@ -0,0 +1,81 @@
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from modules.runtime.web_launcher import server  # noqa: E402
+from modules.runtime.web_launcher.install_stream import FileFollower, InstallEventBroker  # noqa: E402
+
+
+def test_file_follower_reads_only_complete_new_lines(tmp_path):
+    log_path = tmp_path / "job.log"
+    log_path.write_text("first\nsecond-par", encoding="utf-8")
+    follower = FileFollower(log_path)
+
+    assert follower.read_new_lines() == ["first"]
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write("tial\nthird\n")
+    assert follower.read_new_lines() == ["second-partial", "third"]
+    assert follower.read_new_lines() == []
+    assert follower.offset == log_path.stat().st_size
+
+
+def test_file_follower_keeps_only_the_latest_carriage_return_frame(tmp_path, monkeypatch):
+    log_path = tmp_path / "pip.log"
+    log_path.write_bytes(b"Collecting torch\r\n" + b"".join(b"\r  %d%%" % pct for pct in range(0, 60, 10)))
+    follower = FileFollower(log_path)
+
+    assert follower.read_new_lines() == ["Collecting torch", "  40%"]
+    assert follower._partial == b"  50%"
+    with log_path.open("ab") as handle:
+        handle.write(b"\r  90%\r 100%\r\nDone\n")
+    assert follower.read_new_lines() == [" 100%", "Done"]
+
+    monkeypatch.setattr("modules.runtime.web_launcher.install_stream.MAX_PARTIAL_BYTES", 16)
+    with log_path.open("ab") as handle:
+        handle.write(b"#" * 40)
+    assert follower.read_new_lines() == ["#" * 40] and follower._partial == b""
+
+
+def test_broker_fans_out_single_read_to_all_subscribers(tmp_path):
+    status_path = tmp_path / "job.status.jsonl"
+    log_path = tmp_path / "job.log"
+    log_path.write_text("", encoding="utf-8")
+    broker = InstallEventBroker(poll_interval=60)
+    broker.watch("job-1", status_path, log_path)
+    start = broker.cursor
+
+    status_path.write_text('{"event": "download_start", "level": "info"}\n', encoding="utf-8")
+    log_path.write_text("downloading\n", encoding="utf-8")
+    assert broker.poll() == 2
+    assert broker.poll() == 0
+
+    first = broker.wait(start, timeout=0)
+    second = broker.wait(start, timeout=0)
+    assert first == second
+    assert [message["type"] for _, message in first] == ["status", "log"]
+    assert first[0][1]["data"]["event"] == "download_start"
+    assert broker.wait(start + 99, timeout=0) is None
+
+
+def test_installation_updates_follow_appended_status_events(tmp_path):
+    project_root = Path(__file__).resolve().parents[2]
+    api = server.WebLauncherAPI(
+        project_root=project_root,
+        config_path=tmp_path / "config.yaml",
+        log_dir=tmp_path / "logs",
+        history_path=tmp_path / "history.json",
+    )
+    status_path = tmp_path / "logs" / "job.status.jsonl"
+    log_path = tmp_path / "logs" / "job.log"
+    api._install_events.watch("job-1", status_path, log_path)
+
+    cursor, messages = api.installation_updates()
+    assert messages == []
+
+    api._append_status_event(status_path, "info", "mirror_selected", "Using mirror", {"url": "http://mirror"})
+    api._install_events.poll()
+    cursor, messages = api.installation_updates(cursor, timeout=0)
+
+    assert [message["data"]["event"] for _, message in messages] == ["mirror_selected"]
+    assert api.installation_updates(cursor, timeout=0) == (cursor, [])
@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from modules.runtime.web_launcher import server  # noqa: E402
+from modules.runtime.web_launcher.log_reader import StatusEventIndex, tail_events, tail_text  # noqa: E402
+
+
+def test_tail_text_reads_across_small_blocks(tmp_path):
+    log_path = tmp_path / "install.log"
+    log_path.write_text("".join(f"line {idx}\n" for idx in range(200)), encoding="utf-8")
+
+    tail = tail_text(log_path, lines=3, block_size=7)
+
+    assert tail == "line 197\nline 198\nline 199\n"
+    assert tail_text(log_path, lines=500) == log_path.read_text(encoding="utf-8")
+    assert tail_text(tmp_path / "missing.log") == ""
+
+
+def test_tail_events_skips_invalid_lines(tmp_path):
+    status_path = tmp_path / "job.status.jsonl"
+    lines = [json.dumps({"event": f"e{idx}"}) for idx in range(10)] + ["not json"]
+    status_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    events = tail_events(status_path, limit=3)
+
+    assert [event["event"] for event in events] == ["e8", "e9"]
+
+
+def test_status_index_pages_by_offset_and_persists(tmp_path):
+    status_path = tmp_path / "job.status.jsonl"
+    status_path.write_text("".join(json.dumps({"event": f"e{idx}"}) + "\n" for idx in range(5)), encoding="utf-8")
+
+    index = StatusEventIndex(status_path)
+    first = index.page(after=0, limit=2)
+    second = index.page(after=first["next"], limit=10)
+
+    assert [event["event"] for event in first["events"]] == ["e0", "e1"]
+    assert [event["event"] for event in second["events"]] == ["e2", "e3", "e4"]
+    assert second["total"] == 5
+    assert index.index_path.stat().st_size == 5 * 8
+
+    with status_path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"event": "e5"}) + "\n")
+    reopened = StatusEventIndex(status_path)
+    latest = reopened.page(after=second["next"])
+
+    assert [event["event"] for event in latest["events"]] == ["e5"]
+    assert latest["total"] == 6
+    assert reopened.page(after=latest["next"])["events"] == []
+
+
+def test_installation_events_endpoint_helper(tmp_path):
+    project_root = Path(__file__).resolve().parents[2]
+    api = server.WebLauncherAPI(
+        project_root=project_root,
+        config_path=tmp_path / "config.yaml",
+        log_dir=tmp_path / "logs",
+        history_path=tmp_path / "history.json",
+    )
+    status_path = tmp_path / "logs" / "install_models-abc.status.jsonl"
+    for idx in range(3):
+        api._append_status_event(status_path, "info", f"event_{idx}", "message")
+
+    page = api.get_installation_events("install_models-abc", after=0, limit=2)
+    rest = api.get_installation_events("install_models-abc", after=page["next"])
+
+    assert [event["event"] for event in page["events"]] == ["event_0", "event_1"]
+    assert [event["event"] for event in rest["events"]] == ["event_2"]
+    try:
+        api.get_installation_events("../escape")
+    except ValueError:
+        pass
+    else:  # pragma: no cover - defensive
+        raise AssertionError("Expected path-like job ids to be rejected")
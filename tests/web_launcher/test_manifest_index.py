@@ -0,0 +1,63 @@
+import json
+import os
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from modules.runtime.web_launcher import manifest_index  # noqa: E402
+
+
+def _write_manifest(path: Path, names):
+    payload = {"source": "test", "items": [{"name": name, "url": f"https://example.invalid/{name}"} for name in names]}
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def test_index_reuses_snapshot_until_file_changes(tmp_path, monkeypatch):
+    manifest_path = tmp_path / "models.json"
+    _write_manifest(manifest_path, ["Alpha Model"])
+
+    calls = {"count": 0}
+    original = manifest_index.validate_manifest
+
+    def counting_validate(path):
+        calls["count"] += 1
+        return original(path)
+
+    monkeypatch.setattr(manifest_index, "validate_manifest", counting_validate)
+    index = manifest_index.ManifestIndex(tmp_path)
+
+    assert index.get("models", "alpha-model")["name"] == "Alpha Model"
+    assert index.find_by_name("models", "Alpha Model") is not None
+    assert index.count("models") == 1
+    assert calls["count"] == 1
+
+    _write_manifest(manifest_path, ["Alpha Model", "Beta Model"])
+    stat = manifest_path.stat()
+    os.utime(manifest_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert index.get("models", "Beta Model")["slug"] == "beta-model"
+    assert index.count("models") == 2
+    assert calls["count"] == 2
+
+
+def test_load_returns_copy_safe_to_mutate(tmp_path):
+    _write_manifest(tmp_path / "loras.json", ["Gamma"])
+    index = manifest_index.ManifestIndex(tmp_path)
+
+    first = index.load("loras")
+    first["type"] = "loras"
+    first["items"].clear()
+
+    second = index.load("loras")
+    assert "type" not in second
+    assert [item["name"] for item in second["items"]] == ["Gamma"]
+
+
+def test_missing_manifest_reports_error(tmp_path):
+    index = manifest_index.ManifestIndex(tmp_path)
+
+    payload = index.load("models")
+
+    assert payload["has_errors"] is True
+    assert index.get("models", "anything") is None
@@ -0,0 +1,75 @@
+import gzip
+import json
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from modules.runtime.character_studio.registry import CharacterCardRegistry  # noqa: E402
+from modules.runtime.web_launcher import server  # noqa: E402
+from modules.runtime.web_launcher.router import Request  # noqa: E402
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _api(tmp_path):
+    api = server.WebLauncherAPI(
+        project_root=PROJECT_ROOT,
+        config_path=tmp_path / "config.yaml",
+        log_dir=tmp_path / "logs",
+        history_path=tmp_path / "history.json",
+        artifact_db=tmp_path / "artifacts.sqlite",
+    )
+    api._card_registry = CharacterCardRegistry(tmp_path / "cards")
+    return api
+
+
+def _get(api, path, **headers):
+    return server.API_ROUTER.dispatch(Request("GET", path, headers=headers, api=api))
+
+
+def test_repeat_requests_skip_the_handler_until_sources_change(tmp_path, monkeypatch):
+    api = _api(tmp_path)
+    calls = []
+    original = api.list_characters
+    monkeypatch.setattr(api, "list_characters", lambda: calls.append(1) or original())
+
+    first = _get(api, "/api/characters")
+    second = _get(api, "/api/characters")
+    assert first.status == second.status == 200
+    assert json.loads(first.body) == {"items": []} and second.body == first.body
+    assert len(calls) == 1 and api.response_cache.stats()["hits"] == 1
+    assert _get(api, "/api/characters", **{"If-None-Match": first.headers["ETag"]}).status == 304
+
+    card_dir = tmp_path / "cards" / "hero"
+    card_dir.mkdir(parents=True)
+    (card_dir / "card.json").write_text(json.dumps({"id": "hero", "name": "Hero"}), encoding="utf-8")
+    third = _get(api, "/api/characters", **{"If-None-Match": first.headers["ETag"]})
+    assert third.status == 200 and third.headers["ETag"] != first.headers["ETag"]
+    assert len(calls) == 2 and api.response_cache.stats()["entries"] == 1
+
+
+def test_gzip_and_identity_bodies_carry_distinct_strong_etags(tmp_path):
+    api = _api(tmp_path)
+    plain = _get(api, "/api/manifests")
+    zipped = _get(api, "/api/manifests", **{"Accept-Encoding": "gzip"})
+
+    assert plain.headers.get("Content-Encoding") is None and zipped.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(zipped.body) == plain.body
+    assert plain.headers["Vary"] == zipped.headers["Vary"] == "Accept-Encoding"
+    assert zipped.headers["ETag"] != plain.headers["ETag"] and not zipped.headers["ETag"].startswith("W/")
+    assert api.response_cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+    revalidated = _get(api, "/api/manifests", **{"Accept-Encoding": "gzip", "If-None-Match": zipped.headers["ETag"]})
+    assert revalidated.status == 304 and revalidated.headers["ETag"] == zipped.headers["ETag"]
+
+
+def test_saving_pairings_invalidates_the_cached_selection(tmp_path):
+    api = _api(tmp_path)
+    before = _get(api, "/api/pairings")
+    assert _get(api, "/api/pairings").body == before.body
+
+    api.update_pairings({"model": "", "loras": []})
+    after = _get(api, "/api/pairings", **{"If-None-Match": before.headers["ETag"]})
+    assert after.status == 200 and after.headers["ETag"] != before.headers["ETag"]
+    assert json.loads(after.body)["selection"] == {"model": "", "loras": []}
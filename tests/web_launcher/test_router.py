@@ -0,0 +1,107 @@
+import json
+import os
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from modules.runtime.web_launcher import server  # noqa: E402
+from modules.runtime.web_launcher.response_cache import ResponseCache, cached  # noqa: E402
+from modules.runtime.web_launcher.router import HTTPError, Request, Router, file_version  # noqa: E402
+
+
+def test_templates_compile_to_typed_params_and_method_checks():
+    router = Router()
+    router.add("GET", "/api/jobs/<int:job>/events", lambda request: {"job": request.params["job"]}, name="events")
+    router.add("GET", "/api/manifests/<kind>/<item_id>", lambda request: dict(request.params), name="item")
+    router.add("POST", "/api/jobs/<int:job>/events", lambda request: ({"posted": True}, 202), name="post_events")
+    router.compile()
+
+    assert router.dispatch(Request("GET", "/api/jobs/7/events")).payload == {"job": 7}
+    assert router.dispatch(Request("POST", "/api/jobs/7/events")).status == 202
+    assert router.dispatch(Request("GET", "/api/manifests/models/sd%201.5")).payload == {"kind": "models", "item_id": "sd 1.5"}
+    assert router.dispatch(Request("GET", "/api/jobs/seven/events")).status == 404
+    rejected = router.dispatch(Request("DELETE", "/api/jobs/7/events"))
+    assert rejected.status == 405 and rejected.headers["Allow"] == "GET, POST"
+
+
+def test_middleware_runs_global_then_route_and_maps_errors():
+    calls = []
+
+    def tag(label):
+        def middleware(request, call_next):
+            calls.append(label)
+            return call_next(request)
+
+        return middleware
+
+    def fail(request):
+        raise HTTPError(409, "busy")
+
+    router = Router(middleware=[tag("global")])
+    router.add("GET", "/ok", lambda request: {"ok": True}, middleware=[tag("route")], name="ok")
+    router.add("GET", "/conflict", fail)
+    router.add("GET", "/invalid", lambda request: int("x"), name="invalid")
+
+    assert router.dispatch(Request("GET", "/ok")).payload == {"ok": True}
+    assert calls == ["global", "route"]
+    assert router.dispatch(Request("GET", "/conflict")).payload == {"error": "busy"}
+    assert router.dispatch(Request("GET", "/invalid")).status == 400
+    assert router.dispatch(Request("GET", "/missing")).status == 404
+    assert calls == ["global", "route", "global", "global", "global"]
+
+
+def test_conditional_get_skips_handler_until_source_changes(tmp_path):
+    source = tmp_path / "models.json"
+    source.write_text("{}", encoding="utf-8")
+    built = []
+    api = SimpleNamespace(response_cache=ResponseCache())
+    router = Router()
+    router.add(
+        "GET",
+        "/api/manifests",
+        lambda request: built.append(1) or {"items": []},
+        name="manifests",
+        middleware=[cached(lambda request: file_version([source]))],
+    )
+
+    first = router.dispatch(Request("GET", "/api/manifests", api=api))
+    etag = first.headers["ETag"]
+    assert first.status == 200 and first.headers["Last-Modified"]
+    revalidated = router.dispatch(Request("GET", "/api/manifests", headers={"If-None-Match": etag}, api=api))
+    assert revalidated.status == 304 and revalidated.body == b"" and len(built) == 1
+    since = router.dispatch(Request("GET", "/api/manifests", headers={"If-Modified-Since": first.headers["Last-Modified"]}, api=api))
+    assert since.status == 304
+
+    source.write_text('{"items": []}', encoding="utf-8")
+    os.utime(source, ns=(source.stat().st_atime_ns, source.stat().st_mtime_ns + 5_000_000_000))
+    fresh = router.dispatch(Request("GET", "/api/manifests", headers={"If-None-Match": etag}, api=api))
+    assert fresh.status == 200 and fresh.headers["ETag"] != etag and len(built) == 2
+
+
+def test_launcher_routes_cover_api_and_enforce_auth(tmp_path):
+    api = server.WebLauncherAPI(
+        project_root=Path(__file__).resolve().parents[2],
+        config_path=tmp_path / "config.yaml",
+        log_dir=tmp_path / "logs",
+        history_path=tmp_path / "history.json",
+    )
+    router = server.API_ROUTER
+
+    denied = router.dispatch(Request("GET", "/api/tools", api=api, auth_token="secret"))
+    assert denied.status == 401
+    headers = {"Authorization": "Bearer secret"}
+    tools = router.dispatch(Request("GET", "/api/tools", headers=headers, api=api, auth_token="secret"))
+    assert tools.status == 200 and "items" in json.loads(tools.body)
+    again = router.dispatch(
+        Request("GET", "/api/tools", headers={**headers, "If-None-Match": tools.headers["ETag"]}, api=api, auth_token="secret")
+    )
+    assert again.status == 304
+
+    missing_job = router.dispatch(Request("GET", "/api/installations/nope/events", api=api))
+    assert missing_job.status == 404
+    bad_type = router.dispatch(Request("GET", "/api/manifests/widgets", api=api))
+    assert bad_type.status == 400 and "Manifest type" in bad_type.payload["error"]
+    posted = router.dispatch(Request("POST", "/api/actions", read_body=lambda: json.loads('{"action": "nope"}'), api=api))
+    assert posted.status == 400
@@ -4,6 +4,7 @@ import sys
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 
 from modules.runtime.web_launcher import server  # noqa: E402
+from modules.runtime.audio.voice_profiles import services as voice_profiles_services  # noqa: E402
 from modules.runtime.models import tasks  # noqa: E402
 
 
@@ -13,18 +14,19 @@ def test_voice_profiles_tool_wired(monkeypatch, tmp_path):
 
     calls = {"count": 0}
 
-    def fake_list_voice_profiles():
+    def fake_list_voice_profiles(task=None):
         calls["count"] += 1
-        task = tasks.new_task("voice_profiles", payload={"source": "test"})
+        task = task or tasks.new_task("voice_profiles", payload={"source": "test"})
         tasks.mark_running(task)
         return tasks.mark_succeeded(task, result={"profiles": [{"id": "demo"}]})
 
-    monkeypatch.setattr(server.voice_profiles_services, "list_voice_profiles", fake_list_voice_profiles)
+    monkeypatch.setattr(voice_profiles_services, "list_voice_profiles", fake_list_voice_profiles)
 
     result = api.create_task("voice_profiles", {})
+    assert result["kind"] == "voice_profiles"
+    assert result["status"] in {"pending", "running", "completed"}
 
+    finished = api.task_engine.wait(result["id"], timeout=5)
     assert calls["count"] == 1
-    assert result["kind"] == "voice_profiles"
-    assert result["result"]["profiles"][0]["id"] == "demo"
-    assert result["id"] in api._tasks
-    assert api._tasks[result["id"]].result["profiles"][0]["id"] == "demo"
+    assert finished.status == "completed"
+    assert api.get_task(result["id"])["result"]["profiles"][0]["id"] == "demo"
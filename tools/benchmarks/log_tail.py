@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: reverse-seek log tail vs. full-file readlines.
+
+Generates installer-style logs of increasing size (default up to 100 MB) and
+times the web launcher's ``tail_text``/``tail_events`` readers against the
+previous ``readlines()``/decode-everything approach. The seek-based readers
+should stay flat as the files grow.
+
+Usage: python tools/benchmarks/log_tail.py [--sizes-mb 1 10 100] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from modules.runtime.web_launcher.log_reader import StatusEventIndex, tail_events, tail_text  # noqa: E402
+
+
+def _write_log(path: Path, size_bytes: int) -> None:
+    line = "[#a1b2c3 1.2GiB/6.4GiB(18%) CN:16 DL:48MiB ETA:1m48s]\n"
+    block = line * 4096
+    with path.open("w", encoding="utf-8") as handle:
+        written = 0
+        while written < size_bytes:
+            handle.write(block)
+            written += len(block)
+
+
+def _write_status(path: Path, size_bytes: int) -> None:
+    event = json.dumps({"timestamp": "2025-01-01T00:00:00Z", "level": "info", "event": "download_attempt", "message": "x" * 64})
+    block = (event + "\n") * 2048
+    with path.open("w", encoding="utf-8") as handle:
+        written = 0
+        while written < size_bytes:
+            handle.write(block)
+            written += len(block)
+
+
+def _legacy_tail(path: Path, lines: int = 20) -> str:
+    with path.open("r", encoding="utf-8", errors="ignore") as handle:
+        content = handle.readlines()
+    return "".join(content[-lines:])
+
+
+def _legacy_events(path: Path, limit: int = 50) -> list:
+    events = []
+    with path.open("r", encoding="utf-8", errors="ignore") as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                events.append(json.loads(line))
+    return events[-limit:]
+
+
+def _time(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'size':>8} | {'readlines ms':>12} | {'tail ms':>8} | {'decode-all ms':>13} | {'tail_events ms':>14} | {'page ms':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_mb in args.sizes_mb:
+            log_path = Path(tmp) / f"install-{size_mb}.log"
+            status_path = Path(tmp) / f"install-{size_mb}.status.jsonl"
+            _write_log(log_path, size_mb * 1024 * 1024)
+            _write_status(status_path, size_mb * 1024 * 1024)
+
+            index = StatusEventIndex(status_path)
+            index.refresh()
+            cursor = index.indexed_bytes
+
+            legacy_tail = _time(lambda: _legacy_tail(log_path), args.repeat)
+            seek_tail = _time(lambda: tail_text(log_path), args.repeat)
+            legacy_events = _time(lambda: _legacy_events(status_path), args.repeat)
+            seek_events = _time(lambda: tail_events(status_path), args.repeat)
+            paged = _time(lambda: index.page(after=max(cursor - 50 * 150, 0)), args.repeat)
+            print(
+                f"{size_mb:>6}MB | {legacy_tail:>12.2f} | {seek_tail:>8.3f} | {legacy_events:>13.2f} | {seek_events:>14.3f} | {paged:>8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
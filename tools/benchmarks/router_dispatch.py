@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: web launcher route-table dispatch overhead.
+
+Times ``Router.match`` and a full ``Router.dispatch`` (middleware included) for a
+sample path of every route in ``server.API_ROUTER``, against a stub API whose
+methods return a constant payload, so only routing cost is measured. Also
+compares ``/api/manifests`` built and encoded from scratch (response cache
+cleared), served from the response cache, and answered with 304.
+
+Usage: python tools/benchmarks/router_dispatch.py [--iterations 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from modules.runtime.web_launcher.router import Request  # noqa: E402
+from modules.runtime.web_launcher.server import API_ROUTER, WebLauncherAPI  # noqa: E402
+
+SAMPLE_PARAMS = {"str": "models", "int": "42", "path": "a/b"}
+
+
+class _StubAPI:
+    manifest_dir = PROJECT_ROOT / "manifests"
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: {"ok": True}
+
+
+def _sample_path(template: str) -> str:
+    return re.sub(r"<(?:(\w+):)?(\w+)>", lambda match: SAMPLE_PARAMS[match.group(1) or "str"], template)
+
+
+def _per_call_ns(func, iterations: int) -> float:
+    started = time.perf_counter_ns()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter_ns() - started) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    stub = _StubAPI()
+    print(f"{'method':<6} {'path':<44} {'match ns':>10} {'dispatch ns':>12}")
+    for route in API_ROUTER.routes:
+        path = _sample_path(route.template)
+        match_ns = _per_call_ns(lambda: API_ROUTER.match(route.method, path), args.iterations)
+        dispatch_ns = _per_call_ns(
+            lambda: API_ROUTER.dispatch(Request(route.method, path, read_body=dict, api=stub)), args.iterations
+        )
+        print(f"{route.method:<6} {path:<44} {match_ns:>10.0f} {dispatch_ns:>12.0f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        api = WebLauncherAPI(PROJECT_ROOT, config_path=root / "config.yaml", log_dir=root / "logs", history_path=root / "history.json")
+        first = API_ROUTER.dispatch(Request("GET", "/api/manifests", api=api))
+        conditional = Request("GET", "/api/manifests", headers={"If-None-Match": first.headers["ETag"]}, api=api)
+        iterations = max(args.iterations // 20, 100)
+
+        def cold() -> None:
+            api.response_cache.clear()
+            API_ROUTER.dispatch(Request("GET", "/api/manifests", api=api))
+
+        full_ns = _per_call_ns(cold, iterations)
+        hit_ns = _per_call_ns(lambda: API_ROUTER.dispatch(Request("GET", "/api/manifests", api=api)), iterations)
+        revalidate_ns = _per_call_ns(lambda: API_ROUTER.dispatch(conditional), iterations)
+        print(
+            f"\n/api/manifests full build+encode: {full_ns / 1000:.1f} us; "
+            f"cache hit: {hit_ns / 1000:.1f} us; 304 revalidation: {revalidate_ns / 1000:.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
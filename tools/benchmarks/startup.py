@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Regression benchmark: cold-start time of the AI Hub entry points.
+
+Cold-starts the web launcher, ``launcher/aihub_menu.py`` and the config
+service ``--repeat`` times each through ``modules.startup_profile`` (fresh
+interpreter, ``-X importtime``), prints the median cold start, import total and
+first-request total, plus the slowest imports of the slowest run, and exits 1
+when a median cold start exceeds its budget. Budgets default to
+``DEFAULT_BUDGETS_MS`` and can be overridden per target or for all targets.
+
+Usage: python tools/benchmarks/startup.py [--repeat 5] [--budget-ms 1500]
+       [--budget web_launcher=800] [--output reports/startup.json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from modules.startup_profile import PROBES, profile_startup  # noqa: E402
+
+# Generous ceilings for a warm disk cache on a laptop-class CPU; they catch a
+# heavy dependency creeping back into an entry point's import chain.
+DEFAULT_BUDGETS_MS = {"web_launcher": 1500.0, "menu": 1000.0, "config_service": 1000.0}
+
+
+def _budgets(args: argparse.Namespace) -> Dict[str, float]:
+    budgets = {target: args.budget_ms or budget for target, budget in DEFAULT_BUDGETS_MS.items()}
+    for item in args.budget:
+        target, _, value = item.partition("=")
+        if target not in PROBES or not value:
+            raise SystemExit(f"--budget expects TARGET=MS with TARGET in {', '.join(sorted(PROBES))}")
+        budgets[target] = float(value)
+    return budgets
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("targets", nargs="*", default=sorted(PROBES), help="Entry points to measure (default: all)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, help="Budget applied to every target")
+    parser.add_argument("--budget", action="append", default=[], help="Per-target budget, e.g. web_launcher=800")
+    parser.add_argument("--output", help="Also write the slowest run of each target as JSON")
+    args = parser.parse_args()
+    budgets = _budgets(args)
+
+    failures: List[str] = []
+    slowest_runs = []
+    print(f"{'target':<16} {'cold ms':>9} {'imports ms':>11} {'first req ms':>13} {'budget ms':>10}")
+    for target in args.targets:
+        runs = [profile_startup(target, budget_ms=budgets[target]) for _ in range(max(args.repeat, 1))]
+        errors = {run["error"] for run in runs if run["error"]}
+        cold = statistics.median(run["cold_start_ms"] for run in runs)
+        imports = statistics.median(run["imports"]["total_ms"] for run in runs)
+        first = statistics.median(run["first_request"]["total_ms"] for run in runs)
+        print(f"{target:<16} {cold:>9.1f} {imports:>11.1f} {first:>13.1f} {budgets[target]:>10.0f}")
+        slowest = max(runs, key=lambda run: run["cold_start_ms"])
+        slowest_runs.append(slowest)
+        for item in slowest["imports"]["slowest"][:5]:
+            print(f"    {item['module']:<48} {item['self_ms']:>8.2f} ms self")
+        if errors:
+            failures.append(f"{target}: {'; '.join(sorted(errors))}")
+        if cold > budgets[target]:
+            failures.append(f"{target}: median cold start {cold:.0f} ms exceeds the {budgets[target]:.0f} ms budget")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"profiles": slowest_runs}, indent=2) + "\n", encoding="utf-8")
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Load test: threaded vs. asyncio web launcher engines.
+
+Starts both engines in-process against a throwaway ``WebLauncherAPI`` and drives
+them with concurrent keep-alive clients (``http.client``; the threaded engine
+answers HTTP/1.0, so its clients reconnect per request). Reports requests per
+second and p50/p99 latency per endpoint.
+
+Usage: python tools/benchmarks/web_engines.py [--clients 32] [--requests 200] [--path /api/actions]
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from modules.runtime.web_launcher.async_server import AsyncLauncherServer  # noqa: E402
+from modules.runtime.web_launcher.server import LauncherRequestHandler, WebLauncherAPI  # noqa: E402
+
+STATIC_DIR = PROJECT_ROOT / "modules" / "runtime" / "web_launcher" / "static"
+
+
+def _client(port: int, path: str, count: int) -> List[float]:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        connection.request("GET", path, headers={"Accept-Encoding": "gzip"})
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - started)
+        if response.status != 200:
+            raise RuntimeError(f"{path} returned {response.status}")
+    connection.close()
+    return latencies
+
+
+def _load(port: int, path: str, clients: int, per_client: int) -> Dict[str, float]:
+    _client(port, path, 5)  # warm caches and imports
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        batches = list(pool.map(lambda _: _client(port, path, per_client), range(clients)))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(latency for batch in batches for latency in batch)
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per client")
+    parser.add_argument("--path", action="append", default=[], help="Endpoint to load (repeatable; default /api/actions and /api/manifests)")
+    parser.add_argument("--max-concurrency", type=int, default=32)
+    args = parser.parse_args()
+    paths = args.path or ["/api/actions", "/api/manifests"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        api = WebLauncherAPI(
+            project_root=PROJECT_ROOT,
+            config_path=root / "config.yaml",
+            log_dir=root / "logs",
+            history_path=root / "history.json",
+            artifact_db=root / "artifacts.sqlite",
+        )
+
+        threaded = ThreadingHTTPServer(
+            ("127.0.0.1", 0),
+            lambda *a, **kw: LauncherRequestHandler(*a, api=api, static_dir=STATIC_DIR, auth_token=None, **kw),
+        )
+        thread = threading.Thread(target=threaded.serve_forever, daemon=True)
+        thread.start()
+        asynchronous = AsyncLauncherServer(api, STATIC_DIR, port=0, max_concurrency=args.max_concurrency).start_background()
+
+        print(f"{'engine':<10} {'path':<16} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9}")
+        try:
+            for path in paths:
+                for engine, port in (("threaded", threaded.server_address[1]), ("async", asynchronous.port)):
+                    result = _load(port, path, args.clients, args.requests)
+                    print(f"{engine:<10} {path:<16} {result['rps']:>10.0f} {result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f}")
+        finally:
+            threaded.shutdown()
+            asynchronous.stop()
+
+
+if __name__ == "__main__":
+    main()